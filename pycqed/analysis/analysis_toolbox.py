@@ -620,7 +620,7 @@ def compare_instrument_settings_timestamp(timestamp_a, timestamp_b):
     Currently it only compares settings existing in object_a, this function can be improved to not care about the order of arguments.
     '''
 
-    h5mode = 'r+'
+    h5mode = 'r'
     h5filepath = measurement_filename(get_folder(timestamp_a))
     analysis_object_a = h5py.File(h5filepath, h5mode)
     h5filepath = measurement_filename(get_folder(timestamp_b))
@@ -826,6 +826,69 @@ def Cos_amp_phase_guess(model, data, f, t):
     return params
 
 
+def fft_freq_phase_guess_2D(data, t):
+    """
+    Vectorized version of fft_freq_phase_guess for a 2D array with one trace
+    per row, returns arrays of the frequency and phase guesses.
+    """
+    data = np.asarray(data)
+    w = np.fft.fft(data, axis=1)[:, :data.shape[1] // 2]
+    f = np.fft.fftfreq(data.shape[1], t[1] - t[0])[:w.shape[1]]
+    w[:, 0] = 0  # Removes DC component from fourier transform
+    # argmax returns the first maximum, the same as the 1D version
+    freq_guess = np.abs(f[np.argmax(np.abs(w), axis=1)])
+    ph_guess = 2 * np.pi - 2 * np.pi * t[np.argmax(data, axis=1)] * freq_guess
+    return freq_guess, ph_guess
+
+
+def exp_dec_guess_2D(model, data, t):
+    """
+    Vectorized version of exp_dec_guess for a 2D array with one trace per
+    row, returns a dict with an array of guesses per parameter.
+    """
+    data = np.asarray(data)
+    offs_guess = data[:, np.argmax(t)]
+    amp_guess = data[:, np.argmin(t)] - offs_guess
+    # guess tau by looking for value closest to 1/e
+    tau_guess = t[np.argmin(abs((amp_guess * (1 / np.e) +
+                                 offs_guess)[:, None] - data), axis=1)]
+    model.set_param_hint('n', value=1, vary=False)
+    return {'amplitude': amp_guess, 'tau': tau_guess,
+            'n': np.ones(len(data)), 'offset': offs_guess}
+
+
+def Cos_guess_2D(model, data, t):
+    """
+    Vectorized version of Cos_guess for a 2D array with one trace per row,
+    returns a dict with an array of guesses per parameter.
+    """
+    data = np.asarray(data)
+    freq_guess, ph_guess = fft_freq_phase_guess_2D(data, t)
+    model.set_param_hint('amplitude', min=0)  # Ensures positive amp
+    model.set_param_hint('frequency', min=0)
+    return {'amplitude': abs(np.max(data, axis=1) -
+                             np.min(data, axis=1)) / 2,
+            'frequency': freq_guess, 'phase': ph_guess,
+            'offset': np.mean(data, axis=1)}
+
+
+def exp_damp_osc_guess_2D(model, data, t):
+    """
+    Vectorized version of exp_damp_osc_guess for a 2D array with one trace
+    per row, returns a dict with an array of guesses per parameter.
+    """
+    data = np.asarray(data)
+    nr_traces = len(data)
+    freq_guess, ph_guess = fft_freq_phase_guess_2D(data, t)
+    return {'amplitude': abs(np.max(data, axis=1) -
+                             np.min(data, axis=1)) / 2,
+            'frequency': freq_guess, 'phase': ph_guess,
+            'oscillation_offset': np.zeros(nr_traces),
+            'exponential_offset': np.mean(data, axis=1),
+            'n': np.ones(nr_traces),
+            'tau': np.full(nr_traces, 2 / 3 * max(t))}
+
+
 def gauss_2D_guess(model, data, x, y):
     '''
     takes the mean of every row/column and then uses the regular gauss guess
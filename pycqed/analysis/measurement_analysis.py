@@ -18,6 +18,7 @@ import textwrap
 from scipy.interpolate import interp1d
 import pylab
 from pycqed.analysis.tools import data_manipulation as dm_tools
+from pycqed.analysis.tools import lazy_data
 import imp
 import math
 
@@ -118,8 +119,15 @@ class MeasurementAnalysis(object):
         if folder is None:
             folder = self.folder
         self.h5filepath = a_tools.measurement_filename(folder)
-        h5mode = kw.pop('h5mode', 'r+')
-        self.data_file = h5py.File(self.h5filepath, h5mode)
+        # Files are opened read-only by default such that data can be loaded
+        # while it is being measured or by several analyses at once.
+        # Analysis results are written by reopening the file, see
+        # add_analysis_datagroup_to_file.
+        h5mode = kw.pop('h5mode', 'r')
+        if h5mode == 'r':
+            self.data_file = h5d.open_read_only(self.h5filepath)
+        else:
+            self.data_file = h5py.File(self.h5filepath, h5mode)
         if not file_only:
             for k in list(self.data_file.keys()):
                 if type(self.data_file[k]) == h5py.Group:
@@ -273,12 +281,12 @@ class MeasurementAnalysis(object):
             names = self.get_key('sweep_parameter_names')
 
             ind = names.index(key)
-            values = self.g['Data'].value[:, ind]
+            values = self.g['Data'][:, ind]
         elif key in self.get_key('value_names'):
             names = self.get_key('value_names')
             ind = (names.index(key) +
                    len(self.get_key('sweep_parameter_names')))
-            values = self.g['Data'].value[:, ind]
+            values = self.g['Data'][:, ind]
         else:
             values = self.g[key].value
         # Makes sure all data is np float64
@@ -295,7 +303,8 @@ class MeasurementAnalysis(object):
             s = s.decode('utf-8')
         # If it is an array of value decodes individual entries
         if type(s) == np.ndarray:
-            s = [s.decode('utf-8') for s in s]
+            # h5py >= 3 reads variable length strings as str
+            s = [s.decode('utf-8') if isinstance(s, bytes) else s for s in s]
         return s
 
     def group_values(self, group_name):
@@ -306,7 +315,22 @@ class MeasurementAnalysis(object):
         group_values = self.g[group_name].value
         return np.asarray(group_values, dtype=np.float64)
 
+    def reopen_hdf5data_for_writing(self):
+        '''
+        Reopens a datafile that was opened read-only in read/write mode.
+        N.B. references to groups and datasets of the read-only file
+        (except self.g) are no longer valid after reopening.
+        '''
+        if self.data_file.mode == 'r+':
+            return self.data_file
+        self.data_file.close()
+        self.data_file = h5py.File(self.h5filepath, 'r+')
+        if hasattr(self, 'g'):
+            self.g = self.data_file['Experimental Data']
+        return self.data_file
+
     def add_analysis_datagroup_to_file(self, group_name='Analysis'):
+        self.reopen_hdf5data_for_writing()
         if group_name in self.data_file:
             self.analysis_group = self.data_file[group_name]
         else:
@@ -592,6 +616,129 @@ class MeasurementAnalysis(object):
         if close_file:
             self.data_file.close()
 
+    def init_lazy_data(self):
+        '''
+        Creates lazy views on the columns of the 'Data' dataset
+        (datasaving format 'Version 2').
+
+        self.lazy_data (LazyDataset) reads only the selected columns and
+        rows, indexed like self.data, e.g. self.lazy_data[2, :100].
+        self.sweep_point_views and self.measured_value_views are LazyColumn
+        views per sweep parameter and measured value.
+        '''
+        nr_pars = len(self.parameter_names)
+        self.lazy_data = lazy_data.LazyDataset(
+            filepath=self.h5filepath, dataset_path='Experimental Data/Data',
+            get_file=lambda: self.data_file,
+            column_names=list(self.parameter_names) + list(self.value_names))
+        self.sweep_point_views = [self.lazy_data.column(i)
+                                  for i in range(nr_pars)]
+        self.measured_value_views = [
+            self.lazy_data.column(nr_pars + i)
+            for i in range(len(self.value_names))]
+
+    def set_lazy_attributes(self, names, loader):
+        '''
+        Registers attributes that are loaded when one of them is first
+        accessed. loader is called without arguments and returns a dict with
+        the values of the attributes in names. Attributes that are set
+        before they are loaded are not overwritten by the loader.
+
+        Only the attributes defined as properties below (data,
+        sweep_points, measured_values and Z) can be loaded lazily.
+        '''
+        lazy_values = self.__dict__.setdefault('_lazy_values', {})
+        lazy_loaders = self.__dict__.setdefault('_lazy_loaders', {})
+        for name in names:
+            lazy_values.pop(name, None)
+            lazy_loaders[name] = loader
+
+    def _get_lazy_attribute(self, name):
+        lazy_values = self.__dict__.setdefault('_lazy_values', {})
+        if name not in lazy_values:
+            lazy_loaders = self.__dict__.setdefault('_lazy_loaders', {})
+            if name not in lazy_loaders:
+                raise AttributeError(
+                    '{!r} object has no attribute {!r}'.format(
+                        type(self).__name__, name))
+            loader = lazy_loaders[name]
+            for key, val in loader().items():
+                if lazy_loaders.get(key) is loader:
+                    del lazy_loaders[key]
+                    lazy_values.setdefault(key, val)
+        return lazy_values[name]
+
+    def _set_lazy_attribute(self, name, value):
+        self.__dict__.setdefault('_lazy_loaders', {}).pop(name, None)
+        self.__dict__.setdefault('_lazy_values', {})[name] = value
+
+    @property
+    def data(self):
+        '''
+        All columns of the dataset, shape (nr_columns, nr_rows).
+        Only read from the file when accessed.
+        '''
+        return self._get_lazy_attribute('data')
+
+    @data.setter
+    def data(self, value):
+        self._set_lazy_attribute('data', value)
+
+    @property
+    def sweep_points(self):
+        return self._get_lazy_attribute('sweep_points')
+
+    @sweep_points.setter
+    def sweep_points(self, value):
+        self._set_lazy_attribute('sweep_points', value)
+
+    @property
+    def measured_values(self):
+        return self._get_lazy_attribute('measured_values')
+
+    @measured_values.setter
+    def measured_values(self, value):
+        self._set_lazy_attribute('measured_values', value)
+
+    @property
+    def Z(self):
+        return self._get_lazy_attribute('Z')
+
+    @Z.setter
+    def Z(self, value):
+        self._set_lazy_attribute('Z', value)
+
+    def _load_data(self):
+        # data is transposed first to allow the individual parameter or value
+        # types to be read out using a single array index (no colons
+        # required)
+        return {'data': np.asarray(self.lazy_data)}
+
+    def _load_sweep_points_1D(self):
+        if len(self.parameter_names) == 1:
+            sweep_points = self.lazy_data[0]
+        else:
+            sweep_points = self.lazy_data[0:len(self.parameter_names)]
+        return {'sweep_points': sweep_points}
+
+    def _load_measured_values_1D(self):
+        measured_values = np.array([np.asarray(values) for values in
+                                    self.measured_value_views])
+        return {'measured_values': measured_values}
+
+    def _load_values_2D(self, cols, nr_missing_values):
+        Z = []
+        measured_values = []
+        for values in self.measured_value_views:
+            z = np.append(np.asarray(values),
+                          np.zeros(nr_missing_values) + np.nan)
+            Z_i = z.reshape(-1, cols)
+            Z.append(Z_i)
+            measured_values.append(Z_i.T)
+        if len(self.value_names) == 1:
+            Z = Z[0]
+        return {'Z': Z, 'measured_values': measured_values}
+
     def get_naming_and_values(self):
         '''
         Works both for the 'old' 1D sweeps and the new datasaving format.
@@ -634,15 +781,15 @@ class MeasurementAnalysis(object):
             self.value_names = self.get_key('value_names')
             self.value_units = self.get_key('value_units')
 
-            # data is transposed first to allow the individual parameter or value
-            # types to be read out using a single array index (no colons
-            # required)
-            self.data = self.get_values('Data').transpose()
-            if len(self.parameter_names) == 1:
-                self.sweep_points = self.data[0, :]
-            else:
-                self.sweep_points = self.data[0:len(self.parameter_names), :]
-            self.measured_values = self.data[-len(self.value_names):, :]
+            self.init_lazy_data()
+            # self.data, self.sweep_points and self.measured_values are only
+            # read from the file when they are first used, each reading only
+            # its own columns.
+            self.set_lazy_attributes(['data'], self._load_data)
+            self.set_lazy_attributes(['sweep_points'],
+                                     self._load_sweep_points_1D)
+            self.set_lazy_attributes(['measured_values'],
+                                     self._load_measured_values_1D)
 
             self.xlabel = self.parameter_names[0] + ' (' + \
                           self.parameter_units[0] + ')'
@@ -836,9 +983,9 @@ class MeasurementAnalysis(object):
             self.value_names = self.get_key('value_names')
             self.value_units = self.get_key('value_units')
 
-            self.data = self.get_values('Data').transpose()
-            x = self.data[0]
-            y = self.data[1]
+            self.init_lazy_data()
+            x = self.lazy_data[0]
+            y = self.lazy_data[1]
             cols = np.unique(x).shape[0]
 
             # Adding np.nan for prematurely interupted experiments
@@ -854,20 +1001,13 @@ class MeasurementAnalysis(object):
             self.sweep_points = self.X[0]
             self.sweep_points_2D = self.Y.T[0]
 
-            if len(self.value_names) == 1:
-                z = self.data[2]
-                z = np.append(z, np.zeros(nr_missing_values) + np.nan)
-                self.Z = z.reshape(-1, cols)
-                self.measured_values = [self.Z.T]
-            else:
-                self.Z = []
-                self.measured_values = []
-                for i in range(len(self.value_names)):
-                    z = self.data[2 + i]
-                    z = np.append(z, np.zeros(nr_missing_values) + np.nan)
-                    Z = z.reshape(-1, cols)
-                    self.Z.append(Z)
-                    self.measured_values.append(Z.T)
+            # self.data, self.Z and self.measured_values are only read from
+            # the file when they are first used, Z and measured_values only
+            # read the columns of the measured values.
+            self.set_lazy_attributes(['data'], self._load_data)
+            self.set_lazy_attributes(
+                ['Z', 'measured_values'],
+                lambda: self._load_values_2D(cols, nr_missing_values))
 
             self.xlabel = self.parameter_names[0] + ' (' + \
                           self.parameter_units[0] + ')'
@@ -1613,7 +1753,6 @@ class Rabi_Analysis(TD_Analysis):
 
     def __init__(self, label='Rabi', qb_name=None, NoCalPoints=0, **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
 
         super().__init__(qb_name=qb_name,
                          NoCalPoints=NoCalPoints, **kw)
@@ -2374,7 +2513,6 @@ class Motzoi_XY_analysis(TD_Analysis):
 
     def __init__(self, label='Motzoi', cal_points=[[-4, -3], [-2, -1]], **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
         self.cal_points = cal_points
         super().__init__(**kw)
 
@@ -2541,7 +2679,6 @@ class QScale_Analysis(TD_Analysis):
 
     def __init__(self, label='QScale', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
 
         self.make_fig_qscale = kw.get('make_fig', True)
         kw['make_fig'] = False
@@ -2810,7 +2947,6 @@ class Rabi_Analysis_old(TD_Analysis):
 
     def __init__(self, label='Rabi', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
         super(self.__class__, self).__init__(**kw)
 
     def run_default_analysis(self, print_fit_results=False, **kw):
@@ -2996,7 +3132,6 @@ class SSRO_Analysis(MeasurementAnalysis):
         logging.warning('The use of this class is deprectated!' +
                          ' Use the new v2 analysis instead.')
 
-        kw['h5mode'] = 'r+'
         self.rotate = rotate
         self.channels = channels
         self.hist_log_scale = hist_log_scale
@@ -3714,7 +3849,6 @@ class SSRO_discrimination_analysis(MeasurementAnalysis):
     '''
 
     def __init__(self, **kw):
-        kw['h5mode'] = 'r+'
         super(self.__class__, self).__init__(**kw)
 
     def run_default_analysis(self, plot_2D_histograms=True,
@@ -3837,7 +3971,6 @@ class touch_n_go_SSRO_Analysis(MeasurementAnalysis):
 
     def __init__(self, label='touch_n_go', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
         super(self.__class__, self).__init__(**kw)
 
     def run_default_analysis(self, print_fit_results=False, **kw):
@@ -3881,7 +4014,6 @@ class SSRO_single_quadrature_discriminiation_analysis(MeasurementAnalysis):
         """
         # Note: weight_func is a bit of misnomer here
         # it represents the channel/weight of the data we want to bin
-        kw['h5mode'] = 'r+'
         self.weight_func = weight_func
         super().__init__(**kw)
 
@@ -3905,11 +4037,11 @@ class SSRO_single_quadrature_discriminiation_analysis(MeasurementAnalysis):
             # Potentially bug sensitive!!
             self.units = self.value_units[0]
         elif type(self.weight_func) is int:
-            self.shots = self.measured_values[self.weight_func]
+            self.shots = self.get_values(self.value_names[self.weight_func])
             self.units = self.value_units[self.weight_func]
         elif self.weight_func is None:
             self.weight_func = self.value_names[0]
-            self.shots = self.measured_values[0]
+            self.shots = self.get_values(self.weight_func)
             self.units = self.value_units[0]
 
     def histogram_shots(self, shots):
@@ -4004,7 +4136,6 @@ class T1_Analysis(TD_Analysis):
 
     def __init__(self, label='T1', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         super().__init__(**kw)
 
     def fit_T1(self, **kw):
@@ -4149,7 +4280,6 @@ class Ramsey_Analysis(TD_Analysis):
 
     def __init__(self, label='Ramsey', phase_sweep_only=False, **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
         self.phase_sweep_only = phase_sweep_only
         self.artificial_detuning = kw.pop('artificial_detuning', 0)
         if self.artificial_detuning == 0:
@@ -4602,7 +4732,6 @@ class DragDetuning_Analysis(TD_Analysis):
 
     def __init__(self, label='DragDetuning', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         super(self.__class__, self).__init__(**kw)
 
     def run_default_analysis(self, print_fit_results=False, **kw):
@@ -4722,7 +4851,6 @@ class DriveDetuning_Analysis(TD_Analysis):
 
     def __init__(self, label='DriveDetuning', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         super().__init__(**kw)
 
     def run_default_analysis(self, print_fit_results=False, **kw):
@@ -4829,7 +4957,6 @@ class OnOff_Analysis(TD_Analysis):
 
     def __init__(self, label='OnOff', idx=None, **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         self.idx = idx
         super(self.__class__, self).__init__(**kw)
 
@@ -4940,7 +5067,6 @@ class AllXY_Analysis(TD_Analysis):
     def __init__(self, label='AllXY', zero_coord=None, one_coord=None,
                  make_fig=True, **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         self.zero_coord = zero_coord
         self.one_coord = one_coord
         self.make_fig = make_fig
@@ -5040,7 +5166,6 @@ class FFC_Analysis(TD_Analysis):
 
     def __init__(self, label='FFC', make_fig=True, zero_coord=None, one_coord=None, **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         self.zero_coord = zero_coord
         self.one_coord = one_coord
         self.make_fig = make_fig
@@ -5428,7 +5553,6 @@ class Homodyne_Analysis(MeasurementAnalysis):
         # dict must be custom_power_message={'Power': -15, 'Atten': 86, 'res_len':3e-6}
         # Power in dBm, Atten in dB and resonator length in m
         kw['label'] = label
-        kw['h5mode'] = 'r+'
         kw['custom_power_message'] = custom_power_message
         super().__init__(**kw)
 
@@ -5788,7 +5912,6 @@ class VNA_Analysis(MeasurementAnalysis):
 
     def __init__(self, label='VNA', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
         super().__init__(**kw)
 
     def run_default_analysis(self, **kw):
@@ -5811,7 +5934,6 @@ class Acquisition_Delay_Analysis(MeasurementAnalysis):
 
     def __init__(self, label='AD', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
         super().__init__(**kw)
 
     def run_default_analysis(self, print_fit_results=False, window_len=11,
@@ -5864,7 +5986,6 @@ class Hanger_Analysis_CosBackground(MeasurementAnalysis):
 
     def __init__(self, label='HM', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'
         super(self.__class__, self).__init__(**kw)
 
     def run_default_analysis(self, print_fit_results=False,
@@ -6056,7 +6177,6 @@ class Qubit_Spectroscopy_Analysis(MeasurementAnalysis):
 
     def __init__(self, label='Source', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         super(self.__class__, self).__init__(**kw)
 
     def fit_data(self, analyze_ef=False, **kw):
@@ -6425,7 +6545,6 @@ class Mixer_Calibration_Analysis(MeasurementAnalysis):
         kw['label'] = label
         # Adds the label to the keyword arguments so that it can be passed
         # on in **kw
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         super(self.__class__, self).__init__(**kw)
 
     def run_default_analysis(self, print_fit_results=False,
@@ -6465,7 +6584,6 @@ class Qubit_Characterization_Analysis(MeasurementAnalysis):
 
     def __init__(self, label='Qubit_Char', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         super(self.__class__, self).__init__(**kw)
 
     def run_default_analysis(self, **kw):
@@ -6588,7 +6706,6 @@ class Qubit_Sweeped_Spectroscopy_Analysis(Qubit_Characterization_Analysis):
 
     def __init__(self, qubit_name, label='Qubit_Char', fit_mode='flux', **kw):
         kw['label'] = label
-        kw['h5mode'] = 'r+'  # Read write mode, file must exist
         self.fit_mode = fit_mode
         self.qubit_name = qubit_name
         super(Qubit_Characterization_Analysis, self).__init__(**kw)
@@ -7113,16 +7230,11 @@ class time_trace_analysis(MeasurementAnalysis):
     def run_default_analysis(self, flipping_sequence=False, **kw):
         self.get_naming_and_values_2D()
 
-        rsf_lst_mp = []
-        rsf_lst_pm = []
-        for i in range(np.shape(self.Z)[0]):
-            series = self.Z[i, :]
-            if flipping_sequence:
-                series = dm_tools.binary_derivative_old(series)
-
-            rsf = dm_tools.count_rounds_since_flip_split(series)
-            rsf_lst_mp.extend(rsf[0])
-            rsf_lst_pm.extend(rsf[1])
+        traces = np.array(self.Z)
+        if flipping_sequence:
+            traces = dm_tools.binary_derivative_old(traces)
+        rsf_lst_mp, rsf_lst_pm = dm_tools.count_rounds_since_flip_split_2D(
+            traces)
 
         # if self.make_fig:
         self.fig, self.ax = plt.subplots(1, 1, figsize=(13, 6))
@@ -7179,9 +7291,9 @@ class time_trace_analysis_initialized(MeasurementAnalysis):
         self.get_naming_and_values_2D()
         if flipping_sequence:
             dZ = dm_tools.binary_derivative_2D(np.array(self.Z), axis=0)
-            rtf = [dm_tools.count_rounds_to_error(ser) for ser in dZ]
+            rtf = dm_tools.count_rounds_to_error_2D(dZ)
         else:
-            rtf = [dm_tools.count_rounds_to_error(ser) for ser in self.Z]
+            rtf = dm_tools.count_rounds_to_error_2D(np.array(self.Z))
         self.mean_rtf = np.nanmean(rtf)
         self.std_rtf = np.nanstd(rtf)
         self.std_err_rtf = self.std_rtf / np.sqrt(len(self.sweep_points_2D))
@@ -7220,11 +7332,11 @@ class rounds_to_failure_analysis(MeasurementAnalysis):
         self.get_naming_and_values_2D()
         if flipping_sequence:
             dZ = dm_tools.binary_derivative_2D(np.array(self.Z), axis=0)
-            rtf_c = [dm_tools.count_rtf_and_term_cond(
-                ser, only_count_min_1=True) for ser in dZ]
+            rtf, term_cond = dm_tools.count_rtf_and_term_cond_2D(
+                dZ, only_count_min_1=True)
         else:
-            rtf_c = [dm_tools.count_rtf_and_term_cond(ser) for ser in self.Z]
-        rtf, term_cond = list(zip(*rtf_c))
+            rtf, term_cond = dm_tools.count_rtf_and_term_cond_2D(
+                np.array(self.Z))
         self.mean_rtf = np.nanmean(rtf)
         self.std_rtf = np.nanstd(rtf)
         self.std_err_rtf = self.std_rtf / np.sqrt(len(self.sweep_points_2D))
@@ -7710,7 +7822,6 @@ class DoubleFrequency(TD_Analysis):
         kw['label'] = label
         kw['auto'] = auto
         kw['timestamp'] = timestamp
-        kw['h5mode'] = 'r+'
         super().__init__(**kw)
 
     def run_default_analysis(self, **kw):
@@ -11,6 +11,7 @@ import lmfit
 
 import matplotlib.pyplot as plt
 from pycqed.analysis import measurement_analysis as ma
+from pycqed.analysis.tools import tomography_mle as tomo_mle
 
 
 class TomoAnalysis_JointRO():
@@ -108,8 +109,8 @@ class TomoAnalysis_JointRO():
                                ftol=0.01, xtol=0.001, full_output=0,
                                max_iter=1000):
         """
-        Performs a max likelihood optimization using fmin_powell in order to
-        get the closest physically realisable state.
+        Performs a max likelihood optimization using the analytic gradient
+        in order to get the closest physically realisable state.
 
         This is done by constructing a lower triangular matrix T consisting of
         4 ** n qubits params
@@ -117,8 +118,9 @@ class TomoAnalysis_JointRO():
         Keyword arguments:
         use_weights : default(true) Weighs the quadrature data by the std in
                       betas obtained
-        --- arguments for scipy fmin_powel method below, see
-            the powel documentation
+        max_iter : maximum number of iterations of the L-BFGS-B optimizer
+        ftol, xtol, full_output : arguments of the previously used
+            fmin_powell, ignored
         """
         # first we calculate the measurement matrices
         tstart = time.time()
@@ -150,26 +152,16 @@ class TomoAnalysis_JointRO():
         tlinear = time.time()
         # find out the starting rho by the linear tomo
         discard, rho0 = self.execute_pseudo_inverse_tomo()
-        # now fetch the starting t_params from the cholesky decomp of rho
-        tcholesky = time.time()
-        T0 = np.linalg.cholesky(scipy.linalg.sqrtm((rho0.dag() * rho0).full()))
-        t0 = np.zeros(4 ** self.n_qubits, dtype='complex')
-        di = np.diag_indices(2 ** self.n_qubits)
-        tri = np.tril_indices(2 ** self.n_qubits, -1)
-        t0[0:2 ** self.n_qubits] = T0[di]
-        t0[2**self.n_qubits::2] = T0[tri].real
-        t0[2**self.n_qubits+1::2] = T0[tri].imag
         topt = time.time()
-        # minimize the likelihood function using scipy
-        t_optimal = scipy.optimize.fmin_powell(
-            self._max_likelihood_optimization_function, t0, maxiter=max_iter,
-            full_output=full_output, ftol=ftol, xtol=xtol)
+        # minimize the likelihood function using the analytic gradient
+        rho = tomo_mle.max_likelihood_tomo(
+            self.measurement_vector_numpy, self.measurements_tomo,
+            weights=self.weights, rho0=rho0.full(), max_iter=max_iter)
         if show_time is True:
             print(" Time to calc rotation matrixes %.2f " % (tlinear-tstart))
-            print(" Time to do linear tomo %.2f " % (tcholesky-tlinear))
-            print(" Time to build T %.2f " % (topt-tcholesky))
+            print(" Time to do linear tomo %.2f " % (topt-tlinear))
             print(" Time to optimize %.2f" % (time.time()-topt))
-        return qtp.Qobj(self.build_rho_from_triangular_params(t_optimal),
+        return qtp.Qobj(rho,
                         dims=[[2 for i in range(self.n_qubits)],
                               [2 for i in range(self.n_qubits)]])
 
@@ -291,17 +283,8 @@ class TomoAnalysis_JointRO():
             return self.measurement_operator_labels
 
     def build_rho_from_triangular_params(self, t_params):
-        # build the lower triangular matrix T
-        T_mat = np.zeros(
-            (2 ** self.n_qubits, 2 ** self.n_qubits), dtype="complex")
-        di = np.diag_indices(2 ** self.n_qubits)
-        T_mat[di] = t_params[0:2**self.n_qubits]
-        tri = np.tril_indices(2 ** self.n_qubits, -1)
-        T_mat[tri] = t_params[2**self.n_qubits::2]
-        T_mat[tri] += 1j * t_params[2**self.n_qubits+1::2]
-        rho = np.dot(np.conj(T_mat.T),  T_mat) / \
-            np.trace(np.dot(np.conj(T_mat.T),  T_mat))
-        return rho
+        return tomo_mle.build_rho_from_triangular_params(
+            t_params, 2 ** self.n_qubits)
 
 
 ##############################################################
@@ -325,13 +308,10 @@ class TomoAnalysis_JointRO():
         loss
         """
         rho = self.build_rho_from_triangular_params(t_params)
-        L = 0 + 0j
-        for i in range(len(self.measurement_vector)):
-            expectation = np.trace(
-                np.dot(self.measurement_vector_numpy[i], rho))
-            L += ((expectation -
-                   self.measurements_tomo[i]) ** 2) * self.weights[i]
-        return L
+        expectations = tomo_mle.expectation_values(
+            np.array(self.measurement_vector_numpy), rho)
+        return np.sum(self.weights *
+                      (expectations - self.measurements_tomo) ** 2)
 
     def _calibrate_betas(self, measurements_cal):
         """
@@ -775,7 +755,6 @@ class Tomo_Multiplexed(ma.MeasurementAnalysis):
         self.q1_label = q1_label
         self.close_fig = close_fig
         self.single_shots = single_shots
-        kw['h5mode'] = 'r+'
         super(Tomo_Multiplexed, self).__init__(auto=auto, timestamp=timestamp,
                                                label=label, **kw)
         # if auto is True:
@@ -0,0 +1,201 @@
+"""
+Fitting of the same model to many traces.
+
+Analyses that fit a model to every trace of a 2D dataset (e.g. a T1 per flux
+value) normally create a new guess, Parameters object and lmfit fit per
+trace. batch_fit sets up the problem once and only solves the least-squares
+problem per trace, optionally spread over a pool of worker processes.
+Guesses for all traces at once can be made with the vectorized guess
+functions in fitting_models (e.g. exp_dec_guess_2D, Cos_guess_2D).
+
+Models that are a single function of one independent variable without
+constraint expressions are solved directly with
+scipy.optimize.least_squares. Other models (composite models, constraint
+expressions) use lmfit's Model.fit for every trace.
+"""
+import logging
+import numpy as np
+import lmfit
+from concurrent.futures import ProcessPoolExecutor
+from scipy.optimize import least_squares
+
+
+def batch_fit(model, data, x, guesses: dict=None, params=None,
+              nr_workers: int=1, independent_var: str=None):
+    '''
+    Fits a model to every row of data.
+
+    args:
+        model (lmfit.Model) : the model, e.g. one from fitting_models
+        data (array)  : traces to fit, shape (nr_traces, nr_points)
+        x (array)     : values of the independent variable, either shared
+            by all traces (nr_points, ) or per trace (nr_traces, nr_points)
+        guesses (dict): initial values {parameter: value or array of a value
+            per trace}, parameters without a guess start at the value of
+            the params template
+        params (lmfit.Parameters) : template with the bounds and fixed
+            parameters, defaults to model.make_params()
+        nr_workers (int) : number of worker processes, 1 fits all traces in
+            the current process
+        independent_var (str) : name of the independent variable, defaults
+            to the first independent variable of the model
+    returns:
+        fit_res (dict) with keys
+            'best_values' : {parameter: array of best-fit values}
+            'stderr'      : {parameter: array of standard errors}, nan for
+                fixed parameters or if the errors could not be estimated
+            'success', 'chisqr', 'redchi' : arrays with a value per trace
+    Traces for which the fit raises an exception are logged and get nan
+    values and success False.
+    '''
+    data = np.asarray(data)
+    nr_traces = data.shape[0]
+    x = np.asarray(x)
+    if x.ndim == 1:
+        x = np.broadcast_to(x, (nr_traces, len(x)))
+    if params is None:
+        params = model.make_params()
+    if guesses is None:
+        guesses = {}
+    if independent_var is None:
+        independent_var = model.independent_vars[0]
+
+    init_values = np.zeros((nr_traces, len(model.param_names)))
+    for i, name in enumerate(model.param_names):
+        if name in guesses:
+            value = guesses[name]
+        elif params[name].value is not None and \
+                np.isfinite(params[name].value):
+            value = params[name].value
+        else:
+            raise ValueError('No initial value for parameter "{}"'.format(
+                name))
+        init_values[:, i] = value
+
+    problem = _BatchProblem(model, params, independent_var)
+    if nr_workers == 1:
+        results = [problem.fit_rows(x, data, init_values)]
+    else:
+        chunks = np.array_split(np.arange(nr_traces), 4 * nr_workers)
+        chunks = [c for c in chunks if len(c)]
+        with ProcessPoolExecutor(max_workers=nr_workers) as executor:
+            results = list(executor.map(
+                problem.fit_rows, [x[c] for c in chunks],
+                [data[c] for c in chunks], [init_values[c] for c in chunks],
+                chunks))
+
+    best_values, stderr, success, chisqr, redchi = [
+        np.concatenate(r) for r in zip(*results)]
+    return {
+        'best_values': {name: best_values[:, i]
+                        for i, name in enumerate(model.param_names)},
+        'stderr': {name: stderr[:, i]
+                   for i, name in enumerate(model.param_names)},
+        'success': success, 'chisqr': chisqr, 'redchi': redchi}
+
+
+class _BatchProblem:
+    """
+    The part of a batch fit that is the same for all traces. Instances are
+    sent to the worker processes, the model function has to be importable
+    (e.g. a function in fitting_models).
+    """
+
+    def __init__(self, model, params, independent_var):
+        self.param_names = list(model.param_names)
+        self.independent_var = independent_var
+        self.vary = np.array([params[n].vary and not params[n].expr
+                              for n in self.param_names])
+        self.bounds = (
+            np.array([params[n].min for n in self.param_names])[self.vary],
+            np.array([params[n].max for n in self.param_names])[self.vary])
+
+        self.direct = (type(model) is lmfit.Model and
+                       len(model.independent_vars) == 1 and
+                       model.prefix == '' and
+                       not any(params[n].expr for n in self.param_names))
+        if self.direct:
+            self.func = model.func
+            self.opts = dict(model.opts)
+        else:
+            self.model = model
+            self.params = params
+
+    def fit_rows(self, x, data, init_values, trace_indices=None):
+        nr_traces, nr_pars = init_values.shape
+        if trace_indices is None:
+            trace_indices = np.arange(nr_traces)
+        best_values = np.full((nr_traces, nr_pars), np.nan)
+        stderr = np.full((nr_traces, nr_pars), np.nan)
+        success = np.zeros(nr_traces, dtype=bool)
+        chisqr = np.full(nr_traces, np.nan)
+        redchi = np.full(nr_traces, np.nan)
+        fit_row = self._fit_row if self.direct else self._fit_row_lmfit
+        for i in range(nr_traces):
+            try:
+                (best_values[i], stderr[i], success[i], chisqr[i],
+                 redchi[i]) = fit_row(x[i], data[i], init_values[i])
+            except Exception as e:
+                # a failing trace should not stop the fitting of the others
+                logging.warning('Fit of trace {} failed: {!r}'.format(
+                    trace_indices[i], e))
+        return best_values, stderr, success, chisqr, redchi
+
+    def _fit_row(self, x, y, init_values):
+        values = init_values.copy()
+        kw = dict(self.opts)
+        kw[self.independent_var] = x
+
+        def residual(p):
+            values[self.vary] = p
+            kw.update(zip(self.param_names, values))
+            res = np.asarray(self.func(**kw) - y)
+            if np.iscomplexobj(res):
+                res = res.view(np.float64)
+            return res
+
+        p0 = np.clip(init_values[self.vary], *self.bounds)
+        if np.all(np.isinf(self.bounds)):
+            sol = least_squares(residual, p0, method='lm')
+        else:
+            sol = least_squares(residual, p0, bounds=self.bounds,
+                                method='trf')
+        chisqr = 2 * sol.cost
+        nfree = len(sol.fun) - np.sum(self.vary)
+        redchi = chisqr / max(nfree, 1)
+
+        # The jacobian of the solver is not evaluated at the final solution
+        # for all methods, it is recalculated using central differences.
+        # The step is relative to the parameter, but not smaller than
+        # relative to its typical magnitude (the initial value, or 1 if it
+        # starts at 0), such that parameters close to 0 get a finite step.
+        jac = np.zeros((len(sol.fun), len(sol.x)))
+        typical = np.where(p0 != 0, np.abs(p0), 1)
+        for j, p in enumerate(sol.x):
+            step = np.finfo(float).eps**(1/3) * max(abs(p), typical[j])
+            dp = np.zeros(len(sol.x))
+            dp[j] = step
+            jac[:, j] = (residual(sol.x + dp) - residual(sol.x - dp)) / (
+                2 * step)
+        values[self.vary] = sol.x
+
+        stderr = np.full(len(values), np.nan)
+        try:
+            covar = np.linalg.inv(jac.T @ jac) * redchi
+            stderr[self.vary] = np.sqrt(np.diag(covar))
+        except np.linalg.LinAlgError:
+            pass
+        return values, stderr, sol.success, chisqr, redchi
+
+    def _fit_row_lmfit(self, x, y, init_values):
+        params = self.params.copy()
+        for name, value in zip(self.param_names, init_values):
+            if not params[name].expr:
+                params[name].value = value
+        fit_res = self.model.fit(y, params,
+                                 **{self.independent_var: x})
+        values = [fit_res.params[n].value for n in self.param_names]
+        stderr = [np.nan if fit_res.params[n].stderr is None
+                  else fit_res.params[n].stderr for n in self.param_names]
+        return (values, stderr, fit_res.success, fit_res.chisqr,
+                fit_res.redchi)
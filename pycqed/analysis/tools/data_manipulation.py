@@ -29,14 +29,29 @@ def count_rounds_to_error(series):
     Returns NAN if no error is found
     NOTE: superceded by count_rtf_and_term_cond()
     '''
-    last_s = series[0]
-    for i, s in enumerate(series):
-        if s == last_s:
-            last_s = s
-        else:
-            return i
-    print('Warning did not find any error')
-    return np.NAN
+    rte = count_rounds_to_error_2D([series])[0]
+    if np.isnan(rte):
+        print('Warning did not find any error')
+        return np.NAN
+    return int(rte)
+
+
+def count_rounds_to_error_2D(traces):
+    '''
+    Vectorized version of count_rounds_to_error for a set of traces.
+
+    input:
+        traces : 2D array of shape (nr_traces, nr_rounds)
+    output:
+        rounds_to_error : array of shape (nr_traces, ), index of the first
+            entry of each trace that is different from its initial value,
+            NAN if no error is found.
+    '''
+    traces = np.atleast_2d(traces)
+    changed = traces != traces[:, :1]
+    rte = np.argmax(changed, axis=1).astype(float)
+    rte[~np.any(changed, axis=1)] = np.NAN
+    return rte
 
 
 def count_rtf_and_term_cond(series, only_count_min_1=False,
@@ -52,26 +67,10 @@ def count_rtf_and_term_cond(series, only_count_min_1=False,
 
     Returns the lenght of the timetrace +1  if no error is found
     '''
-    rtf = len(series) + 1
-    termination_condition = None
-    initial_s = series[0]
-
-    for i, s in enumerate(series):
-        if s != initial_s:
-            rtf = i
-            if i == len(series)-1:
-                # If termination occurs at last entry it is not possible
-                # to determine the cause of termination (note this should be
-                # a low probability event)
-                termination_condition = 'unknown'
-            elif series[i+1] == s:
-                termination_condition = 'double event'
-            elif series[i+1] != s:
-                termination_condition = 'single event'
-            break
-    if only_count_min_1:
-        if initial_s == 1:
-            rtf = 1
+    rtf, termination_condition = count_rtf_and_term_cond_2D(
+        [series], only_count_min_1=only_count_min_1)
+    rtf = int(rtf[0])
+    termination_condition = termination_condition[0]
     if rtf == len(series) + 1:
         print('Warning did not find a termination event')
     if return_termination_condition:
@@ -80,6 +79,69 @@ def count_rtf_and_term_cond(series, only_count_min_1=False,
         return rtf
 
 
+def count_rtf_and_term_cond_2D(traces, only_count_min_1=False):
+    '''
+    Vectorized version of count_rtf_and_term_cond for a set of traces.
+
+    input:
+        traces : 2D array of shape (nr_traces, nr_rounds)
+    output:
+        rounds_to_failure : int array of shape (nr_traces, ), the length of
+            the traces +1 for traces without a termination event
+        termination_conditions : object array of shape (nr_traces, )
+            containing 'single event', 'double event', 'unknown' or None
+    '''
+    traces = np.atleast_2d(traces)
+    nr_traces, nr_rounds = traces.shape
+    changed = traces != traces[:, :1]
+    terminated = np.any(changed, axis=1)
+    idx = np.argmax(changed, axis=1)
+    rtf = np.where(terminated, idx, nr_rounds + 1)
+
+    rows = np.arange(nr_traces)
+    # the value after the termination event determines the cause
+    next_idx = np.minimum(idx + 1, nr_rounds - 1)
+    double_event = traces[rows, next_idx] == traces[rows, idx]
+    termination_conditions = np.full(nr_traces, None, dtype=object)
+    termination_conditions[terminated & double_event] = 'double event'
+    termination_conditions[terminated & ~double_event] = 'single event'
+    # If termination occurs at last entry it is not possible
+    # to determine the cause of termination (note this should be
+    # a low probability event)
+    termination_conditions[terminated & (idx == nr_rounds - 1)] = 'unknown'
+
+    if only_count_min_1:
+        rtf[traces[:, 0] == 1] = 1
+    return rtf, termination_conditions
+
+
+def run_lengths_2D(traces):
+    '''
+    Run-length encoding of all rows of a 2D array.
+
+    input:
+        traces : 2D array of shape (nr_traces, nr_rounds)
+    output:
+        run_lengths : lengths of all runs of identical entries that are
+            ended by a change, in the order of the traces
+        next_values : the entry following each of these runs
+        trace_indices : index of the trace each run belongs to
+
+    The last run of every trace is not terminated by a change and is not
+    included.
+    '''
+    traces = np.atleast_2d(traces)
+    trace_indices, run_ends = np.nonzero(traces[:, 1:] != traces[:, :-1])
+    next_starts = run_ends + 1
+    run_starts = np.zeros(len(next_starts), dtype=next_starts.dtype)
+    run_starts[1:] = next_starts[:-1]
+    first_of_trace = np.ones(len(trace_indices), dtype=bool)
+    first_of_trace[1:] = trace_indices[1:] != trace_indices[:-1]
+    run_starts[first_of_trace] = 0
+    return (next_starts - run_starts, traces[trace_indices, next_starts],
+            trace_indices)
+
+
 def count_rounds_since_flip(series):
     '''
     Used to extract number of consecutive elements that are identical
@@ -89,17 +151,21 @@ def count_rounds_since_flip(series):
     output:
         rounds_since_change: list
     '''
-    round_since_last_change = 0  # start at zero because
-    last_s = series[0]
-    rounds_since_change = []
-    for i, s in enumerate(series):
-        if s == last_s:
-            round_since_last_change += 1
-        else:
-            rounds_since_change.append(round_since_last_change)
-            round_since_last_change = 1
-        last_s = s
-    return rounds_since_change
+    return count_rounds_since_flip_2D([series]).tolist()
+
+
+def count_rounds_since_flip_2D(traces):
+    '''
+    Vectorized version of count_rounds_since_flip for a set of traces.
+
+    input:
+        traces : 2D array of shape (nr_traces, nr_rounds)
+    output:
+        rounds_since_change : 1D array with the number of consecutive
+            identical elements before every change, of all traces
+            concatenated.
+    '''
+    return run_lengths_2D(traces)[0]
 
 
 def count_rounds_since_flip_split(series):
@@ -113,25 +179,35 @@ def count_rounds_since_flip_split(series):
         rounds_between_flips_m_to_p : list of consecutive entries in +1
         rounds_between_flips_p_to_m : list of consecutive entries in -1
     '''
-    nr_rounds_since_last_flip = 1
-    last_s = +1
-    rounds_between_flips_p_to_m = []
-    rounds_between_flips_m_to_p = []
-    for i, s in enumerate(series):
+    rounds_between_flips_m_to_p, rounds_between_flips_p_to_m = \
+        count_rounds_since_flip_split_2D([series])
+    return (rounds_between_flips_m_to_p.tolist(),
+            rounds_between_flips_p_to_m.tolist())
 
-        if s == last_s:
-            nr_rounds_since_last_flip += 1
-        else:
-            if s == +1:
-                rounds_between_flips_m_to_p.append(nr_rounds_since_last_flip)
-            elif s == -1:
-                rounds_between_flips_p_to_m.append(nr_rounds_since_last_flip)
-            else:
-                raise ValueError('Unexpected value in series,' +
-                                 ' expect only +1 and -1')
-            nr_rounds_since_last_flip = 1
-        last_s = s
-    return rounds_between_flips_m_to_p, rounds_between_flips_p_to_m
+
+def count_rounds_since_flip_split_2D(traces):
+    '''
+    Vectorized version of count_rounds_since_flip_split for a set of traces.
+
+    input:
+        traces : 2D array of shape (nr_traces, nr_rounds) containing entries
+            +1 and -1
+    output:
+        rounds_between_flips_m_to_p : 1D array of the lengths of the runs
+            that are followed by a flip to +1, of all traces concatenated
+        rounds_between_flips_p_to_m : idem for flips to -1
+    '''
+    traces = np.atleast_2d(traces)
+    # every trace is counted as if it was preceded by a +1
+    traces = np.concatenate(
+        [np.ones((len(traces), 1), dtype=traces.dtype), traces], axis=1)
+    run_lengths, next_values, _ = run_lengths_2D(traces)
+    to_p = next_values == +1
+    to_m = next_values == -1
+    if not np.all(to_p | to_m):
+        raise ValueError('Unexpected value in series,' +
+                         ' expect only +1 and -1')
+    return run_lengths[to_p], run_lengths[to_m]
 
 
 def binary_derivative(series):
@@ -141,20 +217,20 @@ def binary_derivative(series):
 
     When there is no change the value is 0.
     If there is a change the value is 1.
+    Multidimensional arrays are differentiated along the last axis.
     '''
-    d_series = np.array([0 if series[i+1] == series[i] else 1
-                         for i in range(len(series)-1)])
-    return d_series
+    series = np.asarray(series)
+    return (series[..., 1:] != series[..., :-1]).astype(int)
 
 
 def binary_derivative_old(series):
     '''
     Used to extract transitions between flipping and non-flipping
     part of data traces.
+    Multidimensional arrays are differentiated along the last axis.
     '''
-    d_series = np.array([1 if series[i+1] == series[i] else -1
-                         for i in range(len(series)-1)])
-    return d_series
+    series = np.asarray(series)
+    return np.where(series[..., 1:] == series[..., :-1], 1, -1)
 
 
 def binary_derivative_2D(data_array, axis=0):
@@ -162,12 +238,13 @@ def binary_derivative_2D(data_array, axis=0):
     Used to extract transitions between flipping and non-flipping
     part of data traces along a certain axis
     '''
+    data_array = np.asarray(data_array)
     if axis == 0:
-        dd_array = np.array([binary_derivative(line)
-                             for line in data_array])
+        dd_array = binary_derivative(data_array)
     elif axis == 1:
-        dd_array = np.array([binary_derivative(line)
-                             for line in data_array.T]).T
+        dd_array = binary_derivative(data_array.T).T
+    else:
+        raise ValueError('axis should be 0 or 1')
     return dd_array
 
 
@@ -0,0 +1,164 @@
+"""
+Lazy, column-selective access to the data of a measurement.
+
+MeasurementControl stores the data of a measurement as a single 2D dataset
+with one column per sweep parameter and one column per measured value. The
+classes in this module only read the requested columns (and rows) from the
+datafile using hyperslab selections instead of loading the full dataset
+into memory.
+"""
+import numpy as np
+from pycqed.measurement import hdf5_data as h5d
+
+
+class LazyDataset:
+    """
+    Column-selective accessor for a 2D hdf5 dataset.
+
+    Indexing follows the layout of the transposed dataset (the layout of
+    MeasurementAnalysis.data), the first index selects the column(s) and
+    the optional second index the rows:
+        lazy_data[2]          -> column 2
+        lazy_data['I', :100]  -> first 100 rows of the column named 'I'
+        lazy_data[1:3]        -> columns 1 and 2, shape (2, nr_rows)
+    Only the selected part of the dataset is read from the file. Values are
+    returned as float64 arrays.
+
+    args:
+        filepath (str)      : path of the hdf5 file
+        dataset_path (str)  : path of the dataset within the file
+        get_file (callable) : optional, returns an open h5py.File for the
+            filepath (e.g. the file of an analysis). If it is not given or
+            the returned file is closed, the file is opened read-only for
+            the duration of a single read.
+        column_names (list) : optional names of the columns, allows
+            selecting columns by name.
+    """
+
+    def __init__(self, filepath: str, dataset_path: str,
+                 get_file=None, column_names: list=None):
+        self.filepath = filepath
+        self.dataset_path = dataset_path
+        self._get_file = get_file
+        self.column_names = column_names
+
+    def _read(self, selection):
+        data_file = None
+        if self._get_file is not None:
+            data_file = self._get_file()
+        # A closed h5py.File evaluates to False
+        if data_file:
+            return selection(data_file[self.dataset_path])
+        with h5d.open_read_only(self.filepath) as data_file:
+            return selection(data_file[self.dataset_path])
+
+    @property
+    def shape(self):
+        """Shape of the transposed dataset (nr_columns, nr_rows)."""
+        return self._read(lambda dset: dset.shape[::-1])
+
+    def __len__(self):
+        return self.shape[0]
+
+    def column_index(self, key):
+        """Returns the index of a column specified by index or name."""
+        if isinstance(key, str):
+            if self.column_names is None or key not in self.column_names:
+                raise KeyError('Column "{}" not found'.format(key))
+            return list(self.column_names).index(key)
+        return int(key)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            col_key, rows = key
+        else:
+            col_key, rows = key, slice(None)
+
+        if isinstance(col_key, slice):
+            cols = list(range(*col_key.indices(self.shape[0])))
+        elif isinstance(col_key, (str, int, np.integer)):
+            cols = self.column_index(col_key)
+        else:
+            cols = [self.column_index(k) for k in col_key]
+
+        if isinstance(cols, int):
+            return self._read_columns([cols], rows)[0]
+        return self._read_columns(cols, rows)
+
+    def _read_columns(self, cols, rows):
+        nr_cols = self.shape[0]
+        cols = [c % nr_cols if c < 0 else c for c in cols]
+        if len(cols) == 0:
+            return np.zeros((0, 0))
+
+        # h5py requires increasing indices, a contiguous range of columns
+        # is read with a single slice.
+        unique_cols, inverse = np.unique(cols, return_inverse=True)
+        if unique_cols[-1] - unique_cols[0] + 1 == len(unique_cols):
+            col_sel = slice(int(unique_cols[0]), int(unique_cols[-1]) + 1)
+        else:
+            col_sel = [int(c) for c in unique_cols]
+
+        if isinstance(rows, (slice, int, np.integer)):
+            def selection(dset):
+                return dset[rows, col_sel]
+            values = self._read(selection)
+        else:
+            # Arbitrary rows are taken from the smallest range of rows
+            # containing all of them.
+            rows = np.asarray(rows)
+            if rows.dtype == bool:
+                rows = np.flatnonzero(rows)
+            nr_rows = self.shape[1]
+            rows = np.where(rows < 0, rows + nr_rows, rows)
+            if len(rows) == 0:
+                return np.zeros((len(cols), 0))
+            start, stop = rows.min(), rows.max() + 1
+
+            def selection(dset):
+                return dset[start:stop, col_sel]
+            values = self._read(selection)[rows - start]
+        values = np.asarray(values, dtype=np.float64)
+        # the column axis is first, the row axis (if any) second
+        values = np.moveaxis(values, -1, 0)
+        return values[inverse]
+
+    def column(self, key):
+        """Returns a lazy view on a single column."""
+        return LazyColumn(self, self.column_index(key))
+
+    def __array__(self, dtype=None):
+        values = np.asarray(self._read(lambda dset: dset[()]),
+                            dtype=np.float64).T
+        if dtype is not None:
+            values = values.astype(dtype)
+        return values
+
+
+class LazyColumn:
+    """
+    Lazy view on a single column of a LazyDataset.
+
+    The rows are read on indexing (e.g. column[:100]), np.asarray(column)
+    reads the full column.
+    """
+
+    def __init__(self, lazy_dataset: LazyDataset, index: int):
+        self.lazy_dataset = lazy_dataset
+        self.index = index
+
+    @property
+    def shape(self):
+        return (self.lazy_dataset.shape[1], )
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, rows):
+        return self.lazy_dataset[self.index, rows]
+
+    def __array__(self, dtype=None):
+        values = self.lazy_dataset[self.index]
+        if dtype is not None:
+            values = values.astype(dtype)
+        return values
@@ -0,0 +1,227 @@
+"""
+Vectorized maximum likelihood state tomography.
+
+The density matrix is parametrized by a lower triangular matrix T as
+    rho = T^dag T / Tr(T^dag T)
+with the d**2 real parameters ordered as
+    [diag(T) (real), Re(T_tri[0]), Im(T_tri[0]), Re(T_tri[1]), ...]
+where T_tri are the elements below the diagonal in np.tril_indices order.
+This is the same parametrization as used by the T-matrix tomography in
+analysis/tomography.py and analysis_v2/tomography_V2.py.
+
+The cost function is the weighted least squares distance
+    L = sum_k w_k (Tr(M_k rho) - m_k)**2
+All expectation values are evaluated at once by contracting a stack of
+measurement operators M_k with rho. The analytic gradient with respect to
+the T-parameters is passed to a gradient based optimizer. Several datasets
+can be reconstructed in a single call.
+"""
+import numpy as np
+from scipy import optimize
+
+
+def _triangular_indices(d):
+    return np.diag_indices(d), np.tril_indices(d, -1)
+
+
+def build_T_from_triangular_params(t_params, d):
+    """
+    Builds the lower triangular matrix T from its d**2 real parameters.
+
+    args:
+        t_params (array) : shape (..., d**2)
+        d (int)          : dimension of the Hilbert space
+    returns:
+        T (array) : shape (..., d, d)
+    """
+    t_params = np.asarray(t_params).real
+    di, tri = _triangular_indices(d)
+    T = np.zeros(t_params.shape[:-1] + (d, d), dtype=complex)
+    T[..., di[0], di[1]] = t_params[..., :d]
+    T[..., tri[0], tri[1]] = (t_params[..., d::2] +
+                              1j * t_params[..., d+1::2])
+    return T
+
+
+def build_rho_from_triangular_params(t_params, d):
+    """
+    Builds the normalized density matrix rho = T^dag T / Tr(T^dag T).
+
+    args:
+        t_params (array) : shape (..., d**2)
+        d (int)          : dimension of the Hilbert space
+    returns:
+        rho (array) : shape (..., d, d)
+    """
+    T = build_T_from_triangular_params(t_params, d)
+    A = np.conj(np.swapaxes(T, -1, -2)) @ T
+    return A / np.trace(A, axis1=-2, axis2=-1).real[..., None, None]
+
+
+def triangular_params_from_rho(rho, eps=1e-6):
+    """
+    Inverse of build_rho_from_triangular_params.
+
+    The density matrix is first made hermitian and positive definite by
+    clipping its eigenvalues at eps, such that the decomposition always
+    exists (e.g. for an initial guess from linear inversion).
+
+    args:
+        rho (array) : shape (..., d, d)
+    returns:
+        t_params (array) : shape (..., d**2)
+    """
+    rho = np.asarray(rho)
+    d = rho.shape[-1]
+    rho = (rho + np.conj(np.swapaxes(rho, -1, -2))) / 2
+    evals, evecs = np.linalg.eigh(rho)
+    evals = np.clip(evals, eps, None)
+    rho = (evecs * evals[..., None, :]) @ np.conj(
+        np.swapaxes(evecs, -1, -2))
+    rho /= np.trace(rho, axis1=-2, axis2=-1).real[..., None, None]
+    # The Cholesky decomposition gives rho = L L^dag with L lower
+    # triangular. To get rho = T^dag T with T lower triangular we decompose
+    # rho with reversed rows and columns: T = J L^dag J.
+    L = np.linalg.cholesky(rho[..., ::-1, ::-1])
+    T = np.conj(np.swapaxes(L, -1, -2))[..., ::-1, ::-1]
+
+    di, tri = _triangular_indices(d)
+    t_params = np.zeros(rho.shape[:-2] + (d**2, ))
+    t_params[..., :d] = T[..., di[0], di[1]].real
+    t_params[..., d::2] = T[..., tri[0], tri[1]].real
+    t_params[..., d+1::2] = T[..., tri[0], tri[1]].imag
+    return t_params
+
+
+def expectation_values(operators, rho):
+    """
+    Calculates Tr(M_k rho) for all operators at once.
+
+    args:
+        operators (array) : shape (K, d, d) or (B, K, d, d)
+        rho (array)       : shape (d, d) or (B, d, d)
+    returns:
+        expectations (array) : real parts, shape (K, ) or (B, K)
+    """
+    return np.einsum('...kij,...ji->...k', operators, rho).real
+
+
+def mle_cost_and_gradient(t_params, operators, measurements, weights):
+    """
+    Weighted least squares cost function and its gradient with respect to
+    the T-parameters.
+
+    args:
+        t_params (array)     : shape (B, d**2)
+        operators (array)    : shape (K, d, d) or (B, K, d, d)
+        measurements (array) : shape (B, K)
+        weights (array)      : shape (B, K)
+    returns:
+        cost (array) : shape (B, )
+        grad (array) : shape (B, d**2)
+
+    With g_k = 2 w_k (Tr(M_k rho) - m_k), G = sum_k g_k M_k and
+    H = (G - sum_k g_k Tr(M_k rho)) / Tr(T^dag T), the derivative of the
+    cost with respect to Re(T) + i Im(T) is given by 2 T H.
+    """
+    d = operators.shape[-1]
+    T = build_T_from_triangular_params(t_params, d)
+    A = np.conj(np.swapaxes(T, -1, -2)) @ T
+    norm = np.trace(A, axis1=-2, axis2=-1).real
+    rho = A / norm[:, None, None]
+
+    expectations = expectation_values(operators, rho)
+    residuals = expectations - measurements
+    cost = np.sum(weights * residuals**2, axis=-1)
+
+    g = 2 * weights * residuals
+    G = np.einsum('...k,...kij->...ij', g, operators)
+    c = np.sum(g * expectations, axis=-1)
+    H = (G - c[:, None, None] * np.eye(d)) / norm[:, None, None]
+    dT = 2 * T @ H
+
+    di, tri = _triangular_indices(d)
+    grad = np.zeros(np.shape(t_params))
+    grad[:, :d] = dT[:, di[0], di[1]].real
+    grad[:, d::2] = dT[:, tri[0], tri[1]].real
+    grad[:, d+1::2] = dT[:, tri[0], tri[1]].imag
+    return cost, grad
+
+
+def linear_inversion(operators, measurements):
+    """
+    Unconstrained least squares estimate of rho from Tr(M_k rho) = m_k.
+
+    args:
+        operators (array)    : shape (K, d, d)
+        measurements (array) : shape (K, ) or (B, K)
+    returns:
+        rho (array) : shape (d, d) or (B, d, d), hermitian but not
+            necessarily positive
+    """
+    operators = np.asarray(operators)
+    measurements = np.asarray(measurements)
+    K, d = operators.shape[0], operators.shape[-1]
+    # Tr(M_k rho) = sum_ij M_kij rho_ji = (M_flat @ vec(rho^T))_k
+    M_flat = operators.reshape(K, d**2)
+    rho_T_vec = np.linalg.lstsq(M_flat, measurements.T, rcond=None)[0]
+    rho = np.swapaxes(rho_T_vec.T.reshape(measurements.shape[:-1] + (d, d)),
+                      -1, -2)
+    return (rho + np.conj(np.swapaxes(rho, -1, -2))) / 2
+
+
+def max_likelihood_tomo(operators, measurements, weights=None, rho0=None,
+                        tol=1e-10, max_iter=1000):
+    """
+    Maximum likelihood (weighted least squares) reconstruction of one or
+    several density matrices.
+
+    args:
+        operators (array)    : measurement operators, shape (K, d, d), or
+            shape (B, K, d, d) for per dataset operators.
+        measurements (array) : measured expectation values, shape (K, ) for
+            a single dataset or (B, K) for B datasets.
+        weights (array)      : weights per measurement, broadcastable to the
+            shape of measurements. Defaults to equal weights.
+        rho0 (array)         : initial guess(es) of shape (d, d) or
+            (B, d, d). If None the linear inversion estimate is used.
+        tol (float)          : tolerance of the optimizer
+        max_iter (int)       : maximum number of iterations
+    returns:
+        rho (array) : density matrix, shape (d, d) or (B, d, d)
+
+    All datasets are optimized together by L-BFGS-B with the analytic
+    gradient. As the datasets are independent the total cost is the sum of
+    the individual costs.
+    """
+    operators = np.asarray(operators, dtype=complex)
+    measurements = np.asarray(measurements, dtype=float)
+    single_dataset = measurements.ndim == 1
+    measurements = np.atleast_2d(measurements)
+    B = measurements.shape[0]
+    d = operators.shape[-1]
+    if weights is None:
+        weights = np.ones(measurements.shape)
+    weights = np.broadcast_to(np.asarray(weights, dtype=float),
+                              measurements.shape)
+
+    if rho0 is None:
+        if operators.ndim == 3:
+            rho0 = linear_inversion(operators, measurements)
+        else:
+            rho0 = np.array([linear_inversion(ops, m) for ops, m in
+                             zip(operators, measurements)])
+    rho0 = np.broadcast_to(rho0, (B, d, d))
+    t0 = triangular_params_from_rho(rho0).ravel()
+
+    def fun(t_flat):
+        cost, grad = mle_cost_and_gradient(
+            t_flat.reshape(B, d**2), operators, measurements, weights)
+        return np.sum(cost), grad.ravel()
+
+    res = optimize.minimize(fun, t0, jac=True, method='L-BFGS-B',
+                            tol=tol, options={'maxiter': max_iter})
+    rho = build_rho_from_triangular_params(res.x.reshape(B, d**2), d)
+    if single_dataset:
+        return rho[0]
+    return rho
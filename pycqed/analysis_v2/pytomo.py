@@ -8,6 +8,7 @@ import subprocess
 import string
 import getopt
 from numpy import zeros, eye
+import numpy as np
 import uuid
 
 i = j = 1j
@@ -16,6 +17,10 @@ File that prepares the input and reads the output from the .exe executable file.
 The executable contains a Convex semidefinite programming code, that is a faster version of MLE.
 This code was originally developed by NATHAN LANGFORD.
 
+The same problems can be solved in-process without the executable using the
+'native' solver (default), an accelerated projected gradient method onto the
+positive semidefinite (state) or completely positive trace preserving
+(process) set.
 """
 
 #-------------------------------------------------------------------------
@@ -817,14 +822,213 @@ def reconstructrho_process(x, dim, OPT):
 #-------------------------------------------------------------------------
 
 
+def _project_psd(X):
+    '''
+    project a hermitian matrix onto the positive semidefinite cone
+    '''
+    X = (X + X.conj().T)/2
+    evals, evecs = np.linalg.eigh(X)
+    return (evecs*np.clip(evals, 0, None)).dot(evecs.conj().T)
+
+
+def _project_tp(X, dim):
+    '''
+    project X onto the subspace of (dim**2 x dim**2) matrices with
+    Tr_out(X) proportional to the identity, the output being the second
+    tensor factor.
+    '''
+    M = np.trace(X.reshape(dim, dim, dim, dim), axis1=1, axis2=3)
+    M -= np.eye(dim)*np.trace(M)/dim
+    return X - np.kron(M, np.eye(dim))/dim
+
+
+def _project_cptp(X, dim, tol=1e-10, max_iter=500):
+    '''
+    project X onto the intersection of the positive semidefinite cone and
+    the trace preserving subspace using Dykstra's algorithm
+    '''
+    P = np.zeros(X.shape, dtype=complex)
+    Q = np.zeros(X.shape, dtype=complex)
+    for it in range(max_iter):
+        Y = _project_tp(X + P, dim)
+        P = X + P - Y
+        X_new = _project_psd(Y + Q)
+        Q = Y + Q - X_new
+        converged = (np.linalg.norm(X_new - Y) <=
+                     tol*max(np.linalg.norm(X_new), 1e-300))
+        X = X_new
+        if converged:
+            break
+    return X
+
+
+def _native_objective(p, data, denom, fixedweight):
+    '''
+    chi-squared like objective of the SDP formulation and its derivative
+    with respect to the predicted data p
+
+    fixed weight: sum (data-p)**2/data
+    otherwise:    sum (data-p)**2/p
+    '''
+    if fixedweight:
+        r = p - data
+        return np.sum(r**2/denom), 2*r/denom
+    if np.any(p[data != 0] <= 0) or np.any(p < 0):
+        return np.inf, None
+    pos = data != 0
+    f = np.sum(p[~pos]) + np.sum((data[pos]-p[pos])**2/p[pos])
+    g = np.ones(len(p))
+    g[pos] = 1 - (data[pos]/p[pos])**2
+    return f, g
+
+
+def _accelerated_projected_gradient(A, data, fixedweight, project, X0, OPT):
+    '''
+    minimise the objective over the set onto which project projects, for
+    predicted data p_k = Re Tr(A_k X) with A_k hermitian, using accelerated
+    projected gradient descent (FISTA) with backtracking and adaptive
+    restart
+    '''
+    dim = X0.shape[0]
+    A = A.reshape(len(A), dim**2)
+    conjA = A.conj()
+    data = np.asarray(data, dtype=float)
+    # the SDP fixes data==0 residuals to zero, use the smallest non-zero
+    # data value as denominator for these bins instead
+    denom = np.where(data != 0, np.abs(data),
+                     np.min(np.abs(data[data != 0])) if np.any(data) else 1)
+
+    def fun(X):
+        f, g = _native_objective((conjA.dot(X.ravel())).real, data,
+                                 denom, fixedweight)
+        if g is None:
+            return f, None
+        return f, g.dot(A).reshape(dim, dim)
+
+    if fixedweight:
+        L = 2*np.linalg.norm(A/np.sqrt(denom)[:, None], 2)**2
+    else:
+        L = 1.0
+
+    X = X0
+    Y = X0
+    f_X, grad = fun(X)
+    t = 1.
+    for it in range(OPT['max_iter']):
+        f_Y, grad_Y = fun(Y)
+        if grad_Y is None:
+            # extrapolated point is infeasible, restart the momentum
+            Y, f_Y, grad_Y, t = X, f_X, grad, 1.
+        while True:
+            X_new = project(Y - grad_Y/L)
+            f_new, grad_new = fun(X_new)
+            diff = X_new - Y
+            if f_new <= (f_Y + np.vdot(grad_Y, diff).real +
+                         L/2*np.vdot(diff, diff).real):
+                break
+            L *= 2
+        step = X_new - X
+        converged = (np.linalg.norm(step) <=
+                     OPT['tol']*max(np.linalg.norm(X_new), 1e-300))
+        if np.vdot(Y - X_new, step).real > 0:
+            t = 1.
+        t_new = (1 + math.sqrt(1 + 4*t**2))/2
+        Y = X_new + (t-1)/t_new*step
+        X, f_X, grad, t = X_new, f_new, grad_new, t_new
+        if converged:
+            break
+        if not fixedweight:
+            L *= 0.9
+    if OPT['verbose']:
+        print("native solver: %d iterations, objective = %g" % (it+1, f_X))
+    return X
+
+
+def _native_initial_guess(A, data, project, dim):
+    '''
+    least squares estimate, projected and mixed with the identity such that
+    all predicted data are strictly positive
+    '''
+    A = A.reshape(len(A), dim**2)
+    x = np.linalg.lstsq(A.conj(), np.asarray(data, dtype=float),
+                        rcond=None)[0]
+    X = project(x.reshape(dim, dim))
+    N = np.trace(X).real
+    if N <= 0:
+        p_identity = (A.conj().dot(np.eye(dim).ravel())).real
+        N = dim*np.sum(data)/np.sum(p_identity)
+    return 0.99*X + 0.01*N*np.eye(dim)/dim
+
+
+def solve_state_native(data, observables, weights, fixedweight, OPT):
+    '''
+    Solves the state tomography problem of writesdpa_state in-process.
+
+    Minimises sum_k (data_k - p_k)**2/s_k, with predicted data
+    p_k = weights_k Tr(E_k rho) and s_k = data_k (fixedweight) or
+    s_k = p_k, over positive semidefinite rho. The trace of rho is the
+    normalisation N and is not constrained.
+    '''
+    observables = np.asarray(observables, dtype=complex)
+    dim = observables.shape[-1]
+    A = np.asarray(weights, dtype=float)[:, None, None]*observables
+    X0 = _native_initial_guess(A, data, _project_psd, dim)
+    return _accelerated_projected_gradient(
+        A, data, fixedweight, _project_psd, X0, OPT)
+
+
+def solve_process_native(data, inputs, observables, weights, fixedweight,
+                         OPT):
+    '''
+    Solves the process tomography problem of writesdpa_process in-process.
+
+    The process matrix chi (dim**2 x dim**2) is positive semidefinite with
+    the partial trace over the output proportional to the identity
+    (trace preserving up to the normalisation N = Tr(chi)). The predicted
+    data are p_mn = weights_mn dim Tr((R_mn^T x E_mn) chi).
+    '''
+    observables = np.asarray(observables, dtype=complex)
+    inputs = np.asarray(inputs, dtype=complex)
+    dim = observables.shape[-1]
+    A = np.array([dim*w*np.kron(R.T, E) for w, R, E in
+                  zip(np.asarray(weights, dtype=float), inputs,
+                      observables)])
+
+    def project(X):
+        return _project_cptp(X, dim)
+    X0 = _native_initial_guess(A, data, project, dim**2)
+    return _accelerated_projected_gradient(
+        A, data, fixedweight, project, X0, OPT)
+
+#-------------------------------------------------------------------------
+
+
 def tomo_state(data, observables, weights, filebase=None, fixedweight=True, tomo_options={}):
+    '''
+    Reconstructs the density matrix rho (with trace N) from data. The default
+    solver 'native' solves the problem in-process by accelerated projected
+    gradient descent. The solvers 'csdp', 'dsdp5' and 'sdplr' write an SDPA
+    problem file and call the corresponding external executable.
 
+    tomo_options: verbose, prettyprint, normalised, solver, and for the
+        native solver tol (relative step size) and max_iter
+    '''
     OPT = {'verbose': False, 'prettyprint': False,
-           'solver': 'csdp', 'normalised': False}
+           'solver': 'native', 'normalised': False,
+           'tol': 1e-8, 'max_iter': 10000}
     for o, a in list(tomo_options.items()):
         OPT[o] = a
     # default option defaults
 
+    if OPT['solver'] == 'native':
+        rho = solve_state_native(data, observables, weights,
+                                 fixedweight, OPT)
+        if OPT['normalised']:
+            rho = rho/rho.trace()
+        if OPT['prettyprint']:
+            pretty_print(rho)
+        return rho
+
     if filebase is None:
         filebase = 'temp' + str(uuid.uuid4())
 
@@ -891,13 +1095,31 @@ def tomo_state(data, observables, weights, filebase=None, fixedweight=True, tomo
 
 
 def tomo_process(data, inputs, observables, weights, filebase=None, fixedweight=True, tomo_options={}):
+    '''
+    Reconstructs the process matrix chi (with trace N) from data. The default
+    solver 'native' solves the problem in-process by accelerated projected
+    gradient descent. The solvers 'csdp', 'dsdp5' and 'sdplr' write an SDPA
+    problem file and call the corresponding external executable.
 
+    tomo_options: verbose, prettyprint, normalised, solver, and for the
+        native solver tol (relative step size) and max_iter
+    '''
     OPT = {'verbose': False, 'prettyprint': False,
-           'solver': 'csdp', 'normalised': False}
+           'solver': 'native', 'normalised': False,
+           'tol': 1e-8, 'max_iter': 10000}
     for o, a in list(tomo_options.items()):
         OPT[o] = a
     # default option defaults
 
+    if OPT['solver'] == 'native':
+        rho = solve_process_native(data, inputs, observables,
+                                   weights, fixedweight, OPT)
+        if OPT['normalised']:
+            rho = rho/rho.trace()
+        if OPT['prettyprint']:
+            pretty_print(rho)
+        return rho
+
     if filebase is None:
         filebase = 'temp' + str(uuid.uuid4())
 
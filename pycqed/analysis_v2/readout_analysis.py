@@ -190,24 +190,22 @@ class Singleshot_Readout_Analysis(ba.BaseDataAnalysis):
         sh_min = min(np.min(eff_sh[0]), np.min(eff_sh[1]))
         sh_max = max(np.max(eff_sh[0]), np.max(eff_sh[1]))
         data_range = (sh_min, sh_max)
-        print(shots)
-        print(eff_sh)
+        # The shots are sorted once, the cumulative counts at any x are then
+        # given by the insertion index in the sorted shots.
         eff_sh_sort = [np.sort(eff_sh[0]), np.sort(eff_sh[1])]
-        x0, n0 = np.unique(eff_sh_sort[0], return_counts=True)
-        cumsum0 = np.cumsum(n0)
-        x1, n1 = np.unique(eff_sh_sort[1], return_counts=True)
-        cumsum1 = np.cumsum(n1)
+        x0, cumsum0 = get_cumulative_counts(eff_sh_sort[0])
+        x1, cumsum1 = get_cumulative_counts(eff_sh_sort[1])
 
         self.proc_data_dict['cumsum_x'] = [x0, x1]
         self.proc_data_dict['cumsum_y'] = [cumsum0, cumsum1]
 
-        all_x = np.unique(np.sort(np.concatenate((x0, x1))))
+        all_x = np.union1d(x0, x1)
         md = self.options_dict.get('max_datapoints', 1000)
         if len(all_x) > md:
             all_x = np.linspace(*data_range, md)
-        ecumsum0 = np.interp(x=all_x, xp=x0, fp=cumsum0, left=0)
+        ecumsum0 = np.searchsorted(eff_sh_sort[0], all_x, side='right')
         necumsum0 = ecumsum0/np.max(ecumsum0)
-        ecumsum1 = np.interp(x=all_x, xp=x1, fp=cumsum1, left=0)
+        ecumsum1 = np.searchsorted(eff_sh_sort[1], all_x, side='right')
         necumsum1 = ecumsum1/np.max(ecumsum1)
 
         self.proc_data_dict['cumsum_x_ds'] = all_x
@@ -724,7 +722,8 @@ class Singleshot_Readout_Analysis(ba.BaseDataAnalysis):
 class Multiplexed_Readout_Analysis(ba.BaseDataAnalysis):
     """
     For two qubits, to make an n-qubit mux readout experiment.
-    we should vectorize this analysis
+    The shots of all channels and prepared states are histogrammed at once,
+    see histogram_shots_per_state.
 
     TODO: This needs to be rewritten/debugged!
     Suggestion:
@@ -790,84 +789,70 @@ class Multiplexed_Readout_Analysis(ba.BaseDataAnalysis):
 
         self.proc_data_dict['ch_names'] = self.raw_data_dict['value_names'][0]
 
-        for ch_name, shots in self.raw_data_dict['measured_values_ord_dict'].items():
-            self.proc_data_dict[ch_name] = shots[0]  # only 1 dataset
-            self.proc_data_dict[ch_name +
-                                ' all'] = self.proc_data_dict[ch_name]
-            min_sh = np.min(self.proc_data_dict[ch_name])
-            max_sh = np.max(self.proc_data_dict[ch_name])
-            self.proc_data_dict['nr_shots'] = len(self.proc_data_dict[ch_name])
-
-            base = 2
-            number_of_experiments = base ** self.nr_of_qubits
-
-            combinations = [int2base(
-                i, base=base, fixed_length=self.nr_of_qubits) for i in
-                range(number_of_experiments)]
-            self.proc_data_dict['combinations'] = combinations
+        base = 2
+        number_of_experiments = base ** self.nr_of_qubits
+        combinations = [int2base(
+            i, base=base, fixed_length=self.nr_of_qubits) for i in
+            range(number_of_experiments)]
+        self.proc_data_dict['combinations'] = combinations
+
+        # All channels are processed together as one (nr_ch, nr_shots) array
+        ch_names = list(self.raw_data_dict['measured_values_ord_dict'].keys())
+        all_shots = np.array(
+            [shots[0] for shots in  # only 1 dataset
+             self.raw_data_dict['measured_values_ord_dict'].values()],
+            dtype=float)
+        self.proc_data_dict['nr_shots'] = all_shots.shape[1]
 
+        #####################################
+        #  Binning data into 1D histograms  #
+        #####################################
+        # No post selection implemented yet
+        hists, bin_edges = histogram_shots_per_state(
+            all_shots, nr_of_states=number_of_experiments, nr_bins=nr_bins)
+        # the cumulative histograms are normalized to ensure the right
+        # fidelities can be calculated
+        chists = np.cumsum(hists, axis=2) / np.sum(
+            hists, axis=2, keepdims=True)
+
+        for ch_idx, ch_name in enumerate(ch_names):
+            self.proc_data_dict[ch_name] = all_shots[ch_idx]
+            self.proc_data_dict[ch_name + ' all'] = all_shots[ch_idx]
             for i, comb in enumerate(combinations):
-                # No post selection implemented yet
                 self.proc_data_dict['{} {}'.format(ch_name, comb)] = \
-                    self.proc_data_dict[ch_name][i::number_of_experiments]
-                #####################################
-                #  Binning data into 1D histograms  #
-                #####################################
-                hist_name = 'hist {} {}'.format(
-                    ch_name, comb)
-                self.proc_data_dict[hist_name] = np.histogram(
-                    self.proc_data_dict['{} {}'.format(
-                        ch_name, comb)],
-                    bins=nr_bins, range=(min_sh, max_sh))
-                #  Cumulative histograms #
-                chist_name = 'c'+hist_name
-                # the cumulative histograms are normalized to ensure the right
-                # fidelities can be calculated
-                self.proc_data_dict[chist_name] = np.cumsum(
-                    self.proc_data_dict[hist_name][0])/(
-                    np.sum(self.proc_data_dict[hist_name][0]))
+                    all_shots[ch_idx, i::number_of_experiments]
+                hist_name = 'hist {} {}'.format(ch_name, comb)
+                self.proc_data_dict[hist_name] = (hists[ch_idx, i],
+                                                  bin_edges[ch_idx])
+                self.proc_data_dict['c'+hist_name] = chists[ch_idx, i]
 
             self.proc_data_dict['bin_centers {}'.format(ch_name)] = (
-                self.proc_data_dict[hist_name][1][:-1] +
-                self.proc_data_dict[hist_name][1][1:]) / 2
-
+                bin_edges[ch_idx, :-1] + bin_edges[ch_idx, 1:]) / 2
             self.proc_data_dict['binsize {}'.format(ch_name)] = (
-                self.proc_data_dict[hist_name][1][1] -
-                self.proc_data_dict[hist_name][1][0])
+                bin_edges[ch_idx, 1] - bin_edges[ch_idx, 0])
 
         #####################################################################
         # Combining histograms of all different combinations and calc Fid.
         ######################################################################
+        prepared_states = get_prepared_states(
+            all_shots.shape[1], number_of_experiments)
+        thresholds = np.zeros(len(ch_names))
+        one_above = np.ones(len(ch_names), dtype=bool)
         for ch_idx, ch_name in enumerate(self.proc_data_dict['ch_names']):
             # Create labels for the specific combinations
             comb_str_0, comb_str_1, comb_str_2 = get_arb_comb_xx_label(
                 self.proc_data_dict['nr_of_qubits'], qubit_idx=ch_idx)
 
-            # Initialize the arrays
+            # Prepared state of this qubit for every combination
+            qubit_state = (np.arange(number_of_experiments) >> ch_idx) & 1
+            zero_hist = [np.sum(hists[ch_idx, qubit_state == 0], axis=0,
+                                dtype=float), bin_edges[ch_idx]]
+            one_hist = [np.sum(hists[ch_idx, qubit_state == 1], axis=0,
+                               dtype=float), bin_edges[ch_idx]]
             self.proc_data_dict['hist {} {}'.format(ch_name, comb_str_0)] = \
-                [np.zeros(nr_bins), np.zeros(nr_bins+1)]
+                zero_hist
             self.proc_data_dict['hist {} {}'.format(ch_name, comb_str_1)] = \
-                [np.zeros(nr_bins), np.zeros(nr_bins+1)]
-            zero_hist = self.proc_data_dict['hist {} {}'.format(
-                ch_name, comb_str_0)]
-            one_hist = self.proc_data_dict['hist {} {}'.format(
-                ch_name, comb_str_1)]
-
-            # Fill them with data from the relevant combinations
-            for i, comb in enumerate(self.proc_data_dict['combinations']):
-                if comb[-(ch_idx+1)] == '0':
-                    zero_hist[0] += self.proc_data_dict[
-                        'hist {} {}'.format(ch_name, comb)][0]
-                    zero_hist[1] = self.proc_data_dict[
-                        'hist {} {}'.format(ch_name, comb)][1]
-                elif comb[-(ch_idx+1)] == '1':
-                    one_hist[0] += self.proc_data_dict[
-                        'hist {} {}'.format(ch_name, comb)][0]
-                    one_hist[1] = self.proc_data_dict[
-                        'hist {} {}'.format(ch_name, comb)][1]
-                elif comb[-(ch_idx+1)] == '2':
-                    # Fixme add two state binning
-                    raise NotImplementedError()
+                one_hist
 
             chist_0 = np.cumsum(zero_hist[0])/(np.sum(zero_hist[0]))
             chist_1 = np.cumsum(one_hist[0])/(np.sum(one_hist[0]))
@@ -885,6 +870,32 @@ class Multiplexed_Readout_Analysis(ba.BaseDataAnalysis):
                                                        centers)
             self.proc_data_dict['F_ass_raw {}'.format(qubit_name)] = fid
             self.proc_data_dict['threshold_raw {}'.format(qubit_name)] = th
+            thresholds[ch_idx] = th
+            # The 1 state lies above the threshold if the 0 state has
+            # accumulated more counts at the threshold.
+            opt_idx = np.argmin(abs(centers - th))
+            one_above[ch_idx] = chist_0[opt_idx] >= chist_1[opt_idx]
+
+        ###########################################################
+        #  Unbinned thresholds and fidelities (sorted once)       #
+        ###########################################################
+        labels = ((prepared_states[None, :] >>
+                   np.arange(len(ch_names))[:, None]) & 1).astype(bool)
+        fids, ths = get_assignment_fid_from_shots(all_shots, labels)
+        for ch_idx in range(len(ch_names)):
+            qubit_name = self.proc_data_dict['qubit_names'][-(ch_idx+1)]
+            self.proc_data_dict['F_ass {}'.format(qubit_name)] = fids[ch_idx]
+            self.proc_data_dict['threshold {}'.format(qubit_name)] = \
+                ths[ch_idx]
+
+        ###########################################################
+        #  Assignment matrix of all 2**N states                   #
+        ###########################################################
+        # element [i, j] is the probability of measuring combination j
+        # when preparing combination i.
+        self.proc_data_dict['assignment_matrix'] = get_assignment_matrix(
+            all_shots, thresholds, nr_of_states=number_of_experiments,
+            one_above=one_above)
 
     def prepare_plots(self):
         # N.B. If the log option is used we should manually set the
@@ -1005,6 +1016,187 @@ def get_assignement_fid_from_cumhist(chist_0, chist_1, bin_centers=None):
     return F_assignment_raw, threshold
 
 
+def get_cumulative_counts(sorted_shots):
+    """
+    Returns the unique values of the sorted shots and the number of shots
+    smaller than or equal to each of these values.
+    Equivalent to np.cumsum of the counts of np.unique, without sorting the
+    shots again.
+    """
+    sorted_shots = np.asarray(sorted_shots)
+    last_of_value = np.ones(len(sorted_shots), dtype=bool)
+    last_of_value[:-1] = sorted_shots[1:] != sorted_shots[:-1]
+    return sorted_shots[last_of_value], np.flatnonzero(last_of_value) + 1
+
+
+def get_prepared_states(nr_shots: int, nr_of_states: int):
+    """
+    Returns the index of the prepared state for every shot of an experiment
+    that cycles through nr_of_states prepared states (shot j is prepared in
+    state j % nr_of_states).
+    """
+    return np.arange(nr_shots) % nr_of_states
+
+
+def histogram_shots_per_state(shots, nr_of_states: int, nr_bins: int,
+                              ranges=None, chunk_size: int=2**16):
+    """
+    Histograms the shots of all channels and all prepared states at once.
+
+    args:
+        shots (array)       : shape (nr_channels, nr_shots), shot j of
+            every channel is prepared in state j % nr_of_states
+        nr_of_states (int)  : number of prepared states
+        nr_bins (int)       : number of bins per channel
+        ranges (array)      : shape (nr_channels, 2), lower and upper edge of
+            the histogram of each channel. Defaults to (min, max) of the
+            shots of the channel.
+        chunk_size (int)    : number of shots per channel that are binned in
+            one step, bounds the size of the temporary arrays.
+    returns:
+        counts (array)      : shape (nr_channels, nr_of_states, nr_bins)
+        bin_edges (array)   : shape (nr_channels, nr_bins+1)
+
+    The counts are identical to
+        np.histogram(shots[ch, i::nr_of_states], bins=nr_bins,
+                     range=ranges[ch])
+    but all channels and states are binned with a single np.bincount.
+    """
+    shots = np.atleast_2d(np.asarray(shots, dtype=float))
+    nr_ch, nr_shots = shots.shape
+    if ranges is None:
+        first_edge = np.min(shots, axis=1)
+        last_edge = np.max(shots, axis=1)
+    else:
+        first_edge, last_edge = np.asarray(ranges, dtype=float).T
+    # Same treatment of empty ranges as np.histogram
+    equal = first_edge == last_edge
+    first_edge = np.where(equal, first_edge - 0.5, first_edge)
+    last_edge = np.where(equal, last_edge + 0.5, last_edge)
+    bin_edges = np.linspace(first_edge, last_edge, nr_bins + 1, axis=1)
+
+    first_edge = first_edge[:, None]
+    last_edge = last_edge[:, None]
+    norm_denom = last_edge - first_edge
+    flat_edges = bin_edges.ravel()
+    edge_offset = np.arange(nr_ch)[:, None] * (nr_bins + 1)
+    state_offset = (np.arange(nr_ch)[:, None] * nr_of_states +
+                    get_prepared_states(nr_shots, nr_of_states)) * nr_bins
+    counts = np.zeros(nr_ch * nr_of_states * nr_bins, dtype=np.intp)
+    for start in range(0, nr_shots, chunk_size):
+        sh = shots[:, start:start+chunk_size]
+        # Bin index from the uniform bin width, corrected for rounding
+        # errors at the bin edges in the same way as np.histogram does.
+        idx = ((sh - first_edge) / norm_denom * nr_bins).astype(np.intp)
+        np.clip(idx, 0, nr_bins - 1, out=idx)
+        idx += edge_offset
+        idx -= sh < flat_edges[idx]
+        idx += ((sh >= flat_edges[idx + 1]) &
+                (idx != edge_offset + nr_bins - 1))
+        idx -= edge_offset
+        idx += state_offset[:, start:start+chunk_size]
+        if ranges is not None:
+            idx = idx[(sh >= first_edge) & (sh <= last_edge)]
+        counts += np.bincount(idx.ravel(), minlength=len(counts))
+    return counts.reshape(nr_ch, nr_of_states, nr_bins), bin_edges
+
+
+def _take_along_last_axis(arr, indices):
+    """
+    Equivalent of np.take_along_axis(arr, indices, axis=-1), which is only
+    available for numpy>=1.15. The leading dimensions of arr and indices
+    have to be equal.
+    """
+    rows = arr.reshape(-1, arr.shape[-1])
+    row_indices = indices.reshape(len(rows), -1)
+    taken = rows[np.arange(len(rows))[:, None], row_indices]
+    return taken.reshape(indices.shape)
+
+
+def get_assignment_fid_from_shots(shots, labels):
+    """
+    Returns the average assignment fidelity and the optimal threshold from
+    the empirical cumulative distributions of the shots (no binning).
+
+    args:
+        shots (array)  : shape (..., nr_shots)
+        labels (array) : bools of the same shape as shots, True if the shot
+            was prepared in the 1 state.
+    returns:
+        F_assignment (array) : shape (...)
+        threshold (array)    : shape (...), shots <= threshold are
+            assigned to the state whose shots are mostly below it.
+
+    The shots of each channel are sorted once; both cumulative
+    distributions are then obtained by a cumulative sum over the labels in
+    sorted order.
+    """
+    shots = np.asarray(shots, dtype=float)
+    labels = np.asarray(labels, dtype=bool)
+    order = np.argsort(shots, axis=-1)
+    # Sorting the values again is faster than gathering them with order
+    sorted_shots = np.sort(shots, axis=-1)
+    sorted_labels = _take_along_last_axis(labels, order)
+
+    cumsum_1 = np.cumsum(sorted_labels, axis=-1)
+    cumsum_0 = np.arange(1, shots.shape[-1] + 1) - cumsum_1
+    n_1 = cumsum_1[..., -1:]
+    n_0 = cumsum_0[..., -1:]
+
+    # |CDF_1 - CDF_0| * n_0 * n_1 in integers, such that equally good
+    # thresholds compare equal and the first one is selected.
+    cdf_diff = abs(cumsum_1 * n_0 - cumsum_0 * n_1)
+    # Only the last of a set of identical values is a valid threshold
+    cdf_diff[..., :-1][sorted_shots[..., 1:] == sorted_shots[..., :-1]] = 0
+    opt_idx = np.argmax(cdf_diff, axis=-1)[..., None]
+    max_diff = _take_along_last_axis(cdf_diff, opt_idx)[..., 0]
+    F_assignment = 1 - (1 - max_diff / (n_0[..., 0] * n_1[..., 0])) / 2
+    threshold = _take_along_last_axis(sorted_shots, opt_idx)[..., 0]
+    return F_assignment, threshold
+
+
+def get_assignment_matrix(shots, thresholds, nr_of_states: int=None,
+                          one_above=None):
+    """
+    Returns the assignment probability matrix of a multiplexed readout.
+
+    args:
+        shots (array)       : shape (nr_channels, nr_shots), shot j of every
+            channel is prepared in state j % nr_of_states. Channel i
+            determines bit i of the measured state (channel 0 is the least
+            significant qubit, consistent with int2base).
+        thresholds (array)  : shape (nr_channels, )
+        nr_of_states (int)  : number of prepared states, defaults to
+            2**nr_channels
+        one_above (array)   : bools, shape (nr_channels, ), True if shots
+            above the threshold of a channel are assigned to the 1 state.
+            Defaults to True for all channels.
+    returns:
+        assignment_matrix (array) : shape (nr_of_states, 2**nr_channels),
+            element [i, j] is the probability to measure state j when
+            preparing state i.
+    """
+    shots = np.atleast_2d(shots)
+    nr_ch, nr_shots = shots.shape
+    nr_meas_states = 2**nr_ch
+    if nr_of_states is None:
+        nr_of_states = nr_meas_states
+    if one_above is None:
+        one_above = np.ones(nr_ch, dtype=bool)
+
+    bits = (shots > np.asarray(thresholds)[:, None]) == \
+        np.asarray(one_above, dtype=bool)[:, None]
+    # The bits of all channels form the index of the measured state
+    measured = np.sum(bits * (1 << np.arange(nr_ch, dtype=np.intp))[:, None],
+                      axis=0)
+
+    prepared = get_prepared_states(nr_shots, nr_of_states)
+    counts = np.bincount(prepared * nr_meas_states + measured,
+                         minlength=nr_of_states * nr_meas_states).reshape(
+                             nr_of_states, nr_meas_states)
+    return counts / np.sum(counts, axis=1, keepdims=True)
+
+
 def make_mux_ssro_histogram_combined(data_dict, ch_name, qubit_idx,
                                      thresholds=None, threshold_labels=None,
                                      title=None, ax=None, **kw):
@@ -543,18 +543,20 @@ def repeated_parity_data_binning(shots, nr_of_meas:int):
         trace_1 (2D array)
     """
 
-    prep_0 = copy(shots[::nr_of_meas*2])
-    meas_0 = copy(shots[1::nr_of_meas*2])
+    shots = np.asarray(shots)
+    if len(shots) % (2*nr_of_meas) != 0:
+        raise ValueError('Number of shots ({}) should be a multiple of '
+                         '2*nr_of_meas ({})'.format(len(shots), 2*nr_of_meas))
+    # axes: (repetition, prepared state, measurement)
+    binned_shots = shots.reshape(-1, 2, nr_of_meas)
 
-    prep_1 = copy(shots[nr_of_meas::nr_of_meas*2])
-    meas_1 = copy(shots[nr_of_meas+1::nr_of_meas*2])
+    prep_0 = binned_shots[:, 0, 0].copy()
+    meas_0 = binned_shots[:, 0, 1].copy()
+    trace_0 = binned_shots[:, 0, 1:].astype(float)
 
-    trace_0 = np.zeros((len(prep_0), nr_of_meas-1))
-    trace_1 = np.zeros((len(prep_1), nr_of_meas-1))
-    for i in range(len(prep_0)):
-        trace_0[i, :] = shots[1+(2*i)*nr_of_meas: (2*i+1)*nr_of_meas]
-
-        trace_1[i, :] = shots[1+(2*i+1)*nr_of_meas: (2*i+2)*nr_of_meas]
+    prep_1 = binned_shots[:, 1, 0].copy()
+    meas_1 = binned_shots[:, 1, 1].copy()
+    trace_1 = binned_shots[:, 1, 1:].astype(float)
 
     return (prep_0, meas_0, trace_0, prep_1, meas_1, trace_1)
 
@@ -562,43 +564,36 @@ def repeated_parity_data_binning(shots, nr_of_meas:int):
 def count_RTE(traces, exp_pattern: str, init_state: int):
     """
     Args:
-        traces (list of 1D arrays): of declared states as 0 and 1
+        traces (2D array): of declared states as 0 and 1, shape
+            (nr_traces, nr_rounds)
         exp_pattern (str) : "constant" or "alternating"
+    Returns
+        RTE (1D array) : rounds to event for every trace, nr_rounds+1
+            (constant) or nr_rounds+2 (alternating) if no event occurred.
     """
-    RTE = np.zeros(len(traces))
-
-    RTE_larger_than_length = False
     if init_state not in (0, 1):
         raise ValueError('Initial state should be 0 or 1')
     if exp_pattern not in ['constant', 'alternating']:
         raise ValueError("exp_pattern should be 'constant' or 'alternating'")
 
-    for i, t in enumerate(traces):
-        if exp_pattern == 'constant':
-            if init_state == 0:
-                try:
-                    RTE[i] = min(np.where( t >0.5)[0])+1
-                except ValueError:
-                    RTE[i] = len(t) + 1
-                    RTE_larger_than_length = True
-
-            else:
-                try:
-                    RTE[i] = min(np.where(t < 0.5)[0])+1
-                except ValueError:
-                    RTE[i] = len(t)+1
-                    RTE_larger_than_length = True
-
-
-        elif exp_pattern == 'alternating':
-            try:
-                t = np.append([init_state], t)
-                dt = dm_tools.binary_derivative(t)
-                RTE[i] = min(np.where(dt<0.5)[0])+1 # Detect first time there is no flip
-            except ValueError:
-                RTE[i] = len(t)+1
-                RTE_larger_than_length = True
-    if RTE_larger_than_length:
+    traces = np.atleast_2d(traces)
+    if exp_pattern == 'constant':
+        if init_state == 0:
+            events = traces > 0.5
+        else:
+            events = traces < 0.5
+        no_event_RTE = traces.shape[1] + 1
+    elif exp_pattern == 'alternating':
+        # An event is the first time there is no flip
+        traces = np.concatenate(
+            [np.full((len(traces), 1), init_state), traces], axis=1)
+        events = dm_tools.binary_derivative(traces) < 0.5
+        no_event_RTE = traces.shape[1] + 1
+
+    found = np.any(events, axis=1)
+    RTE = np.where(found, np.argmax(events, axis=1) + 1,
+                   no_event_RTE).astype(float)
+    if not np.all(found):
         print('Sequences with no errors measured')
     return RTE
 
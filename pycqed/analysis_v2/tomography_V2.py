@@ -10,6 +10,7 @@ except ImportError as e:
     logging.warning('Could not import qutip, tomo code will not work')
 import itertools
 from pycqed.analysis_v2 import pytomo as csdp_tomo
+from pycqed.analysis.tools import tomography_mle as tomo_mle
 
 comp_projectors = [qt.ket2dm(qt.tensor(qt.basis(2,0), qt.basis(2,0))),
                   qt.ket2dm(qt.tensor(qt.basis(2,0), qt.basis(2,1))),
@@ -124,7 +125,7 @@ class TomoAnalysis():
                                 show_time=True, ftol=0.01, xtol=0.001, full_output=0, max_iter=100,
                                             TE_correction_matrix = None):
         """
-        Performs a least squares optimization using fmin_powell in order to get the closest physically realisable state.
+        Performs a least squares optimization using the analytic gradient in order to get the closest physically realisable state.
 
         This is done by constructing a lower triangular matrix T consisting of 4 ** n qubits params
         Keyword arguments:
@@ -133,7 +134,8 @@ class TomoAnalysis():
         use_weights : default(False) Weighs the quadrature data by the std in the estimator of the mean
                     : since this tomo does not have access to the original data, the vars should be given by
                         tomo_var_i = 1 / N_i * np.var(M_i) where i stands for the data corresponding to rotation i.
-        --- arguments for scipy fmin_powel method below, see the powell documentation
+        max_iter: maximum number of iterations of the L-BFGS-B optimizer
+        ftol, xtol, full_output: arguments of the previously used fmin_powell, ignored
         """
         # first we calculate the measurement matrices
         tstart = time.time()
@@ -152,34 +154,45 @@ class TomoAnalysis():
         tlinear = time.time()
         # find out the starting rho by the linear tomo
         discard, rho0 = self.execute_pseudo_inverse_tomo(measurement_operators, meas_tomo)
-
-        # now fetch the starting t_params from the cholesky decomp of rho
-        tcholesky = time.time()
-        T0 = np.linalg.cholesky(scipy.linalg.sqrtm((rho0.dag() * rho0).full()))
-        t0 = np.zeros(4 ** self.n_qubits, dtype='complex' )
-        di = np.diag_indices(2 ** self.n_qubits)
-        tri = np.tril_indices(2 ** self.n_qubits, -1)
-        t0[0:2 ** self.n_qubits] = T0[di]
-        t0[2**self.n_qubits::2] = T0[tri].real
-        t0[2**self.n_qubits+1::2] = T0[tri].imag
         topt = time.time()
-        # minimize the likelihood function using scipy
-        t_optimal = scipy.optimize.fmin_powell(
-            self._max_likelihood_optimization_function, t0, maxiter=max_iter, full_output=full_output, ftol=ftol, xtol=xtol)
+        # minimize the likelihood function using the analytic gradient
+        rho = tomo_mle.max_likelihood_tomo(
+            measurement_vector, meas_tomo, weights=self.weights,
+            rho0=rho0.full(), max_iter=max_iter)
         if show_time is True:
             print(" Time to calc rotation matrices %.2f " % (tlinear-tstart))
-            print(" Time to do linear tomo %.2f " % (tcholesky-tlinear))
-            print(" Time to build T %.2f " % (topt-tcholesky))
+            print(" Time to do linear tomo %.2f " % (topt-tlinear))
             print(" Time to optimize %.2f" % (time.time()-topt))
-        return qt.Qobj(self.build_rho_from_triangular_params(t_optimal), dims=self.qt_dims)
+        return qt.Qobj(rho, dims=self.qt_dims)
+
+    def execute_mle_T_matrix_tomo_batch(self, measurement_operators, meas_tomos,
+                                        weights_tomo=None, max_iter=1000):
+        """
+        Performs the T-matrix MLE tomography for several datasets measured
+        with the same measurement operators (e.g. all Bell states or all
+        tomography timestamps) in a single optimization.
 
+        Keyword arguments:
+        measurement_operators: list of meas operators
+        meas_tomos: array of shape (n_datasets, n_rot measurements)
+        weights_tomo: weights per measurement, default equal weights
+        returns: list of density matrices as qutip Qobj
+        """
+        measurement_operators = [measurement_operators] if type(measurement_operators) == qt.Qobj else measurement_operators
+        measurement_vector = np.vstack(
+            [[m.full() for m in self.get_measurement_vector(measurement_operator)]
+             for measurement_operator in measurement_operators])
+        rhos = tomo_mle.max_likelihood_tomo(
+            measurement_vector, np.atleast_2d(meas_tomos), weights=weights_tomo,
+            max_iter=max_iter)
+        return [qt.Qobj(rho, dims=self.qt_dims) for rho in rhos]
 
     def execute_SDPA_2qubit_tomo(self, measurement_operators, counts_tomo, N_total=1, used_bins=[0,3],
                                  correct_measurement_operators=True, calc_chi_squared =False,
                                  correct_zero_count_bins=True, TE_correction_matrix = None):
         """
         Estimates a density matrix given single shot counts of 4 thresholded
-        bins using a custom C semidefinite solver from Nathan Langford
+        bins using the semidefinite program from Nathan Langford (pytomo)
         Each bin should correspond to a projection operator:
         0: 00, 1: 01, 2: 10, 3: 11
         The calibration counts are used in calculating corrections to the (ideal) measurement operators
@@ -387,17 +400,8 @@ class TomoAnalysis():
     # MLE T Matrix functions
     #
     def build_rho_from_triangular_params(self, t_params):
-        # build the lower triangular matrix T
-        T_mat = np.zeros(
-            (2 ** self.n_qubits, 2 ** self.n_qubits), dtype="complex")
-        di = np.diag_indices(2 ** self.n_qubits)
-        T_mat[di] = t_params[0:2**self.n_qubits]
-        tri = np.tril_indices(2 ** self.n_qubits, -1)
-        T_mat[tri] = t_params[2**self.n_qubits::2]
-        T_mat[tri] += 1j * t_params[2**self.n_qubits+1::2]
-        rho = np.dot(np.conj(T_mat.T),  T_mat) / \
-            np.trace(np.dot(np.conj(T_mat.T),  T_mat))
-        return rho
+        return tomo_mle.build_rho_from_triangular_params(
+            t_params, 2 ** self.n_qubits)
 
     def _max_likelihood_optimization_function(self, t_params):
         """
@@ -410,13 +414,9 @@ class TomoAnalysis():
         self.weights :  weights per measurement vector used in calculating the loss
         """
         rho = self.build_rho_from_triangular_params(t_params)
-        L = 0 + 0j
-        for i in range(len(self.measurement_vector_numpy)):
-            expectation = np.trace(
-                np.dot(self.measurement_vector_numpy[i], rho))
-            L += ((expectation -
-                   self.measurements_tomo[i]) ** 2) * self.weights[i]
-        return L
+        expectations = tomo_mle.expectation_values(
+            self.measurement_vector_numpy, rho)
+        return np.sum(self.weights * (expectations - self.measurements_tomo) ** 2)
 
 #############################################################################################
     # CDSP tomo functions for likelihood.
@@ -25,7 +25,7 @@ from pycqed.analysis_v2 import measurement_analysis as ma2
 from pycqed.measurement.calibration_toolbox import (
     mixer_carrier_cancellation)
 from pycqed.measurement.openql_experiments.openql_helpers import \
-    load_range_of_oql_programs
+    load_range_of_oql_programs, compile_programs_in_parallel
 from pycqed.measurement import sweep_functions as swf
 from pycqed.measurement import detector_functions as det
 from pycqed.measurement.mc_parameter_wrapper import wrap_par_to_swf
@@ -2585,7 +2585,8 @@ class CCLight_Transmon(Qubit):
     def measure_single_qubit_randomized_benchmarking(
             self, nr_cliffords=2**np.arange(12), nr_seeds=100,
             MC=None,
-            recompile: bool ='as needed', prepare_for_timedomain: bool=True):
+            recompile: bool ='as needed', prepare_for_timedomain: bool=True,
+            parallel_compile: bool=False):
         """
         Measures randomized benchmarking decay including second excited state
         population.
@@ -2596,6 +2597,9 @@ class CCLight_Transmon(Qubit):
             - performs RB both with and without an extra pi-pulse
             - Includes calibration poitns for 0, 1, and 2 (g,e, and f)
             - analysis extracts fidelity and leakage/seepage
+
+        If parallel_compile is True the programs for all seeds are compiled
+        in a process pool, in that case all programs are recompiled.
         """
 
         # because only 1 seed is uploaded each time
@@ -2627,8 +2631,9 @@ class CCLight_Transmon(Qubit):
         t0 = time.time()
         net_cliffords = [0, 3]  # always measure double sided
         print('Generating {} RB programs'.format(nr_seeds))
+        program_specs = []
         for i in range(nr_seeds):
-            p = cl_oql.randomized_benchmarking(
+            program_kwargs = dict(
                 qubits=[self.cfg_qubit_nr()],
                 nr_cliffords=nr_cliffords,
                 net_cliffords=net_cliffords,  # always measure double sided
@@ -2637,9 +2642,16 @@ class CCLight_Transmon(Qubit):
                 program_name='RB_s{}_ncl{}_net{}_{}'.format(
                     i, nr_cliffords, net_cliffords, self.name),
                 recompile=recompile)
+            if parallel_compile:
+                program_specs.append(
+                    (cl_oql.randomized_benchmarking, program_kwargs))
+                continue
+            p = cl_oql.randomized_benchmarking(**program_kwargs)
             programs.append(p)
             print('Generated {} RB programs in {:.1f}s'.format(
                 i+1, time.time()-t0), end='\r')
+        if parallel_compile:
+            programs = compile_programs_in_parallel(program_specs)
         print('Succesfully generated {} RB programs in {:.1f}s'.format(
             nr_seeds, time.time()-t0))
         prepare_function_kwargs = {
@@ -1,5 +1,6 @@
 ﻿import string
 import logging
+import numpy as np
 
 
 def is_number(s):
@@ -83,16 +84,47 @@ class Assembler():
                      'pulse':   '000001',
                      'measure': '000010'}
 
+    InstFDC = {'add':     '100',
+               'sub':     '100',
+               'beq':     '100',
+               'bne':     '100',
+               'addi':    '100',
+               'lui':     '100',
+               'waitreg': '001',
+               'pulse':   '001',
+               'measure': '011',
+               'wait':    '001',
+               'trigger': '001'}
+
+    # The bits of an instruction that do not depend on the arguments, i.e.
+    # opcode (bits 31-26), FDC (bits 25-23) and funct (bits 5-0).
+    InstFixedBits = {'nop': 0}
+    for _inst in InstOpCode:
+        InstFixedBits[_inst] = (int(InstOpCode[_inst], 2) << 26 |
+                                int(InstFDC[_inst], 2) << 23 |
+                                int(InstfunctCode.get(_inst, '0'), 2))
+    del _inst
+
+    RegisterIdx = {'r{}'.format(i): i for i in range(16)}
+
     MAX_WAIT_TIME = 2**15 - 1
     MIN_WAIT_TIME = 1
+    # range of the signed 15-bit immediates of beq, bne and addi
+    MAX_IMM15 = 2**14 - 1
+    MIN_IMM15 = -2**14
 
-    def get_reg_num(self, Register):
+    def get_reg_idx(self, Register):
         '''
         It gets the register number from the input string.
 
         @param Register : the input string represents a register
-        @return stat : 4-bit binary string representing the register number
+        @return stat : register number as an integer
         '''
+        try:
+            return self.RegisterIdx[Register]
+        except KeyError:
+            pass
+
         if (not is_number(Register.strip('r'))):
             raise ValueError("Register format is not correct.")
 
@@ -101,7 +133,16 @@ class Assembler():
         if (reg_num < 0 or reg_num > 15):
             raise ValueError("Register number is out of range.")
 
-        return dec_to_bin_w4(reg_num)
+        return reg_num
+
+    def get_reg_num(self, Register):
+        '''
+        It gets the register number from the input string.
+
+        @param Register : the input string represents a register
+        @return stat : 4-bit binary string representing the register number
+        '''
+        return dec_to_bin_w4(self.get_reg_idx(Register))
 
     def get_lui_pos(self, pos):
 
@@ -341,6 +382,146 @@ class Assembler():
         'nop':      NopFormat
     }
 
+    ###########################################################################
+    # Table-driven encoding
+    #
+    # The *Fields functions below convert the arguments of an instruction
+    # into the integer fields (a, b, c, imm). The instruction is encoded as
+    #   fixed_bits | a << 19 | b << 15 | c << 11 | imm
+    # which gives results identical to the *Format functions above.
+    ###########################################################################
+
+    # lui rt, pos, byte_data
+    def LuiFields(self, args):
+        Register, pos, putByte = args
+        rt = self.get_reg_idx(Register)
+        position = int(self.get_lui_pos(pos), 2)
+        imm8 = int(putByte)
+        if (imm8 < 0 or imm8 > 255):
+            raise ValueError("Byte data {} is out of range.".format(putByte))
+        return (rt, rt, position, imm8)
+
+    # add rd, rs, rt and sub rd, rs, rt
+    def AddSubFields(self, args):
+        dst_reg, src_reg1, src_reg2 = args
+        return (self.get_reg_idx(src_reg1), self.get_reg_idx(src_reg2),
+                self.get_reg_idx(dst_reg), 0)
+
+    def get_imm15(self, imm15):
+        '''
+        Returns the 15-bit two's complement of a signed immediate value.
+        Values outside MIN_IMM15 ~ MAX_IMM15 raise a ValueError instead of
+        being truncated.
+        '''
+        if (not is_number(imm15)):
+            raise ValueError('parameter {} is not a number.'.format(imm15))
+        imm15 = int(imm15)
+        if (imm15 < self.MIN_IMM15 or imm15 > self.MAX_IMM15):
+            raise ValueError(
+                'Immediate value {} out of range: {} ~ {}.'.format(
+                    imm15, self.MIN_IMM15, self.MAX_IMM15))
+        return imm15 & 0x7FFF
+
+    # beq rs, rt, off and bne rs, rt, off
+    def BranchFields(self, args):
+        src_reg1, src_reg2, offset15 = args
+        return (self.get_reg_idx(src_reg1), self.get_reg_idx(src_reg2), 0,
+                self.get_imm15(offset15))
+
+    # addi rt, rs, imm
+    def AddiFields(self, args):
+        dst_reg, src_reg1, imm15 = args
+        return (self.get_reg_idx(src_reg1), self.get_reg_idx(dst_reg), 0,
+                self.get_imm15(imm15))
+
+    # waitreg rs
+    def WaitRegFields(self, args):
+        src_reg, = args
+        return (self.get_reg_idx(src_reg), 0, 0, 0)
+
+    # pulse AWG0, AWG1, AWG2
+    def PulseFields(self, args):
+        awgs = []
+        for awg in args:
+            if len(awg) != 4 or awg.strip('01') != '':
+                raise ValueError(
+                    'The codeword "{}" should be 4 bits.'.format(awg))
+            awgs.append(int(awg, 2))
+        awg0, awg1, awg2 = awgs
+        return (awg0, awg1, awg2, 0)
+
+    # measure and nop
+    def NoArgFields(self, args):
+        assert(len(args) == 0)
+        return (0, 0, 0, 0)
+
+    # wait imm
+    def WaitFields(self, args):
+        imm15, = args
+        if not RepresentsInt(imm15):
+            raise ValueError(
+                "Waiting time {} is not an integer.".format(imm15))
+        imm15 = int(imm15)
+        if (imm15 < self.MIN_WAIT_TIME or imm15 > self.MAX_WAIT_TIME):
+            raise ValueError(
+                "Waiting time {} out of range: 1 ~ 32767.".format(imm15))
+        return (0, 0, 0, imm15)
+
+    # trigger mask, duration
+    def TriggerFields(self, args):
+        mask, imm11 = args
+        if len(mask) != 7 or mask.strip('01') != '':
+            raise ValueError('The mask "{}" should be 7 bits of 1 or 0. \
+                              With the MSb indicating marker 1, \
+                              and the LSb indicating marker 7.'.format(mask))
+        if int(imm11) < 0 or int(imm11) > 2047:
+            raise ValueError("the value of the duration time is out of range \
+                              (accepted: integer in 0~2047).")
+        # In the core of 3.1.0, the MSb works for the trigger 7.
+        # Reverse the string so that the MSb works for trigger 1.
+        return (0, 0, 0, int(mask[::-1], 2) << 11 | int(imm11))
+
+    inst_fields_func = {
+        'add':      AddSubFields,
+        'sub':      AddSubFields,
+        'beq':      BranchFields,
+        'bne':      BranchFields,
+        'addi':     AddiFields,
+        'lui':      LuiFields,
+        'waitreg':  WaitRegFields,
+        'pulse':    PulseFields,
+        'measure':  NoArgFields,
+        'wait':     WaitFields,
+        'trigger':  TriggerFields,
+        'nop':      NoArgFields
+    }
+
+    def encode_instructions(self, label_instrs):
+        '''
+        Encodes a list of label_instrs (with resolved branch offsets) into
+        32-bit binary instructions.
+
+        The arguments of all instructions are converted into integer
+        fields, which are combined into instructions in a single vectorized
+        operation.
+        '''
+        fields = np.zeros((len(label_instrs), 5), dtype=np.int64)
+        rows = []
+        for label_instr in label_instrs:
+            inst = label_instr[1].lower()
+            try:
+                rows.append((self.InstFixedBits[inst],) +
+                            self.inst_fields_func[inst](self, label_instr[2:]))
+            except ValueError as detail:
+                raise ValueError('{} instruction format error: {}'.format(
+                    inst.capitalize(), detail.args))
+        if len(rows) > 0:
+            fields[:] = rows
+        instructions = (fields[:, 0] | fields[:, 1] << 19 |
+                        fields[:, 2] << 15 | fields[:, 3] << 11 |
+                        fields[:, 4])
+        return instructions.tolist()
+
     @classmethod
     def remove_comment(self, line):
         line = line.split('#', 1)[0]  # remove anything after '#' symbole
@@ -390,7 +571,11 @@ class Assembler():
 
         Asm_File.close()
 
-    def assemble(self, verbose=False):
+    def preprocess(self):
+        '''
+        Reads the QuMIS file and converts it into a list of label_instrs
+        that map one-to-one onto binary instructions.
+        '''
         # label, name, param[0], param[1] ...
         self.label_instrs = []
 
@@ -402,6 +587,9 @@ class Assembler():
         self.decompose()
         self.split_long_wait()
         self.merge_consecutive_wait()
+
+    def assemble(self, verbose=False):
+        self.preprocess()
         if verbose:
             self.print_label_instrs()
         self.get_label_addr()
@@ -418,41 +606,25 @@ class Assembler():
 
     def split_long_wait(self):
         '''
-        This function merges two consecutive WAIT instructions if the sum
-        of the waiting time of both instructions is not larger than
-        MAX_WAIT_TIME.
+        This function splits WAIT instructions with a waiting time larger
+        than MAX_WAIT_TIME into multiple consecutive WAIT instructions.
         '''
-        i = 0
-        old_i = -1
-        while i < len(self.label_instrs):
-            if old_i == i:
-                print("i:", i)
-                for k, li in enumerate(self.label_instrs):
-                    print(k, li)
-                print("\n\n*****************lines around the error:")
-                print(i-2, self.label_instrs[i-2])
-                print(i-1, self.label_instrs[i-1])
-                print(i-0,  self.label_instrs[i])
-                print(i+1, self.label_instrs[i+1])
-                print(i+2, self.label_instrs[i+2])
-                raise ValueError("Infinite loop while splitting long wait")
-
-            old_i = i
-            label_instr = self.label_instrs[i]
-
+        new_label_instrs = []
+        for label_instr in self.label_instrs:
             # I only care the WAIT instruction here.
             if (label_instr[1] != 'wait'):
-                i = i + 1
+                new_label_instrs.append(label_instr)
                 continue
+
             remain_wait_time = int(label_instr[2])
-            if remain_wait_time <= self.MAX_WAIT_TIME:
-                i += 1
             while (remain_wait_time > self.MAX_WAIT_TIME):
-                self.label_instrs[i][2] = str(self.MAX_WAIT_TIME)
+                label_instr[2] = str(self.MAX_WAIT_TIME)
+                new_label_instrs.append(label_instr)
                 remain_wait_time -= self.MAX_WAIT_TIME
-                new_wait_instr = ['', 'wait', str(remain_wait_time)]
-                self.label_instrs.insert(i+1, new_wait_instr)
-                i += 1
+                label_instr = ['', 'wait', str(remain_wait_time)]
+            new_label_instrs.append(label_instr)
+
+        self.label_instrs = new_label_instrs
 
     def merge_consecutive_wait(self):
         '''
@@ -460,41 +632,26 @@ class Assembler():
         of the waiting time of both instructions is not larger than
         MAX_WAIT_TIME.
         '''
-        i = 0
-        while i < len(self.label_instrs):
-            label_instr = self.label_instrs[i]
-
-            if (i >= len(self.label_instrs)-1):
-                break
-            next_label_instr = self.label_instrs[i+1]
-
-            # I only care the WAIT instruction here.
-            if (label_instr[1] != 'wait'):
-                i = i + 1
-                continue
-
-            # If the next instruction is a target of a jump instruction,
-            # then, we should not merge the wait instruction.
-            if next_label_instr[0] != '':
-                i = i + 1
-                continue
-
-            # if the next instruction is not wait, then no merge.
-            if (next_label_instr[1] != 'wait'):
-                i = i + 1
-                continue
-
-            # OK, current and next instructions are both WAIT.
-            # No worry about the labels.
-            # If the sum waiting time is within the valid range, merge them.
-            if (int(label_instr[2]) +
-                    int(next_label_instr[2]) < self.MAX_WAIT_TIME):
-                label_instr[2] = str(
-                    int(label_instr[2]) + int(next_label_instr[2]))
-                self.label_instrs[i] = label_instr
-                self.label_instrs.pop(i+1)
-            else:
-                i = i + 1
+        new_label_instrs = []
+        for label_instr in self.label_instrs:
+            if len(new_label_instrs) > 0:
+                prev_label_instr = new_label_instrs[-1]
+                # Only merge a WAIT instruction into a preceding WAIT
+                # instruction. If the instruction is a target of a jump
+                # instruction (has a label), we should not merge it.
+                # If the sum waiting time is within the valid range,
+                # merge them.
+                if (prev_label_instr[1] == 'wait' and
+                        label_instr[0] == '' and
+                        label_instr[1] == 'wait' and
+                        int(prev_label_instr[2]) + int(label_instr[2]) <
+                        self.MAX_WAIT_TIME):
+                    prev_label_instr[2] = str(
+                        int(prev_label_instr[2]) + int(label_instr[2]))
+                    continue
+            new_label_instrs.append(label_instr)
+
+        self.label_instrs = new_label_instrs
 
     def cal_branch_offset(self):
         '''
@@ -516,7 +673,8 @@ class Assembler():
         Decompose emulated instruction into atomic instructions.
         E.g., mov -> 4 lui instructions
         '''
-        for i, label_instr in enumerate(self.label_instrs):
+        new_label_instrs = []
+        for label_instr in self.label_instrs:
             if (label_instr[1] == 'mov'):
                 label = label_instr[0]
 
@@ -529,15 +687,14 @@ class Assembler():
                 putByte2 = int(bit32[8:16], 2)
                 putByte3 = int(bit32[0:8], 2)
 
-                lui0 = [label, 'lui', Register, 0, putByte0]
-                lui1 = ['', 'lui', Register, 1, putByte1]
-                lui2 = ['', 'lui', Register, 2, putByte2]
-                lui3 = ['', 'lui', Register, 3, putByte3]
-                self.label_instrs[i] = lui0
-                self.label_instrs.insert(i+1, lui1)
-                self.label_instrs.insert(i+2, lui2)
-                self.label_instrs.insert(i+3, lui3)
+                new_label_instrs += [[label, 'lui', Register, 0, putByte0],
+                                     ['', 'lui', Register, 1, putByte1],
+                                     ['', 'lui', Register, 2, putByte2],
+                                     ['', 'lui', Register, 3, putByte3]]
+            else:
+                new_label_instrs.append(label_instr)
 
+        self.label_instrs = new_label_instrs
         self.align_labels()
 
     def convert_line_to_ele_array(self):
@@ -555,33 +712,42 @@ class Assembler():
         '''
         Align the label with corresponding instruction, so that
         every line is occupied by one instruction.
+
+        N.B. an instruction following a removed line is not aligned in the
+        same call, calling this function repeatedly aligns all labels.
         '''
-        for i, label_instr in enumerate(self.label_instrs):
+        label_instrs = self.label_instrs
+        new_label_instrs = []
+        i = 0
+        while i < len(label_instrs):
+            label_instr = label_instrs[i]
 
             if label_instr[0] == '' and label_instr[1] == '':
                 # remove empty line
-                self.label_instrs.pop(i)
+                new_label_instrs += label_instrs[i+1:i+2]
+                i += 2
                 continue
 
             if label_instr[0] != '' and label_instr[1] == '':
                 # A label without an instruction
-                if (i == len(self.label_instrs) - 1):
+                if (i == len(label_instrs) - 1):
                     # last instruction. Add a nop for this label
-                    self.label_instrs[i] = [label_instr[0], 'nop']
+                    new_label_instrs.append([label_instr[0], 'nop'])
                 else:
-                    # not last instruction.
-                    next_label_instr = self.label_instrs[i + 1]
-                    if (next_label_instr[0] != ''):
-                        # next instruction has a lable, throw away the current
-                        # one
-                        self.label_instrs.pop(i)
-                    else:
+                    next_label_instr = label_instrs[i + 1]
+                    if (next_label_instr[0] == ''):
                         # next instruction has no tag, merge the current label
                         # with next instruction
                         next_label_instr[0] = label_instr[0]
-                        self.label_instrs[i + 1] = next_label_instr
-                        self.label_instrs.pop(i)
+                    # else: next instruction has a label, throw away the
+                    # current one
+                    new_label_instrs.append(next_label_instr)
+                    i += 1
+            else:
+                new_label_instrs.append(label_instr)
+            i += 1
 
+        self.label_instrs = new_label_instrs
         self.get_label_addr()
 
     def get_label_addr(self):
@@ -609,30 +775,24 @@ class Assembler():
         self.align_labels()
 
     def insert_nop_after_label(self):
-        for (index, label_instr) in enumerate(self.label_instrs):
-            if (label_instr[0] == ''):
-                continue
-            if (label_instr[1] == 'nop'):
-                continue
+        new_label_instrs = []
+        for label_instr in self.label_instrs:
+            if (label_instr[0] != '' and label_instr[1] != 'nop'):
+                new_label_instrs.append([label_instr[0], 'nop'])
+                label_instr[0] = ''
+            new_label_instrs.append(label_instr)
 
-            label = label_instr[0]
-            self.label_instrs[index] = [label, 'nop']
-            label_instr[0] = ''
-            self.label_instrs.insert(index + 1, label_instr)
+        self.label_instrs = new_label_instrs
 
     def insert_nop_after_branch(self):
-        max_addr = len(self.label_instrs)
-        addr = 0
-        while (addr < max_addr):
-            if (self.label_instrs[addr][1] == 'beq' or
-                    self.label_instrs[addr][1] == 'bne'):
-
+        new_label_instrs = []
+        for label_instr in self.label_instrs:
+            new_label_instrs.append(label_instr)
+            if (label_instr[1] == 'beq' or label_instr[1] == 'bne'):
                 nop_instr = ['', 'nop']
-                for i in range(self.number_of_nops_appended):
-                    self.label_instrs.insert(addr + 1, nop_instr)
-                addr = addr + self.number_of_nops_appended
-                max_addr = len(self.label_instrs)
-            addr = addr + 1
+                new_label_instrs += [nop_instr] * self.number_of_nops_appended
+
+        self.label_instrs = new_label_instrs
 
     def remove_wait_zero(self):
         for i, label_instr in enumerate(self.label_instrs):
@@ -648,14 +808,7 @@ class Assembler():
         into binary instructions.
         '''
         self.assemble(verbose=verbose)
-        self.instructions = []
-
-        for label_instr in self.label_instrs:
-            elements = label_instr[1:]
-            translate_function = self.inst_translation_func[
-                elements[0].lower()]
-            self.instructions.append(
-                int(translate_function(self, elements[1:]), 2))
+        self.instructions = self.encode_instructions(self.label_instrs)
 
         return self.instructions
 
@@ -664,15 +817,7 @@ class Assembler():
         Show the final instructions after expanding the mov instruction
         and appending nop instruction after labels and beq/bne.
         '''
-        self.label_instrs = []
-        self.get_valid_lines()
-        self.convert_line_to_ele_array()
-        self.add_end_file_loop()
-        self.remove_wait_zero()
-        self.insert_nops()
-        self.decompose()
-        self.split_long_wait()
-        self.merge_consecutive_wait()
+        self.preprocess()
         self.get_label_addr()
         self.text_instructions = []
         for label_instr in self.label_instrs:
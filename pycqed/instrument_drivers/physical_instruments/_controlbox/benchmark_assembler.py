@@ -0,0 +1,96 @@
+"""
+Benchmark of the CBox Assembler on large generated QuMIS programs.
+
+Compares the table-driven encoding (Assembler.encode_instructions) to the
+string based encoding using the *Format functions and reports the time
+required to assemble programs of increasing length.
+
+Usage:
+    python benchmark_assembler.py
+"""
+import os
+import time
+import tempfile
+import numpy as np
+from pycqed.instrument_drivers.physical_instruments._controlbox.Assembler \
+    import Assembler
+
+
+def generate_program(nr_blocks: int, seed: int=0):
+    """
+    Generates a QuMIS program resembling a compiled experiment consisting
+    of nr_blocks blocks of initialization, pulses, triggers and waits.
+    """
+    rng = np.random.RandomState(seed)
+    lines = ['mov r14, 0', 'mov r1, 200', 'Exp_Start:']
+    for i in range(nr_blocks):
+        lines.append('wait {}'.format(rng.randint(1, 60000)))
+        lines.append('pulse 0000, 0000, 1{:03b}'.format(rng.randint(8)))
+        lines.append('wait {}'.format(rng.randint(1, 100)))
+        lines.append('wait {}'.format(rng.randint(1, 100)))
+        lines.append('trigger {:07b}, {}'.format(rng.randint(128),
+                                                 rng.randint(1, 2047)))
+        lines.append('measure')
+        if i % 50 == 49:
+            lines.append('addi r2, r2, 1')
+            lines.append('waitreg r1')
+    lines.append('beq r14, r14, Exp_Start')
+    return '\n'.join(lines) + '\n'
+
+
+def encode_with_format_functions(asm, label_instrs):
+    """
+    Encodes label_instrs using the string based *Format functions, this is
+    the reference for encode_instructions.
+    """
+    instructions = []
+    for label_instr in label_instrs:
+        elements = label_instr[1:]
+        translate_function = asm.inst_translation_func[elements[0].lower()]
+        instructions.append(int(translate_function(asm, elements[1:]), 2))
+    return instructions
+
+
+def benchmark(nr_blocks_list=(100, 1000, 10000, 50000), verbose=True):
+    """
+    Returns a list of dicts containing the program length and the time
+    spent assembling and encoding.
+    """
+    results = []
+    for nr_blocks in nr_blocks_list:
+        with tempfile.NamedTemporaryFile('w', suffix='.qumis',
+                                         delete=False) as f:
+            f.write(generate_program(nr_blocks))
+        try:
+            asm = Assembler(f.name)
+            t0 = time.perf_counter()
+            asm.assemble()
+            t_assemble = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            instructions = asm.encode_instructions(asm.label_instrs)
+            t_encode = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            ref_instructions = encode_with_format_functions(
+                asm, asm.label_instrs)
+            t_encode_ref = time.perf_counter() - t0
+        finally:
+            os.remove(f.name)
+
+        if instructions != ref_instructions:
+            raise ValueError('Encoded instructions differ from reference.')
+        res = {'nr_instructions': len(instructions),
+               't_assemble': t_assemble,
+               't_encode': t_encode,
+               't_encode_ref': t_encode_ref}
+        results.append(res)
+        if verbose:
+            print('{nr_instructions:>8d} instructions: assemble {t_assemble:.3f}s,'
+                  ' encode {t_encode:.3f}s (string based {t_encode_ref:.3f}s)'
+                  .format(**res))
+    return results
+
+
+if __name__ == '__main__':
+    benchmark()
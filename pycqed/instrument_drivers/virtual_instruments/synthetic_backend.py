@@ -0,0 +1,163 @@
+import time
+import numpy as np
+from pycqed.analysis.fitting_models import hanger_func_complex_SI
+from qcodes.instrument.base import Instrument
+from qcodes.utils import validators as vals
+from qcodes.instrument.parameter import ManualParameter
+from pycqed.instrument_drivers.virtual_instruments.mock_device import \
+    Ql_from_Qi_Qe
+
+
+class Synthetic_Backend(Instrument):
+    '''
+    A fast simulated measurement backend, intended to measure the overhead
+    of the MeasurementControl and the detector/sweep function framework.
+
+    In contrast to the Mock_Device and the dummy detectors, all data is
+    generated vectorized over the sweep points and there are no delays
+    unless a latency is configured explicitly using the acquisition latency
+    model:
+        latency = acq_latency + nr_points * acq_latency_per_point
+
+    Supported experiments (see the experiments attribute):
+        - resonator : transmission of a hanger resonator vs ro_freq
+        - rabi      : readout signal vs the drive amplitude mw_amp
+        - T1        : readout signal vs the delay after a pi pulse
+        - SSRO      : single shots alternating between preparing the
+                      ground and the excited state (I, Q blobs)
+
+    Each experiment can be measured using the Synthetic_Detector_Hard
+    (sweep points passed to prepare) or the Synthetic_Detector_Soft (sweep
+    point read from the sweep parameter of the backend).
+    '''
+
+    # experiment: (sweep parameter, value names, value units)
+    experiments = {
+        'resonator': ('ro_freq', ['Magn', 'Phase'], ['V', 'deg']),
+        'rabi': ('mw_amp', ['I', 'Q'], ['V', 'V']),
+        'T1': ('delay', ['I', 'Q'], ['V', 'V']),
+        'SSRO': ('shot', ['I', 'Q'], ['V', 'V'])}
+
+    def __init__(self, name, seed: int=None, **kw):
+        super().__init__(name=name, **kw)
+        self._rng = np.random.RandomState(seed)
+
+        # Sweep parameters
+        self.add_parameter('ro_freq', unit='Hz', initial_value=7e9,
+                           parameter_class=ManualParameter)
+        self.add_parameter('mw_amp', unit='V', initial_value=0,
+                           parameter_class=ManualParameter)
+        self.add_parameter('delay', unit='s', initial_value=0,
+                           parameter_class=ManualParameter)
+        self.add_parameter('shot', initial_value=0,
+                           parameter_class=ManualParameter)
+
+        # Resonator model
+        self.add_parameter('res_freq', unit='Hz', initial_value=7e9,
+                           parameter_class=ManualParameter)
+        self.add_parameter('res_Qi', initial_value=2e5,
+                           parameter_class=ManualParameter)
+        self.add_parameter('res_Qe', initial_value=2e4,
+                           parameter_class=ManualParameter)
+        self.add_parameter('res_amp', unit='V', initial_value=1,
+                           parameter_class=ManualParameter)
+
+        # Qubit and readout model
+        self.add_parameter('amp180', unit='V', initial_value=0.5,
+                           parameter_class=ManualParameter)
+        self.add_parameter('T1', unit='s', initial_value=20e-6,
+                           parameter_class=ManualParameter)
+        self.add_parameter('thermal_pop', initial_value=0.02,
+                           vals=vals.Numbers(0, 1),
+                           parameter_class=ManualParameter)
+        self.add_parameter('ro_ground', unit='V', initial_value=(-0.2, 0.05),
+                           docstring='I, Q of the ground state readout',
+                           parameter_class=ManualParameter)
+        self.add_parameter('ro_excited', unit='V', initial_value=(0.15, 0.1),
+                           docstring='I, Q of the excited state readout',
+                           parameter_class=ManualParameter)
+        self.add_parameter('ro_sigma', unit='V', initial_value=0.05,
+                           docstring='Width of the single shot blobs',
+                           parameter_class=ManualParameter)
+        self.add_parameter('noise_level', unit='V', initial_value=0.002,
+                           docstring='Gaussian noise added to averaged data',
+                           parameter_class=ManualParameter)
+
+        # Acquisition latency model
+        self.add_parameter('acq_latency', unit='s', initial_value=0,
+                           vals=vals.Numbers(0),
+                           docstring='Latency of every acquisition',
+                           parameter_class=ManualParameter)
+        self.add_parameter('acq_latency_per_point', unit='s',
+                           initial_value=0, vals=vals.Numbers(0),
+                           docstring='Additional latency per acquired point',
+                           parameter_class=ManualParameter)
+
+        self.nr_acquisitions = 0
+        self.nr_acquired_points = 0
+
+    def measure(self, experiment: str, sweep_points):
+        '''
+        Returns the simulated data of an experiment as an array of shape
+        (nr_values, len(sweep_points)).
+        '''
+        x = np.atleast_1d(np.asarray(sweep_points, dtype=float))
+        if experiment == 'resonator':
+            data = self._resonator(x)
+        elif experiment == 'rabi':
+            exc_pop = np.sin(np.pi/2 * x/self.amp180())**2
+            data = self._averaged_readout(exc_pop)
+        elif experiment == 'T1':
+            exc_pop = np.exp(-x/self.T1())
+            data = self._averaged_readout(exc_pop)
+        elif experiment == 'SSRO':
+            data = self._single_shots(x)
+        else:
+            raise ValueError('Experiment "{}" not recognized, options '
+                             'are {}'.format(experiment,
+                                             list(self.experiments)))
+        self._wait(len(x))
+        return data
+
+    def measure_point(self, experiment: str):
+        '''
+        Returns the simulated data of an experiment at the current value of
+        its sweep parameter as an array of shape (nr_values, ).
+        '''
+        sweep_par = self.experiments[experiment][0]
+        return self.measure(experiment, self.get(sweep_par))[:, 0]
+
+    def _resonator(self, f):
+        Ql = Ql_from_Qi_Qe(self.res_Qi(), self.res_Qe())
+        S21 = hanger_func_complex_SI(f=f, f0=self.res_freq(), Ql=Ql,
+                                     Qe=self.res_Qe(), A=self.res_amp(),
+                                     theta=0, phi_v=0, phi_0=0, alpha=0)
+        S21 = S21 + self.noise_level() * (
+            self._rng.randn(len(f)) + 1j*self._rng.randn(len(f)))
+        return np.array([np.abs(S21), np.rad2deg(np.angle(S21))])
+
+    def _averaged_readout(self, exc_pop):
+        # includes the residual excitation of the qubit
+        exc_pop = exc_pop + self.thermal_pop()*(1-2*exc_pop)
+        ground = np.reshape(self.ro_ground(), (2, 1))
+        excited = np.reshape(self.ro_excited(), (2, 1))
+        data = ground + (excited-ground)*exc_pop
+        data += self.noise_level() * self._rng.randn(*data.shape)
+        return data
+
+    def _single_shots(self, shots):
+        # even shots prepare the ground state, odd shots the excited state
+        state = (np.round(shots).astype(int) % 2).astype(bool)
+        flipped = self._rng.rand(len(shots)) < self.thermal_pop()
+        state ^= flipped
+        centers = np.array([self.ro_ground(), self.ro_excited()]).T
+        data = centers[:, state.astype(int)]
+        data += self.ro_sigma() * self._rng.randn(*data.shape)
+        return data
+
+    def _wait(self, nr_points: int):
+        self.nr_acquisitions += 1
+        self.nr_acquired_points += nr_points
+        latency = self.acq_latency() + nr_points*self.acq_latency_per_point()
+        if latency > 0:
+            time.sleep(latency)
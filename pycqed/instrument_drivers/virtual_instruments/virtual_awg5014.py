@@ -5,6 +5,7 @@ from qcodes.instrument.base import Instrument
 from qcodes.instrument.parameter import ManualParameter
 from qcodes.utils import validators as vals
 from qcodes.instrument_drivers.tektronix.AWG5014 import Tektronix_AWG5014
+from pycqed.measurement.waveform_control import awg5014_packing
 
 
 class VirtualAWG5014(Tektronix_AWG5014):
@@ -74,28 +75,11 @@ class VirtualAWG5014(Tektronix_AWG5014):
     def stop(self):
         pass
 
-    def pack_waveform(self, wf, m1, m2):
-        # Input validation
-        if not ((len(wf) == len(m1)) and ((len(m1) == len(m2)))):
-            raise Exception('error: sizes of the waveforms do not match')
-        if min(wf) < -1 or max(wf) > 1:
-            raise TypeError('Waveform values out of bonds.' +
-                            ' Allowed values: -1 to 1 (inclusive)')
-        if (list(m1).count(0)+list(m1).count(1)) != len(m1):
-            raise TypeError('Marker 1 contains invalid values.' +
-                            ' Only 0 and 1 are allowed')
-        if (list(m2).count(0)+list(m2).count(1)) != len(m2):
-            raise TypeError('Marker 2 contains invalid values.' +
-                            ' Only 0 and 1 are allowed')
-
-        wflen = len(wf)
-        packed_wf = np.zeros(wflen, dtype=np.uint16)
-        packed_wf += np.uint16(np.round(wf * 8191) + 8191 +
-                               np.round(16384 * m1) +
-                               np.round(32768 * m2))
-        if len(np.where(packed_wf == -1)[0]) > 0:
-            print(np.where(packed_wf == -1))
-        return packed_wf
+    def pack_waveform(self, wf, m1, m2, out=None):
+        return awg5014_packing.pack_waveform(wf, m1, m2, out=out)
+
+    def pack_waveforms(self, wfs, m1s, m2s):
+        return awg5014_packing.pack_waveforms(wfs, m1s, m2s)
 
     def generate_awg_file(self, packed_waveforms, wfname_l, nrep_l, wait_l,
                           goto_l, logic_jump_l, channel_cfg, sequence_cfg=None,
@@ -7,6 +7,7 @@ from pycqed.measurement.pulse_sequences import single_qubit_tek_seq_elts as sqs
 from pycqed.measurement.pulse_sequences import single_qubit_2nd_exc_seqs as sqs2
 from pycqed.measurement.pulse_sequences import fluxing_sequences as fsqs
 from pycqed.measurement.pulse_sequences import multi_qubit_tek_seq_elts as mq_sqs
+from pycqed.measurement.pulse_sequences.sequence_cache import sequence_cache
 import time
 
 
@@ -27,6 +28,8 @@ class File(swf.Hard_Sweep):
     def prepare(self, **kw):
         if self.upload:
             self.AWG.set_setup_filename(self.filename)
+            # the AWG no longer holds any of the cached sequences
+            sequence_cache.invalidate()
 
 
 class awg_seq_swf(swf.Hard_Sweep):
@@ -63,7 +66,7 @@ class awg_seq_swf(swf.Hard_Sweep):
                 old_vals[i] = self.AWG.get('{}_amp'.format(ch))
                 self.AWG.set('{}_amp'.format(ch), 2)
 
-            self.awg_seq_func(**self.awg_seq_func_kwargs)
+            sequence_cache.call(self.awg_seq_func, **self.awg_seq_func_kwargs)
 
             for i, ch in enumerate(self.fluxing_channels):
                 self.AWG.set('{}_amp'.format(ch), old_vals[i])
@@ -88,10 +91,10 @@ class Rabi(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.Rabi_seq(amps=self.sweep_points,
-                         pulse_pars=self.pulse_pars,
-                         RO_pars=self.RO_pars,
-                         n=self.n, return_seq=self.return_seq)
+            sequence_cache.call(sqs.Rabi_seq, amps=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars,
+                                n=self.n, return_seq=self.return_seq)
 
 
 class two_qubit_tomo_cardinal(swf.Hard_Sweep):
@@ -112,13 +115,13 @@ class two_qubit_tomo_cardinal(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            self.seq = mq_sqs.two_qubit_tomo_cardinal(cardinal=self.cardinal,
-                                                      q0_pulse_pars=self.q0_pulse_pars,
-                                                      q1_pulse_pars=self.q1_pulse_pars,
-                                                      RO_pars=self.RO_pars,
-                                                      timings_dict=self.timings_dict,
-                                                      upload=self.upload,
-                                                      return_seq=self.return_seq)
+            self.seq = sequence_cache.call(mq_sqs.two_qubit_tomo_cardinal, cardinal=self.cardinal,
+                                           q0_pulse_pars=self.q0_pulse_pars,
+                                           q1_pulse_pars=self.q1_pulse_pars,
+                                           RO_pars=self.RO_pars,
+                                           timings_dict=self.timings_dict,
+                                           upload=self.upload,
+                                           return_seq=self.return_seq)
 
 class two_qubit_tomo_bell(swf.Hard_Sweep):
 
@@ -158,17 +161,17 @@ class two_qubit_tomo_bell(swf.Hard_Sweep):
             self.AWG.set(
                 '{}_amp'.format(self.q0_flux_pars['channel']), 2.)
 
-            self.seq = mq_sqs.two_qubit_tomo_bell(bell_state=self.bell_state,
-                                                      q0_pulse_pars=self.q0_pulse_pars,
-                                                      q1_pulse_pars=self.q1_pulse_pars,
-                                                      q0_flux_pars=self.q0_flux_pars,
-                                                      q1_flux_pars=self.q1_flux_pars,
-                                                      RO_pars=self.RO_pars,
-                                                      distortion_dict=self.distortion_dict,
-                                                      timings_dict=self.timings_dict,
-                                                      CPhase=self.CPhase,
-                                                      upload=self.upload,
-                                                      return_seq=self.return_seq)
+            self.seq = sequence_cache.call(mq_sqs.two_qubit_tomo_bell, bell_state=self.bell_state,
+                                           q0_pulse_pars=self.q0_pulse_pars,
+                                           q1_pulse_pars=self.q1_pulse_pars,
+                                           q0_flux_pars=self.q0_flux_pars,
+                                           q1_flux_pars=self.q1_flux_pars,
+                                           RO_pars=self.RO_pars,
+                                           distortion_dict=self.distortion_dict,
+                                           timings_dict=self.timings_dict,
+                                           CPhase=self.CPhase,
+                                           upload=self.upload,
+                                           return_seq=self.return_seq)
             self.AWG.set('{}_amp'.format(self.q1_flux_pars['channel']),
                          old_val_qCP)
 
@@ -191,9 +194,9 @@ class Flipping(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.Flipping_seq(pulse_pars=self.pulse_pars,
-                             RO_pars=self.RO_pars,
-                             n=self.n, return_seq=self.return_seq)
+            sequence_cache.call(sqs.Flipping_seq, pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars,
+                                n=self.n, return_seq=self.return_seq)
 
 
 class Rabi_amp90(swf.Hard_Sweep):
@@ -210,10 +213,10 @@ class Rabi_amp90(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.Rabi_amp90_seq(scales=self.sweep_points,
-                               pulse_pars=self.pulse_pars,
-                               RO_pars=self.RO_pars,
-                               n=self.n)
+            sequence_cache.call(sqs.Rabi_amp90_seq, scales=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars,
+                                n=self.n)
 
 
 class Rabi_2nd_exc(swf.Hard_Sweep):
@@ -240,11 +243,11 @@ class Rabi_2nd_exc(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs2.Rabi_2nd_exc_seq(amps=self.sweep_points,
-                                  pulse_pars=self.pulse_pars,
-                                  pulse_pars_2nd=self.pulse_pars_2nd,
-                                  RO_pars=self.RO_pars,
-                                  n=self.n)
+            sequence_cache.call(sqs2.Rabi_2nd_exc_seq, amps=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                pulse_pars_2nd=self.pulse_pars_2nd,
+                                RO_pars=self.RO_pars,
+                                n=self.n)
 
 
 # class chevron_length(swf.Hard_Sweep):
@@ -313,12 +316,12 @@ class chevron_single_element(swf.Soft_Sweep):
             # values of the flux pulses (including kernels) are defined on
             # a 2Vpp scale.
             self.AWG.set('{}_amp'.format(self.flux_pulse_pars['channel']), 2.)
-            fsqs.chevron_seq(self.mw_pulse_pars,
-                             self.RO_pars,
-                             self.flux_pulse_pars,
-                             pulse_lengths=[self.pulse_length],
-                             distortion_dict=self.dist_dict,
-                             cal_points=False)
+            sequence_cache.call(fsqs.chevron_seq, self.mw_pulse_pars,
+                                self.RO_pars,
+                                self.flux_pulse_pars,
+                                pulse_lengths=[self.pulse_length],
+                                distortion_dict=self.dist_dict,
+                                cal_points=False)
             self.AWG.set('{}_amp'.format(self.flux_pulse_pars['channel']),
                          old_val)
 
@@ -353,7 +356,7 @@ class swap_swap_wait(swf.Hard_Sweep):
             # values of the flux pulses (including kernels) are defined on
             # a 2Vpp scale.
             self.AWG.set('{}_amp'.format(self.flux_pulse_pars['channel']), 2.)
-            fsqs.swap_swap_wait(self.mw_pulse_pars,
+            sequence_cache.call(fsqs.swap_swap_wait, self.mw_pulse_pars,
                                 self.RO_pars,
                                 self.flux_pulse_pars,
                                 phases=self.sweep_points,
@@ -414,7 +417,8 @@ class swap_CP_swap_2Qubits(swf.Hard_Sweep):
                 '{}_amp'.format(self.flux_pulse_pars_qCP['channel']), 2.)
             self.AWG.set(
                 '{}_amp'.format(self.flux_pulse_pars_qS['channel']), 2.)
-            fsqs.swap_CP_swap_2Qubits(
+            sequence_cache.call(
+                fsqs.swap_CP_swap_2Qubits,
                 mw_pulse_pars_qCP=self.mw_pulse_pars_qCP,
                 mw_pulse_pars_qS=self.mw_pulse_pars_qS,
                 flux_pulse_pars_qCP=self.flux_pulse_pars_qCP,
@@ -489,7 +493,8 @@ class swap_CP_swap_2Qubits_1qphasesweep(swf.Hard_Sweep):
                 '{}_amp'.format(self.flux_pulse_pars_qCP['channel']), 2.)
             self.AWG.set(
                 '{}_amp'.format(self.flux_pulse_pars_qS['channel']), 2.)
-            self.last_seq = fsqs.swap_CP_swap_2Qubits_1qphasesweep(
+            self.last_seq = sequence_cache.call(
+                fsqs.swap_CP_swap_2Qubits_1qphasesweep,
                 mw_pulse_pars_qCP=self.mw_pulse_pars_qCP,
                 mw_pulse_pars_qS=self.mw_pulse_pars_qS,
                 flux_pulse_pars_qCP=self.flux_pulse_pars_qCP,
@@ -566,7 +571,8 @@ class swap_CP_swap_2Qubits_1qphasesweep_amp(swf.Hard_Sweep):
                 '{}_amp'.format(self.flux_pulse_pars_qCP['channel']), 2.)
             self.AWG.set(
                 '{}_amp'.format(self.flux_pulse_pars_qS['channel']), 2.)
-            self.last_seq = fsqs.swap_CP_swap_2Qubits_1qphasesweep_amp(
+            self.last_seq = sequence_cache.call(
+                fsqs.swap_CP_swap_2Qubits_1qphasesweep_amp,
                 mw_pulse_pars_qCP=self.mw_pulse_pars_qCP,
                 mw_pulse_pars_qS=self.mw_pulse_pars_qS,
                 flux_pulse_pars_qCP=self.flux_pulse_pars_qCP,
@@ -632,7 +638,8 @@ class chevron_with_excited_bus_2Qubits(swf.Hard_Sweep):
                 '{}_amp'.format(self.flux_pulse_pars_qCP['channel']), 2.)
             self.AWG.set(
                 '{}_amp'.format(self.flux_pulse_pars_qS['channel']), 2.)
-            fsqs.chevron_with_excited_bus_2Qubits(
+            sequence_cache.call(
+                fsqs.chevron_with_excited_bus_2Qubits,
                 mw_pulse_pars_qCP=self.mw_pulse_pars_qCP,
                 mw_pulse_pars_qS=self.mw_pulse_pars_qS,
                 flux_pulse_pars_qCP=self.flux_pulse_pars_qCP,
@@ -679,29 +686,29 @@ class chevron_cphase_length(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            fsqs.chevron_seq_cphase(lengths=self.length_vec,
-                                    mw_pulse_pars=self.mw_pulse_pars,
-                                    RO_pars=self.RO_pars,
-                                    flux_pulse_pars=self.flux_pulse_pars,
-                                    cphase_pulse_pars=self.cphase_pulse_pars,
-                                    artificial_detuning=self.artificial_detuning,
-                                    phase_2=self.phase_2,
-                                    distortion_dict=self.dist_dict,
-                                    toggle_amplitude_sign=self.toggle_amplitude_sign,
-                                    cal_points=self.cal_points)
+            sequence_cache.call(fsqs.chevron_seq_cphase, lengths=self.length_vec,
+                                mw_pulse_pars=self.mw_pulse_pars,
+                                RO_pars=self.RO_pars,
+                                flux_pulse_pars=self.flux_pulse_pars,
+                                cphase_pulse_pars=self.cphase_pulse_pars,
+                                artificial_detuning=self.artificial_detuning,
+                                phase_2=self.phase_2,
+                                distortion_dict=self.dist_dict,
+                                toggle_amplitude_sign=self.toggle_amplitude_sign,
+                                cal_points=self.cal_points)
 
     def pre_upload(self, **kw):
-        self.seq = fsqs.chevron_seq_cphase(lengths=self.length_vec,
-                                           mw_pulse_pars=self.mw_pulse_pars,
-                                           RO_pars=self.RO_pars,
-                                           flux_pulse_pars=self.flux_pulse_pars,
-                                           cphase_pulse_pars=self.cphase_pulse_pars,
-                                           artificial_detuning=self.artificial_detuning,
-                                           phase_2=self.phase_2,
-                                           distortion_dict=self.dist_dict,
-                                           toggle_amplitude_sign=self.toggle_amplitude_sign,
-                                           cal_points=self.cal_points,
-                                           return_seq=True)
+        self.seq = sequence_cache.call(fsqs.chevron_seq_cphase, lengths=self.length_vec,
+                                       mw_pulse_pars=self.mw_pulse_pars,
+                                       RO_pars=self.RO_pars,
+                                       flux_pulse_pars=self.flux_pulse_pars,
+                                       cphase_pulse_pars=self.cphase_pulse_pars,
+                                       artificial_detuning=self.artificial_detuning,
+                                       phase_2=self.phase_2,
+                                       distortion_dict=self.dist_dict,
+                                       toggle_amplitude_sign=self.toggle_amplitude_sign,
+                                       cal_points=self.cal_points,
+                                       return_seq=True)
 
 
 
@@ -725,18 +732,18 @@ class BusT2(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            fsqs.BusT2(self.times_vec,
-                       self.mw_pulse_pars,
-                       self.RO_pars,
-                       self.flux_pulse_pars,
-                       distortion_dict=self.dist_dict)
+            sequence_cache.call(fsqs.BusT2, self.times_vec,
+                                self.mw_pulse_pars,
+                                self.RO_pars,
+                                self.flux_pulse_pars,
+                                distortion_dict=self.dist_dict)
 
     def pre_upload(self, **kw):
-        self.seq = fsqs.BusT2(self.times_vec,
-                              self.mw_pulse_pars,
-                              self.RO_pars,
-                              self.flux_pulse_pars,
-                              distortion_dict=self.dist_dict, return_seq=True)
+        self.seq = sequence_cache.call(fsqs.BusT2, self.times_vec,
+                                       self.mw_pulse_pars,
+                                       self.RO_pars,
+                                       self.flux_pulse_pars,
+                                       distortion_dict=self.dist_dict, return_seq=True)
 
 
 class BusEcho(swf.Hard_Sweep):
@@ -760,20 +767,20 @@ class BusEcho(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            fsqs.BusEcho(self.times_vec,
-                         self.mw_pulse_pars,
-                         self.RO_pars,
-                         self.artificial_detuning,
-                         self.flux_pulse_pars,
-                         distortion_dict=self.dist_dict)
-
-    def pre_upload(self, **kw):
-        self.seq = fsqs.BusEcho(self.times_vec,
+            sequence_cache.call(fsqs.BusEcho, self.times_vec,
                                 self.mw_pulse_pars,
                                 self.RO_pars,
                                 self.artificial_detuning,
                                 self.flux_pulse_pars,
-                                distortion_dict=self.dist_dict, return_seq=True)
+                                distortion_dict=self.dist_dict)
+
+    def pre_upload(self, **kw):
+        self.seq = sequence_cache.call(fsqs.BusEcho, self.times_vec,
+                                       self.mw_pulse_pars,
+                                       self.RO_pars,
+                                       self.artificial_detuning,
+                                       self.flux_pulse_pars,
+                                       distortion_dict=self.dist_dict, return_seq=True)
 
 
 class Ramsey_2nd_exc(swf.Hard_Sweep):
@@ -800,11 +807,11 @@ class Ramsey_2nd_exc(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs2.Ramsey_2nd_exc_seq(times=self.sweep_points,
-                                    pulse_pars=self.pulse_pars,
-                                    pulse_pars_2nd=self.pulse_pars_2nd,
-                                    RO_pars=self.RO_pars,
-                                    n=self.n)
+            sequence_cache.call(sqs2.Ramsey_2nd_exc_seq, times=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                pulse_pars_2nd=self.pulse_pars_2nd,
+                                RO_pars=self.RO_pars,
+                                n=self.n)
 
 
 class cphase_fringes(swf.Hard_Sweep):
@@ -829,25 +836,25 @@ class cphase_fringes(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            mq_sqs.cphase_fringes(phases=self.phases,
-                                  q0_pulse_pars=self.q0_pulse_pars,
-                                  q1_pulse_pars=self.q1_pulse_pars,
-                                  RO_pars=self.RO_pars,
-                                  swap_pars_q0=self.swap_pars_q0,
-                                  cphase_pars_q1=self.cphase_pars_q1,
-                                  timings_dict=self.timings_dict,
-                                  distortion_dict=self.dist_dict)
+            sequence_cache.call(mq_sqs.cphase_fringes, phases=self.phases,
+                                q0_pulse_pars=self.q0_pulse_pars,
+                                q1_pulse_pars=self.q1_pulse_pars,
+                                RO_pars=self.RO_pars,
+                                swap_pars_q0=self.swap_pars_q0,
+                                cphase_pars_q1=self.cphase_pars_q1,
+                                timings_dict=self.timings_dict,
+                                distortion_dict=self.dist_dict)
 
     def pre_upload(self, **kw):
-        self.seq = mq_sqs.cphase_fringes(phases=self.phases,
-                                         q0_pulse_pars=self.q0_pulse_pars,
-                                         q1_pulse_pars=self.q1_pulse_pars,
-                                         RO_pars=self.RO_pars,
-                                         swap_pars_q0=self.swap_pars_q0,
-                                         cphase_pars_q1=self.cphase_pars_q1,
-                                         timings_dict=self.timings_dict,
-                                         distortion_dict=self.dist_dict,
-                                         return_seq=True)
+        self.seq = sequence_cache.call(mq_sqs.cphase_fringes, phases=self.phases,
+                                       q0_pulse_pars=self.q0_pulse_pars,
+                                       q1_pulse_pars=self.q1_pulse_pars,
+                                       RO_pars=self.RO_pars,
+                                       swap_pars_q0=self.swap_pars_q0,
+                                       cphase_pars_q1=self.cphase_pars_q1,
+                                       timings_dict=self.timings_dict,
+                                       distortion_dict=self.dist_dict,
+                                       return_seq=True)
 
 
 class T1(swf.Hard_Sweep):
@@ -864,9 +871,9 @@ class T1(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.T1_seq(times=self.sweep_points,
-                       pulse_pars=self.pulse_pars,
-                       RO_pars=self.RO_pars)
+            sequence_cache.call(sqs.T1_seq, times=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars)
 
 
 class AllXY(swf.Hard_Sweep):
@@ -888,9 +895,9 @@ class AllXY(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.AllXY_seq(pulse_pars=self.pulse_pars,
-                          RO_pars=self.RO_pars,
-                          double_points=self.double_points)
+            sequence_cache.call(sqs.AllXY_seq, pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars,
+                                double_points=self.double_points)
 
 
 class OffOn(swf.Hard_Sweep):
@@ -908,8 +915,8 @@ class OffOn(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.OffOn_seq(pulse_pars=self.pulse_pars,
-                          RO_pars=self.RO_pars, pulse_comb=self.name)
+            sequence_cache.call(sqs.OffOn_seq, pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars, pulse_comb=self.name)
 
 
 class Butterfly(swf.Hard_Sweep):
@@ -929,9 +936,9 @@ class Butterfly(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.Butterfly_seq(pulse_pars=self.pulse_pars,
-                              post_msmt_delay=self.post_msmt_delay,
-                              RO_pars=self.RO_pars, initialize=self.initialize)
+            sequence_cache.call(sqs.Butterfly_seq, pulse_pars=self.pulse_pars,
+                                post_msmt_delay=self.post_msmt_delay,
+                                RO_pars=self.RO_pars, initialize=self.initialize)
 
 
 class Randomized_Benchmarking(swf.Hard_Sweep):
@@ -969,6 +976,7 @@ class Randomized_Benchmarking(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
+            # not cached, every call generates new random sequences
             sqs.Randomized_Benchmarking_seq(
                 self.pulse_pars, self.RO_pars,
                 nr_cliffords=self.sweep_points,
@@ -997,11 +1005,11 @@ class Ramsey(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.Ramsey_seq(times=self.sweep_points,
-                           pulse_pars=self.pulse_pars,
-                           RO_pars=self.RO_pars,
-                           artificial_detuning=self.artificial_detuning,
-                           cal_points=self.cal_points)
+            sequence_cache.call(sqs.Ramsey_seq, times=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars,
+                                artificial_detuning=self.artificial_detuning,
+                                cal_points=self.cal_points)
 
 
 class Echo(swf.Hard_Sweep):
@@ -1022,11 +1030,11 @@ class Echo(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.Echo_seq(times=self.sweep_points,
-                         pulse_pars=self.pulse_pars,
-                         RO_pars=self.RO_pars,
-                         artificial_detuning=self.artificial_detuning,
-                         cal_points=self.cal_points)
+            sequence_cache.call(sqs.Echo_seq, times=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars,
+                                artificial_detuning=self.artificial_detuning,
+                                cal_points=self.cal_points)
 
 
 class Motzoi_XY(swf.Hard_Sweep):
@@ -1049,9 +1057,9 @@ class Motzoi_XY(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.Motzoi_XY(motzois=self.sweep_points,
-                          pulse_pars=self.pulse_pars,
-                          RO_pars=self.RO_pars)
+            sequence_cache.call(sqs.Motzoi_XY, motzois=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars)
 
 
 class Freq_XY(swf.Hard_Sweep):
@@ -1074,9 +1082,9 @@ class Freq_XY(swf.Hard_Sweep):
 
     def prepare(self, **kw):
         if self.upload:
-            sqs.Motzoi_XY(motzois=self.sweep_points,
-                          pulse_pars=self.pulse_pars,
-                          RO_pars=self.RO_pars)
+            sequence_cache.call(sqs.Motzoi_XY, motzois=self.sweep_points,
+                                pulse_pars=self.pulse_pars,
+                                RO_pars=self.RO_pars)
 
 
 class CBox_T1(swf.Hard_Sweep):
@@ -1098,10 +1106,10 @@ class CBox_T1(swf.Hard_Sweep):
         if self.upload:
             ch3_amp = self.AWG.get('ch3_amp')
             ch4_amp = self.AWG.get('ch4_amp')
-            st_seqs.CBox_T1_marker_seq(IF=self.IF, times=self.sweep_points,
-                                       RO_pulse_delay=self.RO_pulse_delay,
-                                       RO_trigger_delay=self.RO_trigger_delay,
-                                       verbose=False)
+            sequence_cache.call(st_seqs.CBox_T1_marker_seq, IF=self.IF, times=self.sweep_points,
+                                RO_pulse_delay=self.RO_pulse_delay,
+                                RO_trigger_delay=self.RO_trigger_delay,
+                                verbose=False)
             self.AWG.set('ch3_amp', ch3_amp)
             self.AWG.set('ch4_amp', ch4_amp)
 
@@ -1170,7 +1178,8 @@ class CBox_Ramsey(swf.Hard_Sweep):
         if self.upload:
             ch3_amp = self.AWG.get('ch3_amp')
             ch4_amp = self.AWG.get('ch3_amp')
-            st_seqs.CBox_Ramsey_marker_seq(
+            sequence_cache.call(
+                st_seqs.CBox_Ramsey_marker_seq,
                 IF=self.IF, times=self.sweep_points,
                 RO_pulse_delay=self.RO_pulse_delay,
                 RO_pulse_length=self.RO_pulse_length,
@@ -1222,7 +1231,8 @@ class CBox_Echo(swf.Hard_Sweep):
         if self.upload:
             ch3_amp = self.AWG.get('ch3_amp')
             ch4_amp = self.AWG.get('ch3_amp')
-            st_seqs.CBox_Echo_marker_seq(
+            sequence_cache.call(
+                st_seqs.CBox_Echo_marker_seq,
                 IF=self.IF, times=self.sweep_points,
                 RO_pulse_delay=self.RO_pulse_delay,
                 RO_trigger_delay=self.RO_trigger_delay,
@@ -1280,7 +1290,8 @@ class CBox_OffOn(swf.Hard_Sweep):
         if self.upload:
             ch3_amp = self.AWG.get('ch3_amp')
             ch4_amp = self.AWG.get('ch3_amp')
-            st_seqs.CBox_single_pulse_seq(
+            sequence_cache.call(
+                st_seqs.CBox_single_pulse_seq,
                 IF=self.IF,
                 RO_pulse_delay=self.RO_pulse_delay,
                 RO_trigger_delay=self.RO_trigger_delay,
@@ -1361,7 +1372,8 @@ class CBox_AllXY(swf.Hard_Sweep):
             ch3_amp = self.AWG.get('ch3_amp')
             ch4_amp = self.AWG.get('ch3_amp')
 
-            st_seqs.CBox_two_pulse_seq(
+            sequence_cache.call(
+                st_seqs.CBox_two_pulse_seq,
                 IF=self.IF,
                 pulse_delay=self.pulse_delay,
                 RO_pulse_delay=self.RO_pulse_delay,
@@ -1413,7 +1425,8 @@ class CBox_multi_element_tape(swf.Hard_Sweep):
         if self.upload:
             ch3_amp = self.AWG.get('ch3_amp')
             ch4_amp = self.AWG.get('ch3_amp')
-            st_seqs.CBox_multi_pulse_seq(
+            sequence_cache.call(
+                st_seqs.CBox_multi_pulse_seq,
                 n_pulses=self.n_pulses, pulse_delay=self.pulse_delay,
                 IF=self.IF,
                 RO_pulse_delay=self.RO_pulse_delay,
@@ -1464,7 +1477,8 @@ class Resetless_tape(swf.Hard_Sweep):
         if self.upload:
             ch3_amp = self.AWG.get('ch3_amp')
             ch4_amp = self.AWG.get('ch3_amp')
-            st_seqs.CBox_resetless_multi_pulse_seq(
+            sequence_cache.call(
+                st_seqs.CBox_resetless_multi_pulse_seq,
                 n_pulses=self.n_pulses, pulse_delay=self.pulse_delay,
                 resetless_interval=self.resetless_interval,
                 IF=self.IF,
@@ -1552,7 +1566,8 @@ class CBox_RB_sweep(swf.Hard_Sweep):
             self.upload_tek_seq()
 
     def upload_tek_seq(self):
-        st_seqs.CBox_single_pulse_seq(
+        sequence_cache.call(
+            st_seqs.CBox_single_pulse_seq,
             IF=self.IF,
             RO_pulse_delay=self.RO_pulse_delay +
             self.max_seq_duration+self.safety_margin,
@@ -0,0 +1,220 @@
+"""
+End-to-end benchmark of the MeasurementControl.
+
+Runs 1D, 2D, hard, soft and adaptive measurements on a Synthetic_Backend
+without acquisition latency, such that the measured time is the overhead
+of the MeasurementControl, sweep functions and detector functions. For
+every measurement it reports the number of measured points per second, the
+time spent in each stage and the peak memory allocated.
+
+Stages:
+    set     : setting the sweep functions
+    acquire : preparing detectors and acquiring (generating) data
+    plot    : updating the live plot and instrument monitors
+    write   : data storage and the remaining MC overhead, i.e. the time
+              in MC.run not spent in one of the other stages
+
+The peak memory is determined in a separate run using tracemalloc, as
+tracing the allocations slows down the measurement.
+
+Usage:
+    python benchmark_MC.py [size_factor]
+"""
+import sys
+import time
+import functools
+import tempfile
+import tracemalloc
+from collections import OrderedDict
+import numpy as np
+from pycqed.measurement import measurement_control
+from pycqed.measurement import detector_functions as det
+from pycqed.measurement import sweep_functions as swf
+from pycqed.measurement.optimization import nelder_mead
+from pycqed.instrument_drivers.virtual_instruments.synthetic_backend import \
+    Synthetic_Backend
+from qcodes import station as qc_station
+
+STAGES = ['set', 'acquire', 'plot', 'write']
+
+PLOT_METHODS = ['update_plotmon', 'update_plotmon_2D',
+                'update_plotmon_2D_hard', 'update_plotmon_adaptive',
+                'update_instrument_monitor']
+
+
+class StageTimer:
+    """
+    Accumulates the time spent in wrapped methods per stage. The time of a
+    wrapped call made from within another wrapped call is only attributed
+    to the innermost stage.
+    """
+
+    def __init__(self):
+        self.times = OrderedDict((stage, 0.) for stage in STAGES)
+        self._stack = []
+        self._t_last = None
+
+    def _switch(self):
+        now = time.perf_counter()
+        if self._stack:
+            self.times[self._stack[-1]] += now - self._t_last
+        self._t_last = now
+
+    def wrap(self, obj, method_name: str, stage: str):
+        method = getattr(obj, method_name)
+
+        @functools.wraps(method)
+        def timed_method(*args, **kw):
+            self._switch()
+            self._stack.append(stage)
+            try:
+                return method(*args, **kw)
+            finally:
+                self._switch()
+                self._stack.pop()
+        setattr(obj, method_name, timed_method)
+
+
+def setup_1D_soft(MC, backend, n):
+    MC.set_sweep_function(backend.mw_amp)
+    MC.set_sweep_points(np.linspace(0, 1, n))
+    MC.set_detector_function(det.Synthetic_Detector_Soft(backend, 'rabi'))
+    return {}
+
+
+def setup_1D_hard(MC, backend, n):
+    MC.set_sweep_function(_hard_sweep(backend.delay))
+    MC.set_sweep_points(np.linspace(0, 100e-6, 100*n))
+    MC.set_detector_function(det.Synthetic_Detector_Hard(backend, 'T1'))
+    return {}
+
+
+def setup_SSRO_hard(MC, backend, n):
+    MC.set_sweep_function(_hard_sweep(backend.shot))
+    MC.set_sweep_points(np.arange(1000*n))
+    MC.set_detector_function(det.Synthetic_Detector_Hard(backend, 'SSRO'))
+    return {}
+
+
+def setup_2D_soft(MC, backend, n):
+    m = int(np.sqrt(n))
+    MC.set_sweep_function(backend.mw_amp)
+    MC.set_sweep_points(np.linspace(0, 1, m))
+    MC.set_sweep_function_2D(backend.amp180)
+    MC.set_sweep_points_2D(np.linspace(0.4, 0.6, m))
+    MC.set_detector_function(det.Synthetic_Detector_Soft(backend, 'rabi'))
+    return {'mode': '2D'}
+
+
+def setup_2D_hard(MC, backend, n):
+    MC.set_sweep_function(_hard_sweep(backend.ro_freq))
+    MC.set_sweep_points(np.linspace(6.99e9, 7.01e9, 100))
+    MC.set_sweep_function_2D(backend.res_freq)
+    MC.set_sweep_points_2D(np.linspace(6.995e9, 7.005e9, n))
+    MC.set_detector_function(
+        det.Synthetic_Detector_Hard(backend, 'resonator'))
+    return {'mode': '2D'}
+
+
+def setup_adaptive(MC, backend, n):
+    MC.set_sweep_function(backend.ro_freq)
+    MC.set_detector_function(det.Synthetic_Detector_Soft(backend,
+                                                         'resonator'))
+    # minimizes the transmission to find the resonator
+    MC.set_adaptive_function_parameters({
+        'adaptive_function': nelder_mead, 'x0': [7.001e9],
+        'initial_step': [1e5], 'maxiter': n, 'no_improv_break': n,
+        'minimize': True})
+    return {'mode': 'adaptive'}
+
+
+def _hard_sweep(parameter):
+    # the data is generated by the detector, the sweep function only labels
+    return swf.None_Sweep(sweep_control='hard', name=parameter.name,
+                          parameter_name=parameter.name, unit=parameter.unit)
+
+
+# label: (setup function, nr of points for size_factor 1)
+BENCHMARKS = OrderedDict([
+    ('1D soft', (setup_1D_soft, 1000)),
+    ('1D hard', (setup_1D_hard, 100)),
+    ('SSRO hard', (setup_SSRO_hard, 100)),
+    ('2D soft', (setup_2D_soft, 900)),
+    ('2D hard', (setup_2D_hard, 100)),
+    ('adaptive', (setup_adaptive, 200)),
+])
+
+
+def run_benchmark(MC, backend, label: str, size_factor: float=1,
+                  trace_memory: bool=True):
+    """
+    Runs one of the BENCHMARKS and returns a dict with the number of
+    points, points per second, the time per stage (s) and the peak memory
+    allocated during the run (bytes, None if trace_memory is False).
+    """
+    setup, nr_points = BENCHMARKS[label]
+    nr_points = max(int(nr_points*size_factor), 4)
+
+    result = OrderedDict([('label', label)])
+    for traced in [False, True] if trace_memory else [False]:
+        run_kw = setup(MC, backend, nr_points)
+        timer = StageTimer()
+        for sweep_function in MC.sweep_functions:
+            timer.wrap(sweep_function, 'set_parameter', 'set')
+        for method_name in ['prepare', 'get_values', 'acquire_data_point']:
+            if hasattr(MC.detector_function, method_name):
+                timer.wrap(MC.detector_function, method_name, 'acquire')
+        for method_name in PLOT_METHODS:
+            timer.wrap(MC, method_name, 'plot')
+        timer.wrap(MC, 'run', 'write')
+
+        if traced:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        dat = MC.run('benchmark_{}'.format(label.replace(' ', '_')),
+                     disable_snapshot_metadata=True, **run_kw)
+        t_run = time.perf_counter() - t0
+        if traced:
+            result['peak memory'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            result['points'] = len(dat['dset'])
+            result['points/s'] = result['points']/t_run
+            result['run time'] = t_run
+            result.update(timer.times)
+        # remove the timed wrappers from the MC
+        for method_name in PLOT_METHODS + ['run']:
+            del MC.__dict__[method_name]
+    if not trace_memory:
+        result['peak memory'] = None
+    return result
+
+
+def main(size_factor: float=1):
+    station = qc_station.Station()
+    backend = Synthetic_Backend('synthetic_backend', seed=0)
+    station.add_component(backend)
+    with tempfile.TemporaryDirectory() as datadir:
+        MC = measurement_control.MeasurementControl(
+            'MC_benchmark', datadir=datadir, live_plot_enabled=False,
+            verbose=False)
+        MC.station = station
+        station.add_component(MC)
+        print('{:<12}{:>8}{:>12}'.format('benchmark', 'points', 'points/s') +
+              ''.join('{:>13}'.format(stage + ' (s)') for stage in STAGES) +
+              '{:>10}'.format('peak MB'))
+        try:
+            for label in BENCHMARKS:
+                result = run_benchmark(MC, backend, label, size_factor)
+                print('{:<12}{:>8}{:>12.0f}'.format(
+                    label, result['points'], result['points/s']) +
+                    ''.join('{:>13.3f}'.format(result[stage])
+                            for stage in STAGES) +
+                    '{:>10.2f}'.format(result['peak memory']/1e6))
+        finally:
+            MC.close()
+            backend.close()
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,107 @@
+"""
+Benchmark of the dataset layout options of the MeasurementControl.
+
+Writes synthetic single-shot data (two integration channels with gaussian
+noise around two blobs, i.e. a typical single-shot readout experiment) to a
+dataset in the same way as the MeasurementControl does (resizing and writing
+one hard acquisition at a time) and reports the write throughput and the
+size on disk for the chunking, compression and precision options.
+
+Usage:
+    python benchmark_datasaving.py [nr_shots] [shots_per_acquisition]
+"""
+import os
+import sys
+import time
+import tempfile
+import h5py
+import numpy as np
+from pycqed.measurement import hdf5_data as h5d
+
+
+OPTIONS = [
+    # (label, chunking, compression, shuffle, value precision)
+    ('default chunks', 'auto', None, False, 'float64'),
+    ('sweep chunks', 'sweep', None, False, 'float64'),
+    ('lzf', 'sweep', 'lzf', False, 'float64'),
+    ('lzf + shuffle', 'sweep', 'lzf', True, 'float64'),
+    ('gzip(4) + shuffle', 'sweep', 'gzip', True, 'float64'),
+    ('lzf + shuffle, float32', 'sweep', 'lzf', True, 'float32'),
+    ('gzip(4) + shuffle, float32', 'sweep', 'gzip', True, 'float32'),
+]
+
+
+def generate_shots(nr_shots: int, seed: int=0):
+    """
+    Returns an array of shape (nr_shots, 3) with a shot index as the sweep
+    column and two integrated quadratures as value columns.
+    """
+    rng = np.random.RandomState(seed)
+    states = rng.randint(2, size=nr_shots)
+    centers = np.array([[-0.21, 0.05], [0.17, 0.11]])
+    values = centers[states] + 0.06 * rng.randn(nr_shots, 2)
+    sweep_points = np.arange(nr_shots, dtype=np.float64)
+    return np.column_stack([sweep_points, values])
+
+
+def write_dataset(filepath: str, data, shots_per_acquisition: int,
+                  chunking: str, compression: str, shuffle: bool,
+                  precision: str):
+    """
+    Writes data to a new file acquisition by acquisition, returns the time
+    it took.
+    """
+    nr_columns = data.shape[1]
+    if chunking == 'sweep':
+        chunk_rows = h5d.chunk_rows_for_sweep(nr_columns,
+                                              shots_per_acquisition)
+    else:
+        chunk_rows = None
+    t0 = time.perf_counter()
+    with h5py.File(filepath, 'w') as f:
+        dset = h5d.create_resizable_dataset(
+            f.create_group('Experimental Data'), 'Data', nr_columns,
+            chunk_rows=chunk_rows, compression=compression,
+            compression_opts=4, shuffle=shuffle)
+        for start in range(0, len(data), shots_per_acquisition):
+            new_data = data[start:start+shots_per_acquisition]
+            stop = start + len(new_data)
+            dset.resize((stop, nr_columns))
+            if precision == 'float32':
+                new_data = new_data.copy()
+                new_data[:, 1:] = new_data[:, 1:].astype(
+                    np.float32).astype(np.float64)
+            dset[start:stop] = new_data
+    return time.perf_counter() - t0
+
+
+def read_column(filepath: str, column: int):
+    t0 = time.perf_counter()
+    with h5py.File(filepath, 'r') as f:
+        f['Experimental Data']['Data'][:, column]
+    return time.perf_counter() - t0
+
+
+def main(nr_shots: int=2**21, shots_per_acquisition: int=2**14):
+    data = generate_shots(nr_shots)
+    raw_size = data.nbytes
+    print('{} shots, {} shots per acquisition, {:.1f} MB raw data'.format(
+        nr_shots, shots_per_acquisition, raw_size / 1e6))
+    print('{:<28}{:>12}{:>12}{:>10}{:>14}'.format(
+        'option', 'write MB/s', 'size MB', 'ratio', 'read col (s)'))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, chunking, compression, shuffle, precision in OPTIONS:
+            filepath = os.path.join(tmpdir, 'benchmark.hdf5')
+            t_write = write_dataset(filepath, data, shots_per_acquisition,
+                                    chunking, compression, shuffle,
+                                    precision)
+            size = os.path.getsize(filepath)
+            t_read = read_column(filepath, 1)
+            print('{:<28}{:>12.1f}{:>12.2f}{:>10.2f}{:>14.3f}'.format(
+                label, raw_size / t_write / 1e6, size / 1e6,
+                raw_size / size, t_read))
+            os.remove(filepath)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -5,12 +5,15 @@ Measurement Control.
 import numpy as np
 import logging
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from string import ascii_uppercase
 from pycqed.analysis import analysis_toolbox as a_tools
 from pycqed.analysis.fit_toolbox import functions as fn
 from pycqed.measurement.waveform_control import pulse
 from pycqed.measurement.waveform_control import element
 from pycqed.measurement.waveform_control import sequence
+from pycqed.simulations import chevron_sim as chev_lib
 from qcodes.instrument.parameter import _BaseParameter
 from pycqed.instrument_drivers.virtual_instruments.pyqx import qasm_loader as ql
 
@@ -19,7 +22,16 @@ class Detector_Function(object):
 
     '''
     Detector_Function class for MeasurementControl
+
+    A detector that sets concurrent_safe to True can be acquired in
+    parallel with other detectors by a concurrent Multi_Detector. It has to
+    call start_trigger (or wait_for_trigger_barrier if it has no trigger)
+    exactly once per acquisition, after it is armed. The Multi_Detector
+    starts the (shared) trigger once all detectors are armed.
     '''
+    concurrent_safe = False
+    # set by a concurrent Multi_Detector during an acquisition
+    trigger_barrier = None
 
     def __init__(self, **kw):
         self.name = self.__class__.__name__
@@ -43,6 +55,25 @@ class Detector_Function(object):
     def finish(self, **kw):
         pass
 
+    def wait_for_trigger_barrier(self):
+        '''
+        Waits until all detectors of a concurrent acquisition are armed.
+        Does nothing if the detector is not acquired concurrently.
+        '''
+        if self.trigger_barrier is not None:
+            self.trigger_barrier.wait()
+
+    def start_trigger(self, AWG):
+        '''
+        Starts the AWG that triggers the acquisition. If the detector is
+        acquired concurrently it only waits until all detectors are armed,
+        the Multi_Detector then starts the AWG of each detector once.
+        '''
+        if self.trigger_barrier is not None:
+            self.trigger_barrier.wait()
+        elif AWG is not None:
+            AWG.start()
+
 
 class Multi_Detector(Detector_Function):
     """
@@ -51,14 +82,19 @@ class Multi_Detector(Detector_Function):
     """
 
     def __init__(self, detectors: list,
-                 det_idx_suffix: bool=True, **kw):
+                 det_idx_suffix: bool=True, concurrent: bool=False, **kw):
         """
         detectors     (list): a list of detectors to combine.
         det_idx_suffix(bool): if True suffixes the value names with
                 "_det{idx}" where idx refers to the relevant detector.
+        concurrent    (bool): if True the detectors that are concurrent_safe
+                are acquired in parallel threads. They are all armed before
+                their (shared) AWG is started, each AWG is started once.
+                The other detectors are acquired one by one afterwards.
         """
         self.detectors = detectors
         self.name = 'Multi_detector'
+        self.concurrent = concurrent
         self.value_names = []
         self.value_units = []
         for i, detector in enumerate(detectors):
@@ -73,12 +109,15 @@ class Multi_Detector(Detector_Function):
         for d in self.detectors:
             if d.detector_control != self.detector_control:
                 raise ValueError('All detectors should be of the same type')
+        self._executor = None
 
     def prepare(self, **kw):
         for detector in self.detectors:
             detector.prepare(**kw)
 
     def get_values(self):
+        if self.concurrent:
+            return self._acquire_concurrently('get_values')
         values_list = []
         for detector in self.detectors:
             new_values = detector.get_values()
@@ -91,15 +130,87 @@ class Multi_Detector(Detector_Function):
         # the only reason for their existence is a historical distinction
         # between hard and soft detectors that leads to some confusing data
         # shape related problems, hence the append vs concatenate
+        if self.concurrent:
+            return self._acquire_concurrently('acquire_data_point').flatten()
         values = []
         for detector in self.detectors:
             new_values = detector.acquire_data_point()
             values = np.append(values, new_values)
         return values
 
+    def _acquire_concurrently(self, acquire_method: str):
+        """
+        Acquires the concurrent_safe detectors in parallel, followed by the
+        other detectors. Returns the values of all detectors as an array of
+        shape (nr_values, nr_points) in the order of the detectors.
+        """
+        parallel = [d for d in self.detectors if d.concurrent_safe]
+        if self._executor is None and len(parallel) > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(self.detectors))
+
+        results = {}
+        if len(parallel) > 1:
+            # The trigger is started exactly once, by the last detector
+            # that is armed, before any of the detectors is released.
+            AWGs = []
+            for detector in parallel:
+                AWG = getattr(detector, 'AWG', None)
+                if AWG is not None and all(AWG is not a for a in AWGs):
+                    AWGs.append(AWG)
+
+            def start_trigger():
+                for AWG in AWGs:
+                    AWG.start()
+            barrier = threading.Barrier(len(parallel), action=start_trigger)
+
+            def acquire(detector):
+                detector.trigger_barrier = barrier
+                try:
+                    return getattr(detector, acquire_method)()
+                except Exception:
+                    # releases the detectors waiting for this one
+                    barrier.abort()
+                    raise
+                finally:
+                    detector.trigger_barrier = None
+
+            futures = [self._executor.submit(acquire, d) for d in parallel]
+            errors = []
+            for detector, future in zip(parallel, futures):
+                try:
+                    results[id(detector)] = future.result()
+                except threading.BrokenBarrierError as e:
+                    errors.append(e)
+                except Exception as e:
+                    # the original error takes precedence over the errors
+                    # of the detectors that were waiting at the barrier
+                    errors.insert(0, e)
+            if errors:
+                raise errors[0]
+
+        for detector in self.detectors:
+            if id(detector) not in results:
+                results[id(detector)] = getattr(detector, acquire_method)()
+
+        values = None
+        start = 0
+        for detector in self.detectors:
+            nr_values = len(detector.value_names)
+            new_values = np.reshape(results[id(detector)], (nr_values, -1))
+            if values is None:
+                values = np.empty((len(self.value_names),
+                                   new_values.shape[1]))
+            values[start:start+nr_values] = new_values
+            start += nr_values
+        return values
+
     def finish(self):
         for detector in self.detectors:
             detector.finish()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
 ###############################################################################
 ###############################################################################
@@ -159,6 +270,7 @@ class Soft_Detector(Detector_Function):
 
 
 class Dummy_Detector_Hard(Hard_Detector):
+    concurrent_safe = True
 
     def __init__(self, delay=0, noise=0, **kw):
         super(Dummy_Detector_Hard, self).__init__()
@@ -179,6 +291,7 @@ class Dummy_Detector_Hard(Hard_Detector):
         data = np.array([np.sin(x / np.pi),
                          np.cos(x/np.pi)])
         data += noise
+        self.wait_for_trigger_barrier()
         time.sleep(self.delay)
         # Counter used in test suite to test how many times data was acquired.
         self.times_called += 1
@@ -186,6 +299,31 @@ class Dummy_Detector_Hard(Hard_Detector):
         return data
 
 
+class Synthetic_Detector_Hard(Hard_Detector):
+    '''
+    Hard detector for an experiment simulated by a Synthetic_Backend, the
+    data is generated for all sweep points at once.
+    '''
+    concurrent_safe = True
+
+    def __init__(self, backend, experiment: str='rabi', **kw):
+        super().__init__()
+        self.set_kw()
+        self.detector_control = 'hard'
+        self.backend = backend
+        self.experiment = experiment
+        self.name = 'Synthetic_{}'.format(experiment)
+        _, self.value_names, self.value_units = \
+            backend.experiments[experiment]
+
+    def prepare(self, sweep_points):
+        self.sweep_points = sweep_points
+
+    def get_values(self):
+        self.wait_for_trigger_barrier()
+        return self.backend.measure(self.experiment, self.sweep_points)
+
+
 class QX_Hard_Detector(Hard_Detector):
 
     def __init__(self, qxc, qasm_filenames, p_error=0.004,
@@ -835,6 +973,26 @@ class Dummy_Detector_Soft(Soft_Detector):
         return np.array([np.sin(x/np.pi), np.cos(x/np.pi)])
 
 
+class Synthetic_Detector_Soft(Soft_Detector):
+    '''
+    Soft detector for an experiment simulated by a Synthetic_Backend, the
+    data is generated at the current value of the sweep parameter of the
+    experiment (e.g. backend.mw_amp for 'rabi').
+    '''
+
+    def __init__(self, backend, experiment: str='rabi', **kw):
+        super().__init__()
+        self.set_kw()
+        self.backend = backend
+        self.experiment = experiment
+        self.name = 'Synthetic_{}'.format(experiment)
+        _, self.value_names, self.value_units = \
+            backend.experiments[experiment]
+
+    def acquire_data_point(self, **kw):
+        return self.backend.measure_point(self.experiment)
+
+
 class Dummy_Detector_Soft_diff_shape(Soft_Detector):
     # For testing purpose, returns data in a slightly different shape
 
@@ -1391,12 +1549,44 @@ class CBox_v3_single_int_avg_with_LutReload(CBox_v3_single_integration_average_d
 # --------------------------------------------
 
 
+def _get_trans_offsets(UHFQC, channels):
+    """
+    Returns the offsets that are subtracted after the crosstalk suppression
+    matrix of the UHFQC (lin_trans result logging mode) for each channel.
+    """
+    return np.array([UHFQC.get(
+        'quex_trans_offset_weightfunction_{}'.format(channel))
+        for channel in channels], dtype=float)
+
+
+def _stack_channel_data(data_raw, scaling, offsets=None):
+    """
+    Stacks the data polled from the UHFQC (a dict with a vector per channel)
+    into a single (channels, samples) array and applies the scaling and
+    offset of each channel in place.
+
+    Args:
+        data_raw (dict) : data as returned by UHFQC.acquisition_poll
+        scaling (array) : scaling factor per channel
+        offsets (array) : offset per channel, subtracted after scaling
+    """
+    keys = sorted(data_raw.keys())
+    data = np.empty((len(keys), len(data_raw[keys[0]])))
+    for i, key in enumerate(keys):
+        data[i] = data_raw[key]
+    data *= np.reshape(scaling, (-1, 1))
+    if offsets is not None:
+        data -= np.reshape(offsets, (-1, 1))
+    return data
+
+
 class UHFQC_input_average_detector(Hard_Detector):
 
     '''
     Detector used for acquiring averaged input traces withe the UHFQC
 
     '''
+    concurrent_safe = True
 
     def __init__(self, UHFQC, AWG=None, channels=(0, 1),
                  nr_averages=1024, nr_samples=4096, **kw):
@@ -1418,9 +1608,9 @@ class UHFQC_input_average_detector(Hard_Detector):
         self.UHFQC.quex_rl_readout(0)  # resets UHFQC internal readout counters
 
         self.UHFQC.acquisition_arm()
-        # starting AWG
-        if self.AWG is not None:
-            self.AWG.start()
+        # starting AWG, in a concurrent acquisition (Multi_Detector) it is
+        # started once all detectors are armed
+        self.start_trigger(self.AWG)
 
         data_raw = self.UHFQC.acquisition_poll(samples=self.nr_sweep_points,
                                                arm=False, acquisition_time=0.01)
@@ -1485,6 +1675,7 @@ class UHFQC_integrated_average_detector(Hard_Detector):
     Detector used for integrated average results with the UHFQC
 
     '''
+    concurrent_safe = True
 
     def __init__(self, UHFQC, AWG=None,
                  integration_length: float=1e-6, nr_averages: int=1024,
@@ -1640,32 +1831,27 @@ class UHFQC_integrated_average_detector(Hard_Detector):
             self.AWG.stop()
         self.UHFQC.quex_rl_readout(1)  # resets UHFQC internal readout counters
         self.UHFQC.acquisition_arm()
-        # starting AWG
-
-        if self.AWG is not None:
-            self.AWG.start()
+        # starting AWG, in a concurrent acquisition (Multi_Detector) it is
+        # started once all detectors are armed
+        self.start_trigger(self.AWG)
 
         data_raw = self.UHFQC.acquisition_poll(
             samples=self.nr_sweep_points, arm=False, acquisition_time=0.01)
 
         # the self.channels should be the same as data_raw.keys().
         # this is to be tested (MAR 26-9-2017)
-        data = np.array([data_raw[key]
-                         for key in sorted(data_raw.keys())])*self.scaling_factor
-
-        # Corrects offsets after crosstalk suppression matrix in UFHQC
-        if self.result_logging_mode == 'lin_trans':
-            for i, channel in enumerate(self.channels):
-                data[i] = data[i]-self.UHFQC.get(
-                    'quex_trans_offset_weightfunction_{}'.format(channel))
+        # Scaling and the offsets after the crosstalk suppression matrix in
+        # the UHFQC are applied using the values cached in prepare
+        data = _stack_channel_data(data_raw, self._channel_scaling,
+                                   self._channel_offsets)
         if not self.real_imag:
             data = self.convert_to_polar(data)
 
         no_virtual_channels = len(self.value_names)//len(self.channels)
-
-        data = np.reshape(data.T,
-                          (-1, no_virtual_channels, len(self.channels))).T
-        data = data.reshape((len(self.value_names), -1))
+        # consecutive samples of a channel are the values of a sweep point
+        data = np.reshape(data, (len(self.channels), -1, no_virtual_channels))
+        data = np.transpose(data, (0, 2, 1)).reshape(
+            (len(self.value_names), -1))
         return data
 
     def convert_to_polar(self, data):
@@ -1676,11 +1862,11 @@ class UHFQC_integrated_average_detector(Hard_Detector):
         if len(data)%2 != 0:
             raise ValueError('Expect even number of channels for rotation. Got {}'.format(
                              len(data)))
-        for i in range(len(data)//2):
-            I, Q = data[2*i], data[2*i+1]
-            S21 = I + 1j*Q
-            data[2*i] = np.abs(S21)
-            data[2*i+1] = np.angle(S21)/(2*np.pi)*360
+        data = np.asarray(data, dtype=float)
+        I, Q = data[0::2], data[1::2]
+        magn = np.sqrt(I**2 + Q**2)
+        data[1::2] = np.degrees(np.arctan2(Q, I))
+        data[0::2] = magn
         return data
 
     def acquire_data_point(self):
@@ -1733,6 +1919,20 @@ class UHFQC_integrated_average_detector(Hard_Detector):
 
         self.UHFQC.quex_rl_source(self.result_logging_mode_idx)
         self.UHFQC.acquisition_initialize(channels=self.channels, mode='rl')
+        self._prepare_post_processing()
+
+    def _prepare_post_processing(self):
+        """
+        Caches the scaling and offsets of the channels such that get_values
+        does not have to query the instrument for every acquisition.
+        """
+        self._channel_scaling = np.full(len(self.channels),
+                                        self.scaling_factor, dtype=float)
+        if self.result_logging_mode == 'lin_trans':
+            self._channel_offsets = _get_trans_offsets(self.UHFQC,
+                                                       self.channels)
+        else:
+            self._channel_offsets = None
 
     def finish(self):
         if self.AWG is not None:
@@ -1805,6 +2005,20 @@ class UHFQC_correlation_detector(UHFQC_integrated_average_detector):
         self.UHFQC.awgs_0_userregs_1(0)  # 0 for rl, 1 for iavg
 
         self.UHFQC.acquisition_initialize(channels=self.channels, mode='rl')
+        self._prepare_post_processing()
+
+    def _prepare_post_processing(self):
+        # Slightly different way to deal with scaling factor
+        self.scaling_factor = 1  # / (1.8e9*self.integration_length)
+        if self.thresholding:
+            self._channel_scaling = np.ones(len(self.channels))
+        else:
+            # the correlation channels contain a product of two channels
+            is_corr = np.isin(self.channels, self.correlation_channels)
+            self._channel_scaling = np.where(
+                is_corr, self.scaling_factor**2, self.scaling_factor) / \
+                self.nr_averages
+        self._channel_offsets = None
 
     def define_correlation_channels(self):
         self.correlation_channels = []
@@ -1888,35 +2102,19 @@ class UHFQC_correlation_detector(UHFQC_integrated_average_detector):
                     thresh_level)
 
     def get_values(self):
-        # Slightly different way to deal with scaling factor
-        self.scaling_factor = 1  # / (1.8e9*self.integration_length)
-
         if self.AWG is not None:
             self.AWG.stop()
         self.UHFQC.quex_rl_readout(1)  # resets UHFQC internal readout counters
         self.UHFQC.acquisition_arm()
-        # starting AWG
-        if self.AWG is not None:
-            self.AWG.start()
+        # starting AWG, in a concurrent acquisition (Multi_Detector) it is
+        # started once all detectors are armed
+        self.start_trigger(self.AWG)
 
         data_raw = self.UHFQC.acquisition_poll(samples=self.nr_sweep_points,
                                                arm=False,
                                                acquisition_time=0.01)
 
-        data = []
-        if self.thresholding:
-            for key in sorted(data_raw.keys()):
-                data.append(np.array(data_raw[key]))
-        else:
-            for key in sorted(data_raw.keys()):
-                if key in self.correlation_channels:
-                    data.append(np.array(data_raw[key]) *
-                                (self.scaling_factor**2 / self.nr_averages))
-                else:
-                    data.append(np.array(data_raw[key]) *
-                                (self.scaling_factor / self.nr_averages))
-
-        return data
+        return _stack_channel_data(data_raw, self._channel_scaling)
 
 
 class UHFQC_integration_logging_det(Hard_Detector):
@@ -1925,6 +2123,7 @@ class UHFQC_integration_logging_det(Hard_Detector):
     Detector used for integrated average results with the UHFQC
 
     '''
+    concurrent_safe = True
 
     def __init__(self, UHFQC, AWG=None,
                  integration_length: float=1e-6,
@@ -1997,21 +2196,15 @@ class UHFQC_integration_logging_det(Hard_Detector):
             self.AWG.stop()
         self.UHFQC.quex_rl_readout(1)  # resets UHFQC internal readout counters
         self.UHFQC.acquisition_arm()
-        # starting AWG
-        if self.AWG is not None:
-            self.AWG.start()
+        # starting AWG, in a concurrent acquisition (Multi_Detector) it is
+        # started once all detectors are armed
+        self.start_trigger(self.AWG)
 
         data_raw = self.UHFQC.acquisition_poll(
             samples=self.nr_shots, arm=False, acquisition_time=0.01)
-        data = np.array([data_raw[key]
-                         for key in sorted(data_raw.keys())])*self.scaling_factor
-
         # Corrects offsets after crosstalk suppression matrix in UFHQC
-        if self.result_logging_mode == 'lin_trans':
-            for i, channel in enumerate(self.channels):
-                data[i] = data[i]-self.UHFQC.get(
-                    'quex_trans_offset_weightfunction_{}'.format(channel))
-        return data
+        return _stack_channel_data(data_raw, self._channel_scaling,
+                                   self._channel_offsets)
 
     def prepare(self, sweep_points):
         if self.AWG is not None:
@@ -2040,6 +2233,15 @@ class UHFQC_integration_logging_det(Hard_Detector):
         self.UHFQC.quex_rl_source(self.result_logging_mode_idx)
         self.UHFQC.acquisition_initialize(channels=self.channels, mode='rl')
 
+        # cached such that get_values does not query the instrument
+        self._channel_scaling = np.full(len(self.channels),
+                                        self.scaling_factor, dtype=float)
+        if self.result_logging_mode == 'lin_trans':
+            self._channel_offsets = _get_trans_offsets(self.UHFQC,
+                                                       self.channels)
+        else:
+            self._channel_offsets = None
+
     def finish(self):
         if self.AWG is not None:
             self.AWG.stop()
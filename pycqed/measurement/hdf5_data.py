@@ -91,7 +91,7 @@ class DateTimeGenerator:
 
 class Data(h5py.File):
 
-    def __init__(self, name: str, datadir: str):
+    def __init__(self, name: str, datadir: str, swmr: bool=False):
         """
         Creates an empty data set including the file, for which the currently
         set file name generator is used.
@@ -100,6 +100,10 @@ class Data(h5py.File):
             name (string) : base name of the file
             datadir (string) : A folder will be created within the datadir
                 using the standard timestamp structure
+            swmr (bool) : create the file in the latest file format such
+                that single-writer/multiple-reader mode can be enabled
+                (by setting "swmr_mode = True") once all groups and
+                datasets have been created.
         """
         self._name = name
 
@@ -116,10 +120,82 @@ class Data(h5py.File):
         self.folder, self._filename = os.path.split(self.filepath)
         if not os.path.isdir(self.folder):
             os.makedirs(self.folder)
-        super(Data, self).__init__(self.filepath, 'a')
+        if swmr:
+            super(Data, self).__init__(self.filepath, 'a', libver='latest')
+        else:
+            super(Data, self).__init__(self.filepath, 'a')
         self.flush()
 
 
+def open_read_only(filepath: str):
+    """
+    Opens an hdf5 file for reading.
+
+    The file is opened in single-writer/multiple-reader (SWMR) read mode
+    such that files that are still being written (e.g. by a running
+    MeasurementControl) can be read. Reading in SWMR mode works for files
+    written without SWMR as well, the plain read-only mode is only used as
+    a fallback.
+    """
+    try:
+        return h5py.File(filepath, 'r', swmr=True)
+    except (OSError, ValueError):
+        return h5py.File(filepath, 'r')
+
+
+def chunk_rows_for_sweep(nr_columns: int, rows_per_sweep: int=None,
+                         min_chunk_bytes: int=2**14,
+                         max_chunk_bytes: int=2**20):
+    """
+    Number of rows per chunk for a float64 dataset that grows by rows.
+
+    A chunk contains (a multiple of) the rows written in one step of the
+    sweep (e.g. one hard acquisition or one line of a 2D sweep), bounded
+    such that a chunk is between min_chunk_bytes and max_chunk_bytes.
+
+    Args:
+        nr_columns (int) : number of columns of the dataset
+        rows_per_sweep (int) : number of rows written per step, if None
+            the smallest chunk size is used.
+    """
+    row_bytes = 8 * nr_columns
+    min_rows = max(1, -(-min_chunk_bytes // row_bytes))
+    max_rows = max(1, max_chunk_bytes // row_bytes)
+    if rows_per_sweep is None or rows_per_sweep < 1:
+        return min(min_rows, max_rows)
+    rows = rows_per_sweep * max(1, -(-min_rows // rows_per_sweep))
+    return int(min(rows, max_rows))
+
+
+def create_resizable_dataset(group, name: str, nr_columns: int,
+                             chunk_rows: int=None, compression: str=None,
+                             compression_opts=None, shuffle: bool=False):
+    """
+    Creates an empty float64 dataset of shape (0, nr_columns) that can be
+    resized along the first axis.
+
+    Args:
+        group (h5py.Group) : group to create the dataset in
+        name (str) : name of the dataset
+        nr_columns (int) : number of columns
+        chunk_rows (int) : number of rows per chunk, if None the chunk
+            shape is chosen by h5py.
+        compression (str) : lossless compression filter, None, 'gzip' or
+            'lzf'.
+        compression_opts : options of the compression filter (the
+            compression level 0-9 for 'gzip').
+        shuffle (bool) : apply the byte shuffle filter (before
+            compression), improves the compression of floating point data.
+    """
+    chunks = True if chunk_rows is None else (int(chunk_rows), nr_columns)
+    if compression != 'gzip':
+        compression_opts = None
+    return group.create_dataset(
+        name, (0, nr_columns), maxshape=(None, nr_columns), dtype='float64',
+        chunks=chunks, compression=compression,
+        compression_opts=compression_opts, shuffle=shuffle)
+
+
 def encode_to_utf8(s):
     '''
     Required because h5py does not support python3 strings
@@ -1,8 +1,10 @@
 import logging
 import numpy as np
-from scipy.linalg import toeplitz
+from scipy.linalg import toeplitz, solve_triangular
 from scipy import special
 from os.path import join
+from pycqed.measurement.kernel_inversion import invert_lower_toeplitz, \
+    kernel_and_step_from_htilde
 kernel_dir = None
 
 
@@ -28,24 +30,23 @@ htilde = lambda fun, t, params, width=1: fun(t, params)-fun(t-width, params)
 
 def kernel_generic(fun, t, *args, **kw):
     """
-    Constructs a toeplitz matrix for a given function and performs
-    the required inversion.
+    Inverts the lower-triangular toeplitz matrix for a given function.
+    Only the first column (the function itself) is used for the
+    inversion, the matrix is never constructed.
     """
     c = fun(t, *args, **kw)
-    r = np.zeros(len(c))
-    M = toeplitz(c=c, r=r)
-    return np.linalg.inv(M)[:, 0]
+    return invert_lower_toeplitz(c)
 
 
 def filter_matrix_generic2(fun, t, *params):
     logging.warning('use scipy.linalg.toeplitz instead')
+    t = np.asarray(t)
+    dt = t[:, None] - t[None, :]
+    # only the causal part (t[i] >= t[j] and i >= j) is nonzero
+    causal = (dt >= 0) & (np.arange(len(t))[:, None] >=
+                          np.arange(len(t))[None, :])
     A = np.zeros((len(t), len(t)))
-    for i in range(len(t)):
-        for j in range(len(t)):
-            if t[i] < t[j]:
-                A[i, j] = 0.
-            else:
-                A[i, j] = heaviside(i-j)*fun(t[i]-t[j], *params)
+    A[causal] = fun(dt[causal], *params)
     return A
 
 
@@ -68,13 +69,19 @@ def save_kernel(kernel, save_file=None):
 def filter_matrix_from_htilde(htilde, t=None):
     if t is None:
         t = len(htilde)
-    func = lambda ii: np.diag(htilde[ii]*np.ones(t-ii), k=-ii)
-    return np.sum(np.array([func(tt) for tt in range(t)]), 0)
+    return toeplitz(c=htilde[:t], r=np.zeros(t))
 
 
 # Inverts "A" matrix describing a filter response to give the inverse
 # precompensating filter.
-kernel_from_filter_matrix = lambda A: np.linalg.inv(A)[:, 0]
+def kernel_from_filter_matrix(A):
+    e_0 = np.zeros(len(A))
+    e_0[0] = 1
+    if np.allclose(np.triu(A, 1), 0):
+        # causal filters are lower triangular, the kernel is found by
+        # forward substitution
+        return solve_triangular(A, e_0, lower=True)
+    return np.linalg.solve(A, e_0)
 
 
 def kernel_from_kernel_step(fun, kernel_length, params_dict, resolution=1):
@@ -314,15 +321,12 @@ def kernel_sampled(file_name, step_width_ns, points_per_ns, step_params=None,
         norm_type=norm_type)
     if max_points is None:
         max_points = len(my_htilde_sampled)
-    my_filter_matrix = filter_matrix_from_htilde(
+    # The filter matrix is lower-triangular Toeplitz, it is inverted using
+    # only its first column (see kernel_inversion).
+    my_kernel, my_kernel_step = kernel_and_step_from_htilde(
         my_htilde_sampled[:max_points])
-    print(my_filter_matrix.shape)
-    my_kernel = kernel_from_filter_matrix(my_filter_matrix)
 
     if return_step:
-        my_kernel_step = np.dot(
-            np.linalg.inv(my_filter_matrix),
-            np.ones((len(my_filter_matrix), 1))).flatten()
         return my_kernel, my_kernel_step
     else:
         return my_kernel
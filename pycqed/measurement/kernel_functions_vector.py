@@ -1,6 +1,8 @@
 import logging
 import numpy as np
 from scipy import special
+from scipy.linalg import toeplitz, solve_triangular
+from pycqed.measurement.kernel_inversion import kernel_and_step_from_htilde
 
 
 # 'D:\\GitHubRepos\\iPython-Notebooks\\Experiments\\1607_Qcodes_5qubit\\kernels\\'
@@ -29,17 +31,17 @@ def kernel_generic(fun, t, *params):
 
 
 def kernel_generic2(fun, t, *params):
-    return np.linalg.inv(filter_matrix_generic2(fun, t, *params))[:, 0]
+    return kernel_from_filter_matrix(filter_matrix_generic2(fun, t, *params))
 
 
 def filter_matrix_generic2(fun, t, *params):
+    t = np.asarray(t)
+    dt = t[:, None] - t[None, :]
+    # only the causal part (t[i] >= t[j] and i >= j) is nonzero
+    causal = (dt >= 0) & (np.arange(len(t))[:, None] >=
+                          np.arange(len(t))[None, :])
     A = np.zeros((len(t), len(t)))
-    for i in range(len(t)):
-        for j in range(len(t)):
-            if t[i] < t[j]:
-                A[i, j] = 0.
-            else:
-                A[i, j] = heaviside(i-j)*fun(t[i]-t[j], *params)
+    A[causal] = fun(dt[causal], *params)
     return A
 
 #don't touch open here
@@ -62,13 +64,19 @@ def save_kernel(kernel, save_file=None):
 def filter_matrix_from_htilde(htilde, t=None):
     if t is None:
         t = len(htilde)
-    func = lambda ii: np.diag(htilde[ii]*np.ones(t-ii), k=-ii)
-    return np.sum(np.array([func(tt) for tt in range(t)]), 0)
+    return toeplitz(c=htilde[:t], r=np.zeros(t))
 
 
 # Inverts "A" matrix describing a filter response to give the inverse
 # precompensating filter.
-kernel_from_filter_matrix = lambda A: np.linalg.inv(A)[:, 0]
+def kernel_from_filter_matrix(A):
+    e_0 = np.zeros(len(A))
+    e_0[0] = 1
+    if np.allclose(np.triu(A, 1), 0):
+        # causal filters are lower triangular, the kernel is found by
+        # forward substitution
+        return solve_triangular(A, e_0, lower=True)
+    return np.linalg.solve(A, e_0)
 
 
 def kernel_from_kernel_step(fun, kernel_length, params_dict, resolution=1):
@@ -305,15 +313,12 @@ def kernel_sampled(vector, step_width_ns, points_per_ns, step_params=None,
         norm_type=norm_type)
     if max_points is None:
         max_points = len(my_htilde_sampled)
-    my_filter_matrix = filter_matrix_from_htilde(
+    # The filter matrix is lower-triangular Toeplitz, it is inverted using
+    # only its first column (see kernel_inversion).
+    my_kernel, my_kernel_step = kernel_and_step_from_htilde(
         my_htilde_sampled[:max_points])
-    print(my_filter_matrix.shape)
-    my_kernel = kernel_from_filter_matrix(my_filter_matrix)
 
     if return_step:
-        my_kernel_step = np.dot(
-            np.linalg.inv(my_filter_matrix),
-            np.ones((len(my_filter_matrix), 1))).flatten()
         return my_kernel, my_kernel_step
     else:
         return my_kernel
@@ -0,0 +1,103 @@
+"""
+Inversion of causal (lower-triangular Toeplitz) filters.
+
+A causal filter with impulse response htilde acts on a signal as the
+lower-triangular Toeplitz matrix
+    A[i, j] = htilde[i-j]  for i >= j, 0 otherwise.
+The inverse of such a matrix is again lower-triangular Toeplitz, it is
+fully described by its first column: the predistortion kernel. The
+functions in this module only work with first columns, such that a kernel
+of N points takes O(N) memory instead of the O(N^2) of the dense matrix.
+
+Two methods are implemented:
+    'substitution'  forward substitution, O(N^2) time
+    'fft'           Newton iteration on the power series 1/htilde(z) using
+                    FFT convolutions, O(N log N) time
+"""
+import numpy as np
+from scipy.signal import fftconvolve
+
+# Below this length forward substitution is faster than the FFT method
+_FFT_THRESHOLD = 512
+
+
+def invert_lower_toeplitz(c, method: str='auto'):
+    """
+    Returns the first column of the inverse of the lower-triangular Toeplitz
+    matrix with first column c, i.e. the kernel that undoes the filter with
+    impulse response c.
+
+    Args:
+        c (array)       : first column (impulse response), c[0] != 0
+        method (str)    : 'substitution', 'fft' or 'auto'
+    """
+    c = np.asarray(c, dtype=float)
+    if len(c) == 0:
+        return np.zeros(0)
+    if c[0] == 0:
+        raise ValueError('Matrix is singular, first element is zero.')
+    if method == 'auto':
+        method = 'fft' if len(c) > _FFT_THRESHOLD else 'substitution'
+
+    if method == 'substitution':
+        return _invert_substitution(c)
+    elif method == 'fft':
+        return _invert_newton(c)
+    else:
+        raise ValueError('Method "{}" not recognized'.format(method))
+
+
+def _invert_substitution(c):
+    # Solves A x = e_0 row by row:
+    #   x[n] = -sum_{k=1}^{n} c[k] x[n-k] / c[0]
+    N = len(c)
+    x = np.zeros(N)
+    x[0] = 1/c[0]
+    c_rev = c[::-1]
+    for n in range(1, N):
+        # c[n:0:-1] . x[0:n]
+        x[n] = -np.dot(c_rev[N-n-1:N-1], x[:n]) / c[0]
+    return x
+
+
+def _invert_newton(c):
+    # Newton iteration for the power series inverse, doubles the number of
+    # correct coefficients every step:
+    #   x <- x (2 - c x)  mod z^(2m)
+    N = len(c)
+    x = np.array([1/c[0]])
+    m = 1
+    while m < N:
+        m = min(2*m, N)
+        cx = fftconvolve(c[:m], x)[:m]
+        cx[0] -= 2
+        x = -fftconvolve(x, cx)[:m]
+    return x
+
+
+def lower_toeplitz_matvec(c, v):
+    """
+    Returns A v for the lower-triangular Toeplitz matrix A with first column
+    c, i.e. the first len(v) samples of the convolution of c and v.
+    """
+    c = np.asarray(c, dtype=float)
+    v = np.asarray(v, dtype=float)
+    return fftconvolve(c[:len(v)], v)[:len(v)]
+
+
+def solve_lower_toeplitz(c, b, method: str='auto'):
+    """
+    Solves A x = b for the lower-triangular Toeplitz matrix A with first
+    column c.
+    """
+    return lower_toeplitz_matvec(invert_lower_toeplitz(c, method=method), b)
+
+
+def kernel_and_step_from_htilde(htilde, method: str='auto'):
+    """
+    Returns the predistortion kernel for a filter with impulse response
+    htilde and the step response of that kernel (A^-1 applied to a step,
+    the cumulative sum of the kernel).
+    """
+    kernel = invert_lower_toeplitz(htilde, method=method)
+    return kernel, np.cumsum(kernel)
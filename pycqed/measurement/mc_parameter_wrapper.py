@@ -8,12 +8,15 @@ from pycqed.measurement import detector_functions as det
 import time
 
 
-def wrap_par_to_swf(parameter, retrieve_value=False):
+def wrap_par_to_swf(parameter, retrieve_value=False, pipeline_safe=False):
     '''
      - only soft sweep_functions
+     - pipeline_safe marks the sweep function as safe to set while the data
+       of the previous row is being stored (see Sweep_function)
     '''
     sweep_function = swf.Sweep_function()
     sweep_function.sweep_control = 'soft'
+    sweep_function.pipeline_safe = pipeline_safe
     sweep_function.name = parameter.name
     sweep_function.parameter_name = parameter.label
     sweep_function.unit = parameter.unit
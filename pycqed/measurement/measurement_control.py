@@ -1,9 +1,13 @@
+import os
 import types
 import logging
 import time
 import numpy as np
+import h5py
+from concurrent.futures import ThreadPoolExecutor
 from scipy.optimize import fmin_powell
 from pycqed.measurement import hdf5_data as h5d
+from pycqed.measurement import parameter_history as ph
 from pycqed.utilities import general
 from pycqed.utilities.general import dict_to_ordered_tuples
 from pycqed.utilities.get_default_datadir import get_default_datadir
@@ -87,6 +91,39 @@ class MeasurementControl(Instrument):
                            vals=vals.Bool(),
                            parameter_class=ManualParameter,
                            initial_value=True)
+        self.add_parameter(
+            'swmr_enabled', vals=vals.Bool(),
+            docstring='Write the datafile in single-writer/multiple-reader '
+            '(SWMR) mode. This allows other processes (e.g. analysis) to '
+            'read the datafile while the measurement is running. Not used '
+            'in adaptive mode as groups are added to the datafile during '
+            'the measurement.',
+            parameter_class=ManualParameter,
+            initial_value=True)
+        self.add_parameter(
+            'flush_interval', unit='s',
+            vals=vals.Numbers(min_value=0),
+            docstring='Minimum time between flushes of the dataset when '
+            'writing in SWMR mode. Readers only see data that is flushed.',
+            parameter_class=ManualParameter,
+            initial_value=1)
+        self.add_parameter(
+            'parameter_history_enabled', vals=vals.Bool(),
+            docstring='Add the instrument settings of every measurement to '
+            'the parameter history database in the datadir, see '
+            'pycqed.measurement.parameter_history. Disabled by default, '
+            'the datadir can be on a network share where SQLite is slow '
+            'or locking is unreliable.',
+            parameter_class=ManualParameter,
+            initial_value=False)
+        self.add_parameter(
+            'parameter_history_timeout', unit='s',
+            vals=vals.Numbers(min_value=0),
+            docstring='Maximum time to wait for a lock on the parameter '
+            'history database before the settings of a measurement are '
+            'skipped.',
+            parameter_class=ManualParameter,
+            initial_value=1)
 
         self.add_parameter(
             'cfg_clipping_mode', vals=vals.Bool(),
@@ -95,6 +132,74 @@ class MeasurementControl(Instrument):
             parameter_class=ManualParameter,
             initial_value=False)
 
+        self.add_parameter(
+            'cfg_dataset_chunk_rows',
+            vals=vals.MultiType(vals.Ints(min_value=1),
+                                vals.Enum('auto', 'sweep')),
+            docstring='Number of rows per chunk of the dataset in the '
+            'datafile. "sweep" uses (a multiple of) the number of sweep '
+            'points, i.e. the rows written per hard acquisition or per line '
+            'of a 2D sweep. "auto" leaves the chunk shape to h5py.',
+            parameter_class=ManualParameter,
+            initial_value='sweep')
+        self.add_parameter(
+            'cfg_dataset_compression',
+            vals=vals.Enum(None, 'gzip', 'lzf'),
+            docstring='Lossless compression filter of the dataset in the '
+            'datafile. "lzf" is fast, "gzip" gives smaller files.',
+            parameter_class=ManualParameter,
+            initial_value=None)
+        self.add_parameter(
+            'cfg_dataset_compression_level',
+            vals=vals.Ints(0, 9),
+            docstring='Compression level used for gzip compression.',
+            parameter_class=ManualParameter,
+            initial_value=4)
+        self.add_parameter(
+            'cfg_dataset_shuffle', vals=vals.Bool(),
+            docstring='Apply the byte shuffle filter before compression, '
+            'improves the compression ratio of floating point data.',
+            parameter_class=ManualParameter,
+            initial_value=False)
+        self.add_parameter(
+            'cfg_value_precision',
+            vals=vals.Enum('float64', 'float32'),
+            docstring='Precision with which the measured values are stored. '
+            'The dataset is always float64, with "float32" the measured '
+            'values (not the sweep points) are rounded to single precision '
+            'which makes them compress (with shuffle) to about half the '
+            'size.',
+            parameter_class=ManualParameter,
+            initial_value='float64')
+
+        self.add_parameter(
+            'cfg_soft_avg_write_interval', unit='s',
+            vals=vals.Numbers(min_value=0),
+            docstring='Minimum time between writes of the soft-averaged '
+            'values of a hard sweep to the datafile. The averages are kept '
+            'in memory and are always written at the end of every soft '
+            'average iteration. 0 writes after every acquisition.',
+            parameter_class=ManualParameter,
+            initial_value=0)
+        self.add_parameter(
+            'cfg_soft_avg_stderr', vals=vals.Bool(),
+            docstring='Store the standard error of the soft-averaged values '
+            'of a hard sweep in the dataset "Soft average stderr" next to '
+            'the "Data" dataset, one column per value. The standard error '
+            'is nan for points measured only once.',
+            parameter_class=ManualParameter,
+            initial_value=False)
+
+        self.add_parameter(
+            'cfg_pipelined_2D_hard', vals=vals.Bool(),
+            docstring='In 2D hard sweeps, store the data of a row in a '
+            'background thread while the outer sweep function is set and '
+            'the next row is acquired. Plotting stays in the main thread. '
+            'Only used if the outer (soft) sweep function is pipeline_safe, '
+            'see set_sweep_function_2D.',
+            parameter_class=ManualParameter,
+            initial_value=False)
+
         self.add_parameter('instrument_monitor',
                            parameter_class=ManualParameter,
                            initial_value=None,
@@ -158,26 +263,28 @@ class MeasurementControl(Instrument):
 
         # used for determining data writing indices and soft averages
         self.total_nr_acquired_values = 0
+        self.reset_soft_avg_accumulators()
 
         # needs to be defined here because of the with statement below
         return_dict = {}
         self.last_sweep_pts = None  # used to prevent resetting same value
-
+        # only created when running an optimization, must not refer to the
+        # datafile of a previous run
+        self.opt_res_dset = None
+        self.stderr_dset = None
+
+        # In SWMR mode no new groups, datasets or attributes can be created
+        # in the datafile. The adaptive mode adds these during the run.
+        use_swmr = self.swmr_enabled() and mode != 'adaptive'
         with h5d.Data(name=self.get_measurement_name(),
-                      datadir=self.datadir()) as self.data_object:
+                      datadir=self.datadir(),
+                      swmr=use_swmr) as self.data_object:
             try:
 
                 self.check_keyboard_interrupt()
                 self.get_measurement_begintime()
                 if not disable_snapshot_metadata:
                     self.save_instrument_settings(self.data_object)
-                self.create_experimentaldata_dataset()
-
-                self.plotting_bins = None
-                if exp_metadata is not None:
-                    self.save_exp_metadata(exp_metadata, self.data_object)
-                    if 'bins' in exp_metadata.keys():
-                        self.plotting_bins = exp_metadata['bins']
 
                 if mode is not 'adaptive':
                     try:
@@ -187,6 +294,16 @@ class MeasurementControl(Instrument):
                         self.xlen = len(self.get_sweep_points())
                     except:
                         self.xlen = 1
+                self.create_experimentaldata_dataset()
+
+                self.plotting_bins = None
+                if exp_metadata is not None:
+                    self.save_exp_metadata(exp_metadata, self.data_object)
+                    if 'bins' in exp_metadata.keys():
+                        self.plotting_bins = exp_metadata['bins']
+                if use_swmr:
+                    self.data_object.swmr_mode = True
+                self._time_last_flush = time.time()
                 if self.mode == '1D':
                     self.measure()
                 elif self.mode == '2D':
@@ -198,12 +315,22 @@ class MeasurementControl(Instrument):
                                      .format(self.mode))
             except KeyboardFinish as e:
                 print(e)
+            self.write_soft_avg_data(force=True)
             result = self.dset[()]
             self.get_measurement_endtime()
-            self.save_MC_metadata(self.data_object)  # timing labels etc
+            if not use_swmr:
+                self.save_MC_metadata(self.data_object)  # timing labels etc
 
+            # reads the optimization result while the datafile is open
             return_dict = self.create_experiment_result_dict()
-
+            self.opt_res_dset = None
+            self.stderr_dset = None
+
+        if use_swmr:
+            # The metadata is written through a separate short-lived handle
+            # as it cannot be added while the file is in SWMR mode.
+            with h5py.File(self.data_object.filepath, 'r+') as data_file:
+                self.save_MC_metadata(data_file)  # timing labels etc
         self.finish(result)
         return return_dict
 
@@ -224,6 +351,18 @@ class MeasurementControl(Instrument):
             self.get_measurement_preparetime()
             sweep_points = self.get_sweep_points()
 
+            if (len(self.sweep_functions) > 1 and
+                    self.cfg_pipelined_2D_hard()):
+                # the inner hard sweep only sets the points within a row,
+                # only the outer sweep functions change between rows
+                unsafe = [sf.name for sf in self.sweep_functions[1:]
+                          if not getattr(sf, 'pipeline_safe', False)]
+                if unsafe:
+                    logging.warning('Sweep functions {} are not pipeline '
+                                    'safe, not pipelining.'.format(unsafe))
+                else:
+                    self.measure_hard_2D_pipelined()
+
             while self.get_percdone() < 100:
                 start_idx = self.get_datawriting_start_idx()
                 if len(self.sweep_functions) == 1:
@@ -281,7 +420,8 @@ class MeasurementControl(Instrument):
 
         if self.adaptive_function == 'Powell':
             self.adaptive_function = fmin_powell
-        if issubclass(self.adaptive_function, BaseLearner):
+        if (isinstance(self.adaptive_function, type) and
+                issubclass(self.adaptive_function, BaseLearner)):
             Learner = self.adaptive_function
             self.learner = Learner(self.optimization_function,
                                    bounds=self.af_pars['bounds'])
@@ -319,34 +459,73 @@ class MeasurementControl(Instrument):
 
     def measure_hard(self):
         new_data = np.array(self.detector_function.get_values()).T
+        start_idx, stop_idx = self.get_datawriting_indices_update_ctr(new_data)
+        self.store_hard_data(new_data, start_idx, stop_idx)
+        self.update_plotmon_hard(stop_idx)
+        return new_data
 
+    def measure_hard_2D_pipelined(self):
+        '''
+        Measures the rows of a 2D hard sweep such that the storing of row k
+        (store_hard_data) runs in a background thread while the sweep
+        functions are set and row k+1 is acquired. The plot monitors of
+        row k are updated in the main thread once row k is stored.
+
+        Ordering guarantees:
+            - rows are acquired and stored in the same order as in
+              measure, the data of a row is stored before that of the next
+            - the sweep functions for row k+1 are only set after the data
+              of row k has been acquired
+            - at most one row is being stored at a time, all rows are
+              stored when this function returns
+        Exceptions raised while storing are raised in the measurement loop
+        before the next row is stored.
+        '''
+        sweep_points = self.get_sweep_points()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            storing = None
+            while self.get_percdone() < 100:
+                start_idx = self.get_datawriting_start_idx()
+                for i, sweep_function in enumerate(self.sweep_functions):
+                    sweep_function.set_parameter(sweep_points[start_idx, i])
+                self.detector_function.prepare(
+                    sweep_points=sweep_points[
+                        start_idx:start_idx+self.xlen, 0])
+                new_data = np.array(self.detector_function.get_values()).T
+                start_idx, stop_idx = \
+                    self.get_datawriting_indices_update_ctr(new_data)
+                if storing is not None:
+                    self.update_plotmon_hard(storing.result())
+                storing = executor.submit(self._store_hard_row, new_data,
+                                          start_idx, stop_idx)
+            if storing is not None:
+                self.update_plotmon_hard(storing.result())
+
+    def _store_hard_row(self, new_data, start_idx: int, stop_idx: int):
+        self.store_hard_data(new_data, start_idx, stop_idx)
+        return stop_idx
+
+    def store_hard_data(self, new_data, start_idx: int, stop_idx: int):
+        '''
+        Stores the data of a hard acquisition in rows start_idx:stop_idx
+        of the dataset. Does not touch the plot monitors, such that it can
+        run in a background thread (see measure_hard_2D_pipelined).
+        '''
         ###########################
         # Shape determining block #
         ###########################
 
         datasetshape = self.dset.shape
-        start_idx, stop_idx = self.get_datawriting_indices_update_ctr(new_data)
-
         new_datasetshape = (np.max([datasetshape[0], stop_idx]),
                             datasetshape[1])
         self.dset.resize(new_datasetshape)
         len_new_data = stop_idx-start_idx
-        if len(np.shape(new_data)) == 1:
-            old_vals = self.dset[start_idx:stop_idx,
-                                 len(self.sweep_functions)]
-            new_vals = ((new_data + old_vals*self.soft_iteration) /
-                        (1+self.soft_iteration))
-
-            self.dset[start_idx:stop_idx,
-                      len(self.sweep_functions)] = new_vals
-        else:
-            old_vals = self.dset[start_idx:stop_idx,
-                                 len(self.sweep_functions):]
-            new_vals = ((new_data + old_vals*self.soft_iteration) /
-                        (1+self.soft_iteration))
-
-            self.dset[start_idx:stop_idx,
-                      len(self.sweep_functions):] = new_vals
+        # The soft averages are accumulated in memory and written to the
+        # dataset, they are never read back from the datafile.
+        self.update_soft_avg_accumulators(
+            start_idx, np.reshape(new_data, (len_new_data, -1)))
+        end_of_iteration = stop_idx >= np.shape(self.get_sweep_points())[0]
+        self.write_soft_avg_data(force=end_of_iteration)
         sweep_len = len(self.get_sweep_points().T)
 
         ######################
@@ -369,6 +548,13 @@ class MeasurementControl(Instrument):
                 # specified that you don't want to crash (e.g. on -off seq)
                 pass
 
+        self.flush_data()
+
+    def update_plotmon_hard(self, stop_idx: int):
+        '''
+        Updates the plot and instrument monitors after the data of a hard
+        acquisition up to row stop_idx is stored, runs in the main thread.
+        '''
         self.check_keyboard_interrupt()
         self.update_instrument_monitor()
         self.update_plotmon()
@@ -376,7 +562,6 @@ class MeasurementControl(Instrument):
             self.update_plotmon_2D_hard()
         self.iteration += 1
         self.print_progress(stop_idx)
-        return new_data
 
     def measurement_function(self, x):
         '''
@@ -444,8 +629,11 @@ class MeasurementControl(Instrument):
         old_vals = self.dset[start_idx:stop_idx, :]
         new_vals = ((new_data + old_vals*self.soft_iteration) /
                     (1+self.soft_iteration))
+        new_vals[:, len(self.sweep_functions):] = self.apply_value_precision(
+            new_vals[:, len(self.sweep_functions):])
 
         self.dset[start_idx:stop_idx, :] = new_vals
+        self.flush_data()
         # update plotmon
         self.check_keyboard_interrupt()
         self.update_instrument_monitor()
@@ -563,11 +751,20 @@ class MeasurementControl(Instrument):
         self.measure(**kw)
         return
 
-    def set_sweep_function_2D(self, sweep_function):
+    def set_sweep_function_2D(self, sweep_function,
+                              pipeline_safe: bool=False):
+        '''
+        pipeline_safe (bool): marks the sweep function (or the sweep
+            function wrapping a parameter) as safe to set while the data of
+            the previous row is stored, see cfg_pipelined_2D_hard.
+        '''
         # If it is not a sweep function, assume it is a qc.parameter
         # and try to auto convert it it
         if not isinstance(sweep_function, swf.Sweep_function):
-            sweep_function = wrap_par_to_swf(sweep_function)
+            sweep_function = wrap_par_to_swf(sweep_function,
+                                             pipeline_safe=pipeline_safe)
+        elif pipeline_safe:
+            sweep_function.pipeline_safe = True
 
         if len(self.sweep_functions) != 1:
             raise KeyError(
@@ -1145,6 +1342,21 @@ class MeasurementControl(Instrument):
         '''
         return self.data_object
 
+    def flush_data(self, force: bool=False):
+        '''
+        Flushes the dataset to the datafile such that the data is visible to
+        readers while the measurement is running. Only flushes in SWMR mode
+        and at most once every flush_interval unless force is True.
+        '''
+        if not self.data_object.swmr_mode:
+            return
+        if (force or time.time() - self._time_last_flush >
+                self.flush_interval()):
+            self.dset.flush()
+            if self.stderr_dset is not None:
+                self.stderr_dset.flush()
+            self._time_last_flush = time.time()
+
     def get_column_names(self):
         self.column_names = []
         self.sweep_par_names = []
@@ -1162,16 +1374,148 @@ class MeasurementControl(Instrument):
                 val_name+' (' + self.detector_function.value_units[i] + ')')
         return self.column_names
 
+    def store_soft_avg_stderr(self):
+        '''
+        True if the standard error of the soft averages is stored in the
+        datafile. Only supported for hard detectors.
+        '''
+        return (self.cfg_soft_avg_stderr() and
+                self.detector_function.detector_control == 'hard' and
+                getattr(self, 'mode', None) != 'adaptive')
+
+    def reset_soft_avg_accumulators(self):
+        '''
+        Clears the in-memory soft averages of a hard sweep.
+        '''
+        self._soft_avg_count = np.zeros(0, dtype=int)
+        self._soft_avg_mean = None
+        self._soft_avg_M2 = None
+        self._soft_avg_dirty_rows = None
+        self._time_last_soft_avg_write = time.time()
+
+    def update_soft_avg_accumulators(self, start_idx: int, new_data):
+        '''
+        Adds the values acquired for rows start_idx:start_idx+len(new_data)
+        to the running mean and variance (Welford's algorithm).
+
+        Args:
+            start_idx (int): first row of the dataset the data belongs to
+            new_data (array): acquired values, shape (nr_rows, nr_values)
+        '''
+        stop_idx = start_idx + len(new_data)
+        if self._soft_avg_mean is None:
+            self._soft_avg_mean = np.zeros((0, new_data.shape[1]))
+            self._soft_avg_M2 = np.zeros((0, new_data.shape[1]))
+        if len(self._soft_avg_count) < stop_idx:
+            # the number of rows is not always known before the first
+            # acquisition, the accumulators grow with the dataset
+            extra_rows = stop_idx - len(self._soft_avg_count)
+            self._soft_avg_count = np.concatenate(
+                [self._soft_avg_count, np.zeros(extra_rows, dtype=int)])
+            self._soft_avg_mean, self._soft_avg_M2 = [
+                np.concatenate([a, np.zeros((extra_rows, a.shape[1]))])
+                for a in (self._soft_avg_mean, self._soft_avg_M2)]
+
+        rows = slice(start_idx, stop_idx)
+        self._soft_avg_count[rows] += 1
+        delta = new_data - self._soft_avg_mean[rows]
+        self._soft_avg_mean[rows] += \
+            delta / self._soft_avg_count[rows, None]
+        self._soft_avg_M2[rows] += delta * (new_data -
+                                            self._soft_avg_mean[rows])
+
+        if self._soft_avg_dirty_rows is None:
+            self._soft_avg_dirty_rows = [start_idx, stop_idx]
+        else:
+            self._soft_avg_dirty_rows = [
+                min(self._soft_avg_dirty_rows[0], start_idx),
+                max(self._soft_avg_dirty_rows[1], stop_idx)]
+
+    def get_soft_avg_stderr(self, rows=slice(None)):
+        '''
+        Returns the standard error of the soft-averaged values, nan for
+        points that are measured less than twice.
+        '''
+        count = self._soft_avg_count[rows, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stderr = np.sqrt(self._soft_avg_M2[rows] / (count - 1) / count)
+        stderr[np.broadcast_to(count < 2, stderr.shape)] = np.nan
+        return stderr
+
+    def write_soft_avg_data(self, force: bool=False):
+        '''
+        Writes the rows of the soft averages that changed since the last
+        write to the dataset. Writes at most once every
+        cfg_soft_avg_write_interval unless force is True.
+        '''
+        if self._soft_avg_dirty_rows is None:
+            return
+        if not (force or time.time() - self._time_last_soft_avg_write >=
+                self.cfg_soft_avg_write_interval()):
+            return
+        start_idx, stop_idx = self._soft_avg_dirty_rows
+        rows = slice(start_idx, stop_idx)
+        nr_sweep_funcs = len(self.sweep_functions)
+        nr_vals = self._soft_avg_mean.shape[1]
+        self.dset[rows, nr_sweep_funcs:nr_sweep_funcs+nr_vals] = \
+            self.apply_value_precision(self._soft_avg_mean[rows])
+        if self.stderr_dset is not None:
+            if self.stderr_dset.shape[0] < stop_idx:
+                self.stderr_dset.resize((self.dset.shape[0], nr_vals))
+            self.stderr_dset[rows] = self.get_soft_avg_stderr(rows)
+        self._soft_avg_dirty_rows = None
+        self._time_last_soft_avg_write = time.time()
+
+    def apply_value_precision(self, values):
+        '''
+        Rounds measured values to the precision set in cfg_value_precision.
+        '''
+        if self.cfg_value_precision() == 'float32':
+            return np.asarray(values, dtype=np.float32).astype(np.float64)
+        return values
+
+    def get_dataset_chunk_rows(self, nr_columns: int):
+        '''
+        Returns the number of rows per chunk of the dataset based on
+        cfg_dataset_chunk_rows, None if the chunk shape is left to h5py.
+        '''
+        chunk_rows = self.cfg_dataset_chunk_rows()
+        if chunk_rows == 'auto':
+            return None
+        elif chunk_rows == 'sweep':
+            # In 2D mode xlen is the length of the inner sweep, in adaptive
+            # mode the number of points is not known beforehand.
+            rows_per_sweep = getattr(self, 'xlen', None)
+            if self.mode == 'adaptive':
+                rows_per_sweep = None
+            return h5d.chunk_rows_for_sweep(nr_columns, rows_per_sweep)
+        return chunk_rows
+
     def create_experimentaldata_dataset(self):
         data_group = self.data_object.create_group('Experimental Data')
-        self.dset = data_group.create_dataset(
-            'Data', (0, len(self.sweep_functions) +
-                     len(self.detector_function.value_names)),
-            maxshape=(None, len(self.sweep_functions) +
-                      len(self.detector_function.value_names)),
-            dtype='float64')
+        nr_columns = (len(self.sweep_functions) +
+                      len(self.detector_function.value_names))
+        self.dset = h5d.create_resizable_dataset(
+            data_group, 'Data', nr_columns,
+            chunk_rows=self.get_dataset_chunk_rows(nr_columns),
+            compression=self.cfg_dataset_compression(),
+            compression_opts=self.cfg_dataset_compression_level(),
+            shuffle=self.cfg_dataset_shuffle())
         self.get_column_names()
         self.dset.attrs['column_names'] = h5d.encode_to_utf8(self.column_names)
+
+        # Separate dataset such that readers of "Data" are not affected
+        self.stderr_dset = None
+        if self.store_soft_avg_stderr():
+            value_names = self.detector_function.value_names
+            self.stderr_dset = h5d.create_resizable_dataset(
+                data_group, 'Soft average stderr', len(value_names),
+                compression=self.cfg_dataset_compression(),
+                compression_opts=self.cfg_dataset_compression_level(),
+                shuffle=self.cfg_dataset_shuffle())
+            self.stderr_dset.attrs['column_names'] = h5d.encode_to_utf8(
+                [val_name+' stderr (' + val_unit + ')' for val_name, val_unit
+                 in zip(value_names, self.detector_function.value_units)])
         # Added to tell analysis how to extract the data
         data_group.attrs['datasaving_format'] = h5d.encode_to_utf8('Version 2')
         data_group.attrs['sweep_parameter_names'] = h5d.encode_to_utf8(
@@ -1185,16 +1529,18 @@ class MeasurementControl(Instrument):
             self.detector_function.value_units)
 
     def create_experiment_result_dict(self):
-        try:
-            # only exists as an open dataset when running an
-            # optimization
-            opt_res_dset = self.opt_res_dset[()]
-        except (ValueError, AttributeError) as e:
-            opt_res_dset = None
+        # only exists as an open dataset when running an optimization
+        opt_res_dset = getattr(self, 'opt_res_dset', None)
+        if opt_res_dset is not None:
+            opt_res_dset = opt_res_dset[()]
+        stderr_dset = getattr(self, 'stderr_dset', None)
+        if stderr_dset is not None:
+            stderr_dset = stderr_dset[()]
 
         result_dict = {
             "dset": self.dset[()],
             "opt_res_dset": opt_res_dset,
+            "soft_avg_stderr": stderr_dset,
             "sweep_parameter_names": self.sweep_par_names,
             "sweep_parameter_units": self.sweep_par_units,
             "value_names": self.detector_function.value_names,
@@ -1303,9 +1649,11 @@ class MeasurementControl(Instrument):
             # Below is old style saving of snapshot, exists for the sake of
             # preserving deprecated functionality
             set_grp = data_object.create_group('Instrument settings')
+            settings = {}
             inslist = dict_to_ordered_tuples(self.station.components)
             for (iname, ins) in inslist:
                 instrument_grp = set_grp.create_group(iname)
+                settings[iname] = {}
                 par_snap = ins.snapshot()['parameters']
                 parameter_list = dict_to_ordered_tuples(par_snap)
                 for (p_name, p) in parameter_list:
@@ -1314,6 +1662,30 @@ class MeasurementControl(Instrument):
                     except KeyError:
                         val = ''
                     instrument_grp.attrs[p_name] = str(val)
+                    settings[iname][p_name] = str(val)
+            if self.parameter_history_enabled():
+                self.save_parameter_history(settings, data_object)
+
+    def save_parameter_history(self, settings: dict, data_object=None):
+        '''
+        Adds the instrument settings to the parameter history database in
+        the datadir. Failing to do so does not stop the measurement, if the
+        database is locked by another process the settings are not added
+        after waiting for at most parameter_history_timeout seconds.
+        '''
+        if data_object is None:
+            data_object = self.data_object
+        try:
+            timestamp = '{}_{}'.format(data_object._datemark,
+                                       data_object._timemark)
+            history = ph.ParameterHistory(
+                os.path.join(self.datadir(), ph.DEFAULT_FILENAME),
+                timeout=self.parameter_history_timeout())
+            history.add_instrument_settings(
+                timestamp, settings, name=data_object._name,
+                filepath=data_object.filepath)
+        except Exception as e:
+            logging.warning('Could not save parameter history: {}'.format(e))
 
     def save_MC_metadata(self, data_object=None, *args):
         '''
@@ -53,12 +53,13 @@ def randomized_benchmarking(qubits: list, platf_cfg: str,
                         to measure a single element (for e.g. optimization)
 
         recompile:      True -> compiles the program,
-                        'as needed' -> compares program to timestamp of config
-                            and existence, if required recompile.
-                        False -> compares program to timestamp of config.
+                        'as needed' -> compares the manifest of the program
+                            (hashes of config and arguments) and existence,
+                            if required recompile.
+                        False -> compares the manifest of the program.
                             if compilation is required raises a ValueError
 
-                        If the program is more recent than the config
+                        If the program is up to date
                         it returns an empty OpenQL program object with
                         the intended filename that can be used to upload the
                         previously compiled file.
@@ -109,8 +110,18 @@ def randomized_benchmarking(qubits: list, platf_cfg: str,
     p.output_dir = ql.get_output_dir()
     p.filename = join(p.output_dir, p.name + '.qisa')
 
+    # arguments that determine the program, used to check if the previously
+    # compiled program can be reused.
+    generator_kwargs = dict(
+        qubits=qubits, nr_cliffords=nr_cliffords, nr_seeds=nr_seeds,
+        net_cliffords=net_cliffords, max_clifford_idx=max_clifford_idx,
+        initialize=initialize, interleaving_cliffords=interleaving_cliffords,
+        program_name=program_name, cal_points=cal_points,
+        f_state_cal_pts=f_state_cal_pts)
     if not oqh.check_recompilation_needed(
-            program_fn=p.filename, platf_cfg=platf_cfg, recompile=recompile):
+            program_fn=p.filename, platf_cfg=platf_cfg, recompile=recompile,
+            generator=randomized_benchmarking,
+            generator_kwargs=generator_kwargs):
         return p
 
     if len(qubits) == 1:
@@ -174,5 +185,8 @@ def randomized_benchmarking(qubits: list, platf_cfg: str,
 
     with suppress_stdout():
         p.compile(verbose=False)
+    oqh.write_compilation_manifest(
+        p.filename, platf_cfg=platf_cfg, generator=randomized_benchmarking,
+        generator_kwargs=generator_kwargs)
 
     return p
@@ -1,15 +1,21 @@
 """
 
 """
+import os
 import re
+import hashlib
+import inspect
+import shutil
+import tempfile
 import numpy as np
 import json
 from shutil import copyfile
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 from pycqed.analysis.tools.plotting import set_xlabel, set_ylabel
 from matplotlib.ticker import MaxNLocator
 import matplotlib.patches as mpatches
-from pycqed.utilities.general import is_more_rencent
+from pycqed.utilities.general import NumpyJsonEncoder, is_more_rencent
 
 
 def clocks_to_s(time, clock_cycle=20e-9):
@@ -299,45 +305,246 @@ def flux_pulse_replacement(qisa_fn: str):
     return mod_qisa_fn, grouped_fl_tuples
 
 
+class _ManifestEncoder(NumpyJsonEncoder):
+    """
+    JSON encoder used to hash generator arguments, objects that cannot be
+    converted to JSON are represented by their repr.
+    """
+
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return repr(o)
+
+
+def infer_manifest_filename(qisa_fn: str):
+    """
+    Get's the filename of the compilation manifest based on the qisa filename.
+    """
+    return qisa_fn[:-5]+'_manifest.json'
+
+
+def get_compilation_manifest(platf_cfg: str, generator=None,
+                             generator_kwargs: dict=None):
+    """
+    Returns a dict describing everything a compiled program depends on:
+    the hash of the contents of the platform config, the name and the hash
+    of the source code of the function generating the program and the hash
+    of its arguments.
+
+    args:
+        platf_cfg           : filename of the platform config
+        generator           : function that generates the program
+        generator_kwargs    : arguments passed to the generator that
+                              determine the program (i.e., without the
+                              recompile argument)
+    """
+    with open(platf_cfg, 'rb') as cfg_file:
+        platf_cfg_hash = hashlib.sha1(cfg_file.read()).hexdigest()
+    generator_source_hash = None
+    if generator is not None:
+        try:
+            generator_source_hash = hashlib.sha1(
+                inspect.getsource(generator).encode('utf-8')).hexdigest()
+        except (OSError, TypeError):
+            # The source is not available (e.g., builtin functions)
+            pass
+        generator = '{}.{}'.format(generator.__module__,
+                                   generator.__qualname__)
+    kwargs_str = json.dumps(generator_kwargs, sort_keys=True,
+                            cls=_ManifestEncoder)
+    return {'platf_cfg_hash': platf_cfg_hash,
+            'generator': generator,
+            'generator_source_hash': generator_source_hash,
+            'generator_kwargs_hash': hashlib.sha1(
+                kwargs_str.encode('utf-8')).hexdigest()}
+
+
+def write_compilation_manifest(program_fn: str, platf_cfg: str,
+                               generator=None, generator_kwargs: dict=None):
+    """
+    Writes the compilation manifest (see get_compilation_manifest) next to
+    the compiled program. Should be called after compiling the program.
+    """
+    manifest = get_compilation_manifest(platf_cfg, generator,
+                                        generator_kwargs)
+    with open(infer_manifest_filename(program_fn), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4)
+
+
 def check_recompilation_needed(program_fn: str, platf_cfg: str,
-                               recompile=True):
+                               recompile=True, generator=None,
+                               generator_kwargs: dict=None):
     """
-    determines if compilation of a file is needed based on it's timestamp
-    and an optional recompile option.
+    determines if compilation of a file is needed based on the manifest
+    stored next to the program and an optional recompile option.
+
+    The manifest (see write_compilation_manifest) contains the hashes of
+    the platform config and of the source code of the generator function
+    and its arguments. Compilation is required if the program or its
+    manifest does not exist or if any of these hashes has changed.
+
+    Programs compiled before manifests were introduced have no manifest.
+    For these programs recompile=False falls back to comparing the
+    modification times of the program and the platform config (the
+    previous behaviour), such that they can still be used without
+    recompiling. With recompile='as needed' they are recompiled once,
+    which also writes their manifest.
 
     The behaviour of this function depends on the recompile argument.
 
     recompile:
         True -> True, the program should be compiled
 
-        'as needed' -> compares filename to timestamp of config
-            and checks if the file exists, if required recompile.
-        False -> compares program to timestamp of config.
-            if compilation is required raises a ValueError
+        'as needed' -> compares the manifest of the program to the current
+            config and arguments, if required recompile.
+        False -> compares the manifest of the program to the current
+            config and arguments. if compilation is required raises a
+            ValueError
     """
     if recompile == True:
         return True
-    elif recompile == 'as needed':
-        try:
+    elif recompile == 'as needed' or recompile == False:
+        manifest_fn = infer_manifest_filename(program_fn)
+        if (recompile == False and os.path.isfile(program_fn) and
+                not os.path.isfile(manifest_fn)):
+            # Program compiled without a manifest
             if is_more_rencent(program_fn, platf_cfg):
                 return False
-            else:
-                return True  # compilation is required
-        except FileNotFoundError:
-            # File doesn't exist means compilation is required
-            return True
+            raise ValueError('OpenQL config has changed more recently '
+                             'than program.')
 
-    elif recompile == False:  # if False
-        if is_more_rencent(program_fn, platf_cfg):
+        manifest = get_compilation_manifest(platf_cfg, generator,
+                                            generator_kwargs)
+        try:
+            with open(manifest_fn) as manifest_file:
+                stored_manifest = json.load(manifest_file)
+            up_to_date = (os.path.isfile(program_fn) and
+                          stored_manifest == manifest)
+        except (FileNotFoundError, ValueError):
+            # Missing or corrupted manifest means compilation is required
+            up_to_date = False
+
+        if up_to_date:
             return False
+        elif recompile == 'as needed':
+            return True  # compilation is required
         else:
-            raise ValueError('OpenQL config has changed more recently '
-                             'than program.')
+            raise ValueError('OpenQL config or program arguments have '
+                             'changed since the program was compiled.')
     else:
         raise NotImplementedError(
             'recompile should be True, False or "as needed"')
 
 
+#############################################################################
+# Batch compilation
+#############################################################################
+
+class CompiledProgram:
+    """
+    Lightweight handle to a program compiled by compile_programs_in_parallel.
+
+    OpenQL program objects cannot be passed between processes, this handle
+    exposes the attributes used to upload and sweep over compiled programs
+    (e.g., in load_range_of_oql_programs).
+    """
+
+    def __init__(self, name: str, filename: str, output_dir: str,
+                 sweep_points=None):
+        self.name = name
+        self.filename = filename
+        self.output_dir = output_dir
+        self.sweep_points = sweep_points
+
+    def __repr__(self):
+        return 'CompiledProgram(name={}, filename={})'.format(
+            self.name, self.filename)
+
+
+def _compile_program_spec(program_spec):
+    """
+    Worker function of compile_programs_in_parallel.
+
+    Compiles a single program in a private temporary directory and moves the
+    resulting files into the output directory once compilation is completed.
+    """
+    import openql.openql as ql
+    func, kwargs, output_dir, seed = program_spec
+    # the forked workers inherit the random state of the parent process,
+    # without reseeding e.g. RB programs would get identical sequences
+    np.random.seed(seed)
+    if output_dir is None:
+        output_dir = ql.get_output_dir()
+    # same file system as output_dir to ensure os.replace is atomic
+    tmp_dir = tempfile.mkdtemp(prefix='.compile_', dir=output_dir)
+    ql.set_output_dir(tmp_dir)
+    try:
+        p = func(**kwargs)
+        for root, dirs, files in os.walk(tmp_dir):
+            target_dir = os.path.join(output_dir,
+                                      os.path.relpath(root, tmp_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            for fn in files:
+                os.replace(os.path.join(root, fn),
+                           os.path.join(target_dir, fn))
+    finally:
+        ql.set_output_dir(output_dir)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {'name': p.name,
+            'filename': os.path.join(output_dir,
+                                     os.path.basename(p.filename)),
+            'output_dir': output_dir,
+            'sweep_points': getattr(p, 'sweep_points', None)}
+
+
+def compile_programs_in_parallel(program_specs: list, max_workers: int=None,
+                                 output_dir: str=None):
+    """
+    Compiles a list of independent OpenQL programs in a process pool.
+
+    Args:
+        program_specs (list): list of (function, kwargs) tuples. The function
+            should be defined at module level (so that it can be sent to
+            the worker processes) and return an OpenQL program that has a
+            filename attribute, e.g., clifford_rb_oql.randomized_benchmarking
+            or pygsti_oql.openql_program_from_pygsti_expList.
+        max_workers (int): number of worker processes, defaults to the
+            number of processors of the machine.
+        output_dir (str): directory to write the compiled programs to,
+            defaults to the OpenQL output directory of the workers.
+    Returns:
+        programs (list): CompiledProgram handles in the order of
+            program_specs.
+
+    N.B. every program is compiled in a private temporary directory and its
+    files are only moved (atomically) to the output directory when
+    compilation is completed. As a consequence the "recompile" argument of
+    the generating functions has no effect and all programs are compiled.
+
+    Every program is compiled with the numpy random state seeded with a
+    seed drawn from the random state of the calling process, such that
+    randomized programs (e.g., RB sequences) differ between specs and are
+    reproducible by seeding the calling process.
+
+    Example:
+        specs = [(cl_oql.randomized_benchmarking,
+                  {'qubits': [0], 'platf_cfg': platf_cfg,
+                   'nr_cliffords': nr_cliffords, 'nr_seeds': 1,
+                   'program_name': 'RB_s{}'.format(i)})
+                 for i in range(nr_seeds)]
+        programs = compile_programs_in_parallel(specs)
+    """
+    seeds = np.random.randint(2**32, size=len(program_specs), dtype=np.int64)
+    specs = [(func, kwargs, output_dir, seed) for (func, kwargs), seed
+             in zip(program_specs, seeds)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_compile_program_spec, specs))
+    return [CompiledProgram(**res) for res in results]
+
+
 def load_range_of_oql_programs(programs, counter_param, CC):
     """
     This is a helper function for running an experiment that is spread over
@@ -36,7 +36,12 @@ def openql_program_from_pygsti_expList(expList, program_name: str,
                 p=platf)
     p.output_dir = ql.get_output_dir()
     p.filename = join(p.output_dir, p.name + '.qisa')
-    if oqh.check_recompilation_needed(p.filename, platf_cfg, recompile):
+    generator_kwargs = dict(expList=expList, program_name=program_name,
+                            qubits=qubits)
+    if oqh.check_recompilation_needed(
+            p.filename, platf_cfg, recompile,
+            generator=openql_program_from_pygsti_expList,
+            generator_kwargs=generator_kwargs):
 
         for i, gatestring in enumerate(expList):
             kernel_name = 'G {} {}'.format(i, gatestring)
@@ -46,6 +51,10 @@ def openql_program_from_pygsti_expList(expList, program_name: str,
             p.add_kernel(k)
         with suppress_stdout():
             p.compile()
+        oqh.write_compilation_manifest(
+            p.filename, platf_cfg,
+            generator=openql_program_from_pygsti_expList,
+            generator_kwargs=generator_kwargs)
 
     p.sweep_points = np.arange(len(expList), dtype=float) + start_idx
     p.set_sweep_points(p.sweep_points, len(p.sweep_points))
@@ -94,7 +103,8 @@ def single_qubit_gst(q0: int, platf_cfg: str,
                      maxL: int=256,
                      lite_germs: bool = True,
                      recompile=True,
-                     verbose: bool=True):
+                     verbose: bool=True,
+                     parallel_compile: bool=False):
     """
     Generates the QISA and QASM programs for full 2Q GST.
 
@@ -105,16 +115,19 @@ def single_qubit_gst(q0: int, platf_cfg: str,
                           must be power of 2.
         lite_germs(bool): if True uses "lite" germs
         recompile:      True -> compiles the program,
-                        'as needed' -> compares program to timestamp of config
-                            and existence, if required recompile.
-                        False -> compares program to timestamp of config.
+                        'as needed' -> compares the manifest of the program
+                            (hashes of config and arguments) and existence,
+                            if required recompile.
+                        False -> compares the manifest of the program.
                             if compilation is required raises a ValueError
 
-                        If the program is more recent than the config
+                        If the program is up to date
                         it returns an empty OpenQL program object with
                         the intended filename that can be used to upload the
                         previously compiled file.
         verbose (bool)  : if True prints extra debug info
+        parallel_compile (bool): if True the programs are compiled in a
+                          process pool, all programs are then recompiled.
 
 
     Returns:
@@ -142,25 +155,35 @@ def single_qubit_gst(q0: int, platf_cfg: str,
         print('Generating GST programs')
 
     expSubLists = split_expList(expList, verbose=verbose)
+    program_specs = []
 
     start_idx = 0
     for exp_num, expSubList in enumerate(expSubLists):
         stop_idx = start_idx + len(expSubList)
 
         # turn into openql program
-        p = openql_program_from_pygsti_expList(
-            expSubList, 'std1Q_XYI q{} {} {} {}-{}'.format(
-                q0, lite_germs, maxL, start_idx, stop_idx),
+        program_name = 'std1Q_XYI q{} {} {} {}-{}'.format(
+            q0, lite_germs, maxL, start_idx, stop_idx)
+        program_kwargs = dict(
+            expList=expSubList, program_name=program_name,
             qubits=[q0],
             start_idx=start_idx,
             platf_cfg=platf_cfg, recompile=recompile)
+        start_idx += len(expSubList)
+        if parallel_compile:
+            program_specs.append(
+                (openql_program_from_pygsti_expList, program_kwargs))
+            continue
+        p = openql_program_from_pygsti_expList(**program_kwargs)
         # append to list of programs
         programs.append(p)
-        start_idx += len(expSubList)
         if verbose:
             print('Generated {} GST programs in {:.1f}s'.format(
                   exp_num+1, time.time()-t0), end='\r')
 
+    if parallel_compile:
+        programs = oqh.compile_programs_in_parallel(program_specs)
+
     print('Generated {} GST programs in {:.1f}s'.format(
           exp_num+1, time.time()-t0))
 
@@ -171,7 +194,8 @@ def two_qubit_gst(qubits: list, platf_cfg: str,
                   maxL: int=256,
                   lite_germs: bool = True,
                   recompile=True,
-                  verbose: bool=True):
+                  verbose: bool=True,
+                  parallel_compile: bool=False):
     """
     Generates the QISA and QASM programs for full 2Q GST.
 
@@ -183,16 +207,19 @@ def two_qubit_gst(qubits: list, platf_cfg: str,
                           must be power of 2.
         lite_germs(bool): if True uses "lite" germs
         recompile:      True -> compiles the program,
-                        'as needed' -> compares program to timestamp of config
-                            and existence, if required recompile.
-                        False -> compares program to timestamp of config.
+                        'as needed' -> compares the manifest of the program
+                            (hashes of config and arguments) and existence,
+                            if required recompile.
+                        False -> compares the manifest of the program.
                             if compilation is required raises a ValueError
 
-                        If the program is more recent than the config
+                        If the program is up to date
                         it returns an empty OpenQL program object with
                         the intended filename that can be used to upload the
                         previously compiled file.
         verbose (bool)  : if True prints extra debug info
+        parallel_compile (bool): if True the programs are compiled in a
+                          process pool, all programs are then recompiled.
 
 
     Returns:
@@ -220,25 +247,35 @@ def two_qubit_gst(qubits: list, platf_cfg: str,
         print('Generating GST programs')
 
     expSubLists = split_expList(expList, verbose=verbose)
+    program_specs = []
 
     start_idx = 0
     for exp_num, expSubList in enumerate(expSubLists):
         stop_idx = start_idx + len(expSubList)
 
         # turn into openql program
-        p = openql_program_from_pygsti_expList(
-            expSubList, 'std2Q_XYCPHASE q{}q{} {} {} {}-{}'.format(
-                qubits[0], qubits[1], lite_germs, maxL, start_idx, stop_idx),
+        program_name = 'std2Q_XYCPHASE q{}q{} {} {} {}-{}'.format(
+            qubits[0], qubits[1], lite_germs, maxL, start_idx, stop_idx)
+        program_kwargs = dict(
+            expList=expSubList, program_name=program_name,
             qubits=qubits,
             start_idx=start_idx,
             platf_cfg=platf_cfg, recompile=recompile)
+        start_idx += len(expSubList)
+        if parallel_compile:
+            program_specs.append(
+                (openql_program_from_pygsti_expList, program_kwargs))
+            continue
+        p = openql_program_from_pygsti_expList(**program_kwargs)
         # append to list of programs
         programs.append(p)
-        start_idx += len(expSubList)
         if verbose:
             print('Generated {} GST programs in {:.1f}s'.format(
                   exp_num+1, time.time()-t0), end='\r')
 
+    if parallel_compile:
+        programs = oqh.compile_programs_in_parallel(program_specs)
+
     print('Generated {} GST programs in {:.1f}s'.format(
           exp_num+1, time.time()-t0))
 
@@ -249,7 +286,8 @@ def single_qubit_gst(q0: int, platf_cfg: str,
                      maxL: int=256,
                      lite_germs: bool = True,
                      recompile=True,
-                     verbose: bool=True):
+                     verbose: bool=True,
+                     parallel_compile: bool=False):
     """
     Generates the QISA and QASM programs for full 2Q GST.
 
@@ -260,16 +298,19 @@ def single_qubit_gst(q0: int, platf_cfg: str,
                           must be power of 2.
         lite_germs(bool): if True uses "lite" germs
         recompile:      True -> compiles the program,
-                        'as needed' -> compares program to timestamp of config
-                            and existence, if required recompile.
-                        False -> compares program to timestamp of config.
+                        'as needed' -> compares the manifest of the program
+                            (hashes of config and arguments) and existence,
+                            if required recompile.
+                        False -> compares the manifest of the program.
                             if compilation is required raises a ValueError
 
-                        If the program is more recent than the config
+                        If the program is up to date
                         it returns an empty OpenQL program object with
                         the intended filename that can be used to upload the
                         previously compiled file.
         verbose (bool)  : if True prints extra debug info
+        parallel_compile (bool): if True the programs are compiled in a
+                          process pool, all programs are then recompiled.
 
 
     Returns:
@@ -297,25 +338,35 @@ def single_qubit_gst(q0: int, platf_cfg: str,
         print('Generating GST programs')
 
     expSubLists = split_expList(expList, verbose=verbose)
+    program_specs = []
 
     start_idx = 0
     for exp_num, expSubList in enumerate(expSubLists):
         stop_idx = start_idx + len(expSubList)
 
         # turn into openql program
-        p = openql_program_from_pygsti_expList(
-            expSubList, 'std1Q_XYI q{} {} {} {}-{}'.format(
-                q0, lite_germs, maxL, start_idx, stop_idx),
+        program_name = 'std1Q_XYI q{} {} {} {}-{}'.format(
+            q0, lite_germs, maxL, start_idx, stop_idx)
+        program_kwargs = dict(
+            expList=expSubList, program_name=program_name,
             qubits=[q0],
             start_idx=start_idx,
             platf_cfg=platf_cfg, recompile=recompile)
+        start_idx += len(expSubList)
+        if parallel_compile:
+            program_specs.append(
+                (openql_program_from_pygsti_expList, program_kwargs))
+            continue
+        p = openql_program_from_pygsti_expList(**program_kwargs)
         # append to list of programs
         programs.append(p)
-        start_idx += len(expSubList)
         if verbose:
             print('Generated {} GST programs in {:.1f}s'.format(
                   exp_num+1, time.time()-t0), end='\r')
 
+    if parallel_compile:
+        programs = oqh.compile_programs_in_parallel(program_specs)
+
     print('Generated {} GST programs in {:.1f}s'.format(
           exp_num+1, time.time()-t0))
 
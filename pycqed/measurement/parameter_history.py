@@ -0,0 +1,271 @@
+"""
+Store of the instrument parameter values of all measurements.
+
+The values of the instrument parameters are saved in the datafile of every
+measurement (the 'Instrument settings' group). To get the value of a
+parameter over a range of time every datafile has to be opened. The
+ParameterHistory stores the same values in an SQLite database (one file per
+datadir) indexed by parameter and timestamp, such that the history of a
+parameter over a time range is a single indexed query.
+
+If MC.parameter_history_enabled is set, the MeasurementControl adds the
+parameters of every measurement to the database of its datadir. Existing
+data can be added using ParameterHistory.backfill.
+"""
+import os
+import sqlite3
+import logging
+from contextlib import closing
+import numpy as np
+
+from pycqed.measurement import hdf5_data as h5d
+
+DEFAULT_FILENAME = 'parameter_history.sqlite'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    name TEXT NOT NULL,
+    filepath TEXT,
+    UNIQUE (timestamp, name));
+CREATE TABLE IF NOT EXISTS parameters (
+    id INTEGER PRIMARY KEY,
+    instrument TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    UNIQUE (instrument, parameter));
+CREATE TABLE IF NOT EXISTS parameter_values (
+    parameter_id INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    measurement_id INTEGER NOT NULL,
+    value REAL,
+    value_str TEXT,
+    PRIMARY KEY (parameter_id, timestamp, measurement_id)) WITHOUT ROWID;
+'''
+
+
+def _to_float(value_str: str):
+    try:
+        return float(value_str)
+    except (TypeError, ValueError):
+        return None
+
+
+def _find_measurements(datadir: str, t_start: str, t_stop: str=None,
+                       label: str=''):
+    """
+    Yields (timestamp, folder) of the measurements in a range of timestamps.
+    Unlike a_tools.get_timestamps_in_range days without data are allowed.
+    """
+    for daydir in sorted(os.listdir(datadir)):
+        if not (len(daydir) == 8 and daydir.isdigit()):
+            continue
+        if daydir < t_start[:8] or (t_stop is not None and
+                                    daydir > t_stop[:8]):
+            continue
+        for measdir in sorted(os.listdir(os.path.join(datadir, daydir))):
+            if not measdir[:6].isdigit() or label not in measdir:
+                continue
+            timestamp = '{}_{}'.format(daydir, measdir[:6])
+            if timestamp < t_start or (t_stop is not None and
+                                       timestamp > t_stop):
+                continue
+            yield timestamp, os.path.join(datadir, daydir, measdir)
+
+
+class ParameterHistory:
+    """
+    SQLite store of the instrument parameter values per measurement.
+
+    Values are stored as the string representation that is also used in the
+    'Instrument settings' group of the datafile and, if the string can be
+    converted, as a float. Measurements are identified by their timestamp
+    ('YYYYMMDD_hhmmss') and name, such that measurements started within the
+    same second are stored separately. The store is append-only, adding the
+    settings of a measurement that is already stored has no effect.
+
+    args:
+        db_path (str) : path of the database file, if a directory is given
+            the default filename in that directory is used.
+        timeout (float) : time in seconds to wait for a lock on the
+            database held by another connection (e.g. another process)
+            before raising an sqlite3.OperationalError.
+    """
+
+    def __init__(self, db_path: str, timeout: float=30):
+        if os.path.isdir(db_path):
+            db_path = os.path.join(db_path, DEFAULT_FILENAME)
+        self.db_path = db_path
+        self.timeout = timeout
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        # Several processes (e.g. MC and analyses) can use the same database,
+        # the timeout is the time to wait for a lock held by another one.
+        return sqlite3.connect(self.db_path, timeout=self.timeout)
+
+    def add_instrument_settings(self, timestamp: str, settings: dict,
+                                name: str='', filepath: str=''):
+        """
+        Adds the parameter values of a measurement.
+
+        args:
+            timestamp (str) : timestamp of the measurement
+            settings (dict) : {instrument name: {parameter name: value}}
+            name (str)      : name of the measurement
+            filepath (str)  : path of the datafile
+        returns:
+            added (bool) : False if the measurement was already stored
+        """
+        with closing(self._connect()) as conn, conn:
+            cur = conn.execute(
+                'INSERT OR IGNORE INTO measurements (timestamp, name, '
+                'filepath) VALUES (?, ?, ?)', (timestamp, name, filepath))
+            if cur.rowcount == 0:
+                return False
+            meas_id = cur.lastrowid
+            pars = [(ins, par) for ins, pars in settings.items()
+                    for par in pars]
+            conn.executemany(
+                'INSERT OR IGNORE INTO parameters (instrument, parameter) '
+                'VALUES (?, ?)', pars)
+            par_ids = {(ins, par): par_id for par_id, ins, par in
+                       conn.execute('SELECT id, instrument, parameter '
+                                    'FROM parameters')}
+            rows = []
+            for ins, pars in settings.items():
+                for par, val in pars.items():
+                    val_str = str(val)
+                    rows.append((par_ids[(ins, par)], timestamp, meas_id,
+                                 _to_float(val_str), val_str))
+            conn.executemany(
+                'INSERT OR IGNORE INTO parameter_values '
+                'VALUES (?, ?, ?, ?, ?)', rows)
+        return True
+
+    def add_datafile(self, filepath: str):
+        """
+        Adds the values from the 'Instrument settings' group of a datafile.
+        The timestamp and name are taken from the (standard) directory
+        structure of the datafile.
+        """
+        folder = os.path.dirname(os.path.abspath(filepath))
+        daydir, measdir = os.path.split(folder)
+        timestamp = '{}_{}'.format(os.path.basename(daydir), measdir[:6])
+        name = measdir[7:]
+        with h5d.open_read_only(filepath) as data_file:
+            if 'Instrument settings' not in data_file:
+                settings = {}
+            else:
+                settings = {
+                    ins: {par: (val.decode('utf-8')
+                                if isinstance(val, bytes) else val)
+                          for par, val in ins_grp.attrs.items()}
+                    for ins, ins_grp in
+                    data_file['Instrument settings'].items()}
+        return self.add_instrument_settings(timestamp, settings, name=name,
+                                            filepath=filepath)
+
+    def backfill(self, t_start: str, t_stop: str=None, label: str='',
+                 datadir: str=None):
+        """
+        Adds all measurements in a range of timestamps that are not yet in
+        the store.
+
+        args:
+            t_start, t_stop (str) : timestamps 'YYYYMMDD_hhmmss' of the
+                range, t_stop defaults to now.
+            label (str)   : only add measurements with label in their name
+            datadir (str) : data directory, defaults to a_tools.datadir
+        returns:
+            nr_added (int) : number of measurements that were added
+        """
+        # dirty import inside this function to prevent circular import
+        from pycqed.analysis import analysis_toolbox as a_tools
+        if datadir is None:
+            datadir = a_tools.datadir
+        stored = set(self.get_measurements(t_start, t_stop))
+        nr_added = 0
+        for timestamp, folder in _find_measurements(datadir, t_start, t_stop,
+                                                    label):
+            if (timestamp, os.path.basename(folder)[7:]) in stored:
+                continue
+            try:
+                filepath = a_tools.measurement_filename(folder)
+                nr_added += self.add_datafile(filepath)
+            except Exception as e:
+                logging.warning('Could not add {} to parameter history: '
+                                '{}'.format(timestamp, e))
+        return nr_added
+
+    def get_timestamps(self, t_start: str=None, t_stop: str=None):
+        """Returns the stored timestamps in a range."""
+        return [ts for ts, name in self.get_measurements(t_start, t_stop)]
+
+    def get_measurements(self, t_start: str=None, t_stop: str=None):
+        """Returns the (timestamp, name) of the stored measurements in a
+        range."""
+        query, args = 'SELECT timestamp, name FROM measurements', []
+        query, args = self._add_time_range(query, args, t_start, t_stop,
+                                           'WHERE')
+        with closing(self._connect()) as conn:
+            return conn.execute(query + ' ORDER BY timestamp, id',
+                                args).fetchall()
+
+    def get_parameters(self, instrument: str=None):
+        """Returns a list of the stored (instrument, parameter) names."""
+        query, args = 'SELECT instrument, parameter FROM parameters', []
+        if instrument is not None:
+            query += ' WHERE instrument = ?'
+            args.append(instrument)
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                query + ' ORDER BY instrument, parameter', args).fetchall()
+
+    def get_parameter_history(self, instrument: str, parameter: str,
+                              t_start: str=None, t_stop: str=None,
+                              as_str: bool=False):
+        """
+        Returns the values of a parameter over a range of time.
+
+        args:
+            instrument (str), parameter (str) : name of the parameter
+            t_start, t_stop (str) : timestamps 'YYYYMMDD_hhmmss', inclusive
+            as_str (bool) : return the values as strings
+        returns:
+            timestamps (list) : timestamps of the measurements
+            values : np.array of floats (nan for values that are not a
+                number) or, if as_str, a list of strings.
+        """
+        query = ('SELECT v.timestamp, v.value, v.value_str '
+                 'FROM parameter_values AS v JOIN parameters AS p '
+                 'ON v.parameter_id = p.id '
+                 'WHERE p.instrument = ? AND p.parameter = ?')
+        args = [instrument, parameter]
+        query, args = self._add_time_range(query, args, t_start, t_stop,
+                                           'AND', column='v.timestamp')
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                query + ' ORDER BY v.timestamp, v.measurement_id',
+                args).fetchall()
+        timestamps = [r[0] for r in rows]
+        if as_str:
+            return timestamps, [r[2] for r in rows]
+        values = np.array([np.nan if r[1] is None else r[1] for r in rows],
+                          dtype=float)
+        return timestamps, values
+
+    @staticmethod
+    def _add_time_range(query, args, t_start, t_stop, keyword,
+                        column='timestamp'):
+        conditions = []
+        if t_start is not None:
+            conditions.append('{} >= ?'.format(column))
+            args.append(t_start)
+        if t_stop is not None:
+            conditions.append('{} <= ?'.format(column))
+            args.append(t_stop)
+        if conditions:
+            query += ' {} '.format(keyword) + ' AND '.join(conditions)
+        return query, args
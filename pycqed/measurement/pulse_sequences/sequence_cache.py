@@ -0,0 +1,173 @@
+"""
+Cache for the sequences generated by the pulse sequence functions.
+
+The AWG hard sweep functions (see awg_sweep_functions) call a sequence
+function in their prepare, which generates all elements and uploads them to
+the AWGs through the pulsar. Calibration loops typically repeat the same
+sequence with identical parameters many times.
+
+SequenceCache.call stores the result of a sequence function, keyed on the
+function and a canonical hash of its arguments (pulse parameter dicts, sweep
+points, ...) and of the pulsar channel settings. If the same sequence is
+requested again, the generation is skipped. If the sequence is also still the
+last one programmed through the pulsar the upload is skipped as well,
+otherwise the cached sequence and elements are programmed again.
+
+Sequence functions without an "upload" argument are assumed to always
+upload. Calls with arguments that are not plain data (e.g. instruments or
+functions) are not cached. If the AWGs are programmed outside of the
+pulsar, or the sequence depends on settings that are not arguments of the
+sequence function, the cache has to be invalidated explicitly using
+invalidate().
+"""
+import sys
+import inspect
+import hashlib
+import numpy as np
+from collections import OrderedDict
+
+
+class SequenceCache:
+    """
+    Args:
+        max_size (int): maximum number of sequences kept in the cache, the
+            least recently used sequences are removed first.
+    """
+
+    def __init__(self, max_size: int=32):
+        self.max_size = max_size
+        self.enabled = True
+        self._entries = OrderedDict()
+        self.reset_statistics()
+
+    def call(self, seq_func, *args, **kw):
+        """
+        Calls seq_func(*args, **kw) or returns the result of an earlier call
+        with identical arguments.
+        """
+        if not self.enabled:
+            return seq_func(*args, **kw)
+        try:
+            bound = inspect.signature(seq_func).bind(*args, **kw)
+        except (TypeError, ValueError):
+            # let the sequence function raise the error for invalid args
+            return seq_func(*args, **kw)
+        bound.apply_defaults()
+        # functions without an upload argument always upload
+        upload = bound.arguments.get('upload', True)
+        pulsar = _get_pulsar(seq_func)
+
+        try:
+            key = (seq_func.__module__, seq_func.__qualname__,
+                   canonical_hash(bound.arguments,
+                                  getattr(pulsar, 'channels', None)))
+        except TypeError:
+            # arguments that are not plain data cannot be compared
+            self.uncached += 1
+            return seq_func(*args, **kw)
+        entry = self._entries.get(key, None)
+        if entry is not None and upload:
+            if pulsar is None or entry['sequence'] is None:
+                # cannot determine what is programmed on the AWGs
+                entry = None
+            elif pulsar.last_sequence is entry['sequence']:
+                self.uploads_skipped += 1
+            else:
+                pulsar.program_awgs(entry['sequence'], *entry['elements'])
+                self.uploads += 1
+
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry['result']
+
+        self.misses += 1
+        last_sequence = getattr(pulsar, 'last_sequence', None)
+        result = seq_func(*args, **kw)
+        entry = {'result': result, 'sequence': None, 'elements': None}
+        if upload and pulsar is not None:
+            self.uploads += 1
+            if pulsar.last_sequence is not last_sequence:
+                entry['sequence'] = pulsar.last_sequence
+                entry['elements'] = pulsar.last_elements
+        self._entries[key] = entry
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, seq_func=None):
+        """
+        Removes all sequences from the cache, or only those generated by
+        seq_func.
+        """
+        if seq_func is None:
+            self._entries.clear()
+            return
+        for key in list(self._entries.keys()):
+            if key[:2] == (seq_func.__module__, seq_func.__qualname__):
+                del self._entries[key]
+
+    def statistics(self):
+        """
+        Returns a dict with the number of cache hits and misses, the number
+        of uncached calls, the number of uploads done and skipped and the
+        number of cached sequences.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'uncached': self.uncached, 'uploads': self.uploads,
+                'uploads_skipped': self.uploads_skipped,
+                'size': len(self._entries)}
+
+    def reset_statistics(self):
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.uploads = 0
+        self.uploads_skipped = 0
+
+
+def _get_pulsar(seq_func):
+    # The sequence modules use a module level station to upload
+    module = sys.modules.get(getattr(seq_func, '__module__', None), None)
+    station = getattr(module, 'station', None)
+    return getattr(station, 'pulsar', None)
+
+
+def canonical_hash(*objs):
+    """
+    Returns a hash of the content of (nested) dicts, lists, tuples, arrays,
+    numbers and strings that does not depend on the order of dict items.
+    Raises a TypeError for other objects.
+    """
+    h = hashlib.sha1()
+    for obj in objs:
+        _update_hash(h, obj)
+    return h.hexdigest()
+
+
+def _update_hash(h, obj):
+    if isinstance(obj, dict):
+        h.update(b'd%d' % len(obj))
+        for k in sorted(obj.keys(), key=repr):
+            _update_hash(h, k)
+            _update_hash(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'l%d' % len(obj))
+        for item in obj:
+            _update_hash(h, item)
+    elif isinstance(obj, np.ndarray) and obj.dtype != object:
+        h.update('a{}{}'.format(obj.dtype.str, obj.shape).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, np.ndarray):
+        _update_hash(h, obj.tolist())
+    elif obj is None or isinstance(obj, (bool, int, float, complex, str,
+                                         bytes, np.generic)):
+        h.update(('s' + type(obj).__name__ + repr(obj)).encode())
+    else:
+        # hashing by id() is not safe as ids are reused after garbage
+        # collection
+        raise TypeError('Cannot hash {} by content'.format(type(obj)))
+
+
+# Cache used by the AWG sweep functions
+sequence_cache = SequenceCache()
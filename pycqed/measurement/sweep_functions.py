@@ -14,7 +14,13 @@ class Sweep_function(object):
 
     '''
     sweep_functions class for MeasurementControl(Instrument)
+
+    A sweep function that sets pipeline_safe to True declares that setting
+    the next value does not change the data of earlier points that are
+    still being processed. MC can then set it while the data of the
+    previous row is being stored (see cfg_pipelined_2D_hard).
     '''
+    pipeline_safe = False
 
     def __init__(self, **kw):
         self.set_kw()
@@ -136,6 +142,7 @@ class Heterodyne_Frequency_Sweep_simple(Soft_Sweep):
 
 
 class None_Sweep(Soft_Sweep):
+    pipeline_safe = True
 
     def __init__(self, sweep_control='soft', sweep_points=None,
                  name: str='None_Sweep', parameter_name: str='pts',
@@ -221,6 +228,7 @@ class QX_RB_Sweep(Soft_Sweep):
 
 
 class Delayed_None_Sweep(Soft_Sweep):
+    pipeline_safe = True
 
     def __init__(self, sweep_control='soft', delay=0, **kw):
         super().__init__()
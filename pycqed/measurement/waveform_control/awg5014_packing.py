@@ -0,0 +1,114 @@
+"""
+Conversion of waveforms and markers to the 16-bit integer format of the
+Tektronix AWG5014.
+
+The waveform occupies the lower 14 bits and the two markers one bit each,
+see Table 2-25 in the Programmer's manual of the AWG5014. The functions in
+this module are used by both the Pulsar and the VirtualAWG5014.
+"""
+import numpy as np
+
+
+def validate_waveform(wf, m1, m2):
+    """
+    Checks that the waveform and markers can be packed.
+
+    Args:
+        wf (np.ndarray): waveform, values between -1 and 1 (inclusive)
+        m1 (np.ndarray): first marker, values 0 or 1
+        m2 (np.ndarray): second marker, values 0 or 1
+
+    Raises:
+        Exception: if the lengths of wf, m1 and m2 don't match
+        TypeError: if the waveform contains values outside [-1, 1]
+        TypeError: if the markers contain values that are not 0 or 1
+    """
+    if not (len(wf) == len(m1) == len(m2)):
+        raise Exception('error: sizes of the waveforms do not match')
+    if len(wf) == 0:
+        return
+    if wf.min() < -1 or wf.max() > 1:
+        raise TypeError('Waveform values out of bonds.' +
+                        ' Allowed values: -1 to 1 (inclusive)')
+    for i, m in ((1, m1), (2, m2)):
+        if np.count_nonzero((m == 0) | (m == 1)) != len(m):
+            raise TypeError('Marker {} contains invalid values.'.format(i) +
+                            ' Only 0 and 1 are allowed')
+
+
+def pack_waveform(wf, m1, m2, out=None):
+    """
+    Packs a waveform and two markers into the AWG5014 integer format.
+
+    Args:
+        wf (array): waveform, values between -1 and 1 (inclusive)
+        m1 (array): first marker, values 0 or 1
+        m2 (array): second marker, values 0 or 1
+        out (np.ndarray): optional preallocated uint16 array of the same
+            length as wf to write the packed waveform into.
+
+    Returns:
+        packed_wf (np.ndarray): array of unsigned 16 bit integers
+    """
+    wf = np.asarray(wf)
+    m1 = np.asarray(m1)
+    m2 = np.asarray(m2)
+    validate_waveform(wf, m1, m2)
+
+    if out is None:
+        out = np.empty(len(wf), dtype=np.uint16)
+    elif out.shape != (len(wf), ) or out.dtype != np.uint16:
+        raise ValueError('out should be a uint16 array of shape ({}, ), '
+                         'got {} array of shape {}'.format(
+                             len(wf), out.dtype, out.shape))
+
+    # All intermediate values are exactly representable integers in the
+    # float buffer, the final assignment casts to uint16.
+    buf = np.multiply(wf, 8191, dtype=np.float64)
+    np.rint(buf, out=buf)
+    buf += 8191
+    buf += 16384 * m1
+    buf += 32768 * m2
+    out[:] = buf
+    return out
+
+
+def pack_waveforms(wfs, m1s, m2s):
+    """
+    Packs a list of waveforms with their markers (e.g. all elements of a
+    channel group) in a single call.
+
+    Args:
+        wfs (list): waveforms, values between -1 and 1 (inclusive)
+        m1s (list): first markers, values 0 or 1
+        m2s (list): second markers, values 0 or 1
+
+    Returns:
+        packed_wfs (list): uint16 arrays, one per waveform. These are views
+            on a single contiguous buffer.
+    """
+    if not (len(wfs) == len(m1s) == len(m2s)):
+        raise Exception('error: number of waveforms and markers do not match')
+    if len(wfs) == 0:
+        return []
+    wfs = [np.asarray(wf) for wf in wfs]
+    m1s = [np.asarray(m1) for m1 in m1s]
+    m2s = [np.asarray(m2) for m2 in m2s]
+    for i, (wf, m1, m2) in enumerate(zip(wfs, m1s, m2s)):
+        if not (len(wf) == len(m1) == len(m2)):
+            raise Exception('error: sizes of the waveforms do not match '
+                            '(waveform {})'.format(i))
+
+    try:
+        packed = pack_waveform(np.concatenate(wfs), np.concatenate(m1s),
+                               np.concatenate(m2s))
+    except TypeError:
+        # Locate the offending waveform to give a useful error message
+        for i, (wf, m1, m2) in enumerate(zip(wfs, m1s, m2s)):
+            try:
+                validate_waveform(wf, m1, m2)
+            except TypeError as e:
+                raise TypeError('Waveform {}: {}'.format(i, e)) from None
+        raise
+    split_idx = np.cumsum([len(wf) for wf in wfs])[:-1]
+    return np.split(packed, split_idx)
@@ -319,6 +319,7 @@ class Pulsar(Instrument):
         # create a packed waveform for each element for each channel group
         # in the sequence
         packed_waveforms = {}
+        grp_wfs_to_pack = {grp: ([], [], [], []) for grp in grps}
         elements_with_non_zero_first_points = set()
         for (i, el), cid_wfs in sorted(el_wfs.items()):
             maxlen = 0
@@ -345,12 +346,20 @@ class Pulsar(Instrument):
                                           constant_values=cval)
                     if grp_wfs[cid][0] != 0.:
                         elements_with_non_zero_first_points.add(el)
-                wfname = el + '_' + grp
-
-                packed_waveforms[wfname] = obj.pack_waveform(
-                    grp_wfs[grp],
-                    grp_wfs[grp + '_marker1'],
-                    grp_wfs[grp + '_marker2'])
+                wfnames, wfs, m1s, m2s = grp_wfs_to_pack[grp]
+                wfnames.append(el + '_' + grp)
+                wfs.append(grp_wfs[grp])
+                m1s.append(grp_wfs[grp + '_marker1'])
+                m2s.append(grp_wfs[grp + '_marker2'])
+        # pack all elements of a channel group in one go if the driver
+        # supports it, else element by element
+        for wfnames, wfs, m1s, m2s in grp_wfs_to_pack.values():
+            if hasattr(obj, 'pack_waveforms'):
+                packed = obj.pack_waveforms(wfs, m1s, m2s)
+            else:
+                packed = [obj.pack_waveform(wf, m1, m2)
+                          for wf, m1, m2 in zip(wfs, m1s, m2s)]
+            packed_waveforms.update(zip(wfnames, packed))
 
         # sequence programming
         _t0 = time.time()
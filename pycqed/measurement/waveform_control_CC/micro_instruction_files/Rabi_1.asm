@@ -0,0 +1,6 @@
+mov r0, 20000   # r0 stores the cycle time , 100 us 
+mov r1, 0       # sets the inter pulse wait to 0
+mov r14, 0      # r14 stores number of repetitions
+# Experiment: repeat the rounds for infinite times
+wait 1 
+Exp_Start: 
@@ -23,6 +23,8 @@ import json
 import os
 import bisect
 import copy
+import hashlib
+from collections import OrderedDict
 from pycqed.utilities.general import int_to_bin
 from pycqed.measurement.waveform_control_CC.qasm_compiler_helpers import (
     is_number, is_int, is_positive_number, is_natural, is_integer_array,
@@ -32,6 +34,19 @@ from pycqed.measurement.waveform_control_CC.qasm_compiler_helpers import (
 
 MAX_TRIG_BITS = 7
 DEFAULT_MEASURE_TIME = 300  # ns
+MAX_CACHE_SIZE = 128  # number of entries kept in each compiler cache
+
+# Attributes set by load_config, memoized per config content hash
+_config_attrs = ('config', 'hardware_spec', 'luts', 'physical_qubits',
+                 'cycle_time', 'init_time', 'measureMENT_time', 'qubit_cfgs',
+                 'user_qasm_op_dict', 'qasm_op_dict')
+# Attributes set by compile, memoized per (program hash, config hash)
+_program_attrs = ('raw_lines', 'prog_lines', 'raw_event_list',
+                  'timing_event_list', 'declared_qubits', 'qubit_map',
+                  'timing_grid', 'hw_timing_grid', 'qumis_instructions')
+
+_config_cache = OrderedDict()
+_program_cache = OrderedDict()
 
 user_op_type = {
     "rf": EventType.RF,
@@ -61,6 +76,33 @@ default_op_dict = {
 }
 
 
+def clear_cache():
+    """
+    Empties the processed-config and compiled-program caches shared by all
+    QASM_QuMIS_Compiler instances.
+    """
+    _config_cache.clear()
+    _program_cache.clear()
+
+
+def cache_info()-> dict:
+    """
+    Returns the number of entries in the config and program caches.
+    """
+    return {'config': len(_config_cache), 'program': len(_program_cache)}
+
+
+def _add_to_cache(cache: OrderedDict, key, state: dict):
+    cache[key] = state
+    cache.move_to_end(key)
+    while len(cache) > MAX_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _hash_bytes(raw: bytes)-> str:
+    return hashlib.sha1(raw).hexdigest()
+
+
 class QASM_QuMIS_Compiler():
 
     def __repr__(self):
@@ -84,13 +126,18 @@ class QASM_QuMIS_Compiler():
                               *path_strings, self.compilation_completed)
         return rep
 
-    def __init__(self, config_filename: str='', verbosity_level: int=1):
+    def __init__(self, config_filename: str='', verbosity_level: int=1,
+                 use_cache: bool=True):
         '''
         @param: config_filename, file specifies the user-defined operation
         dictionary, hardware specification and the LUTs.
         @param: verbosity_level, message level to be printed. integer, range
         from 0 to 6. The larger verbosity_level is, the more information is
         printed. 0 prints nothing. 6 prints everything.
+        @param: use_cache, if True the processed config is memoized by its
+        content hash and compiled programs are memoized by the hash of the
+        QASM file and the config. Compiling an unchanged program with an
+        unchanged config then only rewrites the cached QuMIS to file.
 
         Usage:
         1. Instantiate the class, e.g., qqc, with a configuration file path.
@@ -112,6 +159,9 @@ class QASM_QuMIS_Compiler():
         self.qumis_fn = ''
         self.filename = ''
         self.config_filename = config_filename
+        self.config_hash = None
+        self.use_cache = use_cache
+        self.cache_hit = False
 
     def compile(self, filename: str, qumis_fn: str=None,
                 config_fn: str ='', config: dict=None)-> bool:
@@ -124,15 +174,25 @@ class QASM_QuMIS_Compiler():
         self.hw_timing_grid = []       # operations on hardware
         self.timing_grid = []          # quantum operations
         self.load_config(config_filename=config_fn, config=config)
-        self.read_file()               # fills up self.prog_lines
-        self.line_to_event()           # fills up self.raw_event_list
-        self.build_dependency_graph()  # empty function for now
-        self.resolve_qubit_name()      # extract map from qasm and map to cfg
-        self.assign_timing_to_events()
-        self.resolve_channel_latency()
-        self.convert_to_hw_trigger()
-        self.gen_full_time_grid()
-        self.convert_to_qumis()
+
+        program_key = (self.hash_file(), self.config_hash)
+        self.cache_hit = self.use_cache and program_key in _program_cache
+        if self.cache_hit:
+            self._restore_state(_program_cache[program_key])
+            self.write_qumis()
+        else:
+            self.read_file()               # fills up self.prog_lines
+            self.line_to_event()           # fills up self.raw_event_list
+            self.build_dependency_graph()  # empty function for now
+            self.resolve_qubit_name()  # extract map from qasm and map to cfg
+            self.assign_timing_to_events()
+            self.resolve_channel_latency()
+            self.convert_to_hw_trigger()
+            self.gen_full_time_grid()
+            self.convert_to_qumis()
+            if self.use_cache:
+                _add_to_cache(_program_cache, program_key,
+                              self._get_state(_program_attrs))
         if self.verbosity_level >= 1:
             print("QuMIS generated successfully and written into {}".format(
                 self.qumis_fn))
@@ -142,22 +202,65 @@ class QASM_QuMIS_Compiler():
     def build_dependency_graph(self):
         pass
 
+    def _get_state(self, attrs: tuple)-> dict:
+        """
+        Returns a deep copy of the attributes in attrs, used to fill the
+        compiler caches.
+        """
+        return copy.deepcopy({a: getattr(self, a) for a in attrs})
+
+    def _restore_state(self, state: dict):
+        """
+        Sets the attributes stored in a cache entry. A copy is made so that
+        later modifications (e.g., by dump_config) do not affect the cache.
+        """
+        for attr, val in copy.deepcopy(state).items():
+            setattr(self, attr, val)
+
+    def hash_file(self)-> str:
+        """
+        Returns the content hash of the QASM file self.filename.
+        """
+        try:
+            with open(self.filename, 'rb') as prog_file:
+                return _hash_bytes(prog_file.read())
+        except OSError:
+            raise OSError('\tError: Failed to open file ' +
+                          self.filename + ".")
+
     def load_config(self, config_filename: str='', config: dict =None):
         self.config = None
+        self.config_hash = None
 
         if config_filename is not '':
             self.config_filename = config_filename
 
         if self.config_filename != '':
-            with open(self.config_filename) as data_file:
-                self.config = json.load(data_file)
+            with open(self.config_filename, 'rb') as data_file:
+                raw_config = data_file.read()
+            self.config_hash = _hash_bytes(raw_config)
 
         if config is not None:
-            self.config = copy.deepcopy(config)
+            self.config_hash = _hash_bytes(json.dumps(
+                config, sort_keys=True, default=str).encode('utf-8'))
 
-        if self.config is None:
+        if self.config_hash is None:
             raise ValueError('No config specified')
 
+        if self.use_cache and self.config_hash in _config_cache:
+            self._restore_state(_config_cache[self.config_hash])
+            if "qubit_map" in self.config.keys():
+                self.qubit_map = self.config["qubit_map"]
+                self.qubit_map_from_config = True
+            if self.verbosity_level > 3:
+                self.print_op_dict()
+            return
+
+        if config is not None:
+            self.config = copy.deepcopy(config)
+        else:
+            self.config = json.loads(raw_config.decode('utf-8'))
+
         self.qasm_op_dict = None
         if not config_is_valid(self.config):
             # this error should be unreachable but is here for readability
@@ -220,6 +323,9 @@ class QASM_QuMIS_Compiler():
 
         self.qasm_op_dict = {**default_op_dict, **self.user_qasm_op_dict}
         self.qasm_op_dict = lower_dict_key(self.qasm_op_dict)
+        if self.use_cache:
+            _add_to_cache(_config_cache, self.config_hash,
+                          self._get_state(_config_attrs))
         if self.verbosity_level > 3:
             self.print_op_dict()
 
@@ -1241,6 +1347,12 @@ class QASM_QuMIS_Compiler():
                              "Exp_Start \t# Jump to start ad nauseam")
             self.qumis_instructions.append(jump_to_start)
 
+        self.write_qumis()
+
+    def write_qumis(self):
+        """
+        Writes self.qumis_instructions to the file self.qumis_fn.
+        """
         qumis_file = open(self.qumis_fn, "w")
         for qi in self.qumis_instructions:
             qumis_file.write("{}\n".format(qi))
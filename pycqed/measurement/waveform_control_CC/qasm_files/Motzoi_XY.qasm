@@ -0,0 +1,11 @@
+qubit q0 
+
+init_all
+Y90 q0 
+X180 q0 
+RO q0  
+
+init_all
+X90 q0 
+Y180 q0 
+RO q0  
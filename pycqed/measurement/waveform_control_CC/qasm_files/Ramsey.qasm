@@ -0,0 +1,367 @@
+qubit q0 
+
+init_all
+X90 q0     
+Idx 20 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 853 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 1686 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 2519 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 3352 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 4185 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 5018 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 5851 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 6684 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 7517 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 8350 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 9183 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 10016 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 10849 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 11682 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 12515 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 13348 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 14181 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 15014 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 15847 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 16680 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 17513 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 18346 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 19179 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 20012 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 20845 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 21678 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 22511 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 23344 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 24177 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 25010 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 25843 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 26676 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 27509 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 28342 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 29175 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 30008 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 30841 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 31674 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 32507 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 33340 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 34173 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 35006 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 35839 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 36672 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 37505 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 38338 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 39171 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 40004 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 40837 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 41670 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 42503 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 43336 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 44169 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 45002 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 45835 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 46668 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 47501 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 48334 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 49167 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 50000 
+X90 q0     
+RO q0  
@@ -0,0 +1,300 @@
+qubit q0 
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 20 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 853 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 1686 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 2519 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 3352 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 4185 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 5018 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 5851 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 6684 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 7517 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 8350 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 9183 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 10016 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 10849 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 11682 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 12515 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 13348 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 14181 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 15014 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 15847 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 16680 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 17513 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 18346 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 19179 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 20012 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 20845 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 21678 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 22511 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 23344 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 24177 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 25010 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 25843 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 26676 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 27509 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 28342 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 29175 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 30008 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 30841 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 31674 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 32507 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 33340 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 34173 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 35006 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 35839 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 36672 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 37505 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 38338 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 39171 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 40004 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 40837 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 41670 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 42503 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 43336 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 44169 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 45002 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 45835 
+RO q0  
+
+init_all
+X180 q0     # exciting pi pulse
+Idx 46668 
+RO q0  
+
+init_all
+RO q0  
+
+init_all
+RO q0  
+
+init_all
+X180 q0 
+RO q0  
+
+init_all
+X180 q0 
+RO q0  
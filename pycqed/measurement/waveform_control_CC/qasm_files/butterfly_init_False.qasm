@@ -0,0 +1,10 @@
+qubit q0 
+
+init_all
+RO q0  
+RO q0  
+
+init_all
+X180 q0  
+RO q0  
+RO q0  
@@ -0,0 +1,489 @@
+qubit q0 
+
+init_all
+X90 q0     
+Idx 10 
+X180 q0     
+Idx 10 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 426 
+X180 q0     
+Idx 426 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 843 
+X180 q0     
+Idx 843 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 1259 
+X180 q0     
+Idx 1259 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 1676 
+X180 q0     
+Idx 1676 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 2092 
+X180 q0     
+Idx 2092 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 2509 
+X180 q0     
+Idx 2509 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 2925 
+X180 q0     
+Idx 2925 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 3342 
+X180 q0     
+Idx 3342 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 3758 
+X180 q0     
+Idx 3758 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 4175 
+X180 q0     
+Idx 4175 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 4591 
+X180 q0     
+Idx 4591 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 5008 
+X180 q0     
+Idx 5008 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 5424 
+X180 q0     
+Idx 5424 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 5841 
+X180 q0     
+Idx 5841 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 6257 
+X180 q0     
+Idx 6257 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 6674 
+X180 q0     
+Idx 6674 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 7090 
+X180 q0     
+Idx 7090 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 7507 
+X180 q0     
+Idx 7507 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 7923 
+X180 q0     
+Idx 7923 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 8340 
+X180 q0     
+Idx 8340 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 8756 
+X180 q0     
+Idx 8756 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 9173 
+X180 q0     
+Idx 9173 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 9589 
+X180 q0     
+Idx 9589 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 10006 
+X180 q0     
+Idx 10006 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 10422 
+X180 q0     
+Idx 10422 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 10839 
+X180 q0     
+Idx 10839 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 11255 
+X180 q0     
+Idx 11255 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 11672 
+X180 q0     
+Idx 11672 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 12088 
+X180 q0     
+Idx 12088 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 12505 
+X180 q0     
+Idx 12505 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 12921 
+X180 q0     
+Idx 12921 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 13338 
+X180 q0     
+Idx 13338 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 13754 
+X180 q0     
+Idx 13754 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 14171 
+X180 q0     
+Idx 14171 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 14587 
+X180 q0     
+Idx 14587 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 15004 
+X180 q0     
+Idx 15004 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 15420 
+X180 q0     
+Idx 15420 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 15837 
+X180 q0     
+Idx 15837 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 16253 
+X180 q0     
+Idx 16253 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 16670 
+X180 q0     
+Idx 16670 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 17086 
+X180 q0     
+Idx 17086 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 17503 
+X180 q0     
+Idx 17503 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 17919 
+X180 q0     
+Idx 17919 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 18336 
+X180 q0     
+Idx 18336 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 18752 
+X180 q0     
+Idx 18752 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 19169 
+X180 q0     
+Idx 19169 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 19585 
+X180 q0     
+Idx 19585 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 20002 
+X180 q0     
+Idx 20002 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 20418 
+X180 q0     
+Idx 20418 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 20835 
+X180 q0     
+Idx 20835 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 21251 
+X180 q0     
+Idx 21251 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 21668 
+X180 q0     
+Idx 21668 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 22084 
+X180 q0     
+Idx 22084 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 22501 
+X180 q0     
+Idx 22501 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 22917 
+X180 q0     
+Idx 22917 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 23334 
+X180 q0     
+Idx 23334 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 23750 
+X180 q0     
+Idx 23750 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 24167 
+X180 q0     
+Idx 24167 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 24583 
+X180 q0     
+Idx 24583 
+X90 q0     
+RO q0  
+
+init_all
+X90 q0     
+Idx 25000 
+X180 q0     
+Idx 25000 
+X90 q0     
+RO q0  
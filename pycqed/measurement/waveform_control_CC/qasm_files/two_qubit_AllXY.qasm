@@ -0,0 +1,149 @@
+qubit q0 
+qubit q1 
+
+init_all
+I q0
+I q0
+I q1
+I q1
+RO all  
+
+init_all
+X180 q0
+X180 q0
+X180 q1
+X180 q1
+RO all  
+
+init_all
+Y180 q0
+Y180 q0
+Y180 q1
+Y180 q1
+RO all  
+
+init_all
+X180 q0
+Y180 q0
+X180 q1
+Y180 q1
+RO all  
+
+init_all
+Y180 q0
+X180 q0
+Y180 q1
+X180 q1
+RO all  
+
+init_all
+X90 q0
+I q0
+X90 q1
+I q1
+RO all  
+
+init_all
+Y90 q0
+I q0
+Y90 q1
+I q1
+RO all  
+
+init_all
+X90 q0
+Y90 q0
+X90 q1
+Y90 q1
+RO all  
+
+init_all
+Y90 q0
+X90 q0
+Y90 q1
+X90 q1
+RO all  
+
+init_all
+X90 q0
+Y180 q0
+X90 q1
+Y180 q1
+RO all  
+
+init_all
+Y90 q0
+X180 q0
+Y90 q1
+X180 q1
+RO all  
+
+init_all
+X180 q0
+Y90 q0
+X180 q1
+Y90 q1
+RO all  
+
+init_all
+Y180 q0
+X90 q0
+Y180 q1
+X90 q1
+RO all  
+
+init_all
+X90 q0
+X180 q0
+X90 q1
+X180 q1
+RO all  
+
+init_all
+X180 q0
+X90 q0
+X180 q1
+X90 q1
+RO all  
+
+init_all
+Y90 q0
+Y180 q0
+Y90 q1
+Y180 q1
+RO all  
+
+init_all
+Y180 q0
+Y90 q0
+Y180 q1
+Y90 q1
+RO all  
+
+init_all
+X180 q0
+I q0
+X180 q1
+I q1
+RO all  
+
+init_all
+Y180 q0
+I q0
+Y180 q1
+I q1
+RO all  
+
+init_all
+X90 q0
+X90 q0
+X90 q1
+X90 q1
+RO all  
+
+init_all
+Y90 q0
+Y90 q0
+Y90 q1
+Y90 q1
+RO all  
@@ -0,0 +1,18 @@
+qubit q0 
+qubit q1 
+
+init_all
+RO q0 | RO q1 
+
+init_all
+X180 q0
+RO q0 | RO q1 
+
+init_all
+X180 q1
+RO q0 | RO q1 
+
+init_all
+X180 q0
+X180 q1
+RO q0 | RO q1 
@@ -0,0 +1,270 @@
+qubit q0 
+qubit q1 
+
+init_all
+X180 q0
+I q1
+I q0
+I q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X180 q0
+I q1
+RO all  
+
+init_all
+X180 q0
+I q1
+Y90 q0
+I q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mY90 q0
+I q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X90 q0
+I q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mX90 q0
+I q1
+RO all  
+
+init_all
+X180 q0
+I q1
+I q0
+X180 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X180 q0
+X180 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+Y90 q0
+X180 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mY90 q0
+X180 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X90 q0
+X180 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mX90 q0
+X180 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+I q0
+Y90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X180 q0
+Y90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+Y90 q0
+Y90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mY90 q0
+Y90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X90 q0
+Y90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mX90 q0
+Y90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+I q0
+mY90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X180 q0
+mY90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+Y90 q0
+mY90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mY90 q0
+mY90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X90 q0
+mY90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mX90 q0
+mY90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+I q0
+X90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X180 q0
+X90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+Y90 q0
+X90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mY90 q0
+X90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X90 q0
+X90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mX90 q0
+X90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+I q0
+mX90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X180 q0
+mX90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+Y90 q0
+mX90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mY90 q0
+mX90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+X90 q0
+mX90 q1
+RO all  
+
+init_all
+X180 q0
+I q1
+mX90 q0
+mX90 q1
+RO all  
+
+init_all
+RO all 
+
+init_all
+X180 q0
+RO all 
+
+init_all
+X180 q1
+RO all 
+
+init_all
+X180 q0
+X180 q1
+RO all 
@@ -11,6 +11,7 @@
 import logging
 import numpy as np
 import scipy
+from functools import lru_cache
 from pycqed.analysis.fitting_models import Qubit_freq_to_dac
 
 
@@ -352,6 +353,77 @@ def martinis_flux_pulse(length: float, lambda_2: float, lambda_3: float,
                     pulse expressed in units of theta: the reference frame of
                     the interaction, units of epsilon: detuning to the bus
                     eps=f12-f_bus
+
+    See martinis_flux_pulse_batch to generate many pulses at once.
+    """
+    if f_interaction is None:
+        f_interaction = f_bus + E_c
+    theta_i = np.arctan(2*J2 / (f_01_max - f_interaction))
+    # The wave in theta only depends on the shape parameters and theta_i,
+    # it is cached as the same pulse is often regenerated.
+    interp_wave = np.array(_martinis_theta_wave_cached(
+        float(length), float(lambda_2), float(lambda_3), float(theta_f),
+        float(theta_i), float(sampling_rate)))
+    return _convert_theta_wave(
+        interp_wave, return_unit=return_unit, J2=J2,
+        f_interaction=f_interaction, f_01_max=f_01_max, E_c=E_c,
+        V_offset=V_offset, V_per_phi0=V_per_phi0, asymmetry=asymmetry)
+
+
+def martinis_flux_pulse_batch(length, lambda_2, lambda_3, theta_f,
+                              f_01_max: float, J2: float,
+                              V_offset: float=0, V_per_phi0: float=1,
+                              E_c: float=250e6, f_bus: float =None,
+                              f_interaction: float =None,
+                              asymmetry: float =0, sampling_rate: float =1e9,
+                              return_unit: str='V'):
+    """
+    Generates a batch of martinis_flux_pulse's at once.
+
+    length, lambda_2, lambda_3 and theta_f can be arrays, they are
+    broadcast against each other and every combination is a pulse. The
+    other arguments are the same as for martinis_flux_pulse.
+
+    Returns an array of shape (nr_pulses, nr_samples) with nr_samples the
+    number of samples of the longest pulse. Shorter pulses are padded at
+    the end with the value at theta_i (the start of the pulse).
+    """
+    length, lambda_2, lambda_3, theta_f = [
+        np.ravel(p) for p in np.broadcast_arrays(
+            length, lambda_2, lambda_3, theta_f)]
+    if f_interaction is None:
+        f_interaction = f_bus + E_c
+    theta_i = np.arctan(2*J2 / (f_01_max - f_interaction))
+
+    nr_samples = [len(np.arange(0, l, 1/sampling_rate)) for l in length]
+    theta_waves = np.full((len(length), max(nr_samples, default=0)),
+                          theta_i)
+    # pulses of the same length are generated together
+    for l in np.unique(length):
+        rows = np.flatnonzero(length == l)
+        waves = _martinis_theta_waves(l, lambda_2[rows], lambda_3[rows],
+                                      theta_f[rows], theta_i, sampling_rate)
+        theta_waves[rows, :waves.shape[1]] = waves
+    return _convert_theta_wave(
+        theta_waves, return_unit=return_unit, J2=J2,
+        f_interaction=f_interaction, f_01_max=f_01_max, E_c=E_c,
+        V_offset=V_offset, V_per_phi0=V_per_phi0, asymmetry=asymmetry)
+
+
+@lru_cache(maxsize=128)
+def _martinis_theta_wave_cached(length, lambda_2, lambda_3, theta_f,
+                                theta_i, sampling_rate):
+    wave = _martinis_theta_waves(length, [lambda_2], [lambda_3], [theta_f],
+                                 theta_i, sampling_rate)[0]
+    wave.flags.writeable = False
+    return wave
+
+
+def _martinis_theta_waves(length: float, lambda_2, lambda_3, theta_f,
+                          theta_i: float, sampling_rate: float):
+    """
+    Martinis pulses in theta (rad) at the sampling points, for arrays of
+    lambda_2, lambda_3 and theta_f (deg) and a single length.
     """
     # Define number of samples and time points
     # Pulse is generated at a denser grid to allow for good interpolation
@@ -362,23 +434,21 @@ def martinis_flux_pulse(length: float, lambda_2: float, lambda_3: float,
     taus = np.arange(0, rounded_length-tau_step/2, tau_step)
     # -tau_step/2 is to make sure final pt is excluded
 
-    # Derived parameters
-    if f_interaction is None:
-        f_interaction = f_bus + E_c
-    theta_i = np.arctan(2*J2 / (f_01_max - f_interaction))
+    lambda_2 = np.asarray(lambda_2, dtype=float)[:, None]
+    lambda_3 = np.asarray(lambda_3, dtype=float)[:, None]
     # Converting angle to radians as that is used under the hood
-    theta_f = 2*np.pi*theta_f/360
-    if theta_f < theta_i:
+    theta_f = 2*np.pi*np.asarray(theta_f, dtype=float)[:, None]/360
+    if np.any(theta_f < theta_i):
         raise ValueError(
-            'theta_f ({:2.f} deg) < theta_i ({:2.f} deg):'.format(
-                theta_f/(2*np.pi)*360, theta_i/(2*np.pi)*360)
+            'theta_f ({:.2f} deg) < theta_i ({:.2f} deg):'.format(
+                np.min(theta_f)/(2*np.pi)*360, theta_i/(2*np.pi)*360)
             + 'final coupling weaker than initial coupling')
 
     # lambda_1 is scaled such that the final ("center") angle is theta_f
     lambda_1 = (theta_f - theta_i) / (2 + 2 * lambda_3)
 
     # Calculate the wave
-    theta_wave = np.ones(nr_samples) * theta_i
+    theta_wave = np.ones((len(lambda_1), len(taus))) * theta_i
     theta_wave += lambda_1 * (1 - np.cos(2 * np.pi * taus / rounded_length))
     theta_wave += (lambda_1 * lambda_2 *
                    (1 - np.cos(4 * np.pi * taus / rounded_length)))
@@ -392,18 +462,47 @@ def martinis_flux_pulse(length: float, lambda_2: float, lambda_3: float,
             'Martinis flux wave form has been clipped to [{}, 180 deg]'
             .format(theta_i))
 
-    # Transform from proper time to real time
-    t = np.array([np.trapz(np.sin(theta_wave)[:i+1], dx=1/(10*sampling_rate))
-                  for i in range(len(theta_wave))])
+    # Transform from proper time to real time, the cumulative trapezoidal
+    # integral of sin(theta) over the proper time.
+    sin_wave = np.sin(theta_wave)
+    t = np.zeros(theta_wave.shape)
+    t[:, 1:] = np.cumsum((sin_wave[:, 1:] + sin_wave[:, :-1]) / 2,
+                         axis=1) / (10*sampling_rate)
 
     # Interpolate pulse at physical sampling distance
     t_samples = np.arange(0, length, 1/sampling_rate)
-    # Scaling factor for time-axis to get correct pulse length again
-    scale = t[-1]/t_samples[-1]
-    interp_wave = scipy.interpolate.interp1d(
-        t/scale, theta_wave_clipped, bounds_error=False,
-        fill_value='extrapolate')(t_samples)
+    interp_waves = np.zeros((len(theta_wave), len(t_samples)))
+    for i, (t_row, wave_row) in enumerate(zip(t, theta_wave_clipped)):
+        # Scaling factor for time-axis to get correct pulse length again
+        scale = t_row[-1]/t_samples[-1]
+        interp_waves[i] = _interp_extrapolate(t_samples, t_row/scale,
+                                              wave_row)
+    return interp_waves
 
+
+def _interp_extrapolate(x, xp, fp):
+    """
+    Linear interpolation that extrapolates outside of xp, equivalent to
+    interp1d(xp, fp, fill_value='extrapolate')(x).
+    """
+    if np.any(np.diff(xp) <= 0):
+        return scipy.interpolate.interp1d(
+            xp, fp, bounds_error=False, fill_value='extrapolate')(x)
+    y = np.interp(x, xp, fp)
+    below, above = x < xp[0], x > xp[-1]
+    y[below] = fp[0] + (x[below]-xp[0]) * (fp[1]-fp[0])/(xp[1]-xp[0])
+    y[above] = fp[-1] + (x[above]-xp[-1]) * (fp[-1]-fp[-2])/(xp[-1]-xp[-2])
+    return y
+
+
+def _convert_theta_wave(interp_wave, return_unit: str, J2: float,
+                        f_interaction: float, f_01_max: float, E_c: float,
+                        V_offset: float, V_per_phi0: float,
+                        asymmetry: float):
+    """
+    Converts a Martinis pulse from theta (rad) to the return_unit, see
+    martinis_flux_pulse.
+    """
     # Return in the specified units
     if return_unit == 'theta':
         # Theta is returned in radians here
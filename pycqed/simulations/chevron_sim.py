@@ -3,13 +3,66 @@ Based on Olli's mathematica notebook used to simulate chevrons
 """
 
 import numpy as np
-from scipy.linalg import expm
 
 
 def ham(e, g): return np.array([[0.5*e, g], [g, -0.5*e]])
 
 
-def evol(e, g, dt): return expm(dt*1j*ham(e, g))
+def evol(e, g, dt):
+    """
+    Propagator expm(dt*1j*ham(e, g)) in closed form. For an array of
+    energies e an array of shape e.shape + (2, 2) is returned.
+
+    With W = sqrt(e**2/4 + g**2):
+        expm(1j*dt*H) = cos(W*dt)*I + 1j*sin(W*dt)/W * H
+    """
+    e = np.asarray(e, dtype=float)
+    omega = np.sqrt(0.25*e**2 + g**2)
+    cos = np.cos(omega*dt)
+    # sin(W*dt)/W, also valid for W = 0
+    sinc = dt*np.sinc(omega*dt/np.pi)
+    U = np.empty(e.shape + (2, 2), dtype=np.complex128)
+    U[..., 0, 0] = cos + 0.5j*sinc*e
+    U[..., 0, 1] = 1j*sinc*g
+    U[..., 1, 0] = 1j*sinc*g
+    U[..., 1, 1] = cos - 0.5j*sinc*e
+    return U
+
+
+def _eval_vs_time(func, ts):
+    """
+    Evaluates a function of time for an array of times. Functions that do
+    not support arrays are evaluated for every time.
+    """
+    try:
+        values = np.asarray(func(ts), dtype=float)
+        if values.shape == ts.shape:
+            return values
+    except Exception:
+        pass
+    return np.array([func(ti) for ti in ts], dtype=float)
+
+
+def evolve(energies, g, dt):
+    """
+    Evolution of the state [1, 0] for energies that change every time step.
+    Inputs:
+            energies,   array (..., nr_steps) energy parameter at every time
+                        step, leading dimensions are simulated in parallel.
+            g,          Coupling parameter
+            dt,         Stepsize of the time evolution
+    Outputs:
+            f_vec,  array (..., nr_steps, 2), the state at the start of every
+                    time step
+    """
+    energies = np.asarray(energies, dtype=float)
+    U = evol(energies, g, dt)
+    f_vec = np.zeros(energies.shape + (2, ), dtype=np.complex128)
+    f_vec[..., 0, 0] = 1
+    for i in range(energies.shape[-1]-1):
+        f_vec[..., i+1, :] = np.matmul(U[..., i, :, :],
+                                       f_vec[..., i, :, None])[..., 0]
+    return f_vec
 
 
 def rabisim(efun, g, t, dt):
@@ -24,18 +77,11 @@ def rabisim(efun, g, t, dt):
     Outputs:
             f_vec,  Evolution for times (1, 1+dt, ..., t)
     """
-    s0 = np.array([1, 0])
     ts = np.arange(1., t+0.5*dt, dt)
-
-    def f(st, ti): return np.dot(evol(efun(ti), g, dt), st)
-    f_vec = np.zeros((len(ts), 2), dtype=np.complex128)
-    f_vec[0, :] = s0
-    for i, t in enumerate(ts[:-1]):
-        f_vec[i+1, :] = f(f_vec[i], t)
-    return f_vec
+    return evolve(_eval_vs_time(efun, ts), g, dt)
 
 
-def qamp(vec): return np.abs(vec[:, 1])**2
+def qamp(vec): return np.abs(vec[..., 1])**2
 
 
 def chevron(e0, emin, emax, n, g, t, dt, sf):
@@ -50,13 +96,12 @@ def chevron(e0, emin, emax, n, g, t, dt, sf):
             dt,     Stepsize of the time evolution.
             sf,     Step function of the distortion kernel.
     """
-    def energy_func(energy, t): return e0*(1.-(energy*sf(t))**2)
     energy_vec = np.arange(1+emin, 1+emax, (emax-emin)/(n-1))
-    chevron_vec = []
-    for ee in energy_vec:
-        chevron_vec.append(
-            qamp(rabisim(lambda t: energy_func(ee, t), g, t, dt)))
-    return np.array(chevron_vec)
+    ts = np.arange(1., t+0.5*dt, dt)
+    sf_vec = _eval_vs_time(sf, ts)
+    # all energies are simulated at once
+    energies = e0*(1.-(energy_vec[:, None]*sf_vec[None, :])**2)
+    return qamp(evolve(energies, g, dt))
 
 
 def chevron_slice(e0, energy, g, t, dt, sf):
@@ -69,5 +114,5 @@ def chevron_slice(e0, energy, g, t, dt, sf):
             dt,     Stepsize of the time evolution.
             sf,     Step function of the distortion kernel.
     """
-    def energy_func(energy, t): return e0*(1.-(energy*sf(t))**2)
-    return qamp(rabisim(lambda t: energy_func(energy, t), g, t, dt))
+    ts = np.arange(1., t+0.5*dt, dt)
+    return qamp(evolve(e0*(1.-(energy*_eval_vs_time(sf, ts))**2), g, dt))
@@ -8,6 +8,8 @@ import qutip as qtp
 from pycqed.measurement import detector_functions as det
 from scipy.interpolate import interp1d
 from pycqed.measurement.waveform_control_CC import waveform as wf
+from pycqed.simulations.piecewise_propagator import \
+    PiecewiseConstantPropagator
 
 alpha_q0 = 250e6 * 2*np.pi
 w_q0 = 6e9 * 2 * np.pi  # Lower frequency qubit
@@ -174,9 +176,30 @@ def pro_fid_from_unitary(U, U_target):
     # return F
 
 
+def quantities_of_interest_from_unitaries(U):
+    """
+    Vectorized version of phases_from_unitary (phi_cond),
+    leakage_from_unitary and seepage_from_unitary for an array of unitaries
+    of shape (..., 6, 6) in the basis of H_0.
+    """
+    U = np.asarray(U)
+    phi = np.rad2deg(np.angle(U[..., [0, 1, 3, 4], [0, 1, 3, 4]]))
+    phi_cond = (phi[..., 3] - phi[..., 1] - phi[..., 2] - phi[..., 0]) % 360
+
+    comp_idx = [0, 1, 3, 4]  # computational subspace
+    leak_idx = [2, 5]  # static qubit in the 2-state
+    L1 = 1 - np.sum(np.abs(U[..., comp_idx, :][..., comp_idx])**2,
+                    axis=(-1, -2))/4
+    L2 = 1 - np.sum(np.abs(U[..., leak_idx, :][..., leak_idx])**2,
+                    axis=(-1, -2))/2
+    return {'phi_cond': phi_cond, 'L1': L1, 'L2': L2}
+
+
 def simulate_quantities_of_interest(H_0, tlist, eps_vec,
                                     sim_step: float=0.1e-9,
-                                    verbose: bool=True):
+                                    verbose: bool=True,
+                                    max_step: float=0.05e-9,
+                                    propagator=None):
     """
     Calculates the quantities of interest from the propagator U
 
@@ -186,40 +209,44 @@ def simulate_quantities_of_interest(H_0, tlist, eps_vec,
         tlist (array): times in s, describes the x component of the
             trajectory to simulate
         eps_vec(array): detuning describes the y-component of the trajectory
-            to simulate.
+            to simulate. A 2D array (one trajectory per row) simulates all
+            trajectories in one call.
+        sim_step (float): the trajectory is simulated up to the last
+            multiple of sim_step before the end of tlist.
+        max_step (float): maximum duration of the piecewise-constant steps
+            of the propagator.
+        propagator (PiecewiseConstantPropagator): optional, reusing it
+            between calls reuses its cached eigendecompositions. By
+            default eps is quantized to 2pi*1kHz (for H_0 in rad/s), this
+            changes phi_cond by less than 1e-3 deg.
 
     Returns
         phi_cond (float):   conditional phase (deg)
         L1      (float):    leakage
         L2      (float):    seepage
+        (arrays with a value per trajectory for a 2D eps_vec)
 
     # TODO:
         return the Fidelity in the comp subspace with and without correcting
         for phase errors.
     """
-
     eps_interp = interp1d(tlist, eps_vec, fill_value='extrapolate')
+    if propagator is None:
+        propagator = PiecewiseConstantPropagator(
+            H_0, n_q1, eps_resolution=2*np.pi*1e3)
 
-    # function only exists to wrap
-    def eps_t(t, args=None):
-        return eps_interp(t)
-
-    H_c = n_q1
-    H_t = [H_0, [H_c, eps_t]]
+    # eps is taken constant during a step at its value halfway the step
+    t_final = np.arange(0, np.max(tlist), sim_step)[-1]
+    nr_steps = int(np.ceil(t_final/max_step))
+    dt = t_final/nr_steps
+    eps_steps = eps_interp((np.arange(nr_steps)+0.5)*dt)
 
-    tlist_sim = (np.arange(0, np.max(tlist), sim_step))
     t0 = time.time()
-    U_t = qtp.propagator(H_t, tlist_sim)
+    U_final = propagator.propagate(eps_steps, dt)
     t1 = time.time()
     if verbose:
         print('simulation took {:.2f}s'.format(t1-t0))
-
-    U_final = U_t[-1]
-    phases = phases_from_unitary(U_final)
-    phi_cond = phases[-1]
-    L1 = leakage_from_unitary(U_final)
-    L2 = seepage_from_unitary(U_final)
-    return {'phi_cond': phi_cond, 'L1': L1, 'L2': L2}
+    return quantities_of_interest_from_unitaries(U_final)
 
 
 class CZ_trajectory(det.Soft_Detector):
@@ -235,6 +262,9 @@ class CZ_trajectory(det.Soft_Detector):
         self.value_units = ['a.u.', 'deg', '%', '%']
         self.fluxlutman = fluxlutman
         self.H_0 = H_0
+        # kept to reuse the cached eigendecompositions between data points
+        self.propagator = PiecewiseConstantPropagator(
+            H_0, n_q1, eps_resolution=2*np.pi*1e3)
 
     def acquire_data_point(self, **kw):
         tlist = (np.arange(0, self.fluxlutman.cz_length(),
@@ -260,7 +290,7 @@ class CZ_trajectory(det.Soft_Detector):
         qoi = simulate_quantities_of_interest(
             H_0=self.H_0,
             tlist=tlist, eps_vec=eps_vec,
-            sim_step=1e-9, verbose=False)
+            sim_step=1e-9, verbose=False, propagator=self.propagator)
 
         cost_func_val = abs(qoi['phi_cond']-180) + qoi['L1']*100 * 5
         return cost_func_val, qoi['phi_cond'], qoi['L1']*100, qoi['L2']*100
@@ -59,44 +59,111 @@ CZ = np.array([
 def X_theta(theta:float, unit='deg'):
     """
     PTM of rotation of theta degrees along the X axis
-    """
-    if unit=='deg':
-        theta = np.deg2rad(theta)
 
-    X = np.array([[1, 0, 0, 0],
-                  [0, 1, 0, 0],
-                  [0, 0, np.cos(theta), -np.sin(theta)],
-                  [0, 0, np.sin(theta), np.cos(theta)]], dtype=float)
-    return X
+    theta can also be an array of angles, in which case a stack of PTMs
+    with shape theta.shape + (4, 4) is returned.
+    """
+    return _rotation_ptm(theta, unit, 2, 3)
 
 
 def Y_theta(theta:float, unit='deg'):
     """
-    PTM of rotation of theta degrees along the X axis
-    """
-    if unit=='deg':
-        theta = np.deg2rad(theta)
+    PTM of rotation of theta degrees along the Y axis
 
-    Y = np.array([[1, 0, 0, 0],
-                  [0, np.cos(theta), 0, np.sin(theta)],
-                  [0, 0, 1, 0],
-                  [0, -np.sin(theta), 0, np.cos(theta)]], dtype=float)
-    return Y
+    theta can also be an array of angles, in which case a stack of PTMs
+    with shape theta.shape + (4, 4) is returned.
+    """
+    return _rotation_ptm(theta, unit, 3, 1)
 
 
 def Z_theta(theta:float, unit='deg'):
     """
-    PTM of rotation of theta degrees along the X axis
+    PTM of rotation of theta degrees along the Z axis
+
+    theta can also be an array of angles, in which case a stack of PTMs
+    with shape theta.shape + (4, 4) is returned.
     """
+    return _rotation_ptm(theta, unit, 1, 2)
+
+
+def _rotation_ptm(theta, unit, i, j):
+    # rotates the (i, j) plane of the Bloch sphere, the Pauli basis is
+    # ordered I, X, Y, Z so the rotation axis is the remaining index
+    theta = np.asarray(theta, dtype=float)
     if unit=='deg':
         theta = np.deg2rad(theta)
+    cos, sin = np.cos(theta), np.sin(theta)
+
+    R = np.zeros(np.shape(theta) + (4, 4), dtype=float)
+    R[..., 0, 0] = 1
+    R[..., 6-i-j, 6-i-j] = 1
+    R[..., i, i] = cos
+    R[..., i, j] = -sin
+    R[..., j, i] = sin
+    R[..., j, j] = cos
+    return R
+
+
+##############################################################################
+# Operations on stacks of PTMs
+##############################################################################
+
+def compose_sequence(ptms):
+    """
+    Returns the PTM of a sequence of operations.
+    Args:
+        ptms (array) : (..., N, n, n) array of the PTMs of N operations in
+            the order in which they are applied. Leading axes are
+            treated as a batch, e.g. different seeds.
+    returns:
+        ptm (array)  : (..., n, n) array, ptms[N-1] ... ptms[1] ptms[0]
+
+    The product is evaluated as a pairwise tree of batched matrix products,
+    which takes log2(N) calls to np.matmul.
+    """
+    ptms = np.asarray(ptms)
+    while ptms.shape[-3] > 1:
+        last = None
+        if ptms.shape[-3] % 2 == 1:
+            # the unpaired last operation is applied after all pairs
+            last = ptms[..., -1:, :, :]
+            ptms = ptms[..., :-1, :, :]
+        ptms = np.matmul(ptms[..., 1::2, :, :], ptms[..., 0::2, :, :])
+        if last is not None:
+            ptms = np.concatenate([ptms, last], axis=-3)
+    return ptms[..., 0, :, :]
+
+
+def cumulative_compose(ptms):
+    """
+    Returns the PTMs of all initial segments of a sequence of operations,
+    e.g. to simulate the decay curve of a flipping or RB sequence.
+    Args:
+        ptms (array) : (..., N, n, n) array of the PTMs of N operations in
+            the order in which they are applied.
+    returns:
+        cum_ptms (array) : (..., N, n, n) array, cum_ptms[k] is the PTM of
+            the first k+1 operations.
+    """
+    ptms = np.asarray(ptms)
+    cum_ptms = np.empty(ptms.shape, dtype=np.result_type(ptms, float))
+    cum_ptms[..., 0, :, :] = ptms[..., 0, :, :]
+    for k in range(1, ptms.shape[-3]):
+        np.matmul(ptms[..., k, :, :], cum_ptms[..., k-1, :, :],
+                  out=cum_ptms[..., k, :, :])
+    return cum_ptms
 
-    Z = np.array([[1, 0, 0, 0],
-                  [0, np.cos(theta), -np.sin(theta), 0],
-                  [0, np.sin(theta), np.cos(theta), 0],
-                  [0, 0, 0, 1]], dtype=float)
-    return Z
 
+def tensor_product(ptm_0, ptm_1):
+    """
+    Returns the PTM of two operations acting on separate (sets of) qubits,
+    equivalent to np.kron(ptm_0, ptm_1) for every pair in two broadcastable
+    stacks of PTMs.
+    """
+    ptm_0, ptm_1 = np.asarray(ptm_0), np.asarray(ptm_1)
+    prod = np.einsum('...ij,...kl->...ikjl', ptm_0, ptm_1)
+    n = ptm_0.shape[-1]*ptm_1.shape[-1]
+    return prod.reshape(prod.shape[:-4] + (n, n))
 
 
 ##############################################################################
@@ -112,11 +179,15 @@ def process_fidelity(ptm_0, ptm_1, d: int=None):
         d    (int)    : dimension of the Hilbert space
     returns:
         F (float)     : Process fidelity
+
+    ptm_0 and ptm_1 can also be (broadcastable) stacks of PTMs with shape
+    (..., n, n), F is then an array with the fidelity of every pair.
     """
     if d == None:
-        d = np.shape(ptm_0)[0]**0.5
+        d = np.shape(ptm_0)[-1]**0.5
 
-    return np.dot(ptm_0.T, ptm_1).trace()/(d**2)
+    # trace(ptm_0.T ptm_1) for every pair in the stacks
+    return np.einsum('...ij,...ij->...', ptm_0, ptm_1)/(d**2)
 
 
 def average_gate_fidelity(ptm_0, ptm_1, d: int=None):
@@ -130,10 +201,12 @@ def average_gate_fidelity(ptm_0, ptm_1, d: int=None):
         d    (int)    : dimension of the Hilbert space
     returns:
         F_gate (float): Average gate fidelity
+
+    Accepts stacks of PTMs in the same way as process_fidelity.
     """
 
     if d == None:
-        d = np.shape(ptm_0)[0]**0.5
+        d = np.shape(ptm_0)[-1]**0.5
     F_pro = process_fidelity(ptm_0, ptm_1, d)
     F_avg_gate = process_fid_to_avg_gate_fid(F_pro, d)
     return F_avg_gate
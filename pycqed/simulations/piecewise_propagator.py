@@ -0,0 +1,113 @@
+"""
+Propagators of Hamiltonians of the form
+    H(t) = H_0 + eps(t) * H_c
+for a piecewise-constant eps(t).
+
+Every time step the propagator is exp(-1j*H(eps)*dt), calculated exactly
+from the eigendecomposition of H(eps). The eigendecompositions are cached
+per value of eps, optionally quantized to a grid such that the pulses of
+an optimization share most of their decompositions. The propagator of a
+trajectory is the product of the step propagators, reduced pairwise as a
+tree (log2(nr_steps) batched matrix products).
+
+Many trajectories (e.g. a batch of pulse parameters) of the same number of
+steps are propagated in a single call.
+"""
+import numpy as np
+
+
+class PiecewiseConstantPropagator:
+    """
+    Args:
+        H_0 (Qobj or array): static Hamiltonian (angular frequency units)
+        H_c (Qobj or array): control Hamiltonian
+        eps_resolution (float): if given, eps is rounded to a multiple of
+            eps_resolution before the Hamiltonian is diagonalized.
+        max_cache_size (int): the cache of eigendecompositions is cleared
+            when it grows larger than this.
+    """
+
+    def __init__(self, H_0, H_c, eps_resolution: float=None,
+                 max_cache_size: int=2**16):
+        self.H_0 = _to_array(H_0)
+        self.H_c = _to_array(H_c)
+        self.dims = getattr(H_0, 'dims', None)
+        self.eps_resolution = eps_resolution
+        self.max_cache_size = max_cache_size
+        self._eig_cache = {}
+
+    def _eps_keys(self, eps):
+        if self.eps_resolution is None:
+            return eps
+        return np.round(eps / self.eps_resolution)
+
+    def eigendecompositions(self, eps):
+        """
+        Returns the eigenvalues (..., d) and eigenvectors (..., d, d) of
+        H_0 + eps*H_c for an array of eps.
+        """
+        eps = np.asarray(eps, dtype=float)
+        keys, inverse = np.unique(self._eps_keys(eps), return_inverse=True)
+        new_keys = [k for k in keys if k not in self._eig_cache]
+        if len(new_keys):
+            if len(self._eig_cache) + len(new_keys) > self.max_cache_size:
+                self._eig_cache = {}
+                new_keys = keys
+            new_eps = np.asarray(new_keys, dtype=float)
+            if self.eps_resolution is not None:
+                new_eps = new_eps * self.eps_resolution
+            w, v = np.linalg.eigh(self.H_0 + new_eps[:, None, None]*self.H_c)
+            self._eig_cache.update(zip(new_keys, zip(w, v)))
+        w = np.array([self._eig_cache[k][0] for k in keys])
+        v = np.array([self._eig_cache[k][1] for k in keys])
+        inverse = inverse.reshape(eps.shape)
+        return w[inverse], v[inverse]
+
+    def step_propagators(self, eps, dt: float):
+        """
+        Returns exp(-1j*(H_0 + eps*H_c)*dt) for an array of eps, the shape
+        of the result is eps.shape + (d, d).
+        """
+        w, v = self.eigendecompositions(eps)
+        return np.matmul(v * np.exp(-1j*w*dt)[..., None, :],
+                         np.conj(np.swapaxes(v, -1, -2)))
+
+    def propagate(self, eps, dt: float):
+        """
+        Returns the propagator of the full trajectory.
+
+        Args:
+            eps (array): value of eps during every time step, shape
+                (nr_steps, ) for a single or (nr_trajectories, nr_steps)
+                for a batch of trajectories.
+            dt (float): duration of a time step
+        Returns:
+            U (array): shape (d, d) or (nr_trajectories, d, d)
+        """
+        return tree_product(self.step_propagators(eps, dt))
+
+
+def tree_product(U):
+    """
+    Time-ordered product U[..., n-1, :, :] @ ... @ U[..., 0, :, :] of the
+    matrices along axis -3, reduced pairwise.
+    """
+    U = np.asarray(U)
+    if U.shape[-3] == 0:
+        return np.broadcast_to(np.eye(U.shape[-1]),
+                               U.shape[:-3] + U.shape[-2:]).copy()
+    while U.shape[-3] > 1:
+        if U.shape[-3] % 2:
+            # the last step is carried to the next level of the tree
+            U, last = U[..., :-1, :, :], U[..., -1:, :, :]
+            U = np.concatenate([U[..., 1::2, :, :] @ U[..., 0::2, :, :],
+                                last], axis=-3)
+        else:
+            U = U[..., 1::2, :, :] @ U[..., 0::2, :, :]
+    return U[..., 0, :, :]
+
+
+def _to_array(H):
+    if hasattr(H, 'full'):
+        H = H.full()
+    return np.asarray(H, dtype=np.complex128)
@@ -0,0 +1,71 @@
+import itertools
+import unittest
+from functools import reduce
+import numpy as np
+from pycqed.analysis_v2 import pytomo
+
+
+def cardinal_states(n_qubits):
+    kets = [np.array([1, 0]), np.array([0, 1]),
+            np.array([1, 1])/np.sqrt(2), np.array([1, 1j])/np.sqrt(2),
+            np.array([1, -1])/np.sqrt(2), np.array([1, -1j])/np.sqrt(2)]
+    dms = [np.outer(k, k.conj()) for k in kets]
+    return [reduce(np.kron, s) for s in itertools.product(dms, repeat=n_qubits)]
+
+
+class Test_pytomo_native(unittest.TestCase):
+
+    def test_state_noiseless(self):
+        observables = cardinal_states(2)
+        psi = np.array([1, 0, 0, 1j])/np.sqrt(2)
+        rho = 1000*(0.9*np.outer(psi, psi.conj()) + 0.1*np.eye(4)/4)
+        data = np.array([np.trace(E.dot(rho)).real for E in observables])
+        weights = np.ones(len(data))
+        for fixedweight in [True, False]:
+            rho_est = pytomo.tomo_state(data, observables, weights,
+                                        fixedweight=fixedweight)
+            np.testing.assert_allclose(rho_est, rho, atol=1e-3)
+
+    def test_state_optimality(self):
+        # For unphysical data the solution lies on the boundary of the PSD
+        # cone, check the optimality conditions of the SDP instead.
+        rng = np.random.RandomState(0)
+        observables = np.array(cardinal_states(2))
+        psi = np.array([1, 0, 0, 1])/np.sqrt(2)
+        rho = 500*np.outer(psi, psi)
+        data = rng.poisson([np.trace(E.dot(rho)).real + 1
+                            for E in observables]).astype(float)
+        data[data == 0] = 1
+        weights = np.ones(len(data))
+        for fixedweight in [True, False]:
+            rho_est = pytomo.tomo_state(data, observables, weights,
+                                        fixedweight=fixedweight)
+            self.assertGreater(np.linalg.eigvalsh(rho_est).min(), -1e-8)
+            p = np.einsum('kij,ji->k', observables, rho_est).real
+            g = 2*(p-data)/data if fixedweight else 1-(data/p)**2
+            G = np.einsum('k,kij->ij', g, observables)
+            self.assertGreater(np.linalg.eigvalsh(G).min(), -1e-5)
+            self.assertAlmostEqual(np.trace(G.dot(rho_est)).real, 0,
+                                   places=2)
+
+    def test_process_noiseless(self):
+        d = 2
+        U = np.array([[1, -1j], [-1j, 1]])/np.sqrt(2)  # x90
+        inputs = []
+        observables = []
+        data = []
+        for R in cardinal_states(1):
+            for E in cardinal_states(1):
+                inputs.append(R)
+                observables.append(E)
+                data.append(100*np.trace(E.dot(U).dot(R).dot(U.conj().T)).real)
+        data = np.array(data)
+        chi = pytomo.tomo_process(data, inputs, observables,
+                                  np.ones(len(data)),
+                                  tomo_options={'normalised': True})
+        # normalised Choi matrix of the unitary
+        choi = sum(np.kron(np.outer(a, b), U.dot(np.outer(a, b)).dot(U.conj().T))
+                   for a in np.eye(d) for b in np.eye(d))/d
+        np.testing.assert_allclose(chi, choi, atol=1e-4)
+        out_trace = np.trace(chi.reshape(d, d, d, d), axis1=1, axis2=3)
+        np.testing.assert_allclose(out_trace, np.eye(d)/d, atol=1e-6)
@@ -176,6 +176,66 @@ class Test_readout_analysis_functions(unittest.TestCase):
         np.testing.assert_almost_equal(fid, 0.705)
         np.testing.assert_almost_equal(threshold, 0.75)
 
+    def test_get_cumulative_counts(self):
+        shots = np.sort([3., 1., 2., 2., 5., 1., 2.])
+        x, cumsum = ra.get_cumulative_counts(shots)
+        x_ref, counts_ref = np.unique(shots, return_counts=True)
+        np.testing.assert_array_equal(x, x_ref)
+        np.testing.assert_array_equal(cumsum, np.cumsum(counts_ref))
+
+    def test_histogram_shots_per_state(self):
+        nr_states = 4
+        rng = np.random.RandomState(0)
+        shots = rng.normal(size=(2, nr_states*250+3))
+        shots[0, :10] = np.round(shots[0, :10], 1)
+        counts, bin_edges = ra.histogram_shots_per_state(
+            shots, nr_of_states=nr_states, nr_bins=37, chunk_size=100)
+        self.assertEqual(counts.shape, (2, nr_states, 37))
+        for ch in range(2):
+            for i in range(nr_states):
+                h, edges = np.histogram(
+                    shots[ch, i::nr_states], bins=37,
+                    range=(np.min(shots[ch]), np.max(shots[ch])))
+                np.testing.assert_array_equal(counts[ch, i], h)
+                np.testing.assert_array_equal(bin_edges[ch], edges)
+
+    def test_get_assignment_fid_from_shots(self):
+        shots = np.array([[0., 1., 2., 3., 4., 5.],
+                          [0., 1., 1., 1., 4., 5.]])
+        labels = np.array([[0, 0, 1, 0, 1, 1],
+                           [0, 0, 1, 0, 1, 1]], dtype=bool)
+        fid, threshold = ra.get_assignment_fid_from_shots(shots, labels)
+        # Thresholds at 1 and 3 both misassign one of six shots, the
+        # first one is selected.
+        np.testing.assert_array_almost_equal(fid, [5/6, 5/6])
+        np.testing.assert_array_almost_equal(threshold, [1, 1])
+
+        # A threshold inside a set of identical values is not allowed
+        shots = np.array([0., 1., 1., 2.])
+        labels = np.array([0, 0, 1, 1], dtype=bool)
+        fid, threshold = ra.get_assignment_fid_from_shots(shots, labels)
+        np.testing.assert_almost_equal(fid, .75)
+        np.testing.assert_almost_equal(threshold, 0)
+
+    def test_get_assignment_matrix(self):
+        # Two qubits, shot j is prepared in state j % 4
+        shots = np.array([[-1, 1, -1, 1, -1, -1, -1, 1],
+                          [-1, -1, 1, 1, -1, -1, 1, -1]])
+        M = ra.get_assignment_matrix(shots, thresholds=[0, 0])
+        np.testing.assert_array_almost_equal(
+            M, [[1, 0, 0, 0],
+                [.5, .5, 0, 0],
+                [0, 0, 1, 0],
+                [0, .5, 0, .5]])
+        # Inverted assignment of the first channel
+        M = ra.get_assignment_matrix(shots, thresholds=[0, 0],
+                                     one_above=[False, True])
+        np.testing.assert_array_almost_equal(
+            M, [[0, 1, 0, 0],
+                [.5, .5, 0, 0],
+                [0, 0, 0, 1],
+                [.5, 0, .5, 0]])
+
 
 class Test_multiplexed_readout_analysis(unittest.TestCase):
 
@@ -3,6 +3,7 @@ import unittest
 import pycqed as pq
 import os
 from pycqed.analysis_v2 import measurement_analysis as ma
+from pycqed.analysis_v2 import syndrome_analysis as sa
 
 
 class Test_RTE_Analysis(unittest.TestCase):
@@ -115,3 +116,45 @@ class Test_RTE_Analysis(unittest.TestCase):
                                   0.73302394])
         np.testing.assert_array_almost_equal(
             zero_err_frac, a.proc_data_dict['frac_zero'])
+
+
+class Test_syndrome_analysis_functions(unittest.TestCase):
+
+    def test_repeated_parity_data_binning(self):
+        nr_of_meas = 4
+        shots = np.arange(3*2*nr_of_meas)
+        (prep_0, meas_0, trace_0, prep_1, meas_1, trace_1) = \
+            sa.repeated_parity_data_binning(shots, nr_of_meas)
+        np.testing.assert_array_equal(prep_0, [0, 8, 16])
+        np.testing.assert_array_equal(meas_0, [1, 9, 17])
+        np.testing.assert_array_equal(prep_1, [4, 12, 20])
+        np.testing.assert_array_equal(meas_1, [5, 13, 21])
+        np.testing.assert_array_equal(trace_0[1], [9, 10, 11])
+        np.testing.assert_array_equal(trace_1[2], [21, 22, 23])
+
+        # The binned arrays are independent copies of the shots
+        trace_0[0] = np.nan
+        meas_0[0] = -1
+        self.assertEqual(shots[1], 1)
+
+        with self.assertRaises(ValueError):
+            sa.repeated_parity_data_binning(shots[:-1], nr_of_meas)
+
+    def test_count_RTE(self):
+        traces = np.array([[0, 0, 1, 0],
+                           [0, 0, 0, 0],
+                           [1, 1, 1, 1]])
+        np.testing.assert_array_equal(
+            sa.count_RTE(traces, 'constant', init_state=0), [3, 5, 1])
+        np.testing.assert_array_equal(
+            sa.count_RTE(traces, 'constant', init_state=1), [1, 1, 5])
+
+        traces = np.array([[1, 0, 0, 1],
+                           [1, 0, 1, 0],
+                           [0, 1, 0, 1]])
+        # first round without a flip with respect to the previous round
+        np.testing.assert_array_equal(
+            sa.count_RTE(traces, 'alternating', init_state=0), [3, 6, 1])
+
+        with self.assertRaises(ValueError):
+            sa.count_RTE(traces, 'alternating', init_state=2)
@@ -6,6 +6,7 @@ try:
     from pycqed.measurement.openql_experiments import single_qubit_oql as sqo
     from pycqed.measurement.openql_experiments import multi_qubit_oql as mqo
     from pycqed.measurement.openql_experiments import clifford_rb_oql as rb_oql
+    from pycqed.measurement.openql_experiments import openql_helpers as oqh
     from pycqed.measurement.openql_experiments.generate_CCL_cfg import  \
         generate_config
     from pycqed.measurement.openql_experiments.pygsti_oql import \
@@ -142,6 +143,28 @@ try:
             p = rb_oql.randomized_benchmarking([2, 0], platf_cfg=config_fn,
                                        nr_cliffords=[1, 5], nr_seeds=1, cal_points=False)
 
+        def test_parallel_rb_seqs(self):
+            program_specs = [
+                (rb_oql.randomized_benchmarking,
+                 {'qubits': [0], 'platf_cfg': config_fn,
+                  'nr_cliffords': [20], 'nr_seeds': 1,
+                  'cal_points': False, 'program_name': 'RB_par_{}'.format(i)})
+                for i in range(3)]
+            programs = oqh.compile_programs_in_parallel(
+                program_specs, max_workers=2, output_dir=output_dir)
+            self.assertEqual([p.name for p in programs],
+                             ['RB_par_{}'.format(i) for i in range(3)])
+            instructions = []
+            for p in programs:
+                self.assertTrue(os.path.isfile(p.filename))
+                with open(p.filename) as f:
+                    instructions.append([line for line in f.readlines()
+                                         if p.name not in line])
+            # every program gets its own random Clifford sequence
+            for i in range(3):
+                for j in range(i):
+                    self.assertNotEqual(instructions[i], instructions[j])
+
 
 except ImportError as e:
     class TestMissingDependency(unittest.TestCase):
@@ -1,5 +1,9 @@
 import unittest
 import os
+import json
+import shutil
+import tempfile
+import numpy as np
 import pycqed as pq
 import pycqed.measurement.openql_experiments.openql_helpers as oqh
 
@@ -113,4 +117,93 @@ class Test_openql_helpers(unittest.TestCase):
             (283, 'fl_cw_01', {(2, 0)}, 697),
             (297, 'fl_cw_01', {(2, 0)}, 700)]
 
-        self.assertEqual(expected_flux_tuples, grouped_fl_tuples[10])
\ No newline at end of file
+        self.assertEqual(expected_flux_tuples, grouped_fl_tuples[10])
+
+    def test_check_recompilation_needed(self):
+        platf_cfg = os.path.join(pq.__path__[0], 'tests', 'openql',
+                                 'test_cfg_CCL.json')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            program_fn = os.path.join(tmp_dir, 'test_program.qisa')
+            kw = {'qubits': [0], 'nr_cliffords': np.arange(5)}
+
+            self.assertTrue(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile=True))
+            # Program does not exist
+            self.assertTrue(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile='as needed',
+                generator=oqh.get_timetuples, generator_kwargs=kw))
+            with self.assertRaises(ValueError):
+                oqh.check_recompilation_needed(
+                    program_fn, platf_cfg, recompile=False,
+                    generator=oqh.get_timetuples, generator_kwargs=kw)
+
+            # "compile" the program
+            open(program_fn, 'w').close()
+            oqh.write_compilation_manifest(
+                program_fn, platf_cfg,
+                generator=oqh.get_timetuples, generator_kwargs=kw)
+            self.assertFalse(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile='as needed',
+                generator=oqh.get_timetuples, generator_kwargs=kw))
+            self.assertFalse(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile=False,
+                generator=oqh.get_timetuples, generator_kwargs=kw))
+
+            # Changing the arguments or the generator requires recompilation
+            self.assertTrue(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile='as needed',
+                generator=oqh.get_timetuples,
+                generator_kwargs={'qubits': [0],
+                                  'nr_cliffords': np.arange(6)}))
+            self.assertTrue(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile='as needed',
+                generator=oqh.get_register_map, generator_kwargs=kw))
+
+            # Changing the source of the generator requires recompilation
+            with open(oqh.infer_manifest_filename(program_fn)) as f:
+                manifest = json.load(f)
+            manifest['generator_source_hash'] = 'modified'
+            with open(oqh.infer_manifest_filename(program_fn), 'w') as f:
+                json.dump(manifest, f)
+            self.assertTrue(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile='as needed',
+                generator=oqh.get_timetuples, generator_kwargs=kw))
+
+            # Changing the config requires recompilation
+            tmp_cfg = os.path.join(tmp_dir, 'test_cfg.json')
+            shutil.copyfile(platf_cfg, tmp_cfg)
+            oqh.write_compilation_manifest(
+                program_fn, tmp_cfg,
+                generator=oqh.get_timetuples, generator_kwargs=kw)
+            self.assertFalse(oqh.check_recompilation_needed(
+                program_fn, tmp_cfg, recompile='as needed',
+                generator=oqh.get_timetuples, generator_kwargs=kw))
+            with open(tmp_cfg, 'a') as f:
+                f.write(' ')
+            self.assertTrue(oqh.check_recompilation_needed(
+                program_fn, tmp_cfg, recompile='as needed',
+                generator=oqh.get_timetuples, generator_kwargs=kw))
+
+    def test_check_recompilation_needed_without_manifest(self):
+        # Programs compiled before manifests were introduced
+        platf_cfg = os.path.join(pq.__path__[0], 'tests', 'openql',
+                                 'test_cfg_CCL.json')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            program_fn = os.path.join(tmp_dir, 'test_program.qisa')
+            kw = {'qubits': [0]}
+            open(program_fn, 'w').close()
+            cfg_mtime = os.path.getmtime(platf_cfg)
+
+            os.utime(program_fn, (cfg_mtime + 10, cfg_mtime + 10))
+            self.assertFalse(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile=False,
+                generator=oqh.get_timetuples, generator_kwargs=kw))
+            self.assertTrue(oqh.check_recompilation_needed(
+                program_fn, platf_cfg, recompile='as needed',
+                generator=oqh.get_timetuples, generator_kwargs=kw))
+
+            os.utime(program_fn, (cfg_mtime - 10, cfg_mtime - 10))
+            with self.assertRaises(ValueError):
+                oqh.check_recompilation_needed(
+                    program_fn, platf_cfg, recompile=False,
+                    generator=oqh.get_timetuples, generator_kwargs=kw)
@@ -245,8 +245,11 @@ class Test_cz_unitary_simulation(unittest.TestCase):
 
         d = czu.CZ_trajectory(H_0=H_0, fluxlutman=fluxlutman)
         vals = d.acquire_data_point()
-        self.assertAlmostEquals(vals[0], 13.588, places=1)
-        self.assertAlmostEquals(vals[1], 166.87, places=1)
+        # The piecewise-constant propagator is more accurate than the
+        # default tolerance of the qutip ODE solver used before
+        # (166.87 deg), the converged conditional phase is 167.11 deg.
+        self.assertAlmostEquals(vals[0], 13.353, places=1)
+        self.assertAlmostEquals(vals[1], 167.11, places=1)
         self.assertAlmostEquals(vals[2], 0.0920, places=1)
         self.assertAlmostEquals(vals[3], 0.1841, places=1)
 
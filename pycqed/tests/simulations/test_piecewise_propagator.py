@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import qutip as qtp
+from scipy.linalg import expm
+
+from pycqed.simulations import cz_unitary_simulation as czu
+from pycqed.simulations.piecewise_propagator import \
+    PiecewiseConstantPropagator, tree_product
+
+
+class Test_piecewise_propagator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.H_0 = czu.coupled_transmons_hamiltonian(
+            w_q0=6e9*2*np.pi, w_q1=7e9*2*np.pi, alpha_q0=250e6*2*np.pi,
+            J=2.5e6*2*np.pi)
+        self.H_c = czu.n_q1
+
+    def test_tree_product(self):
+        rng = np.random.RandomState(0)
+        for nr_steps in [1, 2, 5, 8, 13]:
+            U = rng.randn(3, nr_steps, 4, 4)
+            expected = np.array([np.eye(4)]*3)
+            for i in range(nr_steps):
+                expected = U[:, i] @ expected
+            np.testing.assert_allclose(tree_product(U), expected,
+                                       rtol=1e-10, atol=1e-10)
+        np.testing.assert_array_equal(tree_product(np.zeros((0, 2, 2))),
+                                      np.eye(2))
+
+    def test_step_propagators(self):
+        prop = PiecewiseConstantPropagator(self.H_0, self.H_c)
+        eps = np.array([[0, -1e9], [-1.25e9, 3e8]])
+        U = prop.step_propagators(eps, 1e-10)
+        self.assertEqual(U.shape, (2, 2, 6, 6))
+        for idx in np.ndindex(eps.shape):
+            H = self.H_0.full() + eps[idx]*self.H_c.full()
+            np.testing.assert_allclose(U[idx], expm(-1j*H*1e-10),
+                                       atol=1e-10)
+
+    def test_eps_quantization(self):
+        prop = PiecewiseConstantPropagator(self.H_0, self.H_c,
+                                           eps_resolution=1e3)
+        w_a, _ = prop.eigendecompositions([1.0003e6, 1.0002e6, 2e6])
+        w_b, _ = prop.eigendecompositions([1e6, 1e6, 2e6])
+        np.testing.assert_array_equal(w_a, w_b)
+        self.assertEqual(len(prop._eig_cache), 2)
+
+    def test_propagate_vs_qutip(self):
+        # for a piecewise-constant eps the propagator is exact
+        eps = np.array([-1e9, -1.1e9, -1.2e9, -1.15e9])*2*np.pi
+        dt = 5e-9
+        U_qtp = qtp.qeye([2, 3])
+        for e in eps:
+            U_qtp = (-1j*(self.H_0 + e*self.H_c)*dt).expm() * U_qtp
+        prop = PiecewiseConstantPropagator(self.H_0, self.H_c)
+        np.testing.assert_allclose(prop.propagate(eps, dt), U_qtp.full(),
+                                   atol=1e-8)
+
+        # batch of trajectories
+        U = prop.propagate(np.array([eps, eps[::-1]]), dt)
+        self.assertEqual(U.shape, (2, 6, 6))
+        np.testing.assert_allclose(U[1], prop.propagate(eps[::-1], dt))
+
+    def test_quantities_of_interest_from_unitaries(self):
+        rng = np.random.RandomState(1)
+        U = rng.randn(3, 6, 6) + 1j*rng.randn(3, 6, 6)
+        qoi = czu.quantities_of_interest_from_unitaries(U)
+        for i in range(3):
+            U_qobj = qtp.Qobj(U[i], dims=self.H_0.dims)
+            self.assertAlmostEqual(qoi['phi_cond'][i],
+                                   czu.phases_from_unitary(U_qobj)[-1])
+            self.assertAlmostEqual(qoi['L1'][i],
+                                   czu.leakage_from_unitary(U_qobj))
+            self.assertAlmostEqual(qoi['L2'][i],
+                                   czu.seepage_from_unitary(U_qobj))
@@ -9,6 +9,50 @@ from pycqed.instrument_drivers.physical_instruments.dummy_instruments \
 from qcodes import station
 
 
+class FakeUHFQC:
+    """
+    Minimal stand-in for the UHFQC driver, returns fixed acquisition data
+    and counts the parameters queried.
+    """
+
+    def __init__(self):
+        self.pars = {'quex_trans_offset_weightfunction_{}'.format(i): 0.
+                     for i in range(4)}
+        self.data_raw = {}
+        self.nr_gets = 0
+        # records the arming of the acquisition if not None
+        self.events = None
+
+    def get(self, name):
+        self.nr_gets += 1
+        return self.pars.get(name, [{'vector': None}])
+
+    def set(self, name, value):
+        self.pars[name] = value
+
+    def acquisition_arm(self):
+        if self.events is not None:
+            self.events.append('arm')
+
+    def acquisition_poll(self, samples, arm=True, acquisition_time=0.01):
+        return self.data_raw
+
+    def __getattr__(self, name):
+        # all other parameters are set without effect
+        return lambda *args, **kw: None
+
+
+class FakeAWG:
+    def __init__(self, events):
+        self.events = events
+
+    def start(self):
+        self.events.append('start')
+
+    def stop(self):
+        pass
+
+
 class Test_Detectors(unittest.TestCase):
 
     @classmethod
@@ -195,6 +239,122 @@ class Test_Detectors(unittest.TestCase):
         np.testing.assert_array_almost_equal(y[0], dset[:, 3])
         np.testing.assert_array_almost_equal(y[1], dset[:, 4])
 
+    def test_Multi_Detector_concurrent(self):
+        sweep_pts = np.linspace(0, 10, 5)
+        d0 = det.Dummy_Detector_Hard(delay=.01)
+        d1 = det.Dummy_Detector_Hard(delay=.01)
+        # Not concurrent_safe, acquired after the other detectors
+        d2 = det.Dummy_Detector_Hard()
+        d2.concurrent_safe = False
+        dm_seq = det.Multi_Detector([d0, d1, d2])
+        dm_conc = det.Multi_Detector([d0, d1, d2], concurrent=True)
+
+        # records the begin and end of every acquisition
+        events = []
+        for i, d in enumerate([d0, d1, d2]):
+            def get_values(i=i, get_values=d.get_values):
+                events.append(('begin', i))
+                values = get_values()
+                events.append(('end', i))
+                return values
+            d.get_values = get_values
+
+        acquisitions = []
+        for dm in [dm_seq, dm_conc]:
+            del events[:]
+            dm.prepare(sweep_points=sweep_pts)
+            values = dm.get_values()
+            dm.finish()
+            acquisitions.append(list(events))
+            y = [np.sin(sweep_pts / np.pi), np.cos(sweep_pts/np.pi)]
+            self.assertEqual(np.shape(values), (6, 5))
+            np.testing.assert_array_almost_equal(values, y*3)
+        self.assertEqual(acquisitions[0], [('begin', 0), ('end', 0),
+                                           ('begin', 1), ('end', 1),
+                                           ('begin', 2), ('end', 2)])
+        # the acquisitions of the concurrent detectors overlap
+        self.assertEqual(sorted(acquisitions[1][:2]),
+                         [('begin', 0), ('begin', 1)])
+        self.assertEqual(sorted(acquisitions[1][2:4]),
+                         [('end', 0), ('end', 1)])
+        self.assertEqual(acquisitions[1][4:], [('begin', 2), ('end', 2)])
+        self.assertIsNone(d0.trigger_barrier)
+
+    def test_Multi_Detector_concurrent_error(self):
+        def failing_get_values():
+            raise ValueError('Acquisition failed')
+        d0 = det.Dummy_Detector_Hard()
+        d1 = det.Dummy_Detector_Hard()
+        d1.get_values = failing_get_values
+        dm = det.Multi_Detector([d0, d1], concurrent=True)
+        dm.prepare(sweep_points=np.arange(3))
+        # d0 is released from the barrier and the original error is raised
+        with self.assertRaisesRegex(ValueError, 'Acquisition failed'):
+            dm.get_values()
+        dm.finish()
+
+    def test_Multi_Detector_concurrent_trigger(self):
+        events = []
+        AWG = FakeAWG(events)
+        detectors = []
+        for i in range(3):
+            UHFQC = FakeUHFQC()
+            UHFQC.events = events
+            UHFQC.data_raw = {0: np.arange(3.)*4*(i+1)}
+            detectors.append(det.UHFQC_integrated_average_detector(
+                UHFQC, AWG=AWG, channels=[0], nr_averages=4))
+        dm = det.Multi_Detector(detectors, concurrent=True)
+        dm.prepare(sweep_points=np.arange(3))
+        values = dm.get_values()
+        dm.finish()
+        self.assertEqual(np.shape(values), (3, 3))
+        np.testing.assert_array_almost_equal(values[1:], [values[0]*2,
+                                                          values[0]*3])
+        # the shared AWG is started once, after all detectors are armed
+        self.assertEqual(events, ['arm']*3 + ['start'])
+
+        # acquired one by one every detector starts the AWG
+        del events[:]
+        dm = det.Multi_Detector(detectors)
+        dm.get_values()
+        self.assertEqual(events, ['arm', 'start']*3)
+
+    def test_UHFQC_int_avg_post_processing(self):
+        UHFQC = FakeUHFQC()
+        UHFQC.pars['quex_trans_offset_weightfunction_1'] = .5
+        d = det.UHFQC_integrated_average_detector(
+            UHFQC, channels=[0, 1], result_logging_mode='lin_trans',
+            nr_averages=4, values_per_point=2)
+        d.prepare(sweep_points=np.arange(3))
+        UHFQC.data_raw = {0: np.arange(6.)*4, 1: np.ones(6)*4}
+        nr_gets = UHFQC.nr_gets
+        data = d.get_values()
+        # offsets are cached in prepare
+        self.assertEqual(UHFQC.nr_gets, nr_gets)
+        np.testing.assert_array_almost_equal(
+            data, [[0, 2, 4], [1, 3, 5], [.5]*3, [.5]*3])
+
+        d = det.UHFQC_integrated_average_detector(
+            UHFQC, channels=[0, 1], result_logging_mode='lin_trans',
+            nr_averages=4, real_imag=False)
+        self.assertEqual(d.value_names, ['Magn', 'Phase'])
+        d.prepare(sweep_points=np.arange(3))
+        UHFQC.data_raw = {0: np.array([4., 0, -4]),
+                          1: np.array([6., 4, 2])}
+        magn, phase = d.get_values()
+        np.testing.assert_array_almost_equal(magn, [np.sqrt(2), .5, 1])
+        np.testing.assert_array_almost_equal(phase, [45, 90, 180])
+
+    def test_UHFQC_correlation_scaling(self):
+        UHFQC = FakeUHFQC()
+        d = det.UHFQC_correlation_detector(
+            UHFQC, channels=[0, 1], correlations=[(0, 1)], nr_averages=4)
+        d.prepare(sweep_points=np.arange(2))
+        self.assertEqual(d.channels, [0, 1, 2])
+        UHFQC.data_raw = {i: np.ones(2)*(i+1) for i in range(3)}
+        np.testing.assert_array_almost_equal(
+            d.get_values(), [[.25, .25], [.5, .5], [.75, .75]])
+
     @classmethod
     def tearDownClass(self):
         self.MC.close()
@@ -1,7 +1,10 @@
 import os
+import time
+import threading
 import pycqed as pq
 import unittest
 import numpy as np
+import h5py
 import adaptive
 import pycqed.analysis.analysis_toolbox as a_tools
 from pycqed.measurement import measurement_control
@@ -51,7 +54,8 @@ class Test_MeasurementControl(unittest.TestCase):
         np.testing.assert_array_almost_equal(y1, y[1, :])
 
         # Test that the return dictionary has the right entries
-        dat_keys = set(['dset', 'opt_res_dset', 'sweep_parameter_names',
+        dat_keys = set(['dset', 'opt_res_dset', 'soft_avg_stderr',
+                        'sweep_parameter_names',
                         'sweep_parameter_units',
                         'value_names', 'value_units'])
         self.assertEqual(dat_keys, set(dat.keys()))
@@ -82,7 +86,8 @@ class Test_MeasurementControl(unittest.TestCase):
         np.testing.assert_array_almost_equal(y1, y[1, :])
 
         # Test that the return dictionary has the right entries
-        dat_keys = set(['dset', 'opt_res_dset', 'sweep_parameter_names',
+        dat_keys = set(['dset', 'opt_res_dset', 'soft_avg_stderr',
+                        'sweep_parameter_names',
                         'sweep_parameter_units',
                         'value_names', 'value_units'])
         self.assertEqual(dat_keys, set(dat.keys()))
@@ -214,6 +219,132 @@ class Test_MeasurementControl(unittest.TestCase):
 
         self.MC.live_plot_enabled(True)
 
+    def test_hard_sweep_2D_pipelined(self):
+        sweep_pts = np.linspace(10, 20, 3)
+        sweep_pts_2D = np.linspace(0, 10, 10)
+        outer_par = ManualParameter('outer_par', initial_value=0)
+        nr_rows = len(sweep_pts_2D)
+        # the inner hard sweep is not checked, it does not change between
+        # rows
+        inner_swf = None_Sweep(sweep_control='hard')
+        inner_swf.pipeline_safe = False
+
+        # records the order in which rows are acquired and stored
+        events = []
+        acquired = [threading.Event() for i in range(nr_rows)]
+        plotmon_threads = set()
+
+        def acquire():
+            row = len([e for e in events if e[0] == 'acquire'])
+            events.append(('acquire', row))
+            acquired[row].set()
+            return np.ones(len(sweep_pts)) * outer_par()
+
+        store_hard_data = self.MC.store_hard_data
+
+        def store(new_data, start_idx, stop_idx):
+            row = len([e for e in events if e[0] == 'store'])
+            if self.MC.cfg_pipelined_2D_hard() and row+1 < nr_rows:
+                # only returns before the timeout if the next row is
+                # acquired while this row is stored
+                acquired[row+1].wait(5)
+            events.append(('store', row))
+            store_hard_data(new_data, start_idx, stop_idx)
+
+        def plotmon_2D_hard():
+            plotmon_threads.add(threading.current_thread())
+
+        self.MC.live_plot_enabled(False)
+        self.MC.store_hard_data = store
+        self.MC.update_plotmon_2D_hard = plotmon_2D_hard
+        orders = {}
+        try:
+            for pipelined in [False, True]:
+                del events[:]
+                for event in acquired:
+                    event.clear()
+                self.MC.cfg_pipelined_2D_hard(pipelined)
+                self.MC.set_sweep_function(inner_swf)
+                self.MC.set_sweep_function_2D(outer_par, pipeline_safe=True)
+                self.MC.set_sweep_points(sweep_pts)
+                self.MC.set_sweep_points_2D(sweep_pts_2D)
+                self.MC.set_detector_function(det.Function_Detector(
+                    get_function=acquire, value_names=['outer'],
+                    detector_control='hard'))
+                dat = self.MC.run('2D_hard_pipelined', mode='2D')
+                orders[pipelined] = list(events)
+
+                # every row contains the data of its own outer value
+                dset = dat['dset']
+                np.testing.assert_array_almost_equal(
+                    dset[:, 0], np.tile(sweep_pts, len(sweep_pts_2D)))
+                np.testing.assert_array_almost_equal(
+                    dset[:, 1], np.repeat(sweep_pts_2D, len(sweep_pts)))
+                np.testing.assert_array_almost_equal(dset[:, 2], dset[:, 1])
+        finally:
+            del self.MC.store_hard_data
+            del self.MC.update_plotmon_2D_hard
+            self.MC.cfg_pipelined_2D_hard(False)
+            self.MC.live_plot_enabled(True)
+
+        expected_order = []
+        for row in range(nr_rows):
+            expected_order += [('acquire', row), ('store', row)]
+        self.assertEqual(orders[False], expected_order)
+        # row k is stored while row k+1 is acquired
+        expected_order = [('acquire', 0)]
+        for row in range(nr_rows):
+            if row+1 < nr_rows:
+                expected_order.append(('acquire', row+1))
+            expected_order.append(('store', row))
+        self.assertEqual(orders[True], expected_order)
+        # the plot monitors are only updated from the main thread
+        self.assertEqual(plotmon_threads, {threading.main_thread()})
+
+    def test_hard_sweep_2D_pipelined_throughput(self):
+        sweep_pts = np.linspace(10, 20, 3)
+        sweep_pts_2D = np.linspace(0, 10, 10)
+        outer_par = ManualParameter('outer_par', initial_value=0)
+        t_acquire = .05
+        t_store = .05
+
+        def acquire():
+            time.sleep(t_acquire)
+            return np.ones(len(sweep_pts)) * outer_par()
+
+        store_hard_data = self.MC.store_hard_data
+
+        def store(new_data, start_idx, stop_idx):
+            time.sleep(t_store)
+            store_hard_data(new_data, start_idx, stop_idx)
+
+        self.MC.live_plot_enabled(False)
+        self.MC.store_hard_data = store
+        run_times = {}
+        try:
+            for pipelined in [False, True]:
+                self.MC.cfg_pipelined_2D_hard(pipelined)
+                self.MC.set_sweep_function(None_Sweep(sweep_control='hard'))
+                self.MC.set_sweep_function_2D(outer_par, pipeline_safe=True)
+                self.MC.set_sweep_points(sweep_pts)
+                self.MC.set_sweep_points_2D(sweep_pts_2D)
+                self.MC.set_detector_function(det.Function_Detector(
+                    get_function=acquire, value_names=['outer'],
+                    detector_control='hard'))
+                t0 = time.time()
+                self.MC.run('2D_hard_pipelined_throughput', mode='2D')
+                run_times[pipelined] = time.time() - t0
+        finally:
+            del self.MC.store_hard_data
+            self.MC.cfg_pipelined_2D_hard(False)
+            self.MC.live_plot_enabled(True)
+
+        # sequentially every row takes t_acquire + t_store, pipelined the
+        # storing of a row overlaps with the acquisition of the next one
+        self.assertGreater(run_times[False],
+                           len(sweep_pts_2D) * (t_acquire + t_store))
+        self.assertLess(run_times[True], .8 * run_times[False])
+
     def test_many_shots_hard_sweep(self):
         """
         Tests acquiring more than the maximum number of shots for a hard
@@ -369,6 +500,77 @@ class Test_MeasurementControl(unittest.TestCase):
                                              decimal=2)
         self.assertEqual(d.times_called, 5001)
 
+    def test_soft_averages_hard_sweep_stderr(self):
+        sweep_pts = np.arange(50)
+        self.MC.soft_avg(200)
+        self.MC.cfg_soft_avg_stderr(True)
+        # Only the writes at the end of a soft average iteration remain
+        self.MC.cfg_soft_avg_write_interval(1e3)
+        try:
+            self.MC.set_sweep_function(None_Sweep(sweep_control='hard'))
+            self.MC.set_sweep_points(sweep_pts)
+            self.MC.set_detector_function(det.Dummy_Detector_Hard(noise=.4))
+            dat = self.MC.run('soft_avg_stderr')
+        finally:
+            self.MC.cfg_soft_avg_stderr(False)
+            self.MC.cfg_soft_avg_write_interval(0)
+        dset = dat['dset']
+        stderr = dat['soft_avg_stderr']
+        self.assertEqual(np.shape(dset), (50, 3))
+        self.assertEqual(np.shape(stderr), (50, 2))
+        self.assertEqual(self.MC.detector_function.times_called, 200)
+
+        with h5py.File(self.MC.data_object.filepath, 'r') as f:
+            data_group = f['Experimental Data']
+            np.testing.assert_array_equal(data_group['Data'][()], dset)
+            np.testing.assert_array_equal(
+                data_group['Soft average stderr'][()], stderr)
+            column_names = [
+                c.decode() if isinstance(c, bytes) else c for c in
+                data_group['Soft average stderr'].attrs['column_names']]
+        self.assertEqual(column_names,
+                         ['distance stderr (m)', 'Power stderr (W)'])
+
+        x = dset[:, 0]
+        np.testing.assert_array_almost_equal(dset[:, 1], np.sin(x/np.pi),
+                                             decimal=1)
+        np.testing.assert_array_almost_equal(dset[:, 2], np.cos(x/np.pi),
+                                             decimal=1)
+        # uniform noise of width .4 averaged 200 times
+        expected_stderr = .4/np.sqrt(12)/np.sqrt(200)
+        np.testing.assert_allclose(stderr, expected_stderr, rtol=.3)
+
+    def test_soft_averages_stderr_analysis(self):
+        # the stderr must not change the data read by the analysis
+        self.MC.soft_avg(3)
+        self.MC.cfg_soft_avg_stderr(True)
+        old_a_tools_datadir = a_tools.datadir
+        a_tools.datadir = self.MC.datadir()
+        try:
+            self.MC.set_sweep_function(None_Sweep(sweep_control='hard'))
+            self.MC.set_sweep_points(np.arange(10))
+            self.MC.set_detector_function(det.Dummy_Detector_Hard(noise=.4))
+            dset = self.MC.run('soft_avg_stderr_analysis')['dset']
+
+            a = ma.MeasurementAnalysis(label='soft_avg_stderr_analysis',
+                                       auto=False)
+            a.get_naming_and_values()
+            self.assertEqual(a.value_names, ['distance', 'Power'])
+            np.testing.assert_array_equal(a.sweep_points, dset[:, 0])
+            np.testing.assert_array_equal(a.measured_values, dset[:, 1:].T)
+            a.finish()
+
+            raw_data = a_tools.get_data_from_timestamp_list(
+                [a.timestamp_string], param_names={
+                    'xvals': 'sweep_points',
+                    'measured_values': 'measured_values'})
+            np.testing.assert_array_equal(raw_data['xvals'][0], dset[:, 0])
+            np.testing.assert_array_equal(raw_data['measured_values'][0],
+                                          dset[:, 1:].T)
+        finally:
+            self.MC.cfg_soft_avg_stderr(False)
+            a_tools.datadir = old_a_tools_datadir
+
     def test_soft_averages_hard_sweep_2D(self):
         self.MC.soft_avg(1)
         self.MC.live_plot_enabled(False)
@@ -467,6 +669,25 @@ class Test_MeasurementControl(unittest.TestCase):
         self.assertLess(yf, 0.7)
         self.assertLess(pf, 0.7)
 
+    def test_run_after_adaptive_measurement(self):
+        self.mock_parabola.noise(0)
+        self.MC.set_sweep_functions(
+            [self.mock_parabola.x, self.mock_parabola.y])
+        self.MC.set_adaptive_function_parameters(
+            {'adaptive_function': nelder_mead,
+             'x0': [-50, -50], 'initial_step': [2.5, 2.5], 'maxiter': 5})
+        self.MC.set_detector_function(self.mock_parabola.parabola)
+        self.MC.run('nelder-mead test', mode='adaptive')
+        # no references into the closed datafile are kept
+        self.assertIsNone(self.MC.opt_res_dset)
+
+        self.MC.set_sweep_function(None_Sweep())
+        self.MC.set_sweep_points(np.arange(3))
+        self.MC.set_detector_function(det.Dummy_Detector_Soft())
+        dat = self.MC.run('soft sweep after adaptive')
+        self.assertEqual(np.shape(dat['dset']), (3, 3))
+        self.assertIsNone(dat['opt_res_dset'])
+
     def test_adaptive_measurement_cma(self):
         """
         Example on how to use the cma-es evolutionary algorithm.
@@ -616,6 +837,38 @@ class Test_MeasurementControl(unittest.TestCase):
         x = dat['dset'][:, 0]
         np.testing.assert_array_almost_equal(x, sweep_pts, decimal=5)
 
+    def test_dataset_layout_options(self):
+        sweep_pts = 3e9 + np.arange(1000)*1e-3
+        self.MC.cfg_dataset_compression('gzip')
+        self.MC.cfg_dataset_shuffle(True)
+        self.MC.cfg_value_precision('float32')
+        try:
+            self.MC.set_sweep_function(None_Sweep(sweep_control='hard'))
+            self.MC.set_sweep_points(sweep_pts)
+            self.MC.set_detector_function(det.Dummy_Detector_Hard())
+            dat = self.MC.run('dataset_layout')
+        finally:
+            self.MC.cfg_dataset_compression(None)
+            self.MC.cfg_dataset_shuffle(False)
+            self.MC.cfg_value_precision('float64')
+
+        with h5py.File(self.MC.data_object.filepath, 'r') as f:
+            dset = f['Experimental Data']['Data']
+            self.assertEqual(dset.dtype, np.float64)
+            self.assertEqual(dset.compression, 'gzip')
+            self.assertTrue(dset.shuffle)
+            # The chunks contain a multiple of the points of one acquisition
+            self.assertEqual(dset.chunks, (1000, 3))
+            stored_data = dset[()]
+        np.testing.assert_array_equal(stored_data, dat['dset'])
+
+        # Sweep points are stored in full precision, values in float32
+        np.testing.assert_array_equal(stored_data[:, 0], sweep_pts)
+        x = sweep_pts
+        y = np.array([np.sin(x / np.pi), np.cos(x/np.pi)]).T
+        np.testing.assert_array_equal(
+            stored_data[:, 1:], y.astype(np.float32).astype(np.float64))
+
     def test_save_exp_metadata(self):
         metadata_dict = {
             'intParam': 1,
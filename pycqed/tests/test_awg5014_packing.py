@@ -0,0 +1,57 @@
+import numpy as np
+import unittest
+from pycqed.measurement.waveform_control import awg5014_packing as pack
+
+
+def reference_pack(wf, m1, m2):
+    return np.uint16(np.round(wf * 8191) + 8191 +
+                     np.round(16384 * m1) + np.round(32768 * m2))
+
+
+class Test_AWG5014_packing(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.wf = np.concatenate([[-1, 1, 0, .5/8191], rng.uniform(-1, 1, 996)])
+        self.m1 = rng.randint(2, size=1000)
+        self.m2 = rng.randint(2, size=1000).astype(float)
+
+    def test_pack_waveform(self):
+        packed = pack.pack_waveform(self.wf, self.m1, self.m2)
+        self.assertEqual(packed.dtype, np.uint16)
+        np.testing.assert_array_equal(
+            packed, reference_pack(self.wf, self.m1, self.m2))
+
+    def test_pack_waveform_out(self):
+        out = np.zeros(1000, dtype=np.uint16)
+        packed = pack.pack_waveform(self.wf, self.m1, self.m2, out=out)
+        self.assertIs(packed, out)
+        np.testing.assert_array_equal(
+            out, reference_pack(self.wf, self.m1, self.m2))
+        with self.assertRaises(ValueError):
+            pack.pack_waveform(self.wf, self.m1, self.m2,
+                               out=np.zeros(1000, dtype=np.int16))
+
+    def test_invalid_input(self):
+        with self.assertRaises(Exception):
+            pack.pack_waveform(self.wf, self.m1[:-1], self.m2)
+        with self.assertRaises(TypeError):
+            pack.pack_waveform(self.wf * 1.1, self.m1, self.m2)
+        m2 = self.m2.copy()
+        m2[3] = .5
+        with self.assertRaisesRegex(TypeError, 'Marker 2'):
+            pack.pack_waveform(self.wf, self.m1, m2)
+
+    def test_pack_waveforms(self):
+        splits = [0, 10, 300, 1000]
+        wfs = [self.wf[i:j] for i, j in zip(splits[:-1], splits[1:])]
+        m1s = [self.m1[i:j] for i, j in zip(splits[:-1], splits[1:])]
+        m2s = [self.m2[i:j] for i, j in zip(splits[:-1], splits[1:])]
+        packed = pack.pack_waveforms(wfs, m1s, m2s)
+        self.assertEqual(len(packed), 3)
+        for p, wf, m1, m2 in zip(packed, wfs, m1s, m2s):
+            np.testing.assert_array_equal(p, reference_pack(wf, m1, m2))
+
+        m1s[1] = m1s[1] * 2
+        with self.assertRaisesRegex(TypeError, 'Waveform 1: Marker 1'):
+            pack.pack_waveforms(wfs, m1s, m2s)
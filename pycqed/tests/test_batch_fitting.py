@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+import lmfit
+
+from pycqed.analysis import fitting_models as fm
+from pycqed.analysis.tools.batch_fitting import batch_fit
+
+
+class Test_batch_fitting(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.RandomState(0)
+        self.t = np.linspace(0, 100e-6, 61)
+        self.tau = rng.uniform(10e-6, 40e-6, 20)
+        self.decays = (0.9 * np.exp(-self.t / self.tau[:, None]) + 0.05 +
+                       0.02 * rng.randn(20, len(self.t)))
+
+        self.t_osc = np.linspace(0, 20e-6, 81)
+        self.freq = rng.uniform(1e5, 3e5, 20)
+        self.oscillations = (
+            0.4 * np.cos(2 * np.pi * self.freq[:, None] * self.t_osc + .3) +
+            0.5 + 0.02 * rng.randn(20, len(self.t_osc)))
+
+    def test_vectorized_guesses(self):
+        freqs, phases = fm.fft_freq_phase_guess_2D(self.oscillations,
+                                                   self.t_osc)
+        for y, f, ph in zip(self.oscillations, freqs, phases):
+            self.assertEqual((f, ph), fm.fft_freq_phase_guess(y, self.t_osc))
+
+        guesses = fm.exp_dec_guess_2D(lmfit.Model(fm.ExpDecayFunc),
+                                      self.decays, self.t)
+        for i, y in enumerate(self.decays):
+            pars = fm.exp_dec_guess(lmfit.Model(fm.ExpDecayFunc), y, self.t)
+            for name in ['amplitude', 'tau', 'offset', 'n']:
+                self.assertEqual(guesses[name][i], pars[name].value)
+
+    def test_batch_fit_matches_lmfit(self):
+        model = lmfit.Model(fm.ExpDecayFunc)
+        guesses = fm.exp_dec_guess_2D(model, self.decays, self.t)
+        fit_res = batch_fit(model, self.decays, self.t, guesses)
+        self.assertTrue(np.all(fit_res['success']))
+        # n is fixed by the guess function
+        np.testing.assert_array_equal(fit_res['best_values']['n'], 1)
+        self.assertTrue(np.all(np.isnan(fit_res['stderr']['n'])))
+
+        for i, y in enumerate(self.decays[:5]):
+            m = lmfit.Model(fm.ExpDecayFunc)
+            lm_res = m.fit(y, fm.exp_dec_guess(m, y, self.t), t=self.t)
+            self.assertAlmostEqual(fit_res['best_values']['tau'][i],
+                                   lm_res.params['tau'].value, delta=1e-9)
+            self.assertAlmostEqual(fit_res['stderr']['tau'][i] /
+                                   lm_res.params['tau'].stderr, 1, places=3)
+            self.assertAlmostEqual(fit_res['chisqr'][i], lm_res.chisqr)
+
+    def test_batch_fit_bounds_and_workers(self):
+        model = lmfit.Model(fm.CosFunc)
+        guesses = fm.Cos_guess_2D(model, self.oscillations, self.t_osc)
+        fit_res = batch_fit(model, self.oscillations, self.t_osc, guesses)
+        np.testing.assert_allclose(fit_res['best_values']['frequency'],
+                                   self.freq, rtol=1e-2)
+        self.assertTrue(np.all(fit_res['best_values']['amplitude'] >= 0))
+
+        fit_res_pool = batch_fit(model, self.oscillations, self.t_osc,
+                                 guesses, nr_workers=2)
+        np.testing.assert_array_equal(fit_res_pool['best_values']['phase'],
+                                      fit_res['best_values']['phase'])
+
+    def test_batch_fit_constraint_expression(self):
+        # Models with constraints are fitted using lmfit
+        model = lmfit.Model(fm.CosFunc)
+        guesses = fm.Cos_guess_2D(model, self.oscillations, self.t_osc)
+        model.set_param_hint('offset', expr='amplitude + 0.1')
+        fit_res = batch_fit(model, self.oscillations[:3], self.t_osc,
+                            {k: v[:3] for k, v in guesses.items()})
+        np.testing.assert_allclose(fit_res['best_values']['offset'],
+                                   fit_res['best_values']['amplitude'] + 0.1)
+
+    def test_missing_initial_value(self):
+        with self.assertRaises(ValueError):
+            batch_fit(lmfit.Model(fm.ExpDecayFunc), self.decays, self.t,
+                      {'tau': 1e-5})
+
+    def test_failing_trace(self):
+        model = lmfit.Model(fm.ExpDecayFunc)
+        data = self.decays[:3].copy()
+        guesses = fm.exp_dec_guess_2D(model, data, self.t)
+        data[1, 5] = np.nan
+        with self.assertLogs(level='WARNING') as log:
+            fit_res = batch_fit(model, data, self.t, guesses)
+        self.assertEqual(len(log.output), 1)
+        self.assertIn('trace 1', log.output[0])
+        np.testing.assert_array_equal(fit_res['success'], [True, False, True])
+        self.assertTrue(np.isnan(fit_res['best_values']['tau'][1]))
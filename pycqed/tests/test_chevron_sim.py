@@ -1,5 +1,6 @@
 import numpy as np
 from unittest import TestCase
+from scipy.linalg import expm
 
 from pycqed.simulations import chevron_sim as chs
 
@@ -36,3 +37,32 @@ class TestChevronSim(TestCase):
                              self.distortion)
         self.assertEqual(np.shape(result),
                          (len(self.freq_vec), len(self.time_vec)+1))
+
+    def test_closed_form_propagator(self):
+        for e, g, dt in [(1.3, 0.2, 0.7), (-4., 0.1, 2.), (0., 0., 1.)]:
+            np.testing.assert_allclose(chs.evol(e, g, dt),
+                                       expm(dt*1j*chs.ham(e, g)), atol=1e-14)
+        U = chs.evol(np.array([[1.3, 0.], [2., -1.]]), 0.2, 0.7)
+        self.assertEqual(U.shape, (2, 2, 2, 2))
+        np.testing.assert_allclose(U[1, 0], chs.evol(2., 0.2, 0.7))
+
+    def test_chevron_vs_stepwise_expm(self):
+        e0, g = 2.*np.pi*(6.552 - 4.8), np.pi*0.0385
+        result = chs.chevron(e0, self.e_min, self.e_max, self.e_points, g,
+                             self.time_stop, self.time_step, self.distortion)
+        energy_vec = np.arange(1+self.e_min, 1+self.e_max,
+                               (self.e_max-self.e_min)/(self.e_points-1))
+        for energy, res in zip(energy_vec[::5], result[::5]):
+            state = np.array([1, 0], dtype=complex)
+            expected = [0]
+            for t in np.arange(1., self.time_stop, self.time_step):
+                e = e0*(1.-(energy*self.distortion(t))**2)
+                state = np.dot(expm(self.time_step*1j*chs.ham(e, g)), state)
+                expected.append(np.abs(state[1])**2)
+            np.testing.assert_allclose(res, expected, atol=1e-12)
+
+        # step functions that only accept scalars are supported
+        result_scalar_sf = chs.chevron(
+            e0, self.e_min, self.e_max, self.e_points, g, self.time_stop,
+            self.time_step, lambda t: float(self.distortion(t)))
+        np.testing.assert_allclose(result_scalar_sf, result)
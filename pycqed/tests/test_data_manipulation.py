@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+
+from pycqed.analysis.tools import data_manipulation as dm_tools
+
+
+class Test_rounds_to_event(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.traces = np.array([[1, 1, 1, -1, -1, 1],
+                                [1, 1, 1, 1, 1, 1],
+                                [-1, 1, 1, -1, 1, -1],
+                                [1, 1, 1, 1, 1, -1],
+                                [1, -1, 1, 1, 1, 1]])
+
+    def test_count_rounds_to_error(self):
+        self.assertEqual(dm_tools.count_rounds_to_error([1, 1, -1, 1]), 2)
+        self.assertTrue(np.isnan(dm_tools.count_rounds_to_error([1, 1, 1])))
+
+        rte = dm_tools.count_rounds_to_error_2D(self.traces)
+        np.testing.assert_array_equal(rte, [3, np.nan, 1, 5, 1])
+        for trace, r in zip(self.traces, rte):
+            np.testing.assert_equal(
+                dm_tools.count_rounds_to_error(trace), r)
+
+    def test_count_rtf_and_term_cond(self):
+        rtf, term_cond = dm_tools.count_rtf_and_term_cond_2D(self.traces)
+        np.testing.assert_array_equal(rtf, [3, 7, 1, 5, 1])
+        np.testing.assert_array_equal(
+            term_cond, ['double event', None, 'double event', 'unknown',
+                        'single event'])
+        for trace, r, tc in zip(self.traces, rtf, term_cond):
+            self.assertEqual(dm_tools.count_rtf_and_term_cond(trace),
+                             (r, tc))
+
+        rtf, term_cond = dm_tools.count_rtf_and_term_cond_2D(
+            self.traces, only_count_min_1=True)
+        np.testing.assert_array_equal(rtf, [1, 1, 1, 1, 1])
+        self.assertEqual(dm_tools.count_rtf_and_term_cond(
+            self.traces[2], only_count_min_1=True,
+            return_termination_condition=False), 1)
+
+    def test_count_rounds_since_flip(self):
+        self.assertEqual(dm_tools.count_rounds_since_flip(self.traces[0]),
+                         [3, 2])
+        self.assertEqual(dm_tools.count_rounds_since_flip(self.traces[1]),
+                         [])
+        np.testing.assert_array_equal(
+            dm_tools.count_rounds_since_flip_2D(self.traces),
+            [3, 2, 1, 2, 1, 1, 5, 1, 1])
+
+    def test_count_rounds_since_flip_split(self):
+        # Traces are counted as if they were preceded by a +1
+        m_to_p, p_to_m = dm_tools.count_rounds_since_flip_split(
+            self.traces[0])
+        self.assertEqual(m_to_p, [2])
+        self.assertEqual(p_to_m, [4])
+
+        m_to_p, p_to_m = dm_tools.count_rounds_since_flip_split_2D(
+            self.traces)
+        np.testing.assert_array_equal(m_to_p, [2, 1, 1, 1])
+        np.testing.assert_array_equal(p_to_m, [4, 1, 2, 1, 6, 2])
+
+        with self.assertRaises(ValueError):
+            dm_tools.count_rounds_since_flip_split([1, 1, 0, 1])
+
+    def test_binary_derivative(self):
+        np.testing.assert_array_equal(
+            dm_tools.binary_derivative([1, 1, -1, -1, 1]), [0, 1, 0, 1])
+        np.testing.assert_array_equal(
+            dm_tools.binary_derivative_old([1, 1, -1, -1, 1]),
+            [1, -1, 1, -1])
+        dd = dm_tools.binary_derivative_2D(self.traces, axis=0)
+        self.assertEqual(dd.shape, (5, 5))
+        np.testing.assert_array_equal(
+            dd[0], dm_tools.binary_derivative(self.traces[0]))
+        dd = dm_tools.binary_derivative_2D(self.traces, axis=1)
+        self.assertEqual(dd.shape, (4, 6))
+        np.testing.assert_array_equal(
+            dd[:, 0], dm_tools.binary_derivative(self.traces[:, 0]))
@@ -1,16 +1,22 @@
 import os
+import tempfile
 import pycqed as pq
 import unittest
+from unittest import mock
 import h5py
 from pycqed.measurement import hdf5_data as h5d
 import numpy as np
 import pycqed.utilities.general as gen
 from pycqed.measurement import measurement_control
+from pycqed.measurement import parameter_history as ph
 from pycqed.instrument_drivers.physical_instruments.dummy_instruments \
     import DummyParHolder
 
 from qcodes import station
+from qcodes.instrument.parameter import Parameter
 from pycqed.analysis import analysis_toolbox as a_tools
+from pycqed.analysis import measurement_analysis as ma
+from pycqed.analysis.tools import lazy_data
 
 
 class Test_HDF5(unittest.TestCase):
@@ -18,11 +24,15 @@ class Test_HDF5(unittest.TestCase):
     @classmethod
     def setUpClass(self):
         self.station = station.Station()
-        self.datadir = os.path.join(pq.__path__[0], 'tests', 'test_data')
+        # measurements are written to a temporary datadir, the test data is
+        # not modified
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.datadir = self._tmpdir.name
         self.MC = measurement_control.MeasurementControl(
             'MC', live_plot_enabled=False, verbose=False)
         self.MC.station = self.station
         self.MC.datadir(self.datadir)
+        self._old_a_tools_datadir = a_tools.datadir
         a_tools.datadir = self.datadir
         self.station.add_component(self.MC)
 
@@ -36,6 +46,8 @@ class Test_HDF5(unittest.TestCase):
         self.MC.close()
         self.mock_parabola.close()
         self.mock_parabola_2.close()
+        a_tools.datadir = self._old_a_tools_datadir
+        self._tmpdir.cleanup()
 
     def test_storing_and_loading_station_snapshot(self):
         """
@@ -189,3 +201,113 @@ class Test_HDF5(unittest.TestCase):
         self.assertEqual(self.mock_parabola_2.status(), True)
         self.assertEqual(self.mock_parabola_2.dict_like(),
                          {'a': {'b': [2, 3, 5]}})
+
+    def test_reading_datafile_during_measurement(self):
+        """
+        The datafile is written in SWMR mode and can be read while the
+        measurement is running.
+        """
+        rows_read = []
+
+        def read_datafile(val):
+            f = h5d.open_read_only(self.MC.data_object.filepath)
+            rows_read.append(len(f['Experimental Data']['Data']))
+            f.close()
+        reader = Parameter('reader', unit='', set_cmd=read_datafile)
+
+        old_flush_interval = self.MC.flush_interval()
+        self.MC.flush_interval(0)
+        self.MC.set_sweep_function(reader)
+        self.MC.set_sweep_points(np.arange(4))
+        self.MC.set_detector_function(self.mock_parabola.skewed_parabola)
+        dat = self.MC.run('test_reading_during_measurement')
+        self.MC.flush_interval(old_flush_interval)
+        self.assertEqual(rows_read, [0, 1, 2, 3])
+
+        # Analysis opens the file read-only and reopens it for writing
+        a = ma.MeasurementAnalysis(label='test_reading_during_measurement',
+                                   auto=False)
+        self.assertEqual(a.data_file.mode, 'r')
+        np.testing.assert_array_equal(a.g['Data'][()], dat['dset'])
+        a.add_analysis_datagroup_to_file()
+        self.assertEqual(a.data_file.mode, 'r+')
+        np.testing.assert_array_equal(a.g['Data'][()], dat['dset'])
+        a.finish()
+
+        with h5py.File(a.h5filepath, 'r') as f:
+            self.assertIn('MC settings', f)
+            self.assertIn('Analysis', f)
+
+    def test_lazy_loading_analysis_data(self):
+        """
+        The data of an analysis is only read from the file when it is used,
+        sweep_points and measured_values only read their own columns.
+        """
+        self.MC.set_sweep_functions([self.mock_parabola.x,
+                                     self.mock_parabola.y])
+        self.MC.set_sweep_points(np.linspace(0, 1, 4))
+        self.MC.set_sweep_points_2D(np.linspace(0, 2, 3))
+        self.MC.set_detector_function(self.mock_parabola.skewed_parabola)
+        dat = self.MC.run('test_lazy_loading', mode='2D')
+        dset = dat['dset']
+
+        full_reads = []
+        read_all = lazy_data.LazyDataset.__array__
+
+        def counting_read_all(lazy_dataset, dtype=None):
+            full_reads.append(lazy_dataset)
+            return read_all(lazy_dataset, dtype)
+
+        with mock.patch.object(lazy_data.LazyDataset, '__array__',
+                               counting_read_all):
+            a = ma.MeasurementAnalysis(label='test_lazy_loading', auto=False)
+            a.get_naming_and_values()
+            np.testing.assert_array_equal(a.sweep_points, dset[:, :2].T)
+            np.testing.assert_array_equal(a.measured_values, dset[:, 2:].T)
+            self.assertEqual(full_reads, [])
+            np.testing.assert_array_equal(a.data, dset.T)
+            self.assertEqual(len(full_reads), 1)
+
+            # values set by an analysis are not overwritten by the loader
+            a.get_naming_and_values()
+            a.measured_values = [np.zeros(3)]
+            np.testing.assert_array_equal(a.measured_values, [np.zeros(3)])
+
+            del full_reads[:]
+            a.get_naming_and_values_2D()
+            np.testing.assert_array_equal(a.sweep_points,
+                                          np.linspace(0, 1, 4))
+            np.testing.assert_array_equal(a.Z, dset[:, 2].reshape(3, 4))
+            np.testing.assert_array_equal(a.measured_values[0],
+                                          dset[:, 2].reshape(3, 4).T)
+            self.assertEqual(full_reads, [])
+            a.finish()
+
+        b = ma.MeasurementAnalysis(label='test_lazy_loading', auto=False)
+        with self.assertRaises(AttributeError):
+            b.Z
+        self.assertFalse(hasattr(b, 'sweep_points'))
+        b.finish()
+
+    def test_parameter_history(self):
+        self.assertFalse(self.MC.parameter_history_enabled())
+        self.MC.parameter_history_enabled(True)
+        try:
+            self.mock_parabola.x(1)
+            for name in ['test_history_a', 'test_history_b']:
+                self.MC.set_sweep_function(self.mock_parabola.y)
+                self.MC.set_sweep_points([0, 1])
+                self.MC.set_detector_function(
+                    self.mock_parabola.skewed_parabola)
+                self.MC.run(name)
+        finally:
+            self.MC.parameter_history_enabled(False)
+
+        history = ph.ParameterHistory(self.datadir)
+        names = [name for ts, name in history.get_measurements()]
+        self.assertIn('test_history_a', names)
+        self.assertIn('test_history_b', names)
+        timestamps, values = history.get_parameter_history(
+            'mock_parabola', 'x')
+        self.assertEqual(len(timestamps), len(names))
+        self.assertEqual(values[-1], 1)
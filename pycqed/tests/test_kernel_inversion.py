@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from scipy.linalg import toeplitz
+
+from pycqed.measurement import kernel_inversion as ki
+from pycqed.measurement import kernel_functions as kf
+
+
+class Test_kernel_inversion(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        # impulse response of a filter with a bounce and an exponential tail
+        t = np.arange(1000)
+        self.htilde = 0.02*np.exp(-t/150.)
+        self.htilde[0] += 0.95
+        self.htilde[12] += 0.03
+
+    def test_methods_vs_dense_inverse(self):
+        for N in [1, 2, 7, 64, 1000]:
+            c = self.htilde[:N]
+            expected = np.linalg.inv(toeplitz(c, np.zeros(N)))[:, 0]
+            for method in ['substitution', 'fft', 'auto']:
+                np.testing.assert_allclose(
+                    ki.invert_lower_toeplitz(c, method=method), expected,
+                    rtol=1e-10, atol=1e-12)
+
+    def test_solve_and_matvec(self):
+        rng = np.random.RandomState(0)
+        b = rng.randn(300)
+        A = toeplitz(self.htilde[:300], np.zeros(300))
+        np.testing.assert_allclose(
+            ki.lower_toeplitz_matvec(self.htilde, b), A @ b, atol=1e-12)
+        np.testing.assert_allclose(
+            ki.solve_lower_toeplitz(self.htilde[:300], b),
+            np.linalg.solve(A, b), atol=1e-10)
+
+        kernel, step = ki.kernel_and_step_from_htilde(self.htilde[:300])
+        np.testing.assert_allclose(step, np.linalg.solve(A, np.ones(300)),
+                                   atol=1e-10)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            ki.invert_lower_toeplitz([0, 1, 2])
+        with self.assertRaises(ValueError):
+            ki.invert_lower_toeplitz([1, 2], method='cholesky')
+
+    def test_kernel_functions(self):
+        t = np.arange(50)
+        A = kf.filter_matrix_generic2(kf.step_skineffect, t, 0.1)
+        self.assertTrue(np.allclose(np.triu(A, 1), 0))
+        np.testing.assert_allclose(A, toeplitz(kf.step_skineffect(t, 0.1),
+                                               np.zeros(50)))
+        np.testing.assert_allclose(
+            kf.kernel_from_filter_matrix(A), np.linalg.inv(A)[:, 0])
+        np.testing.assert_allclose(
+            kf.kernel_generic(kf.step_skineffect, t, 0.1),
+            np.linalg.inv(A)[:, 0])
+        np.testing.assert_allclose(
+            kf.filter_matrix_from_htilde(self.htilde[:20]),
+            toeplitz(self.htilde[:20], np.zeros(20)))
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+import h5py
+import numpy as np
+
+from pycqed.analysis.tools import lazy_data
+
+
+class Test_LazyDataset(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, 'lazy_data.hdf5')
+        self.data = np.arange(40, dtype=np.float64).reshape(10, 4)
+        with h5py.File(self.filepath, 'w') as f:
+            f.create_group('Experimental Data').create_dataset(
+                'Data', data=self.data, maxshape=(None, 4))
+        self.lazy = lazy_data.LazyDataset(
+            self.filepath, 'Experimental Data/Data',
+            column_names=['x', 'I', 'Q', 'amp'])
+
+    @classmethod
+    def tearDownClass(self):
+        self.tmpdir.cleanup()
+
+    def test_shape(self):
+        self.assertEqual(self.lazy.shape, (4, 10))
+        self.assertEqual(len(self.lazy), 4)
+        np.testing.assert_array_equal(np.asarray(self.lazy), self.data.T)
+
+    def test_column_selection(self):
+        np.testing.assert_array_equal(self.lazy[2], self.data[:, 2])
+        np.testing.assert_array_equal(self.lazy['Q'], self.data[:, 2])
+        np.testing.assert_array_equal(self.lazy[-1], self.data[:, 3])
+        np.testing.assert_array_equal(self.lazy[1:3], self.data[:, 1:3].T)
+        np.testing.assert_array_equal(self.lazy[[3, 0, 3]],
+                                      self.data[:, [3, 0, 3]].T)
+        with self.assertRaises(KeyError):
+            self.lazy['phase']
+
+    def test_row_selection(self):
+        np.testing.assert_array_equal(self.lazy[1, 2:5], self.data[2:5, 1])
+        self.assertEqual(self.lazy[1, 4], self.data[4, 1])
+        np.testing.assert_array_equal(self.lazy[[0, 2], [7, 1, -1]],
+                                      self.data[[7, 1, -1]][:, [0, 2]].T)
+        mask = self.data[:, 0] > 15
+        np.testing.assert_array_equal(self.lazy['amp', mask],
+                                      self.data[mask, 3])
+
+    def test_column_view(self):
+        col = self.lazy.column('I')
+        self.assertEqual(col.shape, (10, ))
+        self.assertEqual(len(col), 10)
+        np.testing.assert_array_equal(col[::3], self.data[::3, 1])
+        np.testing.assert_array_equal(np.asarray(col), self.data[:, 1])
+        np.testing.assert_array_equal(np.mean(col), np.mean(self.data[:, 1]))
+
+    def test_open_file(self):
+        # Reads use the open file if available and fall back to opening the
+        # file when it is closed.
+        data_file = h5py.File(self.filepath, 'r')
+        lazy = lazy_data.LazyDataset(self.filepath, 'Experimental Data/Data',
+                                     get_file=lambda: data_file)
+        np.testing.assert_array_equal(lazy[0], self.data[:, 0])
+        data_file.close()
+        np.testing.assert_array_equal(lazy[0], self.data[:, 0])
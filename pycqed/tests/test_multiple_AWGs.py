@@ -1,4 +1,6 @@
 import unittest
+from unittest import mock
+import numpy as np
 
 import qcodes as qc
 from pycqed.instrument_drivers.virtual_instruments.virtual_awg5014 import \
@@ -180,3 +182,46 @@ class TestMultipleAWGs(unittest.TestCase):
         self.assertEqual(min(pwfs2['2-pulse-elt_1_ch3']), 8191)
         self.assertEqual(max(pwfs2['2-pulse-elt_1_ch4']), 40959)
         self.assertEqual(min(pwfs2['2-pulse-elt_1_ch4']), 8191)
+
+    def test_packing_dispatched_to_AWG(self):
+        self.station = qc.Station()
+        self.station.sequencer_config = default_sequencer_config.copy()
+        sqs.station = self.station
+        self.AWG = VirtualAWG5014("AWG_packing")
+        self.station.add_component(self.AWG)
+        self.station.pulsar = ps.Pulsar('Pulsar_packing',
+                                        default_AWG=self.AWG.name)
+        for i in range(4):
+            self.station.pulsar.define_channel(id='ch{}'.format(i+1),
+                                               name='ch{}'.format(i+1),
+                                               type='analog', high=1., low=-1.,
+                                               offset=0.0, delay=0, active=True)
+            for j in range(1, 3):
+                self.station.pulsar.define_channel(
+                    id='ch{}_marker{}'.format(i+1, j),
+                    name='ch{}_marker{}'.format(i+1, j),
+                    type='marker', high=2, low=0,
+                    offset=0., delay=0, active=True)
+
+        # AWGs with a batch pack_waveforms pack each channel group at once
+        with mock.patch.object(self.AWG, 'pack_waveforms',
+                               wraps=self.AWG.pack_waveforms) as pack:
+            sqs.Rabi_seq([0.3, 0.6], default_pulse_pars, default_RO_pars)
+        self.assertEqual(pack.call_count, 4)
+        batch_pwfs = self.AWG.file['p_wfs']
+
+        # other AWGs pack every element with their pack_waveform
+        pack_waveforms = VirtualAWG5014.pack_waveforms
+        del VirtualAWG5014.pack_waveforms
+        try:
+            with mock.patch.object(self.AWG, 'pack_waveform',
+                                   wraps=self.AWG.pack_waveform) as pack:
+                sqs.Rabi_seq([0.3, 0.6], default_pulse_pars,
+                             default_RO_pars)
+        finally:
+            VirtualAWG5014.pack_waveforms = pack_waveforms
+        self.assertEqual(pack.call_count, 8)
+        pwfs = self.AWG.file['p_wfs']
+        self.assertEqual(sorted(pwfs), sorted(batch_pwfs))
+        for wfname in pwfs:
+            np.testing.assert_array_equal(pwfs[wfname], batch_pwfs[wfname])
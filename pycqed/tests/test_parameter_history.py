@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+import numpy as np
+
+import pycqed as pq
+from pycqed.measurement import parameter_history as ph
+
+
+class Test_ParameterHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.history = ph.ParameterHistory(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_default_filename(self):
+        self.assertEqual(self.history.db_path,
+                         os.path.join(self.tmpdir.name, ph.DEFAULT_FILENAME))
+
+    def test_add_and_query(self):
+        for i, ts in enumerate(['20170101_120000', '20170102_120000',
+                                '20170103_120000']):
+            added = self.history.add_instrument_settings(
+                ts, {'QL': {'f_qubit': str(5e9 + i), 'name': 'QL'},
+                     'MC': {'mode': 'soft'}}, name='Rabi')
+            self.assertTrue(added)
+        # the store is append-only
+        self.assertFalse(self.history.add_instrument_settings(
+            '20170101_120000', {'QL': {'f_qubit': '0'}}, name='Rabi'))
+
+        self.assertEqual(self.history.get_parameters(),
+                         [('MC', 'mode'), ('QL', 'f_qubit'), ('QL', 'name')])
+        self.assertEqual(self.history.get_parameters('MC'), [('MC', 'mode')])
+
+        timestamps, values = self.history.get_parameter_history(
+            'QL', 'f_qubit')
+        self.assertEqual(len(timestamps), 3)
+        np.testing.assert_array_equal(values, [5e9, 5e9+1, 5e9+2])
+
+        timestamps, values = self.history.get_parameter_history(
+            'QL', 'f_qubit', t_start='20170102_000000',
+            t_stop='20170103_120000')
+        self.assertEqual(timestamps, ['20170102_120000', '20170103_120000'])
+        np.testing.assert_array_equal(values, [5e9+1, 5e9+2])
+
+        timestamps, values = self.history.get_parameter_history('QL', 'name')
+        self.assertTrue(np.all(np.isnan(values)))
+        timestamps, values = self.history.get_parameter_history(
+            'QL', 'name', as_str=True)
+        self.assertEqual(values, ['QL']*3)
+
+    def test_measurements_in_the_same_second(self):
+        ts = '20170101_120000'
+        self.assertTrue(self.history.add_instrument_settings(
+            ts, {'QL': {'f_qubit': '5e9'}}, name='Rabi'))
+        self.assertTrue(self.history.add_instrument_settings(
+            ts, {'QL': {'f_qubit': '6e9'}}, name='Ramsey'))
+        self.assertFalse(self.history.add_instrument_settings(
+            ts, {'QL': {'f_qubit': '0'}}, name='Ramsey'))
+        self.assertEqual(self.history.get_measurements(),
+                         [(ts, 'Rabi'), (ts, 'Ramsey')])
+        timestamps, values = self.history.get_parameter_history(
+            'QL', 'f_qubit')
+        self.assertEqual(timestamps, [ts, ts])
+        np.testing.assert_array_equal(values, [5e9, 6e9])
+
+    def test_locked_database(self):
+        history = ph.ParameterHistory(self.tmpdir.name, timeout=.1)
+        conn = sqlite3.connect(history.db_path)
+        try:
+            conn.execute('BEGIN EXCLUSIVE')
+            with self.assertRaises(sqlite3.OperationalError):
+                history.add_instrument_settings(
+                    '20170101_120000', {'QL': {'f_qubit': '5e9'}})
+        finally:
+            conn.close()
+        self.assertEqual(history.get_timestamps(), [])
+
+    def test_backfill(self):
+        datadir = os.path.join(pq.__path__[0], 'tests', 'test_data')
+        nr_added = self.history.backfill('20170607_000000', '20170607_235959',
+                                         datadir=datadir)
+        timestamps = self.history.get_timestamps()
+        self.assertEqual(nr_added, len(timestamps))
+        self.assertIn('20170607_152324', timestamps)
+        self.assertTrue(('QR', 'f_qubit') in self.history.get_parameters('QR'))
+
+        ts_hist, f_qubit = self.history.get_parameter_history('QR', 'f_qubit')
+        self.assertEqual(ts_hist, timestamps)
+        self.assertFalse(np.any(np.isnan(f_qubit)))
+
+        # only new measurements are added
+        self.assertEqual(self.history.backfill(
+            '20170607_000000', '20170607_235959', datadir=datadir), 0)
@@ -4,7 +4,10 @@ from unittest import TestCase
 
 from pycqed.simulations.pauli_transfer_matrices import(
     X,Y,Z, H, S, S2, CZ, X_theta, Y_theta, Z_theta,
-    process_fidelity, average_gate_fidelity)
+    process_fidelity, average_gate_fidelity,
+    compose_sequence, cumulative_compose, tensor_product)
+from pycqed.measurement.randomized_benchmarking.clifford_group import \
+    clifford_group_single_qubit
 
 
 class TestPauliTransferProps(TestCase):
@@ -83,4 +86,60 @@ class TestPauliTransferProps(TestCase):
         self.assertAlmostEqual(F_pro, 0.9698463)
 
         F_avg = average_gate_fidelity(Z_160, Z)
-        self.assertAlmostEqual(F_avg, 0.979897540)
\ No newline at end of file
+        self.assertAlmostEqual(F_avg, 0.979897540)
+
+
+class TestPauliTransferStacks(TestCase):
+
+    def test_angle_rotation_arrays(self):
+        angles = np.array([[0, 32], [90, 180]])
+        for rot in [X_theta, Y_theta, Z_theta]:
+            ptms = rot(angles)
+            self.assertEqual(ptms.shape, (2, 2, 4, 4))
+            for idx in np.ndindex(2, 2):
+                np.testing.assert_array_almost_equal(ptms[idx],
+                                                     rot(angles[idx]))
+
+    def test_compose_sequence(self):
+        rng = np.random.RandomState(0)
+        C1 = np.array(clifford_group_single_qubit)
+        # 5 seeds of 7 random Cliffords
+        idx = rng.randint(24, size=(5, 7))
+        seqs = C1[idx]
+        ptms = compose_sequence(seqs)
+        cum_ptms = cumulative_compose(seqs)
+        self.assertEqual(ptms.shape, (5, 4, 4))
+        self.assertEqual(cum_ptms.shape, (5, 7, 4, 4))
+        for i in range(5):
+            exp_ptm = np.linalg.multi_dot(list(seqs[i])[::-1])
+            np.testing.assert_array_almost_equal(ptms[i], exp_ptm)
+            np.testing.assert_array_almost_equal(cum_ptms[i, -1], exp_ptm)
+            np.testing.assert_array_almost_equal(
+                cum_ptms[i, 2], np.linalg.multi_dot(list(seqs[i, :3])[::-1]))
+
+    def test_flipping_sequence_fidelity(self):
+        # N over-rotated pi pulses for a range of over-rotations
+        N = 10
+        eps = np.linspace(0, 5, 6)
+        pulses = np.repeat(X_theta(180 + eps)[:, None], N, axis=1)
+        ptms = compose_sequence(pulses)
+        F_pro = process_fidelity(ptms, X_theta(N*180))
+        np.testing.assert_array_almost_equal(F_pro,
+                                             (1+np.cos(np.deg2rad(N*eps)))/2)
+        F_avg = average_gate_fidelity(ptms, X_theta(N*180))
+        for F, ptm in zip(F_avg, ptms):
+            self.assertAlmostEqual(F, average_gate_fidelity(ptm, np.eye(4)))
+
+    def test_tensor_product(self):
+        np.testing.assert_array_equal(tensor_product(X, Z), np.kron(X, Z))
+        ptms_0 = X_theta(np.array([10, 20, 30]))
+        ptms_1 = Y_theta(np.array([40, 50, 60]))
+        ptms = tensor_product(ptms_0, ptms_1)
+        self.assertEqual(ptms.shape, (3, 16, 16))
+        for i in range(3):
+            np.testing.assert_array_almost_equal(
+                ptms[i], np.kron(ptms_0[i], ptms_1[i]))
+        # two qubit process fidelity
+        F = process_fidelity(np.matmul(CZ, ptms), CZ)
+        self.assertEqual(F.shape, (3, ))
+        self.assertAlmostEqual(F[0], process_fidelity(np.dot(CZ, ptms[0]), CZ))
@@ -3,6 +3,7 @@ This module contains tests for the QASM compiler by Xiang Fu
 """
 import unittest
 import sys
+import json
 import numpy as np
 import pycqed as pq
 from io import StringIO
@@ -276,6 +277,42 @@ class Test_compiler(unittest.TestCase):
             qumis_instrs[i] = compiler.qumis_instructions
         self.assertEqual(qumis_instrs[0], qumis_instrs[1])
 
+    def test_compiler_cache(self):
+        qcx.clear_cache()
+        qasm_fn = join(self.test_file_dir, 'dev_test.qasm')
+        qumis_fn = join(self.test_file_dir, "output.qumis")
+        compiler = qcx.QASM_QuMIS_Compiler(self.config_fn,
+                                           verbosity_level=0)
+        compiler.compile(qasm_fn, qumis_fn)
+        self.assertFalse(compiler.cache_hit)
+        self.assertEqual(qcx.cache_info(), {'config': 1, 'program': 1})
+        ref_qumis = compiler.qumis_instructions
+
+        compiler = qcx.QASM_QuMIS_Compiler(self.config_fn,
+                                           verbosity_level=0)
+        compiler.compile(qasm_fn, qumis_fn)
+        self.assertTrue(compiler.cache_hit)
+        self.assertEqual(compiler.qumis_instructions, ref_qumis)
+        qumis_from_file = open(qumis_fn).read().splitlines()
+        self.assertEqual(qumis_from_file, ref_qumis)
+
+        # A different config results in a different program entry
+        config = json.load(open(self.config_fn))
+        config['hardware specification']['init time'] = 100000
+        compiler = qcx.QASM_QuMIS_Compiler(verbosity_level=0)
+        compiler.compile(qasm_fn, qumis_fn, config=config)
+        self.assertFalse(compiler.cache_hit)
+        self.assertNotEqual(compiler.qumis_instructions, ref_qumis)
+        self.assertEqual(qcx.cache_info(), {'config': 2, 'program': 2})
+
+        # Disabling the cache always compiles
+        compiler = qcx.QASM_QuMIS_Compiler(self.config_fn,
+                                           verbosity_level=0,
+                                           use_cache=False)
+        compiler.compile(qasm_fn, qumis_fn)
+        self.assertFalse(compiler.cache_hit)
+        self.assertEqual(compiler.qumis_instructions, ref_qumis)
+
 
 class Test_single_qubit_seqs(unittest.TestCase):
 
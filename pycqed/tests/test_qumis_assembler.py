@@ -313,3 +313,40 @@ class Test_single_qubit_seqs(TestCase):
         else:
             self.assertEqual(merge_wait_array_no_nop,
                              self.assembler.label_instrs)
+
+    def test_encode_instructions(self):
+        # The table driven encoding should be bit-identical to the string
+        # based *Format functions.
+        test_file_dir = os.path.join(
+            pq.__path__[0], 'tests', 'test_data', "20170328")
+        for fn in sorted(os.listdir(test_file_dir)):
+            if not fn.endswith('.qumis'):
+                continue
+            self.setAssembler(fn)
+            self.assembler.assemble()
+            label_instrs = self.assembler.label_instrs
+            ref_instructions = [
+                int(self.assembler.inst_translation_func[li[1].lower()](
+                    self.assembler, li[2:]), 2) for li in label_instrs]
+            self.assertEqual(
+                self.assembler.encode_instructions(label_instrs),
+                ref_instructions)
+
+    def test_encode_immediate_range(self):
+        self.setAssembler()
+        for inst, args in [('beq', ['r0', 'r0']), ('bne', ['r0', 'r1']),
+                           ('addi', ['r1', 'r1'])]:
+            for imm in [-2**14, -1, 0, 2**14 - 1]:
+                label_instrs = [['', inst] + args + [str(imm)]]
+                ref = int(self.assembler.inst_translation_func[inst](
+                    self.assembler, label_instrs[0][2:]), 2)
+                self.assertEqual(
+                    self.assembler.encode_instructions(label_instrs), [ref])
+            # out of range values are not truncated
+            for imm in [-2**14 - 1, 2**14, 2**15]:
+                with self.assertRaises(ValueError):
+                    self.assembler.encode_instructions(
+                        [['', inst] + args + [str(imm)]])
+        with self.assertRaises(ValueError):
+            self.assembler.encode_instructions(
+                [['', 'addi', 'r1', 'r1', 'a']])
@@ -0,0 +1,133 @@
+import unittest
+import numpy as np
+from pycqed.measurement.pulse_sequences.sequence_cache import \
+    SequenceCache, canonical_hash
+
+
+class DummyPulsar:
+    def __init__(self):
+        self.channels = {'ch1': {'offset': 0.}}
+        self.last_sequence = None
+        self.last_elements = None
+        self.nr_programmed = 0
+
+    def program_awgs(self, sequence, *elements):
+        self.last_sequence = sequence
+        self.last_elements = elements
+        self.nr_programmed += 1
+
+
+class DummyStation:
+    pulsar = DummyPulsar()
+
+
+# The sequence functions upload using a module level station
+station = DummyStation()
+nr_generated = [0]
+
+
+def dummy_seq(times, pulse_pars, upload=True, return_seq=False):
+    nr_generated[0] += 1
+    seq = ['seq', len(times)]
+    el_list = ['el_{}'.format(i) for i in range(len(times))]
+    if upload:
+        station.pulsar.program_awgs(seq, *el_list)
+    if return_seq:
+        return seq, el_list
+    return seq
+
+
+def dummy_seq_always_upload(times, pulse_pars):
+    # like e.g. the CBox sequences, has no upload argument
+    nr_generated[0] += 1
+    seq = ['seq_always_upload', len(times)]
+    station.pulsar.program_awgs(seq, 'el_0')
+    return seq
+
+
+class Test_SequenceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SequenceCache(max_size=2)
+        station.pulsar = DummyPulsar()
+        nr_generated[0] = 0
+        self.pulse_pars = {'amplitude': .5, 'sigma': 5e-9,
+                           'pulse_type': 'SSB_DRAG_pulse'}
+
+    def test_hits_and_skipped_uploads(self):
+        times = np.linspace(0, 1e-6, 11)
+        seq = self.cache.call(dummy_seq, times, self.pulse_pars)
+        # identical arguments, dict order and keyword use do not matter
+        pars = dict(reversed(list(self.pulse_pars.items())))
+        seq2 = self.cache.call(dummy_seq, pulse_pars=pars, times=times.copy())
+        self.assertIs(seq, seq2)
+        self.assertEqual(nr_generated[0], 1)
+        self.assertEqual(station.pulsar.nr_programmed, 1)
+        self.assertEqual(self.cache.statistics(),
+                         {'hits': 1, 'misses': 1, 'uncached': 0,
+                          'uploads': 1, 'uploads_skipped': 1, 'size': 1})
+
+        # changed parameters generate a new sequence
+        self.pulse_pars['amplitude'] = .4
+        self.cache.call(dummy_seq, times, self.pulse_pars)
+        self.assertEqual(nr_generated[0], 2)
+
+        # the first sequence is not on the AWGs anymore and is reprogrammed
+        self.cache.call(dummy_seq, times, pars)
+        self.assertEqual(nr_generated[0], 2)
+        self.assertEqual(station.pulsar.nr_programmed, 3)
+        self.assertIs(station.pulsar.last_sequence, seq)
+        self.assertEqual(len(station.pulsar.last_elements), 11)
+
+        # changing the pulsar settings invalidates the sequences
+        station.pulsar.channels['ch1']['offset'] = .1
+        self.cache.call(dummy_seq, times, pars)
+        self.assertEqual(nr_generated[0], 3)
+
+    def test_hit_without_upload_argument(self):
+        times = np.arange(3)
+        seq_0 = self.cache.call(dummy_seq_always_upload, times,
+                                self.pulse_pars)
+        seq_1 = self.cache.call(dummy_seq, np.arange(4), self.pulse_pars)
+        self.assertIs(station.pulsar.last_sequence, seq_1)
+        # the cache hit still programs the AWGs
+        self.assertIs(self.cache.call(dummy_seq_always_upload, times,
+                                      self.pulse_pars), seq_0)
+        self.assertIs(station.pulsar.last_sequence, seq_0)
+        self.assertEqual(nr_generated[0], 2)
+        self.assertEqual(station.pulsar.nr_programmed, 3)
+        self.assertEqual(self.cache.statistics()['uploads'], 3)
+
+    def test_arguments_not_plain_data(self):
+        pars = dict(self.pulse_pars, instr=DummyPulsar())
+        for i in range(2):
+            self.cache.call(dummy_seq, np.arange(3), pars)
+        self.assertEqual(nr_generated[0], 2)
+        self.assertEqual(self.cache.statistics()['uncached'], 2)
+        self.assertEqual(self.cache.statistics()['size'], 0)
+
+    def test_invalidate_and_max_size(self):
+        for n in [3, 4, 5]:
+            self.cache.call(dummy_seq, np.arange(n), self.pulse_pars)
+        self.assertEqual(self.cache.statistics()['size'], 2)
+        self.cache.call(dummy_seq, np.arange(3), self.pulse_pars)
+        self.assertEqual(nr_generated[0], 4)
+
+        self.cache.invalidate(dummy_seq)
+        self.assertEqual(self.cache.statistics()['size'], 0)
+        self.cache.call(dummy_seq, np.arange(3), self.pulse_pars)
+        self.assertEqual(nr_generated[0], 5)
+
+        self.cache.enabled = False
+        self.cache.call(dummy_seq, np.arange(3), self.pulse_pars)
+        self.assertEqual(nr_generated[0], 6)
+
+    def test_canonical_hash(self):
+        self.assertEqual(canonical_hash({'a': 1, 'b': [1, 2.]}),
+                         canonical_hash({'b': [1, 2.], 'a': 1}))
+        self.assertNotEqual(canonical_hash({'a': 1}), canonical_hash({'a': 2}))
+        self.assertNotEqual(canonical_hash(np.arange(3)),
+                            canonical_hash(np.arange(3.)))
+        self.assertNotEqual(canonical_hash(1), canonical_hash('1'))
+        with self.assertRaises(TypeError):
+            canonical_hash({'a': DummyPulsar()})
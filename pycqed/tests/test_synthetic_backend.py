@@ -0,0 +1,97 @@
+import time
+import unittest
+import numpy as np
+from pycqed.measurement import measurement_control
+from pycqed.measurement import benchmark_MC
+import pycqed.measurement.detector_functions as det
+from pycqed.instrument_drivers.virtual_instruments.synthetic_backend import \
+    Synthetic_Backend
+
+from qcodes import station
+
+
+class Test_Synthetic_Backend(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.station = station.Station()
+        self.backend = Synthetic_Backend('synthetic_backend', seed=0)
+        self.station.add_component(self.backend)
+        self.MC = measurement_control.MeasurementControl(
+            'MC', live_plot_enabled=False, verbose=False)
+        self.MC.station = self.station
+        self.station.add_component(self.MC)
+
+    def setUp(self):
+        self.backend.noise_level(0)
+        self.backend.thermal_pop(0)
+        self.backend.acq_latency(0)
+        self.backend.acq_latency_per_point(0)
+
+    def test_models(self):
+        # rabi, the pi pulse maps the ground to the excited state readout
+        data = self.backend.measure(
+            'rabi', [0, self.backend.amp180(), 2*self.backend.amp180()])
+        np.testing.assert_array_almost_equal(
+            data.T, [self.backend.ro_ground(), self.backend.ro_excited(),
+                     self.backend.ro_ground()])
+        ground = np.array(self.backend.ro_ground())
+        excited = np.array(self.backend.ro_excited())
+        data = self.backend.measure('T1', [0, self.backend.T1()])
+        np.testing.assert_array_almost_equal(
+            data.T, [excited, ground + (excited-ground)/np.e])
+
+        # the resonator dip is at res_freq
+        f = np.linspace(6.99e9, 7.01e9, 201)
+        magn, phase = self.backend.measure('resonator', f)
+        self.assertAlmostEqual(f[np.argmin(magn)], self.backend.res_freq())
+
+        shots = self.backend.measure('SSRO', np.arange(10000))
+        self.assertEqual(shots.shape, (2, 10000))
+        np.testing.assert_allclose(np.mean(shots[:, 1::2], axis=1),
+                                   self.backend.ro_excited(), atol=.005)
+
+        with self.assertRaises(ValueError):
+            self.backend.measure('spectroscopy', f)
+
+    def test_acquisition_latency(self):
+        self.backend.acq_latency(.02)
+        self.backend.acq_latency_per_point(1e-4)
+        t0 = time.time()
+        self.backend.measure('rabi', np.arange(100))
+        self.assertGreaterEqual(time.time()-t0, .03)
+
+    def test_detectors(self):
+        self.MC.set_sweep_function(self.backend.mw_amp)
+        self.MC.set_sweep_points(np.linspace(0, 1, 5))
+        self.MC.set_detector_function(
+            det.Synthetic_Detector_Soft(self.backend, 'rabi'))
+        dset_soft = self.MC.run('synthetic_rabi_soft')['dset']
+
+        d = det.Synthetic_Detector_Hard(self.backend, 'rabi')
+        self.assertEqual(d.value_names, ['I', 'Q'])
+        self.MC.set_sweep_function(benchmark_MC._hard_sweep(
+            self.backend.mw_amp))
+        self.MC.set_sweep_points(np.linspace(0, 1, 5))
+        self.MC.set_detector_function(d)
+        dset_hard = self.MC.run('synthetic_rabi_hard')['dset']
+        np.testing.assert_array_almost_equal(dset_soft, dset_hard)
+
+    def test_benchmark(self):
+        result = benchmark_MC.run_benchmark(self.MC, self.backend, '2D hard',
+                                            size_factor=.05)
+        self.assertEqual(result['points'], 500)
+        self.assertGreater(result['peak memory'], 0)
+        for stage in benchmark_MC.STAGES:
+            self.assertGreaterEqual(result[stage], 0)
+        self.assertLessEqual(sum(result[stage] for stage in
+                                 benchmark_MC.STAGES), result['run time'])
+        # the timed wrappers are removed after the run
+        self.assertNotIn('run', self.MC.__dict__)
+
+    @classmethod
+    def tearDownClass(self):
+        self.MC.close()
+        self.backend.close()
+        del self.station.components['MC']
+        del self.station.components['synthetic_backend']
@@ -1,9 +1,12 @@
 import unittest
+from unittest import mock
 import pycqed as pq
 import os
 import numpy as np
+from scipy import optimize
 from pycqed.analysis import measurement_analysis as ma
 from pycqed.analysis_v2 import tomography_execute as tomography_execute
+from pycqed.analysis_v2 import tomography_V2, pytomo
 import qutip as qt
 
 ma.a_tools.datadir = os.path.join(pq.__path__[0], 'tests', 'test_data')
@@ -32,10 +35,50 @@ class Test_tomography_execute(unittest.TestCase):
       #the code is broken. 
       #The correct method shhould be pauli labels
       benchmark_fidelity = np.real_if_close(np.dot(rho_tomo.flatten(),rho_target.flatten()))
-      self.assertAlmostEqual(benchmark_fidelity, 0.9679030, places=6)
+      self.assertAlmostEqual(benchmark_fidelity, 0.9688183, places=6)
 
-    
+    def test_tomo_analysis_cardinal_state_SDPA(self):
+      # Same dataset as above, reconstructed with the native SDPA solver
+      with mock.patch.object(tomography_V2.csdp_tomo, 'tomo_state',
+                             wraps=pytomo.tomo_state) as tomo_state:
+        tomo_object = tomography_execute.TomographyExecute(timestamp='20161124_162604',tomography_type = "SDPA")
+      rho_tomo = (tomo_object.get_density_matrix()).full()
+      rho_target = (qt.ket2dm(qt.basis(4, 0))).full()
+      benchmark_fidelity = np.real_if_close(np.dot(rho_tomo.flatten(),rho_target.flatten()))
+
+      # Independent reference: minimizes the same objective with a
+      # generic optimizer, over rho = T T^dagger with T lower triangular
+      data, observables, weights = tomo_state.call_args[0][:3]
+      rho_ref = least_squares_rho_cholesky(data, observables, weights)
+      reference_fidelity = np.dot(rho_ref.flatten(), rho_target.flatten()).real
+      self.assertAlmostEqual(benchmark_fidelity, reference_fidelity, places=5)
+
+
+def least_squares_rho_cholesky(data, observables, weights):
+    """
+    Minimizes sum (data - p)**2/data with p = weights Tr(E rho) using BFGS
+    on the Cholesky factor of rho, returns rho normalized to trace 1.
+    """
+    data = np.asarray(data, dtype=float)
+    A = np.asarray(weights, dtype=float)[:, None, None]*np.asarray(observables)
+    dim = A.shape[-1]
+    tril = np.tril_indices(dim)
+    nr_pars = len(tril[0])
 
+    def get_rho(x):
+        T = np.zeros((dim, dim), dtype=complex)
+        T[tril] = x[:nr_pars] + 1j*x[nr_pars:]
+        return T.dot(T.conj().T)
 
+    def chi_squared(x):
+        p = np.einsum('kij,ji->k', A, get_rho(x)).real
+        return np.sum((data-p)**2/data)
 
-    
+    # starts from the maximally mixed state with the average counts
+    x0 = np.zeros(2*nr_pars)
+    x0[[i for i, (r, c) in enumerate(zip(*tril)) if r == c]] = \
+        np.sqrt(dim*np.mean(data)/np.mean(np.trace(A, axis1=1, axis2=2).real))
+    res = optimize.minimize(chi_squared, x0, method='BFGS',
+                            options={'gtol': 1e-10, 'maxiter': 100000})
+    rho = get_rho(res.x)
+    return rho/np.trace(rho)
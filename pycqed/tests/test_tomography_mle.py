@@ -0,0 +1,63 @@
+import itertools
+import unittest
+from functools import reduce
+import numpy as np
+from pycqed.analysis.tools import tomography_mle as tm
+
+
+paulis = [np.eye(2), np.array([[0, 1], [1, 0]]),
+          np.array([[0, -1j], [1j, 0]]), np.diag([1, -1])]
+
+
+def pauli_operators(n_qubits):
+    return np.array([reduce(np.kron, p)
+                     for p in itertools.product(paulis, repeat=n_qubits)])
+
+
+class Test_tomography_mle(unittest.TestCase):
+
+    def test_triangular_params_roundtrip(self):
+        rng = np.random.RandomState(0)
+        t_params = rng.randn(3, 16)
+        rho = tm.build_rho_from_triangular_params(t_params, 4)
+        np.testing.assert_almost_equal(np.trace(rho, axis1=1, axis2=2), 1)
+        rho_2 = tm.build_rho_from_triangular_params(
+            tm.triangular_params_from_rho(rho), 4)
+        np.testing.assert_almost_equal(rho, rho_2)
+
+    def test_gradient(self):
+        rng = np.random.RandomState(1)
+        ops = pauli_operators(2)
+        t_params = rng.randn(2, 16)
+        meas = rng.randn(2, 16)
+        weights = rng.rand(2, 16)
+        cost, grad = tm.mle_cost_and_gradient(t_params, ops, meas, weights)
+        eps = 1e-6
+        num_grad = np.zeros(t_params.shape)
+        for i in range(16):
+            dt = np.zeros(t_params.shape)
+            dt[:, i] = eps
+            num_grad[:, i] = (
+                tm.mle_cost_and_gradient(t_params+dt, ops, meas, weights)[0] -
+                tm.mle_cost_and_gradient(t_params-dt, ops, meas, weights)[0]
+            ) / (2*eps)
+        np.testing.assert_almost_equal(grad, num_grad, decimal=6)
+
+    def test_max_likelihood_tomo_bell_states(self):
+        ops = pauli_operators(2)
+        bell_states = np.array([[1, 0, 0, 1], [1, 0, 0, -1],
+                                [0, 1, 1, 0], [0, 1, -1, 0]]) / np.sqrt(2)
+        rhos = np.array([np.outer(psi, psi) for psi in bell_states])
+        meas = tm.expectation_values(ops, rhos)
+        # unphysical data, the linear inversion is not positive
+        meas[:, 1:] *= 1.05
+
+        rhos_mle = tm.max_likelihood_tomo(ops, meas)
+        self.assertEqual(rhos_mle.shape, (4, 4, 4))
+        for rho, rho_mle in zip(rhos, rhos_mle):
+            self.assertGreater(np.min(np.linalg.eigvalsh(rho_mle)), -1e-12)
+            self.assertAlmostEqual(np.trace(rho_mle).real, 1)
+            self.assertAlmostEqual(np.trace(rho @ rho_mle).real, 1, places=3)
+
+        rho_mle = tm.max_likelihood_tomo(ops, meas[2])
+        np.testing.assert_almost_equal(rho_mle, rhos_mle[2], decimal=4)
@@ -267,6 +267,38 @@ class Test_Waveforms(unittest.TestCase):
         self.assertEqual(np.shape(theta_wave), np.shape(test_wave_2))
         # np.testing.assert_almost_equal(theta_wave, test_wave_2)
 
+    def test_martinis_flux_pulse_batch(self):
+        kw = {'f_01_max': 6e9, 'J2': 40e6, 'E_c': 300e6,
+              'f_interaction': 5e9, 'V_per_phi0': 2, 'V_offset': .1,
+              'sampling_rate': 2.4e9}
+        lengths = np.array([40e-9, 60e-9])
+        waves = wf.martinis_flux_pulse_batch(
+            lengths[:, None], [0, 0.1], 0, 80, **kw)
+        self.assertEqual(waves.shape, (4, 144))
+        for i, (length, lambda_2) in enumerate(
+                [(40e-9, 0), (40e-9, .1), (60e-9, 0), (60e-9, .1)]):
+            wave = wf.martinis_flux_pulse(length, lambda_2, 0, 80, **kw)
+            np.testing.assert_allclose(waves[i, :len(wave)], wave,
+                                       atol=1e-12)
+            # shorter pulses are padded with the idle value (V_offset)
+            np.testing.assert_allclose(waves[i, len(wave):], .1)
+
+        # the cumulative integral is the same as integrating every prefix
+        theta_wave = wf.martinis_flux_pulse(40e-9, .1, 0, 80,
+                                            return_unit='theta', **kw)
+        theta_i = np.arctan(2*kw['J2'] / (kw['f_01_max']-5e9))
+        taus = np.arange(0, 40e-9-1/48e9, 1/24e9)
+        lambda_1 = (2*np.pi*80/360 - theta_i) / 2
+        theta_dense = (theta_i +
+                       lambda_1*(1-np.cos(2*np.pi*taus/40e-9)) +
+                       lambda_1*.1*(1-np.cos(4*np.pi*taus/40e-9)))
+        t = np.array([np.trapz(np.sin(theta_dense)[:i+1], dx=1/24e9)
+                      for i in range(len(theta_dense))])
+        t_samples = np.arange(0, 40e-9, 1/2.4e9)
+        np.testing.assert_allclose(
+            theta_wave, np.interp(t_samples, t/(t[-1]/t_samples[-1]),
+                                  theta_dense), atol=1e-12)
+
     def test_mod_square_VSM(self):
         waveform = wf.mod_square_VSM(1, 0,
                                      20e-9, f_modulation=0, sampling_rate=1e9)
@@ -162,7 +162,7 @@ def load_settings_onto_instrument(instrument, load_from_instr=None,
             else:
                 folder = folder
             filepath = a_tools.measurement_filename(folder)
-            f = h5py.File(filepath, 'r')
+            f = h5d.open_read_only(filepath)
             sets_group = f['Instrument settings']
             if load_from_instr is None:
                 ins_group = sets_group[instrument_name]
@@ -246,7 +246,7 @@ def load_settings_onto_instrument_v2(instrument, load_from_instr: str=None,
             filepath = a_tools.measurement_filename(folder)
         try:
 
-            f = h5py.File(filepath, 'r')
+            f = h5d.open_read_only(filepath)
             snapshot = {}
             h5d.read_dict_from_hdf5(snapshot, h5_group=f['Snapshot'])
 